@@ -0,0 +1,514 @@
+"""
+Archivo: app/core/cache_store.py
+Proposito:
+- Indice unico (SQLite) y politica de desalojo para todos los caches en disco:
+  renders por contenido, DOCX/PDF de vista previa y artefactos de /generate.
+
+Responsabilidades:
+- Registrar cada entrada (archivo o carpeta) con namespace, tamano, ultimo
+  acceso y cantidad de hits.
+- Llevar contadores hits/misses/evicciones por namespace, compartidos entre
+  workers de uvicorn (viven en el mismo SQLite).
+- Llevar el total de bytes indexados en una fila (triggers de SQLite), para
+  que cada escritura chequee la cuota en O(1) y solo desaloje si se excede
+  (enforce_quota).
+- Expirar por antiguedad (TTL por entrada o max_age global) y desalojar por
+  LRU hasta cumplir la cuota de disco (evict, en el barrido).
+- Adoptar archivos existentes bajo carpetas registradas (ej. PDFs viejos),
+  borrar temporales huerfanos y olvidar filas cuyo archivo ya no existe.
+- Barrido periodico en un hilo de fondo (CacheSweeper).
+No hace:
+- No decide claves ni escribe los archivos: cada cache escribe los suyos y
+  los registra aqui.
+
+Entradas/Salidas:
+- Entradas: namespace + ruta de la entrada.
+- Salidas: stats() para el endpoint de administracion.
+
+Dependencias:
+- sqlite3, shutil, threading, app.core.paths, app.core.settings.
+
+Puntos de extension:
+- Registrar nuevas carpetas con register_root() para que el barrido las adopte.
+
+Donde tocar si falla:
+- Si el disco crece, revisar GICATESIS_CACHE_MAX_MB y que el sweeper este
+  activo (GICATESIS_CACHE_SWEEP_INTERVAL > 0).
+- Si el indice se corrompe, borrar app/.cache/index.sqlite3: se reconstruye
+  adoptando los archivos en el proximo barrido.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.paths import (
+    get_cache_index_path,
+    get_docx_cache_dir,
+    get_pdf_cache_dir,
+    get_render_cache_dir,
+)
+from app.core.settings import (
+    get_cache_max_age,
+    get_cache_max_bytes,
+    get_cache_sweep_interval,
+)
+
+logger = logging.getLogger(__name__)
+
+# Filas LRU que enforce_quota lee por vuelta mientras la cuota siga excedida.
+_QUOTA_BATCH = 64
+# Temporales (".*.tmp") mas viejos que esto son restos de escrituras fallidas.
+_STALE_TMP_SECONDS = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    ttl REAL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage(id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_usage_insert AFTER INSERT ON entries
+BEGIN UPDATE usage SET bytes = bytes + NEW.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_usage_update AFTER UPDATE OF size ON entries
+BEGIN UPDATE usage SET bytes = bytes + NEW.size - OLD.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_usage_delete AFTER DELETE ON entries
+BEGIN UPDATE usage SET bytes = bytes - OLD.size WHERE id = 0; END;
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _entry_size(path: Path) -> Optional[int]:
+    """Tamano en bytes de un archivo o carpeta (None si no existe)."""
+    try:
+        if path.is_dir():
+            return sum(
+                child.stat().st_size for child in path.rglob("*") if child.is_file()
+            )
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _remove_entry(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class CacheStore:
+    """Indice SQLite de entradas cacheadas con cuota LRU y expiracion."""
+
+    def __init__(self, index_path: Path, max_bytes: int, max_age: float) -> None:
+        self.index_path = Path(index_path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._roots: List[Tuple[str, Path, str, Optional[float]]] = []
+
+    # ── conexion ──────────────────────────────────────────────
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.index_path),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _write(self, statements: List[Tuple[str, tuple]]) -> None:
+        """Ejecuta sentencias en una transaccion; un fallo del indice no rompe el request."""
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as exc:
+                logger.warning("Cache index write failed: %s", exc)
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            try:
+                return self._connection().execute(sql, params).fetchall()
+            except sqlite3.Error as exc:
+                logger.warning("Cache index read failed: %s", exc)
+                return []
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _counter(namespace: str, column: str, amount: int = 1) -> Tuple[str, tuple]:
+        return (
+            f"INSERT INTO counters(namespace, {column}) VALUES(?, ?) "
+            f"ON CONFLICT(namespace) DO UPDATE SET {column} = {column} + excluded.{column}",
+            (namespace, amount),
+        )
+
+    # ── registro ──────────────────────────────────────────────
+
+    def register_root(
+        self, namespace: str, root: Path, pattern: str = "*", ttl: Optional[float] = None
+    ) -> None:
+        """Declara una carpeta cuyas entradas (pattern) adopta el barrido."""
+        root_entry = (namespace, Path(root), pattern, ttl)
+        if root_entry not in self._roots:
+            self._roots.append(root_entry)
+
+    def record_put(
+        self, namespace: str, path: Path, ttl: Optional[float] = None
+    ) -> None:
+        """Registra (o actualiza) una entrada recien escrita."""
+        path = Path(path).resolve()
+        size = _entry_size(path)
+        if size is None:
+            return
+        now = time.time()
+        self._write(
+            [
+                (
+                    "INSERT INTO entries(path, namespace, size, created_at, last_access, ttl) "
+                    "VALUES(?, ?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET "
+                    "size = excluded.size, last_access = excluded.last_access, "
+                    "ttl = excluded.ttl",
+                    (str(path), namespace, size, now, now, ttl),
+                )
+            ]
+        )
+
+    def record_hit(self, namespace: str, path: Path) -> None:
+        """Marca la entrada como usada (LRU) y suma un hit."""
+        path = Path(path).resolve()
+        now = time.time()
+        size = _entry_size(path) or 0
+        self._write(
+            [
+                (
+                    "INSERT INTO entries(path, namespace, size, created_at, last_access, hits) "
+                    "VALUES(?, ?, ?, ?, ?, 1) ON CONFLICT(path) DO UPDATE SET "
+                    "last_access = excluded.last_access, hits = hits + 1",
+                    (str(path), namespace, size, now, now),
+                ),
+                self._counter(namespace, "hits"),
+            ]
+        )
+
+    def record_miss(self, namespace: str) -> None:
+        self._write([self._counter(namespace, "misses")])
+
+    # ── desalojo ──────────────────────────────────────────────
+
+    def adopt(self) -> int:
+        """Indexa archivos de las carpetas registradas que aun no estan en el indice."""
+        known = {row[0] for row in self._read("SELECT path FROM entries")}
+        statements: List[Tuple[str, tuple]] = []
+        now = time.time()
+        for namespace, root, pattern, ttl in self._roots:
+            if not root.is_dir():
+                continue
+            for path in root.glob(".*.tmp"):
+                try:
+                    if now - path.stat().st_mtime > _STALE_TMP_SECONDS:
+                        path.unlink()
+                except OSError:
+                    pass
+            for path in root.glob(pattern):
+                if path.name.startswith("."):
+                    continue
+                resolved = path.resolve()
+                if str(resolved) in known:
+                    continue
+                size = _entry_size(resolved)
+                if size is None:
+                    continue
+                mtime = resolved.stat().st_mtime
+                statements.append(
+                    (
+                        "INSERT OR IGNORE INTO entries"
+                        "(path, namespace, size, created_at, last_access, ttl) "
+                        "VALUES(?, ?, ?, ?, ?, ?)",
+                        (str(resolved), namespace, size, mtime, mtime, ttl),
+                    )
+                )
+        if statements:
+            self._write(statements)
+        return len(statements)
+
+    def used_bytes(self) -> int:
+        """Total de bytes indexados (fila mantenida por triggers, O(1))."""
+        rows = self._read("SELECT bytes FROM usage WHERE id = 0")
+        return int(rows[0][0]) if rows else 0
+
+    def enforce_quota(self, exclude: Iterable[Path] = ()) -> int:
+        """Desaloja por LRU solo si el total supera la cuota (camino del request).
+
+        Nunca desaloja las rutas de ``exclude``: el llamador las acaba de
+        escribir y va a devolverlas, aunque por si solas superen la cuota.
+        No recorre el indice ni hace stat de cada entrada: expirar por TTL y
+        olvidar archivos borrados queda para el barrido (evict/sweep).
+        """
+        keep = [str(Path(path).resolve()) for path in exclude]
+        query = "SELECT path, namespace, size FROM entries"
+        if keep:
+            query += f" WHERE path NOT IN ({', '.join('?' * len(keep))})"
+        query += " ORDER BY last_access LIMIT ?"
+        evicted_total = 0
+        while True:
+            excess = self.used_bytes() - self.max_bytes
+            if excess <= 0:
+                return evicted_total
+            rows = self._read(query, (*keep, _QUOTA_BATCH))
+            if not rows:
+                return evicted_total
+            evicted: List[Tuple[str, str]] = []
+            for raw_path, namespace, size in rows:
+                if excess <= 0:
+                    break
+                _remove_entry(Path(raw_path))
+                evicted.append((raw_path, namespace))
+                excess -= size
+            self._forget(evicted)
+            evicted_total += len(evicted)
+            logger.info("Cache store: %d entradas desalojadas (cuota)", len(evicted))
+
+    def _forget(
+        self, evicted: List[Tuple[str, str]], missing: Optional[List[str]] = None
+    ) -> None:
+        """Borra filas del indice y suma las evicciones por namespace."""
+        statements = [
+            ("DELETE FROM entries WHERE path = ?", (raw_path,))
+            for raw_path in (missing or []) + [raw_path for raw_path, _ns in evicted]
+        ]
+        per_namespace: Dict[str, int] = {}
+        for _raw_path, namespace in evicted:
+            per_namespace[namespace] = per_namespace.get(namespace, 0) + 1
+        statements.extend(
+            self._counter(namespace, "evictions", count)
+            for namespace, count in per_namespace.items()
+        )
+        if statements:
+            self._write(statements)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Reconciliacion completa: olvida faltantes, expira y desaloja por LRU.
+
+        Hace stat de cada entrada: corre en el barrido de fondo, no por request.
+        """
+        now = time.time() if now is None else now
+        rows = self._read(
+            "SELECT path, namespace, size, last_access, ttl FROM entries "
+            "ORDER BY last_access"
+        )
+        forget: List[str] = []
+        evicted: List[Tuple[str, str]] = []
+        alive: List[Tuple[str, str, int]] = []
+        for raw_path, namespace, size, last_access, ttl in rows:
+            path = Path(raw_path)
+            if not path.exists():
+                forget.append(raw_path)
+            elif now - last_access > (ttl if ttl is not None else self.max_age):
+                _remove_entry(path)
+                evicted.append((raw_path, namespace))
+            else:
+                alive.append((raw_path, namespace, size))
+
+        total = sum(size for _path, _ns, size in alive)
+        for raw_path, namespace, size in alive:
+            if total <= self.max_bytes:
+                break
+            _remove_entry(Path(raw_path))
+            evicted.append((raw_path, namespace))
+            total -= size
+
+        if not forget and not evicted:
+            return 0
+        self._forget(evicted, forget)
+        if evicted:
+            logger.info("Cache store: %d entradas desalojadas", len(evicted))
+        return len(evicted)
+
+    def sweep(self) -> int:
+        """Barrido completo: adopta huerfanos, olvida faltantes y desaloja."""
+        self.adopt()
+        return self.evict()
+
+    # ── reporte ───────────────────────────────────────────────
+
+    def entry_hits(self, namespace: str) -> Dict[str, int]:
+        """Hits por nombre de archivo de un namespace (para priorizar prewarm)."""
+        return {
+            Path(raw_path).name: hits
+            for raw_path, hits in self._read(
+                "SELECT path, hits FROM entries WHERE namespace = ?", (namespace,)
+            )
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Uso de disco y efectividad (hit ratio) total y por namespace."""
+        namespaces: Dict[str, Dict[str, Any]] = {}
+
+        def _bucket(namespace: str) -> Dict[str, Any]:
+            return namespaces.setdefault(
+                namespace,
+                {"entries": 0, "sizeBytes": 0, "hits": 0, "misses": 0, "evictions": 0},
+            )
+
+        for namespace, entries, size in self._read(
+            "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries "
+            "GROUP BY namespace"
+        ):
+            bucket = _bucket(namespace)
+            bucket["entries"], bucket["sizeBytes"] = entries, size
+        for namespace, hits, misses, evictions in self._read(
+            "SELECT namespace, hits, misses, evictions FROM counters"
+        ):
+            bucket = _bucket(namespace)
+            bucket["hits"], bucket["misses"], bucket["evictions"] = hits, misses, evictions
+
+        totals = {"entries": 0, "sizeBytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+        for bucket in namespaces.values():
+            lookups = bucket["hits"] + bucket["misses"]
+            bucket["hitRatio"] = round(bucket["hits"] / lookups, 4) if lookups else 0.0
+            for key in totals:
+                totals[key] += bucket[key]
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            **totals,
+            "hitRatio": round(totals["hits"] / lookups, 4) if lookups else 0.0,
+            "maxBytes": self.max_bytes,
+            "maxAgeSeconds": self.max_age,
+            "namespaces": namespaces,
+        }
+
+
+class CacheSweeper:
+    """Hilo de fondo que ejecuta store.sweep() cada interval segundos."""
+
+    def __init__(self, store: CacheStore, interval: float) -> None:
+        self.store = store
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="cache-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.store.sweep()
+            except Exception as exc:  # el sweeper nunca debe morir
+                logger.warning("Cache sweep failed: %s", exc)
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_STORE: Optional[CacheStore] = None
+_SWEEPER: Optional[CacheSweeper] = None
+_STORE_LOCK = threading.Lock()
+
+
+def _register_default_roots(store: CacheStore) -> None:
+    store.register_root("render", get_render_cache_dir())
+    store.register_root("docx", get_docx_cache_dir(), "*.docx")
+    store.register_root("pdf", get_pdf_cache_dir(), "*.pdf")
+
+
+def get_cache_store() -> CacheStore:
+    """Retorna el indice de caches del proceso (singleton)."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                store = CacheStore(
+                    index_path=get_cache_index_path(),
+                    max_bytes=get_cache_max_bytes(),
+                    max_age=get_cache_max_age(),
+                )
+                _register_default_roots(store)
+                _STORE = store
+    return _STORE
+
+
+def start_cache_sweeper() -> Optional[CacheSweeper]:
+    """Arranca el barrido periodico (None si GICATESIS_CACHE_SWEEP_INTERVAL=0)."""
+    global _SWEEPER
+    interval = get_cache_sweep_interval()
+    if interval <= 0:
+        return None
+    store = get_cache_store()
+    with _STORE_LOCK:
+        if _SWEEPER is None:
+            _SWEEPER = CacheSweeper(store, interval)
+            _SWEEPER.start()
+    return _SWEEPER
+
+
+def stop_cache_sweeper() -> None:
+    global _SWEEPER
+    with _STORE_LOCK:
+        sweeper, _SWEEPER = _SWEEPER, None
+    if sweeper is not None:
+        sweeper.stop()
+
+
+def reset_cache_store() -> None:
+    """Detiene el sweeper y descarta el singleton. Util en tests."""
+    global _STORE
+    stop_cache_sweeper()
+    with _STORE_LOCK:
+        store, _STORE = _STORE, None
+    if store is not None:
+        store.close()
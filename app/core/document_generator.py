@@ -5,78 +5,86 @@ Proposito:
 
 Responsabilidades:
 - Resolver el comando del script generador desde el provider.
-- Ejecutar el subprocess que produce el DOCX.
+- Delegar la ejecucion al backend configurado (subprocess, inprocess o pool).
 - Limpiar archivos temporales de forma segura.
 No hace:
 - No define rutas HTTP ni renderiza templates.
 - No gestiona cache (eso va en formats/router o un futuro cache_service).
 
 Entradas/Salidas:
-- Entradas: format_id, generator command, rutas JSON/output.
+- Entradas: format_id, generator command, rutas JSON/output o dict ya procesado.
 - Salidas: (output_path, filename) del DOCX generado.
 
 Dependencias:
-- subprocess, tempfile, pathlib, app.core.loaders, app.core.registry.
+- tempfile, pathlib, app.core.loaders, app.core.registry.
+- app.core.generator_backends (ejecucion del generador).
+- app.core.metrics (tiempo de pared del generador por backend).
 - app.core.format_builder (para normalize_format_type).
 
 Puntos de extension:
 - Agregar hooks pre/post generacion.
-- Soportar nuevos tipos de generadores (no solo subprocess).
+- Agregar backends nuevos en app/core/generator_backends.py.
 
 Donde tocar si falla:
-- Revisar resolve_generator_command y ejecucion de subprocess.
+- Revisar GICATESIS_GENERATOR_MODE y el backend en generator_backends.
 """
 
 import json
-import subprocess
-import sys
 import tempfile
 from pathlib import Path
-from typing import List, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, Optional, Tuple
 
-from app.core.loaders import find_format_index
+from app.core import metrics
+from app.core.loaders import FormatIndexItem, find_format_index
 from app.core.registry import get_provider
 from app.core.format_builder import normalize_format_type
+from app.core.generator_backends import (  # noqa: F401 (re-export)
+    GeneratorCommand,
+    get_generator_backend,
+    resolve_generator_command,
+)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# RESOLUCION DE GENERADORES
+# EJECUCION DE GENERADORES
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def resolve_generator_command(
-    generator: Union[Path, Sequence[str]],
-    json_path: Path,
+def run_generator(
+    generator: GeneratorCommand,
     output_path: Path,
-) -> Tuple[List[str], Optional[Path]]:
+    *,
+    json_path: Optional[Path] = None,
+    data: Optional[Dict[str, Any]] = None,
+) -> None:
     """
-    Resuelve el comando del generador y su directorio de trabajo.
+    Ejecuta el generador con el backend configurado.
 
-    Soporta:
-    - list/tuple: se interpreta como comando ya compuesto.
-    - Path/str: se interpreta como ruta a script .py.
-
-    Retorna: (cmd_list, workdir_or_None).
+    Recibe una ruta JSON o un dict ya procesado (data tiene prioridad).
+    Lanza RuntimeError con el detalle del backend si la generacion falla.
     """
-    if isinstance(generator, (list, tuple)):
-        cmd = [str(part) for part in generator]
-        workdir = None
-        for part in reversed(generator):
-            part_str = str(part)
-            if part_str.endswith(".py"):
-                workdir = Path(part_str).resolve().parent
-                break
-        return cmd + [str(json_path), str(output_path)], workdir
-
-    script_path = Path(generator)
-    if not script_path.exists():
-        raise RuntimeError(f"Generator script not found: {script_path}")
-    return [
-        sys.executable,
-        str(script_path),
-        str(json_path),
-        str(output_path),
-    ], script_path.parent
+    backend = get_generator_backend()
+    with metrics.timed("gicatesis_generator_duration_seconds", backend=backend.name):
+        if data is not None:
+            backend.generate(generator, output_path, data=data)
+        else:
+            backend.generate(generator, output_path, json_path=json_path)
+
+
+def build_document_filename(item: FormatIndexItem) -> str:
+    """Nombre de descarga del DOCX de un formato (UNI_CATEGORIA_ENFOQUE.docx)."""
+    return f"{item.uni.upper()}_{item.categoria.upper()}_{item.enfoque.upper()}.docx"
+
+
+def _new_output_path(provider_code: str) -> Path:
+    tmp_file = tempfile.NamedTemporaryFile(
+        prefix=f"{provider_code}_",
+        suffix=".docx",
+        delete=False,
+    )
+    output_path = Path(tmp_file.name)
+    tmp_file.close()
+    return output_path
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -88,6 +96,7 @@ def generate_document_by_id(
     format_id: str,
     section_filter: Optional[str] = None,
     override_json_path: Optional[Path] = None,
+    override_data: Optional[Dict[str, Any]] = None,
 ) -> Tuple[Path, str]:
     """
     Genera un DOCX para un formato identificado por format_id.
@@ -95,6 +104,8 @@ def generate_document_by_id(
     Permite:
     - section_filter == "planteamiento": filtra solo Capitulo I.
     - override_json_path: usa un JSON preprocesado en lugar del original.
+    - override_data: usa un dict preprocesado (evita escribir/leer JSON temporal
+      cuando el backend es inprocess/pool).
 
     Retorna: (output_path, filename).
     """
@@ -103,7 +114,6 @@ def generate_document_by_id(
         raise ValueError(f"Invalid format ID: {format_id}")
 
     tipo = item.categoria
-    enfoque = item.enfoque
 
     provider = get_provider(item.uni)
     generator = provider.get_generator_command(tipo)
@@ -114,9 +124,12 @@ def generate_document_by_id(
 
     # ─── LOGICA DE OVERRIDE O FILTRADO ───
     path_to_use = json_path
-    cleanup_path = False
+    data_to_use: Optional[Dict[str, Any]] = None
+
+    if override_data is not None:
+        data_to_use = override_data
 
-    if override_json_path:
+    elif override_json_path:
         path_to_use = override_json_path
 
     elif section_filter == "planteamiento":
@@ -139,48 +152,21 @@ def generate_document_by_id(
             if "PLANTEAMIENTO" in cap.get("titulo", "").upper()
         ]
 
-        # 4. Guardamos el JSON filtrado
-        tmp_json = tempfile.NamedTemporaryFile(
-            prefix="filtered_",
-            suffix=".json",
-            delete=False,
-            mode="w",
-            encoding="utf-8",
-        )
-        json.dump(data, tmp_json, ensure_ascii=False, indent=2)
-        tmp_json.close()
-
-        path_to_use = Path(tmp_json.name)
-        cleanup_path = True
+        # 4. El backend decide si necesita serializarlo a un JSON temporal
+        data_to_use = data
 
     # ─── GENERACION ───
-    filename = f"{provider.code.upper()}_{tipo.upper()}_{enfoque.upper()}.docx"
-    tmp_file = tempfile.NamedTemporaryFile(
-        prefix=f"{provider.code}_",
-        suffix=".docx",
-        delete=False,
-    )
-    output_path = Path(tmp_file.name)
-    tmp_file.close()
-
-    cmd, workdir = resolve_generator_command(generator, path_to_use, output_path)
-    result = subprocess.run(
-        cmd,
-        cwd=str(workdir) if workdir else None,
-        capture_output=True,
-        text=True,
-    )
-
-    # Limpiamos el JSON temporal si fue creado por el filtro
-    if cleanup_path and path_to_use != json_path and path_to_use != override_json_path:
-        try:
-            path_to_use.unlink()
-        except Exception:
-            pass
+    filename = build_document_filename(item)
+    output_path = _new_output_path(provider.code)
 
-    if result.returncode != 0:
-        print("[ERROR]", result.stderr)
-        raise RuntimeError("Document generation failed. Check console for details.")
+    try:
+        run_generator(generator, output_path, json_path=path_to_use, data=data_to_use)
+    except RuntimeError as exc:
+        cleanup_temp_file(output_path)
+        print("[ERROR]", exc)
+        raise RuntimeError(
+            "Document generation failed. Check console for details."
+        ) from exc
 
     if not output_path.exists():
         raise RuntimeError("Generator script executed but did not create DOCX file.")
@@ -214,25 +200,14 @@ def generate_document_by_type(
         raise RuntimeError(f"JSON no encontrado: {json_path}")
 
     filename = f"{provider.code.upper()}_{fmt_type.upper()}_{sub_type.upper()}.docx"
-    tmp_file = tempfile.NamedTemporaryFile(
-        prefix=f"{provider.code}_",
-        suffix=".docx",
-        delete=False,
-    )
-    output_path = Path(tmp_file.name)
-    tmp_file.close()
-
-    cmd, workdir = resolve_generator_command(generator, json_path, output_path)
-    result = subprocess.run(
-        cmd,
-        cwd=str(workdir) if workdir else None,
-        capture_output=True,
-        text=True,
-    )
+    output_path = _new_output_path(provider.code)
 
-    if result.returncode != 0:
-        print("[ERROR PYTHON]", result.stderr)
-        raise RuntimeError("Fallo la generacion interna. Revisa consola.")
+    try:
+        run_generator(generator, output_path, json_path=json_path)
+    except RuntimeError as exc:
+        cleanup_temp_file(output_path)
+        print("[ERROR PYTHON]", exc)
+        raise RuntimeError("Fallo la generacion interna. Revisa consola.") from exc
 
     if not output_path.exists():
         raise RuntimeError("El script corrio pero no genero el DOCX")
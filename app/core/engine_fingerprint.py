@@ -0,0 +1,119 @@
+"""
+Archivo: app/core/engine_fingerprint.py
+Proposito:
+- Calcular una sola vez la huella del codigo que determina un render
+  (engine, generadores, preprocesador, loaders) y exponerla como token.
+
+Responsabilidades:
+- Hashear el contenido (no el mtime) de las fuentes del motor.
+- Memorizar el token por proceso; recalcularlo solo ante una recarga explicita
+  (reload_engine_fingerprint o SIGHUP en POSIX).
+No hace:
+- No hashea los JSON de formatos (eso es FormatIndexItem.content_hash).
+- No invalida archivos de cache: los caches cambian de clave al cambiar el token.
+
+Entradas/Salidas:
+- Entradas: archivos .py bajo app/.
+- Salidas: token hexadecimal (sha256).
+
+Dependencias:
+- hashlib, signal, threading, app.core.paths.
+
+Puntos de extension:
+- Agregar rutas a _FINGERPRINT_SOURCES si otro modulo influye en el DOCX.
+
+Donde tocar si falla:
+- Si un cambio de codigo no invalida el cache, revisar _FINGERPRINT_SOURCES
+  o enviar SIGHUP al worker (kill -HUP <pid>).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import signal
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.core.paths import get_app_root
+
+logger = logging.getLogger(__name__)
+
+# Rutas relativas a app/: carpetas se recorren recursivamente (*.py).
+_FINGERPRINT_SOURCES = (
+    "engine",
+    "universities",
+    "modules/generation/preprocessor.py",
+    "modules/formats/service.py",
+    "core/loaders.py",
+)
+
+# RLock: el handler de SIGHUP corre en el hilo principal y puede reentrar.
+_LOCK = threading.RLock()
+_FINGERPRINT: Optional[str] = None
+
+
+def _iter_source_files(app_root: Path, sources: Iterable[str]) -> List[Path]:
+    files: List[Path] = []
+    for rel in sources:
+        path = app_root / rel
+        if path.is_dir():
+            files.extend(path.rglob("*.py"))
+        elif path.is_file():
+            files.append(path)
+    return sorted(set(files))
+
+
+def compute_engine_fingerprint(app_root: Optional[Path] = None) -> str:
+    """Hash sha256 del contenido de las fuentes del motor (sin cache)."""
+    root = app_root or get_app_root()
+    hasher = hashlib.sha256()
+    for path in _iter_source_files(root, _FINGERPRINT_SOURCES):
+        hasher.update(path.relative_to(root).as_posix().encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(path.read_bytes())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def get_engine_fingerprint() -> str:
+    """Retorna el token del motor; se calcula en el primer uso o al arrancar."""
+    global _FINGERPRINT
+    if _FINGERPRINT is None:
+        with _LOCK:
+            if _FINGERPRINT is None:
+                _FINGERPRINT = compute_engine_fingerprint()
+                logger.info("Engine fingerprint: %s", _FINGERPRINT[:16])
+    return _FINGERPRINT
+
+
+def reload_engine_fingerprint() -> str:
+    """Recalcula el token (ej. tras desplegar codigo sin reiniciar)."""
+    global _FINGERPRINT
+    fingerprint = compute_engine_fingerprint()
+    with _LOCK:
+        previous, _FINGERPRINT = _FINGERPRINT, fingerprint
+    if previous != fingerprint:
+        logger.info("Engine fingerprint recargado: %s", fingerprint[:16])
+    return fingerprint
+
+
+def reset_engine_fingerprint() -> None:
+    """Descarta el token memorizado (se recalcula en el proximo uso)."""
+    global _FINGERPRINT
+    with _LOCK:
+        _FINGERPRINT = None
+
+
+def install_reload_signal() -> bool:
+    """Registra SIGHUP -> reload_engine_fingerprint. False si no aplica."""
+    sighup = getattr(signal, "SIGHUP", None)
+    if sighup is None:
+        return False
+    try:
+        signal.signal(sighup, lambda _signum, _frame: reload_engine_fingerprint())
+    except ValueError:
+        # Solo el hilo principal puede registrar handlers (ej. TestClient).
+        return False
+    return True
@@ -0,0 +1,526 @@
+"""
+Archivo: app/core/generator_backends.py
+Proposito:
+- Backends intercambiables para ejecutar el generador DOCX.
+
+Responsabilidades:
+- subprocess: ejecuta el script del provider en un proceso nuevo (aislamiento
+  total) y reproduce las metricas que el hijo deja en un JSON sidecar.
+- inprocess: llama al pipeline del Block Engine dentro del proceso del servidor.
+- pool: mantiene N procesos worker precalentados (docx, lxml y renderers ya
+  importados) que reciben el dict del formato por pipe y devuelven bytes DOCX.
+  El timeout corre desde que un worker toma el documento y, si vence, solo se
+  reemplaza ese worker.
+No hace:
+- No resuelve format_id ni filtra secciones (eso vive en document_generator).
+- No gestiona cache de DOCX/PDF.
+
+Entradas/Salidas:
+- Entradas: comando del generador, dict JSON o ruta JSON, ruta de salida.
+- Salidas: DOCX escrito en output_path o RuntimeError con detalle.
+
+Dependencias:
+- subprocess, multiprocessing (spawn + Pipe por worker), app.core.settings,
+  app.core.metrics (pool y subprocess reenvian las metricas de sus procesos).
+
+Puntos de extension:
+- Agregar nuevos backends implementando GeneratorBackend.generate().
+
+Donde tocar si falla:
+- Verificar GICATESIS_GENERATOR_MODE y que el generador sea el compartido:
+  los comandos custom de un provider siempre corren como subprocess.
+- "Reemplazando worker ... reason=timeout" en el log: un documento supero
+  GICATESIS_GENERATOR_TIMEOUT; los demas renders del pool siguen corriendo.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple, Union
+
+from app.core import metrics
+from app.core.paths import get_app_root
+from app.core.settings import (
+    get_generator_mode,
+    get_generator_pool_size,
+    get_generator_timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+GeneratorCommand = Union[Path, Sequence[str]]
+
+# Generador unificado que pueden ejecutar los backends in-process/pool.
+_SHARED_GENERATOR = (
+    get_app_root() / "universities" / "shared" / "universal_generator.py"
+).resolve()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RESOLUCION DE COMANDOS
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def resolve_generator_command(
+    generator: GeneratorCommand,
+    json_path: Path,
+    output_path: Path,
+) -> Tuple[List[str], Optional[Path]]:
+    """
+    Resuelve el comando del generador y su directorio de trabajo.
+
+    Soporta:
+    - list/tuple: se interpreta como comando ya compuesto.
+    - Path/str: se interpreta como ruta a script .py.
+
+    Retorna: (cmd_list, workdir_or_None).
+    """
+    if isinstance(generator, (list, tuple)):
+        cmd = [str(part) for part in generator]
+        workdir = None
+        for part in reversed(generator):
+            part_str = str(part)
+            if part_str.endswith(".py"):
+                workdir = Path(part_str).resolve().parent
+                break
+        return cmd + [str(json_path), str(output_path)], workdir
+
+    script_path = Path(generator)
+    if not script_path.exists():
+        raise RuntimeError(f"Generator script not found: {script_path}")
+    return [
+        sys.executable,
+        str(script_path),
+        str(json_path),
+        str(output_path),
+    ], script_path.parent
+
+
+def is_shared_generator(generator: GeneratorCommand) -> bool:
+    """Indica si el comando apunta al universal_generator compartido."""
+    if isinstance(generator, (list, tuple)):
+        return False
+    try:
+        return Path(generator).resolve() == _SHARED_GENERATOR
+    except (OSError, TypeError):
+        return False
+
+
+def _load_json(json_path: Path) -> Dict[str, Any]:
+    with open(json_path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BACKENDS
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class GeneratorBackend(Protocol):
+    """Contrato comun: escribe el DOCX en output_path o lanza RuntimeError."""
+
+    name: str
+
+    def generate(
+        self,
+        generator: GeneratorCommand,
+        output_path: Path,
+        *,
+        json_path: Optional[Path] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None: ...
+
+
+class SubprocessGeneratorBackend:
+    """Ejecuta el generador en un proceso Python nuevo por documento."""
+
+    name = "subprocess"
+
+    def generate(
+        self,
+        generator: GeneratorCommand,
+        output_path: Path,
+        *,
+        json_path: Optional[Path] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        tmp_json: Optional[Path] = None
+        if json_path is None:
+            # El script solo acepta rutas: serializa el dict a un JSON temporal.
+            handle = tempfile.NamedTemporaryFile(
+                prefix="gen_",
+                suffix=".json",
+                delete=False,
+                mode="w",
+                encoding="utf-8",
+            )
+            json.dump(data or {}, handle, ensure_ascii=False, indent=2)
+            handle.close()
+            tmp_json = Path(handle.name)
+            json_path = tmp_json
+
+        # El hijo deja sus observaciones (etapas, blocks) en este sidecar; los
+        # generadores custom lo ignoran y el archivo queda vacio.
+        handle = tempfile.NamedTemporaryFile(
+            prefix="gen_", suffix=".metrics.json", delete=False
+        )
+        handle.close()
+        sidecar = Path(handle.name)
+        env = {**os.environ, metrics.METRICS_SIDECAR_ENV: str(sidecar)}
+
+        try:
+            cmd, workdir = resolve_generator_command(generator, json_path, output_path)
+            result = subprocess.run(
+                cmd,
+                cwd=str(workdir) if workdir else None,
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+            metrics.replay_observations(metrics.load_observations(str(sidecar)))
+        finally:
+            for tmp_path in (tmp_json, sidecar):
+                if tmp_path is None:
+                    continue
+                try:
+                    tmp_path.unlink()
+                except Exception:
+                    pass
+
+        if result.returncode != 0:
+            detail = (result.stderr or result.stdout or "sin detalle").strip()
+            raise RuntimeError(detail)
+
+
+class InProcessGeneratorBackend:
+    """Llama a generate_document_from_data dentro del proceso actual."""
+
+    name = "inprocess"
+
+    def __init__(self, fallback: Optional[SubprocessGeneratorBackend] = None) -> None:
+        self._fallback = fallback or SubprocessGeneratorBackend()
+        # Sin lock: cada render_blocks usa su propio RenderContext, asi que
+        # varios renders pueden correr a la vez en este proceso.
+
+    def generate(
+        self,
+        generator: GeneratorCommand,
+        output_path: Path,
+        *,
+        json_path: Optional[Path] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not is_shared_generator(generator):
+            self._fallback.generate(
+                generator, output_path, json_path=json_path, data=data
+            )
+            return
+        if data is None:
+            data = _load_json(json_path)
+
+        from app.universities.shared.universal_generator import (
+            generate_document_from_data,
+        )
+
+        try:
+            generate_document_from_data(data, str(output_path))
+        except Exception as exc:
+            raise RuntimeError(f"{type(exc).__name__}: {exc}") from exc
+
+
+def _pool_worker_main(conn: Any) -> None:
+    """Bucle del worker: precalienta el engine y ejecuta un trabajo a la vez.
+
+    Cada trabajo llega por el pipe como ``(fn, args)`` y la respuesta vuelve
+    como ``("ok", resultado)`` o ``("error", detalle)``. ``None`` lo detiene.
+    """
+    import app.universities.shared.universal_generator  # noqa: F401
+
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            conn.send(("ok", fn(*args)))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+def _pool_render(data: Dict[str, Any]) -> Tuple[bytes, list]:
+    """Renderiza en el worker y devuelve el DOCX junto con sus metricas por etapa."""
+    from app.universities.shared.universal_generator import render_document_bytes
+
+    with metrics.capture_observations() as observations:
+        payload = render_document_bytes(data)
+    return payload, observations
+
+
+class _WorkerTimeout(Exception):
+    """El worker no respondio dentro del timeout."""
+
+
+class _WorkerDied(Exception):
+    """El proceso worker termino o cerro su pipe."""
+
+
+class _PoolWorker:
+    """Un proceso worker con su pipe; lo usa un solo hilo del servidor a la vez."""
+
+    def __init__(self, context: Any) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_pool_worker_main,
+            args=(child_conn,),
+            name="gicatesis-generator-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def wait_ready(self, timeout: float) -> None:
+        """Espera a que el worker termine de importar el engine."""
+        if self.ready:
+            return
+        if not self._poll(timeout):
+            raise _WorkerTimeout("arranque")
+        self._recv()
+        self.ready = True
+
+    def run(self, fn: Any, args: Tuple[Any, ...], timeout: float) -> Any:
+        """Ejecuta ``fn(*args)`` en el worker; el timeout corre desde el envio.
+
+        Solo se llama con el worker libre, asi que el trabajo empieza en cuanto
+        se envia: la espera en cola del pool no consume el timeout.
+        """
+        self.wait_ready(timeout)
+        try:
+            self.conn.send((fn, args))
+        except OSError as exc:
+            raise _WorkerDied(str(exc)) from exc
+        if not self._poll(timeout):
+            raise _WorkerTimeout("render")
+        status, value = self._recv()
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def kill(self) -> None:
+        """Termina el proceso (tambien si esta colgado en un render)."""
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(5)
+        self.conn.close()
+
+    def _poll(self, timeout: float) -> bool:
+        try:
+            return self.conn.poll(timeout)
+        except OSError as exc:
+            raise _WorkerDied(str(exc)) from exc
+
+    def _recv(self) -> Tuple[str, Any]:
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError) as exc:
+            raise _WorkerDied("el worker cerro el pipe") from exc
+
+
+class WorkerPoolGeneratorBackend:
+    """Pool de procesos precalentados que devuelven el DOCX como bytes.
+
+    Cada documento toma un worker libre (espera sin limite si todos estan
+    ocupados) y su timeout corre solo desde que el worker lo recibe. Un worker
+    colgado o caido se reemplaza sin tocar a los demas.
+    """
+
+    name = "pool"
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float,
+        fallback: Optional[SubprocessGeneratorBackend] = None,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self._fallback = fallback or SubprocessGeneratorBackend()
+        # spawn: seguro con el servidor multi-hilo y portable a Windows.
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: Optional[queue.Queue] = None
+        self._workers: List[_PoolWorker] = []
+        self._lock = threading.Lock()
+
+    def warm(self) -> None:
+        """Levanta los workers y espera a que terminen de importar el engine."""
+        idle = self._get_idle()
+        # Toma cada worker de la cola: ningun render usa su pipe mientras tanto.
+        taken: List[_PoolWorker] = []
+        try:
+            for _ in range(self.size):
+                worker = idle.get()
+                if worker is None:
+                    idle.put(None)
+                    return
+                taken.append(worker)
+                worker.wait_ready(self.timeout)
+        except (_WorkerTimeout, _WorkerDied) as exc:
+            logger.warning("Generator pool warmup failed: %s", exc)
+            return
+        finally:
+            for worker in taken:
+                idle.put(worker)
+        logger.info("Generator pool listo (%s workers)", self.size)
+
+    def generate(
+        self,
+        generator: GeneratorCommand,
+        output_path: Path,
+        *,
+        json_path: Optional[Path] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not is_shared_generator(generator):
+            self._fallback.generate(
+                generator, output_path, json_path=json_path, data=data
+            )
+            return
+        if data is None:
+            data = _load_json(json_path)
+
+        try:
+            payload, observations = self._run(_pool_render, data)
+        except _WorkerTimeout as exc:
+            logger.error("Generator pool timeout (%.0fs): %s", self.timeout, output_path)
+            raise RuntimeError("Timeout generando DOCX en el pool") from exc
+        except _WorkerDied as exc:
+            raise RuntimeError("El worker del pool de generadores se detuvo inesperadamente") from exc
+
+        # Las metricas del worker viven en otro proceso: se registran aqui.
+        metrics.replay_observations(observations)
+        Path(output_path).write_bytes(payload)
+
+    def shutdown(self) -> None:
+        """Detiene los workers del pool (los renders en curso fallan)."""
+        with self._lock:
+            idle, self._idle = self._idle, None
+            workers, self._workers = self._workers, []
+        if idle is None:
+            return
+        # Despierta a los hilos que esperan un worker libre de este pool.
+        idle.put(None)
+        for worker in workers:
+            worker.kill()
+
+    def _run(self, fn: Any, *args: Any) -> Any:
+        idle = self._get_idle()
+        worker = idle.get()
+        if worker is None:
+            idle.put(None)
+            raise RuntimeError("El pool de generadores se detuvo")
+        try:
+            result = worker.run(fn, args, self.timeout)
+        except _WorkerTimeout:
+            self._replace(idle, worker, reason="timeout")
+            raise
+        except _WorkerDied:
+            self._replace(idle, worker, reason="broken")
+            raise
+        except BaseException:
+            idle.put(worker)
+            raise
+        idle.put(worker)
+        return result
+
+    def _get_idle(self) -> queue.Queue:
+        with self._lock:
+            if self._idle is None:
+                self._idle = queue.Queue()
+                self._workers = [_PoolWorker(self._context) for _ in range(self.size)]
+                for worker in self._workers:
+                    self._idle.put(worker)
+            return self._idle
+
+    def _replace(self, idle: queue.Queue, worker: _PoolWorker, reason: str) -> None:
+        """Termina solo ``worker`` y deja uno nuevo en su lugar."""
+        logger.warning("Reemplazando worker %s del generator pool (reason=%s)", worker.pid, reason)
+        with self._lock:
+            current = idle is self._idle
+            if current:
+                fresh = _PoolWorker(self._context)
+                self._workers = [fresh if w is worker else w for w in self._workers]
+        worker.kill()
+        if current:
+            idle.put(fresh)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SELECCION DEL BACKEND
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+_BACKEND: Optional[GeneratorBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def _build_backend(mode: str) -> GeneratorBackend:
+    if mode == "inprocess":
+        return InProcessGeneratorBackend()
+    if mode == "pool":
+        backend = WorkerPoolGeneratorBackend(
+            size=get_generator_pool_size(),
+            timeout=get_generator_timeout(),
+        )
+        atexit.register(backend.shutdown)
+        return backend
+    return SubprocessGeneratorBackend()
+
+
+def get_generator_backend() -> GeneratorBackend:
+    """Retorna el backend configurado (singleton por proceso)."""
+    global _BACKEND
+    if _BACKEND is None:
+        with _BACKEND_LOCK:
+            if _BACKEND is None:
+                _BACKEND = _build_backend(get_generator_mode())
+                logger.info("Generator backend: %s", _BACKEND.name)
+    return _BACKEND
+
+
+def warm_generator_backend() -> None:
+    """Precalienta el pool si el backend configurado lo soporta."""
+    backend = get_generator_backend()
+    warm = getattr(backend, "warm", None)
+    if callable(warm):
+        warm()
+
+
+def reset_generator_backend() -> None:
+    """Descarta el backend actual (relee env en el proximo uso). Util en tests."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        backend, _BACKEND = _BACKEND, None
+    shutdown = getattr(backend, "shutdown", None)
+    if callable(shutdown):
+        shutdown()
@@ -0,0 +1,444 @@
+"""
+Archivo: app/core/libreoffice_pool.py
+Proposito:
+- Pool de instancias LibreOffice headless para convertir DOCX->PDF en Linux.
+
+Responsabilidades:
+- Mantener N instancias, cada una con su perfil (UserInstallation) persistente,
+  para no pagar el bootstrap del perfil en cada PDF. El perfil es propio del
+  proceso (instance-<pid>-<n>): con varios workers uvicorn/gunicorn, dos
+  soffice sobre el mismo perfil se reenvian el trabajo o no arrancan.
+- Repartir conversiones con una cola; cada instancia atiende un job a la vez.
+- Aplicar timeout por job y reiniciar la instancia colgada (kill del grupo).
+- Transporte UNO por pipe si pyuno esta disponible; si no, --convert-to sobre
+  el perfil ya inicializado de la instancia.
+No hace:
+- No genera DOCX ni gestiona cache (eso vive en modules/formats y render_cache).
+- No cubre Windows (ahi se usa Word COM en pdf_converter).
+
+Entradas/Salidas:
+- Entradas: docx_path, pdf_path, timeout.
+- Salidas: PDF escrito en pdf_path o excepcion (TimeoutError/RuntimeError).
+
+Dependencias:
+- subprocess, threading, queue, uno (opcional), app.core.paths, app.core.settings.
+- app.core.metrics (espera en cola y duracion de cada conversion).
+
+Puntos de extension:
+- Agregar transportes nuevos en _SofficeInstance.convert().
+
+Donde tocar si falla:
+- GICATESIS_LIBREOFFICE_POOL_SIZE=0 vuelve al modo de un proceso por PDF.
+- Borrar app/.cache/libreoffice si un perfil queda corrupto. Los perfiles de un
+  proceso que murio sin shutdown (instance-<pid>-*) quedan ahi hasta borrarlos.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core import metrics
+from app.core.paths import get_libreoffice_profile_root
+from app.core.settings import get_libreoffice_pool_size
+
+try:  # pyuno solo existe si el Python del servidor trae las bindings.
+    import uno  # type: ignore
+    from com.sun.star.beans import PropertyValue  # type: ignore
+except Exception:  # pragma: no cover - depende del entorno
+    uno = None  # type: ignore[assignment]
+    PropertyValue = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+_STARTUP_TIMEOUT = 60.0
+_DEFAULT_QUEUE_TIMEOUT = 600.0
+
+
+def find_libreoffice_executable() -> Optional[str]:
+    """Resuelve el binario de LibreOffice (GICATESIS_LIBREOFFICE_BIN o PATH)."""
+    configured = os.getenv("GICATESIS_LIBREOFFICE_BIN", "").strip()
+    return configured or shutil.which("libreoffice") or shutil.which("soffice")
+
+
+def _uno_property(name: str, value: Any) -> Any:
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+@dataclass
+class _ConversionJob:
+    source: Path
+    target: Path
+    timeout: float
+    done: threading.Event = field(default_factory=threading.Event)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    error: Optional[BaseException] = None
+    cancelled: bool = False
+    timed_out: bool = False
+
+
+class _SofficeInstance:
+    """Una instancia headless con perfil persistente propio."""
+
+    def __init__(self, index: int, executable: str, profile_dir: Path) -> None:
+        self.index = index
+        self.executable = executable
+        self.profile_dir = profile_dir
+        self.pipe_name = f"gicatesis_lo_{os.getpid()}_{index}"
+        self.conversions = 0
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._desktop = None
+        self._lock = threading.Lock()
+
+    @property
+    def transport(self) -> str:
+        return "uno" if uno is not None else "cli"
+
+    def _base_args(self) -> List[str]:
+        profile_uri = self.profile_dir.resolve().as_uri()
+        return [
+            self.executable,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nodefault",
+            "--nolockcheck",
+            f"-env:UserInstallation={profile_uri}",
+        ]
+
+    def _spawn(self, args: List[str], capture: bool) -> subprocess.Popen:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stream = subprocess.PIPE if capture else subprocess.DEVNULL
+        process = subprocess.Popen(
+            args,
+            stdout=stream,
+            stderr=stream,
+            text=True,
+            # Grupo propio: soffice lanza soffice.bin y hay que matar ambos.
+            start_new_session=True,
+        )
+        with self._lock:
+            self._process = process
+        return process
+
+    def convert(self, source: Path, target: Path) -> None:
+        if uno is not None:
+            self._convert_uno(source, target)
+        else:
+            self._convert_cli(source, target)
+        self.conversions += 1
+
+    def warm(self) -> None:
+        """Levanta el servidor UNO (el modo CLI no mantiene proceso vivo)."""
+        if uno is not None:
+            self._ensure_desktop()
+
+    def kill(self) -> None:
+        """Termina el proceso actual (servidor o conversion) y limpia el lock."""
+        with self._lock:
+            process, self._process = self._process, None
+            self._desktop = None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except Exception:
+            process.kill()
+        try:
+            process.wait(timeout=5)
+        except Exception:
+            pass
+        # Un kill deja el lock del perfil: el siguiente arranque lo reclamaria.
+        # El perfil es de este proceso (pid en el nombre), nadie mas lo usa.
+        try:
+            (self.profile_dir / ".lock").unlink()
+        except OSError:
+            pass
+
+    def remove_profile(self) -> None:
+        """Borra el perfil de la instancia (solo lo usa este proceso)."""
+        if self.profile_dir.name.startswith(f"instance-{os.getpid()}-"):
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    # ── CLI ──────────────────────────────────────────────────────────────
+
+    def _convert_cli(self, source: Path, target: Path) -> None:
+        # outdir propio por job: dos instancias pueden convertir el mismo stem.
+        with tempfile.TemporaryDirectory(prefix="gicatesis-pdf-") as outdir:
+            process = self._spawn(
+                self._base_args()
+                + ["--convert-to", "pdf", "--outdir", outdir, str(source)],
+                capture=True,
+            )
+            stdout, stderr = process.communicate()
+            with self._lock:
+                if self._process is process:
+                    self._process = None
+            generated = Path(outdir) / f"{source.stem}.pdf"
+            if process.returncode != 0 or not generated.is_file():
+                detail = (stderr or stdout or "sin detalle").strip()
+                raise RuntimeError(f"LibreOffice no pudo generar el PDF: {detail}")
+            shutil.move(str(generated), str(target))
+
+    # ── UNO ──────────────────────────────────────────────────────────────
+
+    def _ensure_desktop(self):
+        with self._lock:
+            process, desktop = self._process, self._desktop
+        if process is not None and process.poll() is None and desktop is not None:
+            return desktop
+        self.kill()
+
+        connect = f"pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+        process = self._spawn(self._base_args() + [f"--accept={connect}"], capture=False)
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        deadline = time.monotonic() + _STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connect}")
+                break
+            except Exception:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    self.kill()
+                    raise RuntimeError("LibreOffice no respondio al iniciar")
+                time.sleep(0.25)
+        desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        with self._lock:
+            self._desktop = desktop
+        logger.info("LibreOffice #%s listo (pid=%s)", self.index, process.pid)
+        return desktop
+
+    def _convert_uno(self, source: Path, target: Path) -> None:
+        desktop = self._ensure_desktop()
+        document = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(source)),
+            "_blank",
+            0,
+            (_uno_property("Hidden", True),),
+        )
+        if document is None:
+            raise RuntimeError(f"LibreOffice no pudo abrir {source.name}")
+        tmp_target = target.with_name(f".{target.name}.{self.index}.tmp")
+        try:
+            # Igual que Word COM: actualizar TOC e indices antes de exportar.
+            indexes = document.getDocumentIndexes()
+            for position in range(indexes.getCount()):
+                indexes.getByIndex(position).update()
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(tmp_target)),
+                (_uno_property("FilterName", "writer_pdf_Export"),),
+            )
+        finally:
+            try:
+                document.close(True)
+            except Exception:
+                pass
+        os.replace(tmp_target, target)
+
+
+class LibreOfficeServerPool:
+    """Cola de conversiones atendida por N instancias LibreOffice persistentes."""
+
+    def __init__(
+        self,
+        executable: str,
+        size: int,
+        profile_root: Path,
+        queue_timeout: float = _DEFAULT_QUEUE_TIMEOUT,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.queue_timeout = queue_timeout
+        self._queue: queue.Queue[Optional[_ConversionJob]] = queue.Queue()
+        self._instances = [
+            _SofficeInstance(
+                index, executable, profile_root / f"instance-{os.getpid()}-{index}"
+            )
+            for index in range(self.size)
+        ]
+        self._threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(instance,),
+                name=f"soffice-{instance.index}",
+                daemon=True,
+            )
+            for instance in self._instances
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def convert(self, docx_path: str, pdf_path: str, timeout: float = 120.0) -> None:
+        """Encola y espera la conversion. Lanza excepcion si falla."""
+        source = Path(docx_path).resolve()
+        target = Path(pdf_path).resolve()
+        if not source.is_file():
+            raise FileNotFoundError(f"DOCX no encontrado: {source}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        job = _ConversionJob(source=source, target=target, timeout=timeout)
+        self._queue.put(job)
+        if not job.done.wait(timeout=self.queue_timeout + timeout):
+            job.cancelled = True
+            raise TimeoutError("Timeout esperando turno de conversion PDF")
+        if job.error:
+            raise job.error
+
+    def warm(self) -> None:
+        """Arranca los servidores UNO en paralelo (no-op en modo CLI)."""
+        threads = [
+            threading.Thread(target=self._safe_warm, args=(instance,), daemon=True)
+            for instance in self._instances
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "transport": self._instances[0].transport,
+            "queued": self._queue.qsize(),
+            "instances": [
+                {
+                    "index": instance.index,
+                    "conversions": instance.conversions,
+                    "restarts": instance.restarts,
+                }
+                for instance in self._instances
+            ],
+        }
+
+    def shutdown(self) -> None:
+        """Detiene los workers, mata las instancias y borra sus perfiles."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for instance in self._instances:
+            instance.kill()
+            instance.remove_profile()
+
+    def _safe_warm(self, instance: _SofficeInstance) -> None:
+        try:
+            instance.warm()
+        except Exception as exc:
+            logger.warning("LibreOffice #%s warmup failed: %s", instance.index, exc)
+
+    def _worker(self, instance: _SofficeInstance) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            if job.cancelled:
+                job.done.set()
+                continue
+            metrics.observe(
+                "gicatesis_pdf_queue_wait_seconds",
+                time.perf_counter() - job.enqueued_at,
+                converter="libreoffice_pool",
+            )
+            watchdog = threading.Timer(
+                job.timeout, self._on_timeout, args=(instance, job)
+            )
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                with metrics.timed(
+                    "gicatesis_pdf_conversion_duration_seconds",
+                    converter="libreoffice_pool",
+                ):
+                    instance.convert(job.source, job.target)
+            except Exception as exc:
+                if job.timed_out:
+                    job.error = TimeoutError("Timeout generando PDF")
+                else:
+                    logger.warning(
+                        "LibreOffice #%s conversion error: %s", instance.index, exc
+                    )
+                    instance.kill()
+                    job.error = exc
+            finally:
+                watchdog.cancel()
+                job.done.set()
+
+    def _on_timeout(self, instance: _SofficeInstance, job: _ConversionJob) -> None:
+        logger.error(
+            "PDF conversion timeout (%.0fs), reiniciando LibreOffice #%s: %s",
+            job.timeout,
+            instance.index,
+            job.source,
+        )
+        job.timed_out = True
+        instance.restarts += 1
+        instance.kill()
+
+
+_POOL: Optional[LibreOfficeServerPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_libreoffice_pool() -> Optional[LibreOfficeServerPool]:
+    """Retorna el pool (singleton) o None si GICATESIS_LIBREOFFICE_POOL_SIZE=0."""
+    global _POOL
+    size = get_libreoffice_pool_size()
+    if size <= 0:
+        return None
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                executable = find_libreoffice_executable()
+                if not executable:
+                    raise RuntimeError(
+                        "LibreOffice no esta instalado o no se encontro en PATH"
+                    )
+                _POOL = LibreOfficeServerPool(
+                    executable=executable,
+                    size=size,
+                    profile_root=get_libreoffice_profile_root(),
+                )
+                atexit.register(_POOL.shutdown)
+                logger.info(
+                    "LibreOffice pool: %s instancias (%s)",
+                    size,
+                    _POOL.stats()["transport"],
+                )
+    return _POOL
+
+
+def warm_libreoffice_pool() -> None:
+    """Arranca las instancias UNO al iniciar el servidor (solo Linux)."""
+    if os.name == "nt" or not find_libreoffice_executable():
+        return
+    pool = get_libreoffice_pool()
+    if pool is not None:
+        pool.warm()
+
+
+def reset_libreoffice_pool() -> None:
+    """Descarta el pool actual (relee env en el proximo uso). Util en tests."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
@@ -7,6 +7,8 @@ Responsabilidades:
 - Leer JSON con UTF-8 y manejar errores comunes.
 - Descubrir formatos por universidad/categoria/enfoque desde app/data.
 - Proveer busqueda por format_id y lectura con _meta.
+- Mantener un indice en memoria por universidad, invalidado por mtime/size
+  de cada JSON (clear_format_index_cache() fuerza la recarga).
 No hace:
 - No valida reglas de negocio ni genera documentos.
 
@@ -24,12 +26,15 @@ Donde tocar si falla:
 - Revisar discovery, normalizacion de IDs o lectura JSON.
 """
 
+import copy
+import hashlib
 import json
 import re
+import threading
 import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 def load_json_file(file_path: Path) -> Any:
@@ -61,6 +66,8 @@ class FormatIndexItem:
     path: Path
     titulo: str
     data: Optional[Dict[str, Any]] = None
+    # sha256 del JSON canonico del formato (clave de caches de render).
+    content_hash: str = ""
 
 
 _ENFOQUE_ALIASES = {
@@ -195,107 +202,217 @@ def _humanize_id(format_id: str, uni: str) -> str:
     return " ".join(word.capitalize() for word in parts) or format_id
 
 
-def _discover_for_uni(uni: str) -> List[FormatIndexItem]:
-    """Descubre formatos para una universidad especifica."""
-    from app.core.registry import get_provider
+def _content_hash(data: Any) -> str:
+    """Hash estable del contenido JSON (independiente de espacios y mtime)."""
+    if data is None:
+        return ""
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 
-    data_dir = get_provider(uni).get_data_dir()
-    if not data_dir.exists():
-        return []
+def _index_json_file(
+    uni: str, data_dir: Path, path: Path, seen_ids: set[str]
+) -> List[FormatIndexItem]:
+    """Construye las entradas de indice de un JSON (una o varias si es lista)."""
+    rel_path = path.relative_to(data_dir)
+    categoria = (
+        rel_path.parent.name.lower() if rel_path.parent != Path(".") else "general"
+    )
+    stem = path.stem
+    tokens = [t for t in re.split(r"[_-]+", stem.lower()) if t]
+    enfoque = _derive_enfoque(tokens)
+
+    # Lee JSON; si falla, se omite el contenido pero se conserva el indice.
+    try:
+        data = load_json_file(path)
+    except Exception:
+        data = None
 
     items: List[FormatIndexItem] = []
-    seen_ids: set[str] = set()
+    if isinstance(data, list):
+        # Soporta listas de formatos dentro de un mismo JSON (ej. UNI).
+        for idx, entry in enumerate(data):
+            if not isinstance(entry, dict):
+                continue
+            raw_id = entry.get("id") or entry.get("format_id") or f"{stem}-{idx + 1}"
+            entry_tokens = [t for t in re.split(r"[_-]+", str(raw_id).lower()) if t]
+            entry_categoria = (
+                entry.get("tipo_formato") or entry.get("categoria") or categoria
+            ).lower()
+            entry_enfoque = (
+                entry.get("enfoque") or _derive_enfoque(entry_tokens)
+            ).lower()
+            format_id = _normalize_format_id(str(raw_id), uni)
+            if format_id in seen_ids:
+                continue
+            seen_ids.add(format_id)
 
-    for path in data_dir.rglob("*.json"):
-        if _is_ignored_path(path):
-            continue
+            titulo = (
+                entry.get("titulo") or entry.get("title") or _humanize_id(format_id, uni)
+            )
+            items.append(
+                FormatIndexItem(
+                    format_id=format_id,
+                    uni=uni,
+                    categoria=entry_categoria,
+                    enfoque=entry_enfoque,
+                    path=path.resolve(),
+                    titulo=str(titulo),
+                    data=dict(entry),
+                    content_hash=_content_hash(entry),
+                )
+            )
+        return items
 
-        rel_path = path.relative_to(data_dir)
-        categoria = (
-            rel_path.parent.name.lower() if rel_path.parent != Path(".") else "general"
+    if isinstance(data, dict):
+        raw_id = data.get("id") or stem
+        titulo = data.get("titulo")
+    else:
+        raw_id = stem
+        titulo = None
+
+    format_id = _normalize_format_id(str(raw_id), uni)
+    if format_id in seen_ids:
+        return items
+    seen_ids.add(format_id)
+    if not titulo:
+        titulo = _humanize_id(format_id, uni)
+
+    items.append(
+        FormatIndexItem(
+            format_id=format_id,
+            uni=uni,
+            categoria=categoria,
+            enfoque=enfoque,
+            path=path.resolve(),
+            titulo=str(titulo),
+            content_hash=_content_hash(data),
         )
-        stem = path.stem
-        tokens = [t for t in re.split(r"[_-]+", stem.lower()) if t]
-        enfoque = _derive_enfoque(tokens)
+    )
+    return items
 
-        # Lee JSON; si falla, se omite el contenido pero se conserva el indice.
-        try:
-            data = load_json_file(path)
-        except Exception:
-            data = None
-
-        if isinstance(data, list):
-            # Soporta listas de formatos dentro de un mismo JSON (ej. UNI).
-            for idx, entry in enumerate(data):
-                if not isinstance(entry, dict):
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Firma (mtime_ns, size) de un archivo o None si no existe."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class _UniFormatIndex:
+    """Indice en memoria de una universidad con invalidacion por archivo.
+
+    - Agregar/eliminar JSON cambia el mtime de su carpeta: se reconstruye todo.
+    - Editar un JSON cambia su (mtime, size): se reindexa solo ese archivo.
+    """
+
+    def __init__(self, uni: str) -> None:
+        from app.core.registry import get_provider
+
+        self.uni = uni
+        self.data_dir = get_provider(uni).get_data_dir()
+        self.dir_stats: Dict[Path, Optional[int]] = {}
+        self.file_stats: Dict[Path, Optional[Tuple[int, int]]] = {}
+        self.file_items: Dict[Path, List[FormatIndexItem]] = {}
+        self.source_paths: Dict[Path, Path] = {}  # item.path (resolve) -> clave
+        self.items: List[FormatIndexItem] = []
+        self.by_id: Dict[str, FormatIndexItem] = {}
+
+        if self.data_dir.exists():
+            self.dir_stats[self.data_dir] = self._dir_mtime(self.data_dir)
+            seen_ids: set[str] = set()
+            for path in self.data_dir.rglob("*"):
+                if path.is_dir():
+                    self.dir_stats[path] = self._dir_mtime(path)
                     continue
-                raw_id = (
-                    entry.get("id") or entry.get("format_id") or f"{stem}-{idx + 1}"
-                )
-                entry_tokens = [t for t in re.split(r"[_-]+", str(raw_id).lower()) if t]
-                entry_categoria = (
-                    entry.get("tipo_formato") or entry.get("categoria") or categoria
-                ).lower()
-                entry_enfoque = (
-                    entry.get("enfoque") or _derive_enfoque(entry_tokens)
-                ).lower()
-                format_id = _normalize_format_id(str(raw_id), uni)
-                if format_id in seen_ids:
+                if path.suffix != ".json" or _is_ignored_path(path):
                     continue
-                seen_ids.add(format_id)
-
-                titulo = (
-                    entry.get("titulo")
-                    or entry.get("title")
-                    or _humanize_id(format_id, uni)
-                )
-                items.append(
-                    FormatIndexItem(
-                        format_id=format_id,
-                        uni=uni,
-                        categoria=entry_categoria,
-                        enfoque=entry_enfoque,
-                        path=path.resolve(),
-                        titulo=str(titulo),
-                        data=dict(entry),
-                    )
+                self.file_stats[path] = _stat_signature(path)
+                self.source_paths[path.resolve()] = path
+                self.file_items[path] = _index_json_file(
+                    uni, self.data_dir, path, seen_ids
                 )
-            continue
-
-        if isinstance(data, dict):
-            raw_id = data.get("id") or stem
-            titulo = data.get("titulo")
-        else:
-            raw_id = stem
-            titulo = None
-
-        format_id = _normalize_format_id(str(raw_id), uni)
-        if format_id in seen_ids:
-            continue
-        seen_ids.add(format_id)
-        if not titulo:
-            titulo = _humanize_id(format_id, uni)
-
-        items.append(
-            FormatIndexItem(
-                format_id=format_id,
-                uni=uni,
-                categoria=categoria,
-                enfoque=enfoque,
-                path=path.resolve(),
-                titulo=str(titulo),
+        self._rebuild_views()
+
+    @staticmethod
+    def _dir_mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _rebuild_views(self) -> None:
+        items = [item for entries in self.file_items.values() for item in entries]
+        items.sort(
+            key=lambda item: (
+                item.categoria,
+                item.enfoque,
+                item.titulo.lower(),
+                item.format_id,
             )
         )
-
-    items.sort(
-        key=lambda item: (
-            item.categoria,
-            item.enfoque,
-            item.titulo.lower(),
-            item.format_id,
+        self.items = items
+        self.by_id = {item.format_id: item for item in items}
+
+    def layout_changed(self) -> bool:
+        """True si se agregaron/eliminaron archivos o carpetas."""
+        if not self.dir_stats:
+            return self.data_dir.exists()
+        return any(
+            self._dir_mtime(path) != mtime for path, mtime in self.dir_stats.items()
         )
-    )
-    return items
+
+    def refresh_files(self, paths: Iterable[Path]) -> None:
+        """Reindexa los archivos cuya firma (mtime, size) cambio."""
+        changed = False
+        for path in paths:
+            signature = _stat_signature(path)
+            if path not in self.file_stats or signature == self.file_stats[path]:
+                continue
+            seen_ids = {
+                item.format_id
+                for other, entries in self.file_items.items()
+                if other != path
+                for item in entries
+            }
+            self.file_stats[path] = signature
+            self.file_items[path] = (
+                _index_json_file(self.uni, self.data_dir, path, seen_ids)
+                if signature is not None
+                else []
+            )
+            changed = True
+        if changed:
+            self._rebuild_views()
+
+
+_FORMAT_INDEX: Dict[str, _UniFormatIndex] = {}
+_FORMAT_INDEX_LOCK = threading.RLock()
+
+
+def _get_uni_index(uni: str, paths: Optional[Iterable[Path]] = None) -> _UniFormatIndex:
+    """Retorna el indice vigente; paths=None revalida todos los archivos."""
+    with _FORMAT_INDEX_LOCK:
+        index = _FORMAT_INDEX.get(uni)
+        if index is None or index.layout_changed():
+            index = _UniFormatIndex(uni)
+            _FORMAT_INDEX[uni] = index
+            return index
+        index.refresh_files(index.file_stats.keys() if paths is None else paths)
+        return index
+
+
+def clear_format_index_cache() -> None:
+    """Invalida el indice de formatos. Llamar tras cambios masivos en app/data."""
+    with _FORMAT_INDEX_LOCK:
+        _FORMAT_INDEX.clear()
+
+
+def _discover_for_uni(uni: str) -> List[FormatIndexItem]:
+    """Descubre formatos para una universidad especifica (indice cacheado)."""
+    return list(_get_uni_index(uni).items)
 
 
 def discover_format_files(uni: Optional[str] = None) -> List[FormatIndexItem]:
@@ -322,20 +439,25 @@ def discover_format_files(uni: Optional[str] = None) -> List[FormatIndexItem]:
 
 
 def find_format_index(format_id: str) -> Optional[FormatIndexItem]:
-    """Busca un formato por ID normalizado."""
+    """Busca un formato por ID normalizado (O(1) sobre el indice cacheado)."""
     if not format_id:
         return None
     parts = format_id.split("-")
     uni = (parts[0] if parts else "unac").strip().lower()
     normalized = _normalize_format_id(format_id, uni)
     try:
-        items = discover_format_files(uni)
+        index = _get_uni_index(uni, paths=())
     except KeyError:
         return None
-    for item in items:
-        if item.format_id == normalized:
-            return item
-    return None
+    item = index.by_id.get(normalized)
+    if item is None:
+        return None
+    with _FORMAT_INDEX_LOCK:
+        # Solo se revalida el archivo del formato pedido.
+        source = index.source_paths.get(item.path)
+        if source is not None:
+            index.refresh_files([source])
+        return index.by_id.get(normalized)
 
 
 def load_format_by_id(format_id: str) -> Dict[str, Any]:
@@ -344,7 +466,8 @@ def load_format_by_id(format_id: str) -> Dict[str, Any]:
     if not item:
         raise FileNotFoundError(f"Formato no encontrado: {format_id}")
 
-    data = item.data if item.data is not None else load_json_file(item.path)
+    # Las entradas de listas viven en el indice compartido: copia profunda.
+    data = copy.deepcopy(item.data) if item.data is not None else load_json_file(item.path)
     if isinstance(data, list):
         # Selecciona la entrada exacta cuando el JSON contiene lista.
         match = None
@@ -0,0 +1,329 @@
+"""
+Archivo: app/core/metrics.py
+Proposito:
+- Instrumentacion del pipeline (histogramas de latencia y contadores) expuesta
+  en formato de texto de Prometheus, sin dependencias ni servicios externos.
+
+Responsabilidades:
+- Declarar las metricas conocidas (_DEFINITIONS) con su ayuda y etiquetas.
+- Registrar observaciones thread-safe (observe, inc, timed).
+- Capturar observaciones en un proceso worker y reproducirlas en el servidor
+  (capture_observations / replay_observations): el backend "pool" las devuelve
+  junto al DOCX y el "subprocess" las deja en un JSON sidecar
+  (export_observations / load_observations, ruta en GICATESIS_METRICS_SIDECAR).
+- Serializar todo en text exposition format 0.0.4 (render_metrics).
+No hace:
+- No expone rutas HTTP (eso vive en app/modules/api/metrics_router.py).
+- No persiste nada: los valores viven en memoria del proceso y se pierden al
+  reiniciar, como cualquier exporter de Prometheus.
+
+Entradas/Salidas:
+- Entradas: nombre de metrica, valor y etiquetas desde los puntos instrumentados.
+- Salidas: texto para GET /metrics.
+
+Dependencias:
+- threading, bisect, json, app.core.settings.
+
+Puntos de extension:
+- Agregar una metrica nueva en _DEFINITIONS y llamarla con observe()/inc().
+
+Donde tocar si falla:
+- GICATESIS_METRICS=false desactiva el registro (observe/inc no hacen nada).
+- Si una serie no aparece, revisar que el nombre y las etiquetas coincidan con
+  _DEFINITIONS: etiquetas desconocidas se ignoran y las faltantes quedan "".
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.settings import is_metrics_enabled
+
+_STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_BLOCK_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_PDF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# nombre -> (tipo, ayuda, etiquetas, buckets)
+_DEFINITIONS: Dict[str, Tuple[str, str, Tuple[str, ...], Sequence[float]]] = {
+    "gicatesis_stage_duration_seconds": (
+        "histogram",
+        "Duracion de cada etapa del pipeline (preprocess, normalize, render, save).",
+        ("stage", "format"),
+        _STAGE_BUCKETS,
+    ),
+    "gicatesis_block_render_duration_seconds": (
+        "histogram",
+        "Duracion de render_block por tipo de block.",
+        ("block_type",),
+        _BLOCK_BUCKETS,
+    ),
+    "gicatesis_generator_duration_seconds": (
+        "histogram",
+        "Tiempo de pared del generador DOCX por backend (subprocess, inprocess, pool).",
+        ("backend",),
+        _STAGE_BUCKETS,
+    ),
+    "gicatesis_pdf_conversion_duration_seconds": (
+        "histogram",
+        "Duracion de la conversion DOCX->PDF por conversor.",
+        ("converter",),
+        _PDF_BUCKETS,
+    ),
+    "gicatesis_pdf_queue_wait_seconds": (
+        "histogram",
+        "Espera en cola antes de que un conversor PDF tome el job.",
+        ("converter",),
+        _PDF_BUCKETS,
+    ),
+    "gicatesis_cache_requests_total": (
+        "counter",
+        "Consultas al cache DOCX/PDF de formatos por resultado (hit, miss).",
+        ("cache", "result"),
+        (),
+    ),
+}
+
+_UNKNOWN_FORMAT = "unknown"
+
+# Variable de entorno con la que el backend "subprocess" indica al hijo donde
+# dejar sus observaciones.
+METRICS_SIDECAR_ENV = "GICATESIS_METRICS_SIDECAR"
+
+
+class _Histogram:
+    """Histograma acumulativo por combinacion de etiquetas."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # etiquetas -> [conteo por bucket..., suma, total]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, key: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def lines(self) -> Iterator[str]:
+        for key in sorted(self._series):
+            series = self._series[key]
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames + ("le",), key + ("+Inf",))
+            yield f"{self.name}_bucket{labels} {_format_value(series[-1])}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(series[-2])}"
+            yield f"{self.name}_count{labels} {_format_value(series[-1])}"
+
+
+class _Counter:
+    """Contador monotono por combinacion de etiquetas."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, key: Tuple[str, ...], value: float) -> None:
+        self._series[key] = self._series.get(key, 0.0) + value
+
+    def lines(self) -> Iterator[str]:
+        for key in sorted(self._series):
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(self._series[key])}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Metricas del proceso. Usar get_metrics_registry() (singleton)."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+        for name, (kind, help_text, labelnames, buckets) in _DEFINITIONS.items():
+            if kind == "histogram":
+                self._metrics[name] = _Histogram(name, help_text, labelnames, buckets)
+            else:
+                self._metrics[name] = _Counter(name, help_text, labelnames)
+
+    def record(self, name: str, value: float, labels: Dict[str, Any]) -> None:
+        metric = self._metrics.get(name)
+        if metric is None:
+            raise KeyError(f"Metrica no declarada: {name}")
+        key = tuple(str(labels.get(label, "")) for label in metric.labelnames)
+        with self._lock:
+            metric.observe(key, float(value))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for metric in self._metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+
+_REGISTRY: Optional[MetricsRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+_CAPTURE = threading.local()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Retorna el registry del proceso (lee GICATESIS_METRICS en el primer uso)."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = MetricsRegistry(enabled=is_metrics_enabled())
+    return _REGISTRY
+
+
+def reset_metrics_registry() -> None:
+    """Descarta todas las series (relee env en el proximo uso). Util en tests."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        _REGISTRY = None
+
+
+def _record(kind: str, name: str, value: float, labels: Dict[str, Any]) -> None:
+    buffer = getattr(_CAPTURE, "buffer", None)
+    if buffer is not None:
+        buffer.append((kind, name, value, labels))
+        return
+    registry = get_metrics_registry()
+    if registry.enabled:
+        registry.record(name, value, labels)
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    """Agrega una observacion a un histograma declarado en _DEFINITIONS."""
+    _record("observe", name, seconds, labels)
+
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    """Incrementa un contador declarado en _DEFINITIONS."""
+    _record("inc", name, amount, labels)
+
+
+@contextmanager
+def timed(name: str, **labels: Any) -> Iterator[None]:
+    """Observa en ``name`` la duracion del bloque (tambien si lanza excepcion)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def capture_observations() -> Iterator[List[Tuple[str, str, float, Dict[str, Any]]]]:
+    """Acumula las observaciones del hilo en una lista en lugar de registrarlas.
+
+    La usa el worker del backend "pool": la lista viaja al servidor junto con
+    el DOCX y se aplica alli con replay_observations(). El backend
+    "subprocess" la recibe a traves de export_observations().
+    """
+    previous = getattr(_CAPTURE, "buffer", None)
+    buffer: List[Tuple[str, str, float, Dict[str, Any]]] = []
+    _CAPTURE.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        _CAPTURE.buffer = previous
+
+
+def replay_observations(observations: Sequence[Tuple[str, str, float, Dict[str, Any]]]) -> None:
+    """Registra observaciones capturadas en otro proceso."""
+    for kind, name, value, labels in observations:
+        _record(kind, name, value, labels)
+
+
+@contextmanager
+def export_observations(path: Optional[str]) -> Iterator[None]:
+    """Captura las observaciones del bloque y las escribe como JSON en ``path``.
+
+    La usa el proceso hijo del backend "subprocess"; sin ``path`` no hace nada.
+    El archivo se escribe tambien si el bloque lanza excepcion.
+    """
+    if not path:
+        yield
+        return
+    with capture_observations() as captured:
+        try:
+            yield
+        finally:
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(captured, handle, default=str)
+
+
+def load_observations(path: str) -> List[Tuple[str, str, float, Dict[str, Any]]]:
+    """Lee un sidecar de export_observations (lista vacia si falta o esta roto)."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            raw = json.load(handle)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(raw, list):
+        return []
+    return [
+        (kind, name, float(value), labels)
+        for kind, name, value, labels in (
+            item for item in raw if isinstance(item, list) and len(item) == 4
+        )
+        if isinstance(labels, dict)
+    ]
+
+
+def format_label(data: Any) -> str:
+    """Etiqueta ``format`` a partir de ``_meta.id`` del JSON del formato."""
+    meta = data.get("_meta") if isinstance(data, dict) else None
+    format_id = meta.get("id") if isinstance(meta, dict) else None
+    if isinstance(format_id, str) and format_id.strip():
+        return format_id.strip()[:64]
+    return _UNKNOWN_FORMAT
+
+
+def render_metrics() -> str:
+    """Todas las metricas del proceso en text exposition format."""
+    return get_metrics_registry().render()
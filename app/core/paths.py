@@ -7,7 +7,7 @@ Responsabilidades:
 - Resolver rutas del app root, project root y data root.
 - Proveer ubicaciones estandar para datos y exports.
 No hace:
-- No accede a archivos ni valida existencia.
+- No accede a archivos ni valida existencia (solo lee overrides de env).
 
 Entradas/Salidas:
 - Entradas: N/A (usa ubicacion del archivo actual).
@@ -25,6 +25,7 @@ Donde tocar si falla:
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 
@@ -55,10 +56,18 @@ def get_exports_dir() -> Path:
 
 
 def get_cache_root() -> Path:
-    """Retorna la raiz de cache persistente dentro de app/."""
+    """Retorna la raiz de cache persistente (app/.cache o GICATESIS_CACHE_DIR)."""
+    override = os.getenv("GICATESIS_CACHE_DIR", "").strip()
+    if override:
+        return Path(override)
     return get_app_root() / ".cache"
 
 
+def get_cache_index_path() -> Path:
+    """Retorna la ruta del indice SQLite compartido por todos los caches."""
+    return get_cache_root() / "index.sqlite3"
+
+
 def get_docx_cache_dir() -> Path:
     """Retorna la carpeta de cache para DOCX."""
     return get_cache_root() / "docx"
@@ -67,3 +76,26 @@ def get_docx_cache_dir() -> Path:
 def get_pdf_cache_dir() -> Path:
     """Retorna la carpeta de cache para PDF."""
     return get_cache_root() / "pdf"
+
+
+def get_render_cache_dir() -> Path:
+    """Retorna la carpeta del cache de renders por contenido (DOCX/PDF)."""
+    override = os.getenv("GICATESIS_RENDER_CACHE_DIR", "").strip()
+    if override:
+        return Path(override)
+    return get_cache_root() / "render"
+
+
+def get_lock_dir() -> Path:
+    """Retorna la carpeta de locks de archivo (single-flight entre procesos)."""
+    return get_cache_root() / "locks"
+
+
+def get_render_profile_dir() -> Path:
+    """Retorna la carpeta de perfiles de render bajo demanda (profile=true)."""
+    return get_cache_root() / "profiles"
+
+
+def get_libreoffice_profile_root() -> Path:
+    """Retorna la carpeta de perfiles persistentes de LibreOffice (uno por instancia)."""
+    return get_cache_root() / "libreoffice"
@@ -1,13 +1,15 @@
 """
 Archivo: app/core/pdf_converter.py
 Proposito:
-- Convertir DOCX a PDF con Word COM de forma estable y reutilizable.
+- Convertir DOCX a PDF con Word COM (Windows) o LibreOffice (Linux/Docker).
 
 Responsabilidades:
 - Mantener una sola instancia de Word (singleton) en un hilo STA dedicado.
 - Serializar conversiones con cola + lock.
 - Manejar reinicios/reintentos ante com_error (Object not connected).
 - Ofrecer timeout y reinicio de Word si se cuelga.
+- En Linux delegar al pool persistente de app/core/libreoffice_pool.py
+  (o a un proceso soffice por PDF si GICATESIS_LIBREOFFICE_POOL_SIZE=0).
 
 No hace:
 - No genera DOCX ni gestiona cache (eso vive en modules/formats).
@@ -17,7 +19,8 @@ Entradas/Salidas:
 - Salidas: PDF generado en disco o excepcion controlada.
 
 Dependencias:
-- pythoncom, win32com, threading, queue, logging.
+- pythoncom, win32com, threading, queue, logging, app.core.libreoffice_pool.
+- app.core.metrics (espera en cola y duracion por conversor).
 
 Donde tocar si falla:
 - Ajustar _convert_with_retry, timeouts o el reinicio de Word.
@@ -29,14 +32,17 @@ import atexit
 import logging
 import os
 import queue
-import shutil
 import subprocess
 import tempfile
 import threading
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from app.core import metrics
+from app.core.libreoffice_pool import find_libreoffice_executable, get_libreoffice_pool
+
 if os.name == "nt":
     import pythoncom
     import win32com.client
@@ -66,6 +72,7 @@ class _Job:
     timeout: float
     done: threading.Event
     error: Optional[BaseException] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
 
 
 class PdfConversionManager:
@@ -113,8 +120,16 @@ class PdfConversionManager:
                 job = self._queue.get()
                 if job is None:
                     break
+                metrics.observe(
+                    "gicatesis_pdf_queue_wait_seconds",
+                    time.perf_counter() - job.enqueued_at,
+                    converter="word",
+                )
                 try:
-                    self._convert_with_retry(job.docx_path, job.pdf_path)
+                    with metrics.timed(
+                        "gicatesis_pdf_conversion_duration_seconds", converter="word"
+                    ):
+                        self._convert_with_retry(job.docx_path, job.pdf_path)
                 except Exception as exc:
                     job.error = exc
                 finally:
@@ -235,40 +250,43 @@ def convert_docx_to_pdf(docx_path: str, pdf_path: str, timeout: float = 120.0) -
     """Convierte con Word COM en Windows y LibreOffice en Linux/Docker."""
     if os.name == "nt":
         return get_pdf_converter().convert(docx_path, pdf_path, timeout=timeout)
+    pool = get_libreoffice_pool()
+    if pool is not None:
+        return pool.convert(docx_path, pdf_path, timeout=timeout)
     return _convert_with_libreoffice(docx_path, pdf_path, timeout)
 
 
 def _convert_with_libreoffice(docx_path: str, pdf_path: str, timeout: float) -> None:
-    """Convierte DOCX a PDF con LibreOffice en Linux/Docker."""
+    """Convierte DOCX a PDF con un proceso LibreOffice y perfil temporal propio."""
     source = Path(docx_path).resolve()
     target = Path(pdf_path).resolve()
     if not source.is_file():
         raise FileNotFoundError(f"DOCX no encontrado: {source}")
 
-    configured_bin = os.getenv("GICATESIS_LIBREOFFICE_BIN", "").strip()
-    executable = configured_bin or shutil.which("libreoffice") or shutil.which("soffice")
+    executable = find_libreoffice_executable()
     if not executable:
         raise RuntimeError("LibreOffice no esta instalado o no se encontro en PATH")
 
     target.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.TemporaryDirectory(prefix="gicatesis-libreoffice-") as profile_dir:
-        profile_uri = Path(profile_dir).resolve().as_uri()
-        result = subprocess.run(
-            [
-                executable,
-                "--headless",
-                f"-env:UserInstallation={profile_uri}",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                str(target.parent),
-                str(source),
-            ],
-            check=False,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+    with metrics.timed("gicatesis_pdf_conversion_duration_seconds", converter="libreoffice"):
+        with tempfile.TemporaryDirectory(prefix="gicatesis-libreoffice-") as profile_dir:
+            profile_uri = Path(profile_dir).resolve().as_uri()
+            result = subprocess.run(
+                [
+                    executable,
+                    "--headless",
+                    f"-env:UserInstallation={profile_uri}",
+                    "--convert-to",
+                    "pdf",
+                    "--outdir",
+                    str(target.parent),
+                    str(source),
+                ],
+                check=False,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
 
     generated = target.parent / f"{source.stem}.pdf"
     if result.returncode != 0 or not generated.is_file():
@@ -159,4 +159,8 @@ def list_universities() -> list[str]:
 
 def clear_provider_cache() -> None:
     """Invalida el cache de providers. Llamar despues de agregar/eliminar universidades."""
+    from app.core.loaders import clear_format_index_cache
+
     discover_providers.cache_clear()
+    # Los indices de formatos dependen del data_dir de cada provider.
+    clear_format_index_cache()
@@ -0,0 +1,198 @@
+"""
+Archivo: app/core/render_cache.py
+Proposito:
+- Cache en disco, direccionado por contenido, para DOCX/PDF renderizados.
+
+Responsabilidades:
+- Calcular una clave canonica: payload del request + hash del JSON del
+  formato + token del motor (app.core.engine_fingerprint).
+- Guardar/recuperar archivos de forma atomica (os.replace).
+- Registrar accesos en el indice unico (app.core.cache_store), que expira por
+  antiguedad, desaloja por LRU segun la cuota y lleva hits/misses/evicciones.
+No hace:
+- No renderiza ni convierte documentos (solo almacena resultados).
+
+Entradas/Salidas:
+- Entradas: format_id, payload del request, rutas de archivos generados.
+- Salidas: rutas dentro del cache o None si no hay entrada valida.
+
+Dependencias:
+- hashlib, json, os, shutil, threading, app.core.paths, app.core.settings,
+  app.core.engine_fingerprint, app.core.cache_store.
+
+Puntos de extension:
+- Agregar nuevos "kind" (ej. "html") sin cambiar la clave.
+
+Donde tocar si falla:
+- Si un render viejo sigue saliendo, revisar get_engine_fingerprint y la clave.
+- Desactivar con GICATESIS_RENDER_CACHE=false para descartar el cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.cache_store import CacheStore, get_cache_store
+from app.core.engine_fingerprint import get_engine_fingerprint
+from app.core.loaders import find_format_index
+from app.core.paths import get_render_cache_dir
+from app.core.settings import is_render_cache_enabled
+
+logger = logging.getLogger(__name__)
+
+# Version del esquema de clave: subirla invalida todo el cache.
+_KEY_VERSION = "render-cache-v1"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLAVES
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _canonical_bytes(obj: Any) -> bytes:
+    return json.dumps(
+        obj,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode("utf-8")
+
+
+def _format_source_digest(format_id: str) -> str:
+    item = find_format_index(format_id)
+    if item is None or not item.content_hash:
+        return "missing"
+    return item.content_hash
+
+
+def build_render_cache_key(format_id: str, payload: Dict[str, Any]) -> str:
+    """Clave SHA256 para un render: payload canonico + huella del motor."""
+    hasher = hashlib.sha256()
+    hasher.update(_KEY_VERSION.encode("utf-8"))
+    hasher.update(format_id.encode("utf-8"))
+    hasher.update(_format_source_digest(format_id).encode("utf-8"))
+    hasher.update(get_engine_fingerprint().encode("utf-8"))
+    hasher.update(_canonical_bytes(payload))
+    return hasher.hexdigest()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STORE
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class RenderCache:
+    """Store de archivos {key}.{kind}; acceso, cuota y LRU viven en CacheStore.
+
+    El indice SQLite (app.core.cache_store) es compartido por los workers de
+    uvicorn, asi que el orden LRU y los contadores son globales.
+    """
+
+    NAMESPACE = "render"
+
+    def __init__(self, root: Path, store: CacheStore) -> None:
+        self.root = Path(root)
+        self.store = store
+
+    def _path(self, key: str, kind: str) -> Path:
+        return self.root / f"{key}.{kind}"
+
+    def get(self, key: str, kind: str) -> Optional[Path]:
+        """Retorna la ruta cacheada (y la marca como usada) o None."""
+        path = self._path(key, kind)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        if size <= 0:
+            self.store.record_miss(self.NAMESPACE)
+            return None
+        self.store.record_hit(self.NAMESPACE, path)
+        return path
+
+    def copy_to(self, key: str, kind: str, dest: Path) -> bool:
+        """Copia la entrada cacheada a dest. Retorna False si no existe."""
+        cached = self.get(key, kind)
+        if cached is None:
+            return False
+        try:
+            shutil.copyfile(cached, dest)
+        except OSError as exc:
+            logger.warning("Render cache copy failed %s: %s", cached, exc)
+            return False
+        return True
+
+    def put(self, key: str, kind: str, source: Path) -> Optional[Path]:
+        """Copia source al cache de forma atomica y aplica la politica de desalojo."""
+        source = Path(source)
+        if not source.is_file() or source.stat().st_size <= 0:
+            return None
+        target = self._path(key, kind)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{key[:12]}-", suffix=f".{kind}.tmp", dir=self.root
+            )
+            os.close(fd)
+            shutil.copyfile(source, tmp_name)
+            os.replace(tmp_name, target)
+        except OSError as exc:
+            logger.warning("Render cache write failed %s: %s", target, exc)
+            return None
+        self.store.record_put(self.NAMESPACE, target)
+        self.store.enforce_quota(exclude=(target,))
+        # Otro request pudo desalojarla entre record_put y este punto.
+        return target if target.exists() else None
+
+    def evict(self) -> int:
+        """Barrido completo del indice: temporales huerfanos, expiracion y cuota."""
+        return self.store.sweep()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores y uso de disco del namespace "render"."""
+        stats = self.store.stats()
+        namespace = stats["namespaces"].get(self.NAMESPACE, {})
+        return {
+            "hits": namespace.get("hits", 0),
+            "misses": namespace.get("misses", 0),
+            "evictions": namespace.get("evictions", 0),
+            "hitRatio": namespace.get("hitRatio", 0.0),
+            "entries": namespace.get("entries", 0),
+            "sizeBytes": namespace.get("sizeBytes", 0),
+            "maxBytes": stats["maxBytes"],
+            "maxAgeSeconds": stats["maxAgeSeconds"],
+        }
+
+
+_CACHE: Optional[RenderCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """Retorna el cache de renders (singleton) o None si esta desactivado."""
+    global _CACHE
+    if not is_render_cache_enabled():
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = RenderCache(
+                    root=get_render_cache_dir(), store=get_cache_store()
+                )
+    return _CACHE
+
+
+def reset_render_cache() -> None:
+    """Descarta el singleton (relee env en el proximo uso). Util en tests."""
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
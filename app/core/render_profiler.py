@@ -0,0 +1,248 @@
+"""
+Archivo: app/core/render_profiler.py
+Proposito:
+- Perfilado bajo demanda de un render (POST /api/v1/render/* con "profile": true)
+  para reproducir un payload lento sin adjuntar un profiler al servidor.
+
+Responsabilidades:
+- Ejecutar el pipeline in-process bajo cProfile y, en paralelo, un muestreador
+  de pila del hilo del render (stacks en formato collapsed de flamegraph.pl).
+- Desglosar el tiempo por etapa y por tipo de block a partir de las
+  observaciones de app/core/metrics.py (render_block ya mide cada block).
+- Guardar los archivos en <cache>/profiles/<id>/ y podar los perfiles viejos.
+- Serializar los renders perfilados (_PROFILE_LOCK): cProfile es global al
+  proceso desde Python 3.12 y un segundo enable() falla. Si hay uno en curso,
+  ProfilerBusyError (el router responde 409).
+No hace:
+- No decide quien puede perfilar (el gate por API key vive en render_router).
+- No registra en /metrics las duraciones perfiladas: cProfile las infla.
+- No aisla el render de otras requests: en Python >= 3.12 profile.pstats
+  incluye llamadas de otros hilos que corran a la vez (profile.collapsed y el
+  desglose de summary.json si son solo del hilo del render).
+- No perfila dentro de LibreOffice/Word: la conversion PDF entra en el perfil,
+  pero solo como espera del proceso externo (stages_ms.pdf_convert).
+
+Entradas/Salidas:
+- Entradas: una funcion sin argumentos que produce el artefacto.
+- Salidas: (resultado, RenderProfile) y, en disco, PROFILE_FILES.
+
+Dependencias:
+- cProfile, pstats, threading, app.core.metrics, app.core.paths, app.core.settings.
+
+Puntos de extension:
+- Agregar un archivo nuevo al perfil: escribirlo en _write_profile y sumarlo a
+  PROFILE_FILES (GET /api/v1/render/profiles/{id}/{archivo} solo sirve esos).
+
+Donde tocar si falla:
+- Si profile.collapsed sale vacio, el render duro menos que _SAMPLE_INTERVAL
+  (o que el switch interval del GIL): usar profile.pstats.
+- GICATESIS_PROFILE_KEEP controla cuantos perfiles quedan en disco.
+- 409 en "profile": true: otro render perfilado (u otro profiler del proceso)
+  esta activo; reintentar cuando termine.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.core import metrics
+from app.core.paths import get_render_profile_dir
+from app.core.settings import get_render_profile_keep
+
+T = TypeVar("T")
+
+_SAMPLE_INTERVAL = 0.001
+_PSTATS_LIMIT = 60
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_BLOCK_METRIC = "gicatesis_block_render_duration_seconds"
+_STAGE_METRIC = "gicatesis_stage_duration_seconds"
+_PDF_METRIC = "gicatesis_pdf_conversion_duration_seconds"
+
+# Un solo render perfilado a la vez por proceso (ver ProfilerBusyError).
+_PROFILE_LOCK = threading.Lock()
+
+PROFILE_FILES = ("summary.json", "profile.pstats", "profile.txt", "profile.collapsed")
+
+
+class ProfilerBusyError(RuntimeError):
+    """Ya hay un render perfilado (u otro profiler) activo en el proceso."""
+
+
+class RenderProfile:
+    """Perfil guardado de un render: id, carpeta y resumen (summary.json)."""
+
+    __slots__ = ("profile_id", "directory", "summary")
+
+    def __init__(self, profile_id: str, directory: Path, summary: Dict[str, Any]) -> None:
+        self.profile_id = profile_id
+        self.directory = directory
+        self.summary = summary
+
+
+class _StackSampler(threading.Thread):
+    """Muestrea la pila de un hilo hasta ``root`` (exclusive) cada intervalo."""
+
+    def __init__(self, thread_id: int, root: FrameType, interval: float) -> None:
+        super().__init__(name="gicatesis-profile-sampler", daemon=True)
+        self._thread_id = thread_id
+        self._root = root
+        self._interval = interval
+        self._stopped = threading.Event()
+        self.stacks: Counter = Counter()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names: List[str] = []
+            while frame is not None and frame is not self._root:
+                code = frame.f_code
+                qualname = getattr(code, "co_qualname", code.co_name)
+                names.append(f"{Path(code.co_filename).stem}:{qualname}")
+                frame = frame.f_back
+            if names and frame is self._root:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def _breakdown(observations: List[Tuple[str, str, float, Dict[str, Any]]]) -> Tuple[dict, list]:
+    stages: Dict[str, float] = {}
+    blocks: Dict[str, Dict[str, float]] = {}
+    for _kind, name, value, labels in observations:
+        if name == _STAGE_METRIC:
+            stage = str(labels.get("stage", ""))
+            stages[stage] = stages.get(stage, 0.0) + value * 1000
+        elif name == _PDF_METRIC:
+            stages["pdf_convert"] = stages.get("pdf_convert", 0.0) + value * 1000
+        elif name == _BLOCK_METRIC:
+            row = blocks.setdefault(
+                str(labels.get("block_type", "")), {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            row["count"] += 1
+            row["total_ms"] += value * 1000
+            row["max_ms"] = max(row["max_ms"], value * 1000)
+    stage_rows = {name: round(ms, 3) for name, ms in stages.items()}
+    block_rows = [
+        {
+            "block_type": block_type,
+            "count": int(row["count"]),
+            "total_ms": round(row["total_ms"], 3),
+            "max_ms": round(row["max_ms"], 3),
+        }
+        for block_type, row in sorted(blocks.items(), key=lambda item: -item[1]["total_ms"])
+    ]
+    return stage_rows, block_rows
+
+
+def _pstats_text(profiler: cProfile.Profile) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).strip_dirs()
+    stats.sort_stats("cumulative").print_stats(_PSTATS_LIMIT)
+    stats.sort_stats("tottime").print_stats(_PSTATS_LIMIT)
+    return stream.getvalue()
+
+
+def _prune(root: Path, keep: int) -> None:
+    profiles = sorted(
+        (path for path in root.iterdir() if path.is_dir() and _PROFILE_ID_RE.match(path.name)),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in profiles[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def _write_profile(
+    profile_id: str,
+    profiler: cProfile.Profile,
+    stacks: Counter,
+    summary: Dict[str, Any],
+) -> Path:
+    root = get_render_profile_dir()
+    directory = root / profile_id
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(directory / "profile.pstats"))
+    (directory / "profile.txt").write_text(_pstats_text(profiler), encoding="utf-8")
+    (directory / "profile.collapsed").write_text(
+        "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items())),
+        encoding="utf-8",
+    )
+    (directory / "summary.json").write_text(
+        json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    _prune(root, get_render_profile_keep())
+    return directory
+
+
+def profile_render(fn: Callable[[], T], *, label: str) -> Tuple[T, RenderProfile]:
+    """Ejecuta ``fn`` perfilado y guarda el perfil junto al artefacto.
+
+    Si ``fn`` lanza, la excepcion se propaga y no se guarda ningun perfil.
+    Lanza ProfilerBusyError sin ejecutar ``fn`` si ya hay un perfil en curso.
+    """
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        raise ProfilerBusyError("Another profiled render is in progress")
+    try:
+        profile_id = uuid.uuid4().hex
+        profiler = cProfile.Profile()
+        sampler = _StackSampler(threading.get_ident(), sys._getframe(), _SAMPLE_INTERVAL)
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        try:
+            profiler.enable()
+        except ValueError as exc:
+            # Python >= 3.12: otra herramienta (coverage, debugger) ya ocupa
+            # sys.monitoring para profiling.
+            raise ProfilerBusyError(str(exc)) from exc
+        with metrics.capture_observations() as observations:
+            sampler.start()
+            start = time.perf_counter()
+            try:
+                try:
+                    result = fn()
+                finally:
+                    profiler.disable()
+            finally:
+                wall_ms = (time.perf_counter() - start) * 1000
+                sampler.stop()
+    finally:
+        _PROFILE_LOCK.release()
+
+    stages, blocks = _breakdown(observations)
+    summary = {
+        "profile_id": profile_id,
+        "label": label,
+        "created_at": created_at,
+        "wall_ms": round(wall_ms, 3),
+        "sample_interval_ms": _SAMPLE_INTERVAL * 1000,
+        "samples": sum(sampler.stacks.values()),
+        "stages_ms": stages,
+        "blocks": blocks,
+        "files": list(PROFILE_FILES),
+    }
+    directory = _write_profile(profile_id, profiler, sampler.stacks, summary)
+    return result, RenderProfile(profile_id, directory, summary)
+
+
+def get_profile_file(profile_id: str, name: str = "summary.json") -> Optional[Path]:
+    """Ruta de un archivo de perfil existente, o None si el id/nombre no es valido."""
+    if not _PROFILE_ID_RE.match(profile_id or "") or name not in PROFILE_FILES:
+        return None
+    path = get_render_profile_dir() / profile_id / name
+    return path if path.is_file() else None
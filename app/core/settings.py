@@ -15,6 +15,33 @@ FUNCIÓN PRINCIPAL:
   Lee: GICA_DEFAULT_UNI (env var)
   Fallback: "unac"
 
+FUNCIONES DE GENERACIÓN:
+- get_generator_mode() -> str
+  Backend del generador DOCX: "subprocess", "inprocess" o "pool".
+- get_generator_pool_size() -> int
+  Cantidad de workers precalentados para el modo "pool".
+
+- get_generation_concurrency() -> int
+  Corridas de POST /api/v1/generate ejecutadas en paralelo.
+
+FUNCIONES DE CONVERSION PDF:
+- get_libreoffice_pool_size() -> int
+  Instancias soffice persistentes en Linux (0 = una por conversion).
+
+FUNCIONES DE CACHE:
+- is_pdf_prewarm_enabled() / get_prewarm_concurrency()
+  Precalentado de PDFs en segundo plano (app/modules/formats/prewarm.py).
+- is_render_cache_enabled()
+  Activa el cache de renders por contenido (app/core/render_cache.py).
+- get_cache_max_bytes() / get_cache_max_age() / get_cache_sweep_interval()
+  Cuota, expiracion y barrido del indice unico de caches (app/core/cache_store.py).
+
+FUNCIONES DE OBSERVABILIDAD:
+- is_metrics_enabled()
+  Registro de histogramas/contadores expuestos en GET /metrics (app/core/metrics.py).
+- get_render_profile_keep() -> int
+  Perfiles de render (profile=true) conservados en disco (app/core/render_profiler.py).
+
 COMUNICACIÓN CON OTROS MÓDULOS:
 - Es CONSUMIDO por:
   - app/modules/formats/router.py (endpoint /cover-model)
@@ -24,6 +51,22 @@ COMUNICACIÓN CON OTROS MÓDULOS:
 VARIABLES DE ENTORNO:
 - GICA_DEFAULT_UNI: Código de universidad por defecto (ej: "unac", "uni")
   Si no está definida, usa "unac" como fallback.
+- GICATESIS_GENERATOR_MODE: Backend del generador (default "subprocess").
+- GICATESIS_GENERATOR_POOL_SIZE: Workers del pool (default 2).
+- GICATESIS_GENERATOR_TIMEOUT: Timeout en segundos por documento (default 180).
+- GICATESIS_GENERATION_CONCURRENCY: Corridas /generate simultaneas (default 2).
+- GICATESIS_GENERATION_MAX_QUEUED: Corridas /generate en espera antes de responder 429 (default 32).
+- GICATESIS_LIBREOFFICE_POOL_SIZE: Instancias soffice persistentes (default 2, 0 desactiva).
+- GICATESIS_RENDER_CACHE: "false" desactiva el cache de renders (default "true").
+- GICATESIS_RENDER_CACHE_DIR: Carpeta alternativa para el cache de renders.
+- PDF_PREWARM_ON_STARTUP: "true" precalienta PDFs al arrancar, en segundo plano (default "false").
+- GICATESIS_PREWARM_CONCURRENCY: Formatos precalentados en paralelo (default 2).
+- GICATESIS_CACHE_DIR: Raiz alternativa de todos los caches (default app/.cache).
+- GICATESIS_CACHE_MAX_MB: Cuota de disco total de caches y artefactos (default 2048).
+- GICATESIS_CACHE_MAX_AGE: Segundos sin acceso antes de expirar (default 86400).
+- GICATESIS_CACHE_SWEEP_INTERVAL: Segundos entre barridos de fondo (default 300, 0 desactiva).
+- GICATESIS_METRICS: "false" desactiva el registro de metricas y GET /metrics (default "true").
+- GICATESIS_PROFILE_KEEP: Perfiles de render conservados; los mas viejos se borran (default 20).
 
 EJEMPLO DE USO:
     from app.core.settings import get_default_uni_code
@@ -51,3 +94,125 @@ def get_default_uni_code() -> str:
     if value:
         return value
     return _FALLBACK_UNI
+
+
+# Backends validos para el generador DOCX (ver app/core/generator_backends.py)
+_GENERATOR_MODES = ("subprocess", "inprocess", "pool")
+_FALLBACK_GENERATOR_MODE = "subprocess"
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Lee un entero positivo desde env; valores invalidos usan el default."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("%s invalido (%r), usando %s", name, raw, default)
+        return default
+    return max(minimum, value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lee un float positivo desde env; valores invalidos usan el default."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning("%s invalido (%r), usando %s", name, raw, default)
+        return default
+    return value if value > 0 else default
+
+
+def get_generator_mode() -> str:
+    """
+    Retorna el backend del generador DOCX.
+    Lee GICATESIS_GENERATOR_MODE; valores desconocidos caen a 'subprocess'.
+    """
+    value = os.getenv("GICATESIS_GENERATOR_MODE", "").strip().lower()
+    if not value:
+        return _FALLBACK_GENERATOR_MODE
+    if value not in _GENERATOR_MODES:
+        logger.warning(
+            "GICATESIS_GENERATOR_MODE desconocido (%r), usando %s",
+            value,
+            _FALLBACK_GENERATOR_MODE,
+        )
+        return _FALLBACK_GENERATOR_MODE
+    return value
+
+
+def get_generator_pool_size() -> int:
+    """Retorna la cantidad de workers del pool (GICATESIS_GENERATOR_POOL_SIZE)."""
+    return _env_int("GICATESIS_GENERATOR_POOL_SIZE", 2)
+
+
+def get_generator_timeout() -> float:
+    """Retorna el timeout por documento en segundos (GICATESIS_GENERATOR_TIMEOUT)."""
+    return _env_float("GICATESIS_GENERATOR_TIMEOUT", 180.0)
+
+
+def get_generation_concurrency() -> int:
+    """Corridas /generate en paralelo (GICATESIS_GENERATION_CONCURRENCY)."""
+    return _env_int("GICATESIS_GENERATION_CONCURRENCY", 2)
+
+
+def get_generation_max_queued() -> int:
+    """Corridas /generate en espera, sin contar las activas (GICATESIS_GENERATION_MAX_QUEUED)."""
+    return _env_int("GICATESIS_GENERATION_MAX_QUEUED", 32, minimum=0)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Lee un booleano estilo 1/true/yes/on desde env."""
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
+
+
+def is_render_cache_enabled() -> bool:
+    """Indica si el cache de renders por contenido esta activo (GICATESIS_RENDER_CACHE)."""
+    return _env_flag("GICATESIS_RENDER_CACHE", True)
+
+
+def is_pdf_prewarm_enabled() -> bool:
+    """Indica si se precalientan PDFs al arrancar (PDF_PREWARM_ON_STARTUP)."""
+    return _env_flag("PDF_PREWARM_ON_STARTUP", False)
+
+
+def get_prewarm_concurrency() -> int:
+    """Formatos precalentados en paralelo (GICATESIS_PREWARM_CONCURRENCY)."""
+    return _env_int("GICATESIS_PREWARM_CONCURRENCY", 2)
+
+
+def get_cache_max_bytes() -> int:
+    """Cuota total de caches en disco, en bytes (GICATESIS_CACHE_MAX_MB)."""
+    return _env_int("GICATESIS_CACHE_MAX_MB", 2048) * 1024 * 1024
+
+
+def get_cache_max_age() -> float:
+    """Segundos sin acceso antes de expirar una entrada (GICATESIS_CACHE_MAX_AGE)."""
+    return _env_float("GICATESIS_CACHE_MAX_AGE", 86400.0)
+
+
+def get_cache_sweep_interval() -> float:
+    """Segundos entre barridos del cache (GICATESIS_CACHE_SWEEP_INTERVAL, 0 desactiva)."""
+    return _env_float("GICATESIS_CACHE_SWEEP_INTERVAL", 300.0)
+
+
+def get_libreoffice_pool_size() -> int:
+    """Instancias LibreOffice persistentes (GICATESIS_LIBREOFFICE_POOL_SIZE, 0 desactiva)."""
+    return _env_int("GICATESIS_LIBREOFFICE_POOL_SIZE", 2, minimum=0)
+
+
+def is_metrics_enabled() -> bool:
+    """Indica si se registran metricas para GET /metrics (GICATESIS_METRICS)."""
+    return _env_flag("GICATESIS_METRICS", True)
+
+
+def get_render_profile_keep() -> int:
+    """Perfiles de render conservados en disco (GICATESIS_PROFILE_KEEP)."""
+    return _env_int("GICATESIS_PROFILE_KEEP", 20)
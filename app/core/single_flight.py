@@ -0,0 +1,123 @@
+"""
+Archivo: app/core/single_flight.py
+Proposito:
+- Deduplicar llenados de cache concurrentes por clave ("single-flight").
+
+Responsabilidades:
+- Lock en proceso por clave (hilos del mismo worker uvicorn).
+- Lock de archivo por clave (varios workers uvicorn / procesos).
+- Liberar los locks en memoria cuando no quedan interesados.
+No hace:
+- No decide si el cache esta fresco: el llamador debe re-verificar dentro
+  del lock (double-checked) y asi los que esperaban reutilizan el resultado.
+
+Entradas/Salidas:
+- Entradas: clave logica (ej. "pdf:unac-informe-cuant:<sha>").
+- Salidas: context manager que retiene ambos locks.
+
+Dependencias:
+- threading, fcntl (POSIX) o msvcrt (Windows), app.core.paths.
+
+Donde tocar si falla:
+- Si un request queda bloqueado, revisar archivos en app/.cache/locks y el
+  proceso que retiene el lock (un render colgado retiene su clave).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.paths import get_lock_dir
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+def _lock_file(fd: int) -> None:
+    if os.name == "nt":
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK reintenta ~10s y luego falla: seguir esperando.
+                time.sleep(0.1)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _unlock_file(fd: int) -> None:
+    if os.name == "nt":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class SingleFlight:
+    """Locks por clave: en proceso + archivo en lock_dir."""
+
+    def __init__(self, lock_dir: Optional[Path] = None) -> None:
+        self._lock_dir = lock_dir
+        self._guard = threading.Lock()
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+
+    @property
+    def lock_dir(self) -> Path:
+        return self._lock_dir or get_lock_dir()
+
+    def _lock_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.lock_dir / f"{digest}.lock"
+
+    def _acquire_local(self, key: str) -> threading.Lock:
+        with self._guard:
+            lock, waiters = self._locks.get(key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._locks[key] = (lock, waiters + 1)
+        lock.acquire()
+        return lock
+
+    def _release_local(self, key: str, lock: threading.Lock) -> None:
+        lock.release()
+        with self._guard:
+            _lock, waiters = self._locks[key]
+            if waiters <= 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, waiters - 1)
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        """Retiene la clave; un solo llamador (en todos los procesos) a la vez."""
+        local = self._acquire_local(key)
+        try:
+            path = self._lock_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_file(fd)
+                try:
+                    yield
+                finally:
+                    _unlock_file(fd)
+            finally:
+                os.close(fd)
+        finally:
+            self._release_local(key, local)
+
+
+_SINGLE_FLIGHT = SingleFlight()
+
+
+def single_flight(key: str):
+    """Atajo sobre el SingleFlight del proceso (locks en app/.cache/locks)."""
+    return _SINGLE_FLIGHT.hold(key)
@@ -10,4 +10,5 @@ Módulos:
     primitives.py – Funciones DOCX puras (futuro, Fase 2).
     normalizer.py – JSON canónico v2 → Block[] (futuro, Fase 3).
     renderers/    – Un archivo por tipo de bloque (futuro, Fase 4).
+    packaging.py  – Guardado determinista del DOCX (bytes estables).
 """
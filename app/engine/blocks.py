@@ -0,0 +1,257 @@
+"""
+Archivo: app/engine/blocks.py
+Proposito:
+- Blocks tipados y compactos (__slots__) para los tipos de forma fija que el
+  normalizer produce en volumen (paragraph, heading, note, page_break, ...).
+
+Responsabilidades:
+- Declarar una clase por tipo con sus campos como slots (sin __dict__ por
+  instancia: 40-72 bytes frente a 184 del dict equivalente).
+- Comportarse como el dict de siempre (get, [], in, ==, dict(block), copy) para
+  que renderers, tests y herramientas no cambien.
+- Convertir un dict ya construido a su clase (typed_block) cuando todas sus
+  claves estan declaradas; si no, devolver el dict intacto.
+No hace:
+- No tipa blocks que transportan JSON arbitrario (table, image, matriz, logo,
+  ...): sus claves dependen del formato y seguirian necesitando un dict.
+- No valida valores; solo restringe nombres de claves.
+
+Entradas/Salidas:
+- Entradas: dicts de Block producidos por app/engine/normalizer.py.
+- Salidas: instancias de SlottedBlock (o el mismo dict si no aplica).
+
+Dependencias:
+- collections.abc.
+
+Puntos de extension:
+- Tipar un block nuevo: declarar la subclase con ``block_type`` y __slots__ y
+  agregarla a _BLOCK_CLASSES.
+- Si el normalizer empieza a emitir una clave nueva en un tipo tipado, hay que
+  sumarla a sus __slots__; mientras tanto ese block sale como dict (sin error).
+
+Donde tocar si falla:
+- KeyError "no declarada" al asignar: un consumidor agrega claves a un block
+  tipado; declararla en __slots__ o trabajar sobre ``block.to_dict()``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import ItemsView, KeysView, MutableMapping, ValuesView
+from typing import Any, ClassVar, Dict, FrozenSet, Iterator, Union
+
+
+class SlottedBlock:
+    """Block con slots fijos y la interfaz de mapping del Block dict.
+
+    ``type`` no ocupa slot: es ``block_type`` de la clase. Un slot sin asignar
+    equivale a una clave ausente (``get`` devuelve el default, ``in`` es False).
+    No hereda de MutableMapping (se registra como subclase virtual): con el ABC
+    en la MRO, cada ``isinstance`` del dispatch costaba ~6x mas.
+    """
+
+    __slots__ = ()
+    block_type: ClassVar[str] = ""
+    _KEYS: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = frozenset(cls.__slots__)
+
+    def __init__(self, **values: Any) -> None:
+        for key, value in values.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        elif key == "type":
+            return self.block_type
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._KEYS:
+            return getattr(self, key, default)
+        if key == "type":
+            return self.block_type
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._KEYS:
+            return hasattr(self, key)  # type: ignore[arg-type]
+        return key == "type"
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._KEYS:
+            raise KeyError(f"Clave no declarada para block '{self.block_type}': {key}")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._KEYS and hasattr(self, key):
+            delattr(self, key)
+            return
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield "type"
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+
+    def __len__(self) -> int:
+        return 1 + sum(1 for key in self.__slots__ if hasattr(self, key))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (dict, SlottedBlock)):
+            return NotImplemented
+        return self.to_dict() == dict(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def keys(self) -> KeysView:
+        return KeysView(self)
+
+    def items(self) -> ItemsView:
+        return ItemsView(self)
+
+    def values(self) -> ValuesView:
+        return ValuesView(self)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            if key != "type" or value != self.block_type:
+                self[key] = value
+
+    def copy(self) -> "SlottedBlock":
+        clone = self.__class__.__new__(self.__class__)
+        for key in self.__slots__:
+            if hasattr(self, key):
+                setattr(clone, key, getattr(self, key))
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Block dict equivalente (``type`` primero, luego los slots asignados)."""
+        result: Dict[str, Any] = {"type": self.block_type}
+        for key in self.__slots__:
+            if hasattr(self, key):
+                result[key] = getattr(self, key)
+        return result
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+MutableMapping.register(SlottedBlock)
+
+
+class ParagraphBlock(SlottedBlock):
+    __slots__ = ("text",)
+    block_type = "paragraph"
+
+
+class ParagraphBoldBlock(SlottedBlock):
+    __slots__ = ("text", "size")
+    block_type = "paragraph_bold"
+
+
+class ParagraphCenteredBlock(SlottedBlock):
+    __slots__ = ("text", "bold", "size", "space_before", "space_after")
+    block_type = "paragraph_centered"
+
+
+class HeadingBlock(SlottedBlock):
+    __slots__ = ("text", "level", "centered", "space_before", "space_after")
+    block_type = "heading"
+
+
+class BlackHeadingBlock(SlottedBlock):
+    __slots__ = ("text", "level", "size", "centered")
+    block_type = "black_heading"
+
+
+class CenteredTextBlock(SlottedBlock):
+    __slots__ = ("text", "bold", "italic", "size", "space_before", "space_after")
+    block_type = "centered_text"
+
+
+class NoteBlock(SlottedBlock):
+    __slots__ = ("text",)
+    block_type = "note"
+
+
+class TocFieldBlock(SlottedBlock):
+    __slots__ = ("field_code", "heading_text", "exclude_from_toc")
+    block_type = "toc_field"
+
+
+class PageBreakBlock(SlottedBlock):
+    __slots__ = ("force",)
+    block_type = "page_break"
+
+
+class SectionBreakBlock(SlottedBlock):
+    __slots__ = ()
+    block_type = "section_break"
+
+
+class SectionSwitchBlock(SlottedBlock):
+    __slots__ = ("orientation",)
+    block_type = "section_switch"
+
+
+class PageFooterBlock(SlottedBlock):
+    __slots__ = ()
+    block_type = "page_footer"
+
+
+_BLOCK_CLASSES: Dict[str, type] = {
+    cls.block_type: cls
+    for cls in (
+        ParagraphBlock,
+        ParagraphBoldBlock,
+        ParagraphCenteredBlock,
+        HeadingBlock,
+        BlackHeadingBlock,
+        CenteredTextBlock,
+        NoteBlock,
+        TocFieldBlock,
+        PageBreakBlock,
+        SectionBreakBlock,
+        SectionSwitchBlock,
+        PageFooterBlock,
+    )
+}
+
+
+def typed_block(block: Union[Dict[str, Any], SlottedBlock]) -> Union[Dict[str, Any], SlottedBlock]:
+    """Version tipada de ``block`` si su tipo y todas sus claves estan declarados."""
+    if type(block) is not dict:
+        return block
+    block_type = block.get("type")
+    cls = _BLOCK_CLASSES.get(block_type) if isinstance(block_type, str) else None
+    if cls is None:
+        return block
+    keys = cls._KEYS
+    typed = cls.__new__(cls)
+    for key, value in block.items():
+        if key in keys:
+            setattr(typed, key, value)
+        elif key != "type":
+            return block
+    return typed
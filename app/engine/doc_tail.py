@@ -0,0 +1,106 @@
+"""
+Archivo: app/engine/doc_tail.py
+Proposito:
+- Consultar el estado del final del documento (ultimo elemento, salto de
+  pagina pendiente, spacer vacio, ultimo section break) en tiempo constante.
+
+Responsabilidades:
+- Leer la cola del ``<w:body>`` con punteros de hermanos de lxml
+  (``body[-1]`` y ``getprevious()``), sin materializar ``list(body)`` ni
+  ``doc.paragraphs`` (ambos O(tamano del documento)).
+No hace:
+- No modifica el documento (eso lo hacen page_control y primitives).
+
+Entradas/Salidas:
+- Entradas: Document de python-docx.
+- Salidas: elementos lxml / Paragraph del final del body o flags.
+
+Dependencias:
+- python-docx (Paragraph, qn).
+
+Donde tocar si falla:
+- Si aparecen hojas en blanco, comparar con la logica de page_control: aqui
+  solo se localizan elementos, no se decide nada.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from docx.document import Document
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+_W_P = qn("w:p")
+_W_PPR = qn("w:pPr")
+_W_SECTPR = qn("w:sectPr")
+_W_TBL = qn("w:tbl")
+_W_BR = qn("w:br")
+_W_TYPE = qn("w:type")
+
+
+def last_content_element(doc: Document):
+    """Ultimo hijo del body ignorando el ``<w:sectPr>`` final (o None)."""
+    body = doc.element.body
+    try:
+        last = body[-1]
+    except IndexError:
+        return None
+    if last.tag == _W_SECTPR:
+        return last.getprevious()
+    return last
+
+
+def is_section_break_paragraph(element) -> bool:
+    """Indica si el elemento es un ``<w:p>`` con ``<w:sectPr>`` en su ``<w:pPr>``."""
+    if element is None or element.tag != _W_P:
+        return False
+    p_pr = element.find(_W_PPR)
+    return p_pr is not None and p_pr.find(_W_SECTPR) is not None
+
+
+def last_content_is_section_break(doc: Document) -> bool:
+    """True si el ultimo contenido es un section-break paragraph."""
+    return is_section_break_paragraph(last_content_element(doc))
+
+
+def last_content_has_page_break(doc: Document) -> bool:
+    """True si el ultimo contenido es un parrafo con ``<w:br w:type="page">``."""
+    last = last_content_element(doc)
+    if last is None or last.tag != _W_P:
+        return False
+    return any(br.get(_W_TYPE) == "page" for br in last.iter(_W_BR))
+
+
+def last_empty_trailing_paragraph(doc: Document) -> Optional[Paragraph]:
+    """Ultimo parrafo del body si es un spacer vacio (sin texto ni tabla)."""
+    last = last_content_element(doc)
+    if last is None or last.tag != _W_P:
+        return None
+    if last.find(_W_TBL) is not None:
+        return None
+    if "".join(last.itertext()).strip():
+        return None
+    return Paragraph(last, doc._body)
+
+
+def last_section_break_paragraph(doc: Document):
+    """``<w:p>`` mas reciente con section break (recorre desde el final)."""
+    element = last_content_element(doc)
+    while element is not None:
+        if is_section_break_paragraph(element):
+            return element
+        element = element.getprevious()
+    return None
+
+
+def last_text_paragraph(doc: Document) -> Optional[Paragraph]:
+    """Ultimo parrafo del body (nivel superior) con texto visible."""
+    element = last_content_element(doc)
+    while element is not None:
+        if element.tag == _W_P:
+            paragraph = Paragraph(element, doc._body)
+            if paragraph.text.strip():
+                return paragraph
+        element = element.getprevious()
+    return None
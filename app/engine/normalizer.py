@@ -16,10 +16,13 @@ No hace:
 
 Entradas/Salidas:
 - Entradas: dict del JSON completo (ya parseado).
-- Salidas: List[Block] — lista plana y ordenada.
+- Salidas: List[Block] — lista plana y ordenada (normalize), o el mismo orden
+  como iterador perezoso (iter_normalize) para que render_blocks lo consuma
+  sin materializar la lista completa. Los tipos de forma fija salen como
+  blocks con slots (app.engine.blocks); tablas, imagenes, etc. siguen en dict.
 
 Dependencias:
-- app.engine.types (Block).
+- app.engine.types (Block), app.engine.blocks (typed_block).
 
 Puntos de extension:
 - Agregar nuevos _normalize_X para secciones futuras.
@@ -34,8 +37,9 @@ from __future__ import annotations
 
 import re
 import unicodedata
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
+from app.engine.blocks import typed_block
 from app.engine.types import Block
 
 
@@ -125,6 +129,15 @@ _COMMON_ABBREVIATIONS: Dict[str, tuple[str, str]] = {
     "GPS": ("GPS", "Global Positioning System"),
     "CAD": ("CAD", "Computer-Aided Design"),
 }
+# Una sola pasada por fragmento: cada clave solo puede coincidir con una racha
+# completa de [A-Z0-9], asi que las coincidencias nunca se solapan.
+_COMMON_ABBREVIATION_RE = re.compile(
+    r"(?<![A-Z0-9])(?:"
+    + "|".join(
+        re.escape(key) for key in sorted(_COMMON_ABBREVIATIONS, key=len, reverse=True)
+    )
+    + r")(?![A-Z0-9])"
+)
 
 
 def _first_nonempty_text(candidates: List[Any]) -> str:
@@ -487,6 +500,8 @@ def _append_abbreviation_row(
     if canonical:
         display, expanded = canonical
         normalized_key = _norm_upper(display)
+    if normalized_key in seen:
+        return
     if (
         not normalized_key
         or not expanded
@@ -495,8 +510,6 @@ def _append_abbreviation_row(
         or not _meaning_matches_sigla(expanded, display)
     ):
         return
-    if normalized_key in seen:
-        return
     seen.add(normalized_key)
     rows.append({"sigla": display, "meaning": expanded})
 
@@ -580,7 +593,10 @@ def _derive_document_abbreviation_rows(data: dict | None) -> List[Dict[str, str]
                     sigla, meaning = canonical
                 _append_abbreviation_row(rows, seen, sigla, meaning)
 
-        for meaning, sigla in _ABBR_IN_TEXT_RE.findall(fragment):
+        # Ambos patrones "texto (sigla)" exigen un "(": sin el, findall recorre
+        # el fragmento entero probando cada inicio sin encontrar nada.
+        has_paren = "(" in fragment
+        for meaning, sigla in _ABBR_IN_TEXT_RE.findall(fragment) if has_paren else ():
             cleaned_meaning = re.sub(r"\s+", " ", meaning).strip(" .;:-")
             if len(cleaned_meaning.split()) > 12:
                 continue
@@ -589,7 +605,9 @@ def _derive_document_abbreviation_rows(data: dict | None) -> List[Dict[str, str]
                 sigla, cleaned_meaning = canonical
             _append_abbreviation_row(rows, seen, sigla, cleaned_meaning)
 
-        for sigla, meaning in _ABBR_REVERSED_IN_TEXT_RE.findall(fragment):
+        for sigla, meaning in (
+            _ABBR_REVERSED_IN_TEXT_RE.findall(fragment) if has_paren else ()
+        ):
             cleaned_meaning = re.sub(r"\s+", " ", meaning).strip(" .;:-")
             if len(cleaned_meaning.split()) > 12:
                 continue
@@ -598,10 +616,12 @@ def _derive_document_abbreviation_rows(data: dict | None) -> List[Dict[str, str]
                 sigla, cleaned_meaning = canonical
             _append_abbreviation_row(rows, seen, sigla, cleaned_meaning)
 
-        normalized_fragment = _norm_upper(fragment)
-        for key, (display, meaning) in _COMMON_ABBREVIATIONS.items():
-            if re.search(rf"(?<![A-Z0-9]){re.escape(key)}(?![A-Z0-9])", normalized_fragment):
-                _append_abbreviation_row(rows, seen, display, meaning)
+        found = set(_COMMON_ABBREVIATION_RE.findall(_norm_upper(fragment)))
+        if found:
+            # Orden de _COMMON_ABBREVIATIONS, no de aparicion en el texto.
+            for key, (display, meaning) in _COMMON_ABBREVIATIONS.items():
+                if key in found:
+                    _append_abbreviation_row(rows, seen, display, meaning)
 
     return rows
 
@@ -732,17 +752,29 @@ def normalize(data: dict) -> List[Block]:
       6. finales
       7. page_footer  (numeración de páginas)
     """
-    blocks: List[Block] = []
+    return list(iter_normalize(data))
+
+
+def iter_normalize(data: dict) -> Iterator[Block]:
+    """Mismos Blocks que ``normalize`` pero producidos de forma perezosa.
+
+    Cada sección se normaliza recién cuando el consumidor llega a ella y el
+    cuerpo avanza item por item, así ``render_blocks`` va escribiendo el
+    documento sin que la lista completa exista en memoria. La política de
+    tablas landscape consecutivas solo retiene la racha de tablas en curso.
+    Cada block de forma fija se entrega como su clase con slots (typed_block).
+    """
+    return _iter_consecutive_landscape_table_policy(map(typed_block, _iter_sections(data)))
 
-    blocks.extend(_normalize_caratula(data))
-    blocks.extend(_normalize_pagina_respeto(data))
-    blocks.extend(_normalize_informacion_basica(data))
-    blocks.extend(_normalize_preliminares(data))
-    blocks.extend(_normalize_cuerpo(data))
-    blocks.extend(_normalize_finales(data))
-    blocks.append({"type": "page_footer"})
 
-    return _apply_consecutive_landscape_table_policy(blocks)
+def _iter_sections(data: dict) -> Iterator[Block]:
+    yield from _normalize_caratula(data)
+    yield from _normalize_pagina_respeto(data)
+    yield from _normalize_informacion_basica(data)
+    yield from _normalize_preliminares(data)
+    yield from _iter_cuerpo(data)
+    yield from _normalize_finales(data)
+    yield {"type": "page_footer"}
 
 
 def _is_landscape_table_block(block: Any) -> bool:
@@ -754,40 +786,37 @@ def _is_landscape_table_block(block: Any) -> bool:
     return orientation == "landscape"
 
 
-def _apply_consecutive_landscape_table_policy(blocks: List[Block]) -> List[Block]:
+def _iter_consecutive_landscape_table_policy(blocks: Iterable[Block]) -> Iterator[Block]:
     """Avoid redundant portrait restores between consecutive landscape tables.
 
     When two or more landscape canonical tables are consecutive, only the last
     one should restore portrait orientation. This prevents blank pages produced
     by back-to-back section switches (landscape -> portrait -> landscape).
-    """
-    if not blocks:
-        return blocks
-
-    normalized: List[Block] = []
-    index = 0
-    total = len(blocks)
 
-    while index < total:
-        current = blocks[index]
-        if not _is_landscape_table_block(current):
-            normalized.append(current)
-            index += 1
+    En streaming: una tabla landscape no se puede emitir hasta saber si la
+    sigue otra, así que solo se retiene la racha en curso y se libera al
+    primer block que no lo es.
+    """
+    run: List[Block] = []
+    for block in blocks:
+        if _is_landscape_table_block(block):
+            run.append(block)
             continue
+        if run:
+            yield from _flush_landscape_run(run)
+            run = []
+        yield block
+    if run:
+        yield from _flush_landscape_run(run)
 
-        run_end = index
-        while run_end + 1 < total and _is_landscape_table_block(blocks[run_end + 1]):
-            run_end += 1
-
-        for table_index in range(index, run_end + 1):
-            table_block = dict(blocks[table_index])
-            if table_index < run_end:
-                table_block["restore_portrait"] = False
-            normalized.append(table_block)
-
-        index = run_end + 1
 
-    return normalized
+def _flush_landscape_run(run: List[Block]) -> Iterator[Block]:
+    last = len(run) - 1
+    for position, block in enumerate(run):
+        table_block = dict(block)
+        if position < last:
+            table_block["restore_portrait"] = False
+        yield table_block
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -1688,19 +1717,17 @@ def _normalize_project_structured_section(data: dict | None, item: dict) -> list
     return []
 
 
-def _normalize_cuerpo(data: dict) -> List[Block]:
+def _iter_cuerpo(data: dict) -> Iterator[Block]:
     cuerpo = data.get("cuerpo", [])
     if not cuerpo:
-        return []
-
-    blocks: List[Block] = []
+        return
 
     for index, cap in enumerate(cuerpo):
         # Salto de pagina antes de cada capitulo (excepto el primero).
         # Evita insertar un salto justo despues del titulo.
         chapter_title = str(cap.get("titulo", "") or "")
         if index > 0:
-            blocks.append({"type": "page_break"})
+            yield {"type": "page_break"}
 
         chapter_items = cap.get("contenido", []) if isinstance(cap.get("contenido"), list) else []
         has_landscape_table = any(
@@ -1712,22 +1739,20 @@ def _normalize_cuerpo(data: dict) -> List[Block]:
         if has_landscape_table:
             # Keep chapter heading and its first landscape table in the same
             # landscape section to avoid blank portrait pages before the table.
-            blocks.append({"type": "section_switch", "orientation": "landscape"})
+            yield {"type": "section_switch", "orientation": "landscape"}
 
         # Título del capítulo
-        blocks.append(
-            {
-                "type": "heading",
-                "text": chapter_title,
-                "level": 1,
-                "centered": False,
-                "space_after": 12,
-            }
-        )
+        yield {
+            "type": "heading",
+            "text": chapter_title,
+            "level": 1,
+            "centered": False,
+            "space_after": 12,
+        }
 
         # Nota del capítulo
         if "nota_capitulo" in cap:
-            blocks.append({"type": "note", "text": cap["nota_capitulo"]})
+            yield {"type": "note", "text": cap["nota_capitulo"]}
 
         # Contenido del capítulo
         chapter_has_ai = bool(cap.get("_ai_content")) or any(
@@ -1742,18 +1767,14 @@ def _normalize_cuerpo(data: dict) -> List[Block]:
                 and not item.get("_ai_generated")
             ):
                 continue
-            blocks.extend(_normalize_content_item(item, data))
+            yield from _normalize_content_item(item, data)
 
         # Ejemplos APA a nivel de capítulo
         if "ejemplos_apa" in cap:
-            blocks.append(
-                {
-                    "type": "apa_examples",
-                    "ejemplos": cap["ejemplos_apa"],
-                }
-            )
-
-    return blocks
+            yield {
+                "type": "apa_examples",
+                "ejemplos": cap["ejemplos_apa"],
+            }
 
 
 def _normalize_content_item(
@@ -0,0 +1,98 @@
+"""
+Archivo: app/engine/packaging.py
+Proposito:
+- Serializar el Document python-docx a bytes estables (mismo input → mismos bytes).
+
+Responsabilidades:
+- Normalizar docProps/core.xml (fechas created/modified/lastPrinted y revision).
+- Reescribir el ZIP con fecha fija por entrada, atributos fijos y orden estable.
+No hace:
+- No modifica el contenido de word/*.xml (eso es de los renderers).
+- No decide donde se guarda el archivo (eso es del generador).
+
+Entradas/Salidas:
+- Entradas: Document python-docx ya renderizado.
+- Salidas: bytes DOCX deterministas o archivo escrito en disco.
+
+Dependencias:
+- python-docx (docx), zipfile.
+
+Puntos de extension:
+- SOURCE_DATE_EPOCH permite fijar otra fecha para core.xml.
+
+Donde tocar si falla:
+- Si el hash del DOCX cambia entre renders iguales, comparar las entradas
+  del ZIP: algo fuera de core.xml esta introduciendo fecha o azar.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Union
+
+from docx.document import Document
+
+# Fecha minima representable en ZIP (DOS): la usan los builds reproducibles.
+ZIP_FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# Fecha por defecto del template de python-docx.
+_DEFAULT_CORE_DATETIME = datetime(2013, 12, 23, 23, 15, tzinfo=timezone.utc)
+_CONTENT_TYPES = "[Content_Types].xml"
+
+
+def _core_datetime() -> datetime:
+    epoch = os.getenv("SOURCE_DATE_EPOCH", "").strip()
+    if epoch.isdigit():
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    return _DEFAULT_CORE_DATETIME
+
+
+def normalize_core_properties(doc: Document) -> None:
+    """Fija fechas y revision de docProps/core.xml."""
+    props = doc.core_properties
+    stamp = _core_datetime()
+    props.created = stamp
+    props.modified = stamp
+    props.revision = 1
+    if props.last_printed is not None:
+        props.last_printed = stamp
+
+
+def _entry_order(name: str) -> tuple:
+    # [Content_Types].xml primero (convencion OPC), el resto alfabetico.
+    return (name != _CONTENT_TYPES, name)
+
+
+def normalize_docx_zip(raw: bytes) -> bytes:
+    """Reescribe el ZIP con fecha fija, atributos fijos y entradas ordenadas."""
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(raw)) as source, zipfile.ZipFile(
+        output, "w", compression=zipfile.ZIP_DEFLATED
+    ) as target:
+        for name in sorted(source.namelist(), key=_entry_order):
+            info = zipfile.ZipInfo(name, date_time=ZIP_FIXED_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 0
+            info.external_attr = 0
+            target.writestr(info, source.read(name))
+    return output.getvalue()
+
+
+def document_to_bytes(doc: Document) -> bytes:
+    """Serializa el documento a bytes DOCX deterministas."""
+    normalize_core_properties(doc)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return normalize_docx_zip(buffer.getvalue())
+
+
+def save_document(doc: Document, target: Union[str, Path, BinaryIO]) -> None:
+    """Guarda el documento en disco (o stream) en modo determinista."""
+    payload = document_to_bytes(doc)
+    if hasattr(target, "write"):
+        target.write(payload)
+        return
+    Path(target).write_bytes(payload)
@@ -44,6 +44,8 @@ from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.shared import Cm, Pt, RGBColor
 
+from app.engine.doc_tail import last_section_break_paragraph
+
 logger = logging.getLogger(__name__)
 
 
@@ -519,36 +521,36 @@ def _shrink_section_break_paragraph(doc: Document) -> None:
     Si la tabla landscape llenó la página, ese párrafo vacío se desborda a la
     siguiente página generando una hoja en blanco.
 
-    Solución: recorrer hacia atrás los ``<w:p>`` del body y, al encontrar el
-    que tiene ``<w:sectPr>`` en su ``<w:pPr>``, forzar fuente a 2 half-points
-    (1 pt) y spacing a 0 para que no ocupe espacio visible.
+    Solución: ubicar desde el final del body (el recién creado es el último
+    ``<w:p>``, ver app.engine.doc_tail) el que tiene ``<w:sectPr>`` en su
+    ``<w:pPr>``, forzar fuente a 2 half-points (1 pt) y spacing a 0 para que
+    no ocupe espacio visible.
     """
-    body = doc.element.body
-    for p_elem in reversed(list(body.iterchildren(qn("w:p")))):
-        p_pr = p_elem.find(qn("w:pPr"))
-        if p_pr is not None and p_pr.find(qn("w:sectPr")) is not None:
-            # --- spacing 0 ---
-            spacing = p_pr.find(qn("w:spacing"))
-            if spacing is None:
-                spacing = OxmlElement("w:spacing")
-                p_pr.insert(0, spacing)
-            spacing.set(qn("w:before"), "0")
-            spacing.set(qn("w:after"), "0")
-            spacing.set(qn("w:line"), "240")
-            spacing.set(qn("w:lineRule"), "auto")
-
-            # --- rPr con tamaño mínimo para cualquier run implícito ---
-            r_pr = p_pr.find(qn("w:rPr"))
-            if r_pr is None:
-                r_pr = OxmlElement("w:rPr")
-                p_pr.append(r_pr)
-            for tag in ("w:sz", "w:szCs"):
-                el = r_pr.find(qn(tag))
-                if el is None:
-                    el = OxmlElement(tag)
-                    r_pr.append(el)
-                el.set(qn("w:val"), "2")  # 2 half-points = 1 pt
-            break
+    p_elem = last_section_break_paragraph(doc)
+    if p_elem is None:
+        return
+    p_pr = p_elem.find(qn("w:pPr"))
+    # --- spacing 0 ---
+    spacing = p_pr.find(qn("w:spacing"))
+    if spacing is None:
+        spacing = OxmlElement("w:spacing")
+        p_pr.insert(0, spacing)
+    spacing.set(qn("w:before"), "0")
+    spacing.set(qn("w:after"), "0")
+    spacing.set(qn("w:line"), "240")
+    spacing.set(qn("w:lineRule"), "auto")
+
+    # --- rPr con tamaño mínimo para cualquier run implícito ---
+    r_pr = p_pr.find(qn("w:rPr"))
+    if r_pr is None:
+        r_pr = OxmlElement("w:rPr")
+        p_pr.append(r_pr)
+    for tag in ("w:sz", "w:szCs"):
+        el = r_pr.find(qn(tag))
+        if el is None:
+            el = OxmlElement(tag)
+            r_pr.append(el)
+        el.set(qn("w:val"), "2")  # 2 half-points = 1 pt
 
 
 def switch_to_landscape(doc: Document) -> None:
@@ -6,7 +6,11 @@ Proposito:
 Responsabilidades:
 - Almacenar la relacion tipo → renderer.
 - Despachar blocks al renderer correcto via render_block().
-- Proveer render_blocks() para procesar listas completas.
+- Proveer render_blocks() para procesar listas completas o iteradores
+  (normalizer.iter_normalize) a medida que se producen.
+- Crear un RenderContext por documento y pasarlo a los renderers que declaran
+  un parametro ``ctx`` (los de firma (doc, block) siguen funcionando).
+- Medir cada render_block por tipo (gicatesis_block_render_duration_seconds).
 No hace:
 - No implementa renderers concretos (eso va en renderers/).
 - No normaliza JSON (eso va en normalizer.py).
@@ -16,7 +20,7 @@ Entradas/Salidas:
 - Salidas: documento python-docx modificado in-place.
 
 Dependencias:
-- app.engine.types.
+- app.engine.types, app.engine.blocks, app.engine.render_state, app.core.metrics.
 
 Puntos de extension:
 - Agregar middleware pre/post rendering.
@@ -29,12 +33,20 @@ Donde tocar si falla:
 
 from __future__ import annotations
 
+import inspect
 import logging
-from typing import Callable, Dict, List
+import time
+from typing import Callable, Dict, Iterable, List, Optional
 
 from docx.document import Document
 
-from app.engine.render_state import reset_render_state
+from app.core import metrics
+from app.engine.render_state import (
+    RenderContext,
+    current_render_context,
+    use_render_context,
+)
+from app.engine.blocks import SlottedBlock
 from app.engine.types import Block, BlockRenderer
 
 logger = logging.getLogger(__name__)
@@ -42,6 +54,20 @@ logger = logging.getLogger(__name__)
 # Mapa interno: tipo de block → función renderer.
 _RENDERERS: Dict[str, BlockRenderer] = {}
 
+# Renderer → acepta ``ctx``. Se resuelve una vez por funcion (no por block).
+_ACCEPTS_CTX: Dict[Callable, bool] = {}
+
+
+def _accepts_ctx(fn: Callable) -> bool:
+    accepts = _ACCEPTS_CTX.get(fn)
+    if accepts is None:
+        try:
+            accepts = "ctx" in inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            accepts = False
+        _ACCEPTS_CTX[fn] = accepts
+    return accepts
+
 
 def register(block_type: str) -> Callable[[BlockRenderer], BlockRenderer]:
     """Decorador para registrar un renderer de bloque.
@@ -54,6 +80,13 @@ def register(block_type: str) -> Callable[[BlockRenderer], BlockRenderer]:
         def render_heading(doc: Document, block: Block) -> None:
             ...
 
+    Si el renderer declara un parametro ``ctx`` recibe el RenderContext del
+    documento en curso (contadores de capitulo/figura/tabla)::
+
+        @register("image")
+        def render_image(doc, block, ctx: RenderContext | None = None) -> None:
+            ...
+
     Lanza ValueError si el tipo ya está registrado (previene duplicados).
     """
     if not isinstance(block_type, str) or not block_type.strip():
@@ -66,23 +99,30 @@ def register(block_type: str) -> Callable[[BlockRenderer], BlockRenderer]:
                 f"ya registrado como {_RENDERERS[block_type].__name__}"
             )
         _RENDERERS[block_type] = fn
+        _accepts_ctx(fn)
         logger.debug("Registered renderer for '%s': %s", block_type, fn.__name__)
         return fn
 
     return decorator
 
 
-def render_block(doc: Document, block: Block) -> None:
+def render_block(
+    doc: Document, block: Block, ctx: Optional[RenderContext] = None
+) -> None:
     """Despacha un Block al renderer correspondiente.
 
     Si el tipo no tiene renderer registrado, emite warning y continúa
     (no lanza excepción para no interrumpir la generación del documento).
+    Sin ``ctx`` se usa el contexto del render en curso en este hilo.
     """
-    if not isinstance(block, dict):
+    if isinstance(block, SlottedBlock):
+        block_type = block.block_type
+    elif isinstance(block, dict):
+        block_type = block.get("type", "")
+    else:
         logger.warning("Block inválido (no es dict): %s", type(block))
         return
 
-    block_type = block.get("type", "")
     if not block_type:
         logger.warning("Block sin campo 'type': %s", block)
         return
@@ -92,22 +132,41 @@ def render_block(doc: Document, block: Block) -> None:
         logger.warning("No hay renderer registrado para tipo '%s'", block_type)
         return
 
-    renderer(doc, block)
-
-
-def render_blocks(doc: Document, blocks: List[Block]) -> None:
-    """Renderiza una lista de Blocks en orden secuencial.
+    start = time.perf_counter()
+    try:
+        if _accepts_ctx(renderer):
+            renderer(doc, block, ctx=ctx if ctx is not None else current_render_context())
+        else:
+            renderer(doc, block)
+    finally:
+        metrics.observe(
+            "gicatesis_block_render_duration_seconds",
+            time.perf_counter() - start,
+            block_type=block_type,
+        )
+
+
+def render_blocks(
+    doc: Document, blocks: Iterable[Block], ctx: Optional[RenderContext] = None
+) -> RenderContext:
+    """Renderiza una lista (o iterador) de Blocks en orden secuencial.
 
     Cada block se despacha individualmente a su renderer.
     Si un renderer falla, logea el error y continúa con el siguiente.
+    Cada llamada usa su propio RenderContext (nuevo si no se pasa ``ctx``),
+    asi que varios documentos pueden renderizarse a la vez en hilos distintos.
     """
-    reset_render_state()
-    for i, block in enumerate(blocks):
-        try:
-            render_block(doc, block)
-        except Exception:
-            block_type = block.get("type", "???") if isinstance(block, dict) else "???"
-            logger.exception("Error renderizando block #%d (tipo='%s')", i, block_type)
+    ctx = ctx if ctx is not None else RenderContext(doc)
+    with use_render_context(ctx):
+        for i, block in enumerate(blocks):
+            try:
+                render_block(doc, block, ctx)
+            except Exception:
+                block_type = (
+                    block.get("type", "???") if isinstance(block, (dict, SlottedBlock)) else "???"
+                )
+                logger.exception("Error renderizando block #%d (tipo='%s')", i, block_type)
+    return ctx
 
 
 def list_registered() -> List[str]:
@@ -123,3 +182,4 @@ def is_registered(block_type: str) -> bool:
 def _clear_registry() -> None:
     """Limpia el registry. SOLO para tests."""
     _RENDERERS.clear()
+    _ACCEPTS_CTX.clear()
@@ -1,23 +1,24 @@
-"""Mutable render state shared across sequential DOCX renderers."""
+"""Per-render state (chapter/figure/table counters) for the DOCX renderers.
+
+Each ``render_blocks`` call owns a :class:`RenderContext`; it is passed to
+renderers that accept a ``ctx`` argument and published through a
+``ContextVar`` so the module-level helpers below resolve to the context of the
+render running in the current thread. Several documents can therefore be
+rendered concurrently in the same process without sharing counters.
+"""
 
 from __future__ import annotations
 
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from docx.document import Document
 
 _CHAPTER_HEADING_RE = re.compile(r"^\s*([IVXLC]+|\d+)\s*[.)-]\s+")
 _ROMAN_VALUES = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100}
 
-_chapter_number = 0
-_chapter_figure_number = 0
-_chapter_table_number = 0
-
-
-def reset_render_state() -> None:
-    global _chapter_number, _chapter_figure_number, _chapter_table_number
-    _chapter_number = 0
-    _chapter_figure_number = 0
-    _chapter_table_number = 0
-
 
 def _roman_to_int(value: str) -> int:
     total = 0
@@ -43,33 +44,85 @@ def _heading_number(text: str) -> int | None:
     return parsed if parsed > 0 else None
 
 
+class RenderContext:
+    """Mutable state of a single document render."""
+
+    __slots__ = ("doc", "chapter_number", "chapter_figure_number", "chapter_table_number")
+
+    def __init__(self, doc: Optional[Document] = None) -> None:
+        self.doc = doc
+        self.chapter_number = 0
+        self.chapter_figure_number = 0
+        self.chapter_table_number = 0
+
+    def reset(self) -> None:
+        self.chapter_number = 0
+        self.chapter_figure_number = 0
+        self.chapter_table_number = 0
+
+    def register_heading(self, text: str, *, level: int) -> None:
+        if level != 1:
+            return
+        parsed_number = _heading_number(str(text or ""))
+        if parsed_number is None:
+            return
+        self.chapter_number = parsed_number
+        self.chapter_figure_number = 0
+        self.chapter_table_number = 0
+
+    def next_figure_number(self) -> tuple[int | None, int, bool]:
+        self.chapter_figure_number += 1
+        return (
+            self.chapter_number if self.chapter_number > 0 else None,
+            self.chapter_figure_number,
+            self.chapter_figure_number == 1,
+        )
+
+    def next_table_number(self) -> tuple[int | None, int, bool]:
+        self.chapter_table_number += 1
+        return (
+            self.chapter_number if self.chapter_number > 0 else None,
+            self.chapter_table_number,
+            self.chapter_table_number == 1,
+        )
+
+
+_CURRENT: ContextVar[Optional[RenderContext]] = ContextVar(
+    "gicatesis_render_context", default=None
+)
+
+
+def current_render_context() -> RenderContext:
+    """Context of the render running in this thread/task (created lazily)."""
+    ctx = _CURRENT.get()
+    if ctx is None:
+        # render_block() called outside render_blocks(): keep a per-thread context.
+        ctx = RenderContext()
+        _CURRENT.set(ctx)
+    return ctx
+
+
+@contextmanager
+def use_render_context(ctx: RenderContext) -> Iterator[RenderContext]:
+    """Publish ``ctx`` as the current render context for the enclosed block."""
+    token = _CURRENT.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _CURRENT.reset(token)
+
+
+def reset_render_state() -> None:
+    current_render_context().reset()
+
+
 def register_heading(text: str, *, level: int) -> None:
-    global _chapter_number, _chapter_figure_number, _chapter_table_number
-    if level != 1:
-        return
-    parsed_number = _heading_number(str(text or ""))
-    if parsed_number is None:
-        return
-    _chapter_number = parsed_number
-    _chapter_figure_number = 0
-    _chapter_table_number = 0
+    current_render_context().register_heading(text, level=level)
 
 
 def next_figure_number() -> tuple[int | None, int, bool]:
-    global _chapter_figure_number
-    _chapter_figure_number += 1
-    return (
-        _chapter_number if _chapter_number > 0 else None,
-        _chapter_figure_number,
-        _chapter_figure_number == 1,
-    )
+    return current_render_context().next_figure_number()
 
 
 def next_table_number() -> tuple[int | None, int, bool]:
-    global _chapter_table_number
-    _chapter_table_number += 1
-    return (
-        _chapter_number if _chapter_number > 0 else None,
-        _chapter_table_number,
-        _chapter_table_number == 1,
-    )
+    return current_render_context().next_table_number()
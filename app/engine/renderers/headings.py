@@ -4,14 +4,16 @@ from __future__ import annotations
 
 from docx.document import Document
 
-from app.engine.render_state import register_heading
+from app.engine.render_state import RenderContext, current_render_context
 from app.engine.registry import register
 from app.engine.primitives import add_heading_formal, add_black_heading
 from app.engine.types import Block
 
 
 @register("heading")
-def render_heading(doc: Document, block: Block) -> None:
+def render_heading(
+    doc: Document, block: Block, ctx: RenderContext | None = None
+) -> None:
     """Renderiza un encabezado formal (Heading 1/2).
 
     Block keys:
@@ -29,14 +31,16 @@ def render_heading(doc: Document, block: Block) -> None:
         space_after=block.get("space_after", 12),
         centered=block.get("centered", False),
     )
-    register_heading(
+    (ctx or current_render_context()).register_heading(
         str(block.get("text") or ""),
         level=int(block.get("level", 1) or 1),
     )
 
 
 @register("black_heading")
-def render_black_heading(doc: Document, block: Block) -> None:
+def render_black_heading(
+    doc: Document, block: Block, ctx: RenderContext | None = None
+) -> None:
     """Renderiza un subtítulo con fuente Arial negra.
 
     Block keys:
@@ -52,7 +56,7 @@ def render_black_heading(doc: Document, block: Block) -> None:
         size=block.get("size", 13),
         centered=block.get("centered", True),
     )
-    register_heading(
+    (ctx or current_render_context()).register_heading(
         str(block.get("text") or ""),
         level=int(block.get("level", 2) or 2),
     )
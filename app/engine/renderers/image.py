@@ -9,7 +9,7 @@ from docx.document import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Cm, Pt, RGBColor
 
-from app.engine.render_state import next_figure_number
+from app.engine.render_state import RenderContext, current_render_context
 from app.engine.registry import register
 from app.engine.primitives import resolve_asset, add_seq_field
 from app.engine.types import Block
@@ -42,7 +42,9 @@ def _rgb_from_hex(value: str) -> RGBColor | None:
 
 
 @register("image")
-def render_image(doc: Document, block: Block) -> None:
+def render_image(
+    doc: Document, block: Block, ctx: RenderContext | None = None
+) -> None:
     """Renderiza una imagen con caption numerada y fuente opcional.
 
     Replica _render_image() del generador:
@@ -74,7 +76,9 @@ def render_image(doc: Document, block: Block) -> None:
     try:
         # Caption with SEQ field
         if titulo and not omit_caption:
-            chapter_number, figure_number, is_first_in_chapter = next_figure_number()
+            chapter_number, figure_number, is_first_in_chapter = (
+                ctx or current_render_context()
+            ).next_figure_number()
             pc = doc.add_paragraph()
             pc.alignment = WD_ALIGN_PARAGRAPH.CENTER
             pc.paragraph_format.space_after = Pt(4)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from docx.document import Document
 
 from app.engine.registry import register
+from app.engine.render_state import RenderContext
 from app.engine.renderers.table import _render_tabla_impl
 from app.engine.types import Block
 
@@ -101,7 +102,9 @@ def _build_metodologia_block(met: dict) -> str:
 
 
 @register("matriz")
-def render_matriz(doc: Document, block: Block) -> None:
+def render_matriz(
+    doc: Document, block: Block, ctx: RenderContext | None = None
+) -> None:
     """Renderiza la Matriz de Consistencia con 5 columnas y fusiones."""
     matriz_data = block.get("data", {})
     if not matriz_data:
@@ -184,4 +187,4 @@ def render_matriz(doc: Document, block: Block) -> None:
         },
     }
 
-    _render_tabla_impl(doc, tabla_data)
+    _render_tabla_impl(doc, tabla_data, ctx)
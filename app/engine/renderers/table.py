@@ -7,6 +7,10 @@ la función original del universal_generator.py, incluyendo:
 - Encabezados con sombreado
 - Fusión de celdas
 - Notas de pie de tabla
+- Ruta rápida para tablas grandes (cronogramas, matrices de varias páginas):
+  las filas de datos se arman clonando celdas prearmadas en vez de recorrer
+  ``table.rows[i].cells[j]`` (O(filas) por acceso en python-docx). El XML
+  resultante es idéntico al de la ruta celda por celda.
 
 La función _render_tabla_impl es reutilizada por el renderer de matriz.
 """
@@ -14,6 +18,7 @@ La función _render_tabla_impl es reutilizada por el renderer de matriz.
 from __future__ import annotations
 
 import re
+from copy import deepcopy
 
 from docx.document import Document
 from docx.enum.table import WD_TABLE_ALIGNMENT
@@ -21,8 +26,10 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.shared import Cm, Pt
+from docx.table import _Cell
 
-from app.engine.render_state import next_table_number
+from app.engine.doc_tail import last_text_paragraph
+from app.engine.render_state import RenderContext, current_render_context
 from app.engine.registry import register
 from app.engine.primitives import (
     DEFAULT_HEADER_COLOR,
@@ -44,6 +51,9 @@ from app.engine.types import Block
 # IMPLEMENTACIÓN COMPARTIDA
 # ─────────────────────────────────────────────────────────────
 
+# Filas de datos a partir de las cuales se usa la ruta rápida (_append_rows_bulk).
+_BULK_MIN_ROWS = 16
+
 
 def _table_style(tabla_data: dict) -> dict:
     """Return style metadata accepting both GicaTesis and GicaGen key names."""
@@ -277,14 +287,95 @@ def _cell_font_size(tabla_data: dict, row_idx: int, col_idx: int, text: str, sty
 def _tighten_previous_heading_spacing(doc: Document, style: dict) -> None:
     if not style.get("compactar_cronograma"):
         return
-    for paragraph in reversed(doc.paragraphs):
-        if paragraph.text.strip():
-            paragraph.paragraph_format.space_after = Pt(2)
-            paragraph.paragraph_format.line_spacing = 1.0
-            break
+    paragraph = last_text_paragraph(doc)
+    if paragraph is not None:
+        paragraph.paragraph_format.space_after = Pt(2)
+        paragraph.paragraph_format.line_spacing = 1.0
+
+
+class _CellTemplates:
+    """Celdas de datos prearmadas por (columna, tamaño, negrita, alineación).
+
+    Cada plantilla se arma una sola vez con los mismos helpers de la ruta
+    celda por celda (format_cell_text, _compact_cell_after_format,
+    set_cell_vertical_alignment) sobre una copia de la celda vacía de su
+    columna, de modo que tcPr/pPr/rPr salen idénticos. Se arma con el texto
+    "\n" para capturar tanto el primer párrafo (con el run vacío que deja
+    ``cell.text = ""``) como el párrafo de continuación de celdas multilínea.
+    """
+
+    def __init__(self, table, blank_tcs: list, style: dict, compact: bool) -> None:
+        self._table = table
+        self._blank_tcs = blank_tcs
+        self._style = style
+        self._compact = compact
+        self._cache: dict = {}
+
+    def _template(self, col_idx: int, font_size, bold: bool, alignment):
+        key = (col_idx, font_size, bold, alignment)
+        template = self._cache.get(key)
+        if template is None:
+            tc = deepcopy(self._blank_tcs[col_idx])
+            cell = _Cell(tc, self._table)
+            format_cell_text(cell, "\n", font_size, bold=bold, alignment=alignment)
+            if self._compact:
+                _compact_cell_after_format(cell, self._style)
+            set_cell_vertical_alignment(cell)
+            next_p = tc.p_lst[-1]
+            tc.remove(next_p)
+            template = self._cache[key] = (tc, next_p)
+        return template
+
+    def build(self, col_idx: int, text, font_size, bold: bool, alignment):
+        """Retorna un ``<w:tc>`` nuevo equivalente a format_cell_text(text)."""
+        tc_template, next_p_template = self._template(col_idx, font_size, bold, alignment)
+        lines = str(text).split("\n")
+        tc = deepcopy(tc_template)
+        if lines[0]:
+            tc.p_lst[0].r_lst[-1].text = lines[0]
+        for line in lines[1:]:
+            p = deepcopy(next_p_template)
+            if line:
+                p.r_lst[-1].text = line
+            tc.append(p)
+        return tc
+
+
+def _append_rows_bulk(
+    table, blank_tr, tabla_data: dict, filas: list, style: dict, font_size
+) -> None:
+    """Agrega las filas de datos en una pasada sobre el XML (ruta rápida).
+
+    Equivale al bucle celda por celda de _render_tabla_impl: cada ``<w:tr>``
+    es una copia de la fila vacía (con anchos ya aplicados) y cada celda con
+    contenido se reemplaza por una copia de su plantilla con el texto puesto.
+    """
+    tbl = table._tbl
+    blank_tcs = blank_tr.tc_lst
+    num_cols = len(blank_tcs)
+    templates = _CellTemplates(table, blank_tcs, style, _is_schedule_table(tabla_data))
+    for row_idx, fila in enumerate(filas):
+        tr = deepcopy(blank_tr)
+        row_tcs = tr.tc_lst
+        bold = _cell_bold(tabla_data, row_idx)
+        for col_idx, cell_text in enumerate(fila):
+            if col_idx >= num_cols:
+                break
+            text = cell_text or ""
+            tc = templates.build(
+                col_idx,
+                text,
+                _cell_font_size(tabla_data, row_idx, col_idx, text, style, font_size),
+                bold,
+                _cell_alignment(tabla_data, row_idx, col_idx, style),
+            )
+            tr.replace(row_tcs[col_idx], tc)
+        tbl.append(tr)
 
 
-def _render_exact_or_seq_caption(doc: Document, titulo: str, style: dict) -> None:
+def _render_exact_or_seq_caption(
+    doc: Document, titulo: str, style: dict, ctx: RenderContext | None = None
+) -> None:
     if not titulo:
         return
     if style.get("titulo_exacto"):
@@ -299,7 +390,9 @@ def _render_exact_or_seq_caption(doc: Document, titulo: str, style: dict) -> Non
         return
 
     clean_title = re.sub(r"^Tabla\s*[\d.]+\s*[:.]*\s*", "", titulo).strip() or titulo
-    chapter_number, table_number, is_first_in_chapter = next_table_number()
+    chapter_number, table_number, is_first_in_chapter = (
+        ctx or current_render_context()
+    ).next_table_number()
     p = doc.add_paragraph()
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     p.paragraph_format.space_after = Pt(6)
@@ -324,7 +417,9 @@ def _render_exact_or_seq_caption(doc: Document, titulo: str, style: dict) -> Non
     run_title.font.name = "Arial"
 
 
-def _render_tabla_impl(doc: Document, tabla_data: dict) -> None:
+def _render_tabla_impl(
+    doc: Document, tabla_data: dict, ctx: RenderContext | None = None
+) -> None:
     """Renderiza una tabla completa. Replica ``render_tabla()`` del generador.
 
     Esta función es el corazón del rendering de tablas y es reutilizada
@@ -374,12 +469,13 @@ def _render_tabla_impl(doc: Document, tabla_data: dict) -> None:
 
     # 2. Caption / Title
     _tighten_previous_heading_spacing(doc, estilo)
-    _render_exact_or_seq_caption(doc, str(titulo or ""), estilo)
+    _render_exact_or_seq_caption(doc, str(titulo or ""), estilo, ctx)
 
-    # 3. Create table
+    # 3. Create table (ruta rápida: solo el encabezado; los datos van en el paso 6)
     num_cols = len(encabezados)
     num_rows = 1 + len(filas)
-    table = doc.add_table(rows=num_rows, cols=num_cols)
+    bulk = len(filas) >= _BULK_MIN_ROWS
+    table = doc.add_table(rows=1 if bulk else num_rows, cols=num_cols)
 
     if show_borders:
         table.style = "Table Grid"
@@ -408,6 +504,9 @@ def _render_tabla_impl(doc: Document, tabla_data: dict) -> None:
         # celda (tcW) para que ocupe todo el ancho de la pagina horizontal.
         _apply_table_geometry(table, [col_width] * num_cols)
 
+    # Fila vacía con anchos aplicados: molde de las filas de la ruta rápida.
+    blank_tr = deepcopy(table._tbl.tr_lst[0]) if bulk else None
+
     # 5. Headers
     for i, header_text in enumerate(encabezados):
         cell = table.rows[0].cells[i]
@@ -425,21 +524,24 @@ def _render_tabla_impl(doc: Document, tabla_data: dict) -> None:
         set_cell_vertical_alignment(cell)
 
     # 6. Data rows
-    for row_idx, fila in enumerate(filas):
-        for col_idx, cell_text in enumerate(fila):
-            if col_idx >= num_cols:
-                break
-            cell = table.rows[row_idx + 1].cells[col_idx]
-            format_cell_text(
-                cell,
-                cell_text or "",
-                _cell_font_size(tabla_data, row_idx, col_idx, cell_text or "", estilo, font_size),
-                bold=_cell_bold(tabla_data, row_idx),
-                alignment=_cell_alignment(tabla_data, row_idx, col_idx, estilo),
-            )
-            if _is_schedule_table(tabla_data):
-                _compact_cell_after_format(cell, estilo)
-            set_cell_vertical_alignment(cell)
+    if bulk:
+        _append_rows_bulk(table, blank_tr, tabla_data, filas, estilo, font_size)
+    else:
+        for row_idx, fila in enumerate(filas):
+            for col_idx, cell_text in enumerate(fila):
+                if col_idx >= num_cols:
+                    break
+                cell = table.rows[row_idx + 1].cells[col_idx]
+                format_cell_text(
+                    cell,
+                    cell_text or "",
+                    _cell_font_size(tabla_data, row_idx, col_idx, cell_text or "", estilo, font_size),
+                    bold=_cell_bold(tabla_data, row_idx),
+                    alignment=_cell_alignment(tabla_data, row_idx, col_idx, estilo),
+                )
+                if _is_schedule_table(tabla_data):
+                    _compact_cell_after_format(cell, estilo)
+                set_cell_vertical_alignment(cell)
 
     if _is_schedule_table(tabla_data):
         if table.rows:
@@ -495,18 +597,22 @@ def _render_tabla_impl(doc: Document, tabla_data: dict) -> None:
 
 
 @register("table")
-def render_table(doc: Document, block: Block) -> None:
+def render_table(
+    doc: Document, block: Block, ctx: RenderContext | None = None
+) -> None:
     """Renderiza una tabla canónica (tipo: 'tabla') completa.
 
     Block keys (heredados del JSON):
         encabezados, filas, orientacion, titulo, nota_pie,
         estilo, celdas_fusionadas.
     """
-    _render_tabla_impl(doc, block)
+    _render_tabla_impl(doc, block, ctx)
 
 
 @register("legacy_table")
-def render_legacy_table(doc: Document, block: Block) -> None:
+def render_legacy_table(
+    doc: Document, block: Block, ctx: RenderContext | None = None
+) -> None:
     """Renderiza una tabla legacy (headers/rows) convirtiéndola al formato estándar.
 
     Block keys:
@@ -531,4 +637,4 @@ def render_legacy_table(doc: Document, block: Block) -> None:
     if nota:
         tabla_data["nota_pie"] = nota
 
-    _render_tabla_impl(doc, tabla_data)
+    _render_tabla_impl(doc, tabla_data, ctx)
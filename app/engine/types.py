@@ -4,8 +4,9 @@ Proposito:
 - Define los tipos fundamentales del Block Engine.
 
 Responsabilidades:
-- Declarar Block como alias tipado.
-- Declarar el protocolo BlockRenderer que todo renderer debe cumplir.
+- Declarar Block como alias tipado (dict o block con slots de app.engine.blocks).
+- Declarar el protocolo BlockRenderer que todo renderer debe cumplir
+  (con ``ctx`` opcional para acceder al RenderContext del documento).
 No hace:
 - No contiene logica de rendering ni normalización.
 
@@ -14,7 +15,7 @@ Entradas/Salidas:
 - Salidas: Block, BlockRenderer disponibles para importar.
 
 Dependencias:
-- typing, Protocol.
+- typing, Protocol, app.engine.blocks.
 
 Puntos de extension:
 - Agregar campos obligatorios al Block si se necesita validación.
@@ -25,14 +26,21 @@ Donde tocar si falla:
 
 from __future__ import annotations
 
-from typing import Any, Dict, Protocol
+from typing import TYPE_CHECKING, Any, Dict, Protocol, Union
 
 from docx.document import Document
 
+from app.engine.blocks import SlottedBlock
+
+if TYPE_CHECKING:
+    from app.engine.render_state import RenderContext
+
 
 # Un Block es un diccionario con "type" obligatorio y datos arbitrarios.
 # Ejemplo: {"type": "heading", "text": "CAPÍTULO I", "level": 1}
-Block = Dict[str, Any]
+# Los tipos de forma fija llegan como SlottedBlock (HeadingBlock, ...), que se
+# leen igual: block.get("text"), block["level"], "centered" in block.
+Block = Union[Dict[str, Any], SlottedBlock]
 
 
 class BlockRenderer(Protocol):
@@ -43,3 +51,15 @@ class BlockRenderer(Protocol):
     """
 
     def __call__(self, doc: Document, block: Block) -> None: ...
+
+
+class ContextBlockRenderer(Protocol):
+    """Renderer que ademas recibe el RenderContext del documento en curso.
+
+    El registry detecta el parametro ``ctx`` al despachar; no hace falta
+    registrarlo de otra forma.
+    """
+
+    def __call__(
+        self, doc: Document, block: Block, ctx: "RenderContext | None" = None
+    ) -> None: ...
@@ -35,16 +35,21 @@ API_KEY = os.getenv("GICATESIS_API_KEY")
 
 from app.modules.home.router import router as home_router
 from app.modules.catalog.router import router as catalog_router
-from app.modules.formats.router import (
-    router as formats_router,
-    prewarm_pdfs as _prewarm_pdfs,
-)
+from app.modules.formats.router import router as formats_router
+from app.modules.formats.prewarm import start_pdf_prewarm_on_startup
 from app.modules.alerts.router import router as alerts_router
 from app.modules.references.router import router as references_router
 from app.modules.admin.router import router as admin_router
 from app.modules.api.router import router as api_router
 from app.modules.api.generation_router import router as generation_router
 from app.modules.api.render_router import router as render_router
+from app.modules.api.cache_router import router as cache_router
+from app.modules.api.metrics_router import router as metrics_router
+from app.modules.generation.service import register_artifacts_cache
+from app.core.cache_store import start_cache_sweeper, stop_cache_sweeper
+from app.core.engine_fingerprint import get_engine_fingerprint, install_reload_signal
+from app.core.generator_backends import warm_generator_backend
+from app.core.libreoffice_pool import warm_libreoffice_pool
 
 app = FastAPI(title="Formatoteca", version="1.0.0")
 
@@ -63,10 +68,41 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def _init_engine_fingerprint() -> None:
+    # Hashea el codigo del motor una vez; SIGHUP lo recalcula sin reiniciar.
+    get_engine_fingerprint()
+    install_reload_signal()
+
+
+@app.on_event("startup")
+def _warm_generator_backend() -> None:
+    # Levanta los workers precalentados si GICATESIS_GENERATOR_MODE=pool.
+    warm_generator_backend()
+
+
+@app.on_event("startup")
+def _warm_libreoffice_pool() -> None:
+    # Arranca las instancias soffice persistentes (Linux con pyuno).
+    warm_libreoffice_pool()
+
+
 @app.on_event("startup")
 def _prewarm_pdf_cache() -> None:
-    # Precalienta PDFs solo si el flag de entorno esta activo.
-    _prewarm_pdfs()
+    # Precalienta PDFs en segundo plano (no bloquea el arranque) si el flag esta activo.
+    start_pdf_prewarm_on_startup()
+
+
+@app.on_event("startup")
+def _start_cache_sweeper() -> None:
+    # Barre caches y artefactos vencidos (cuota LRU) en un hilo de fondo.
+    register_artifacts_cache()
+    start_cache_sweeper()
+
+
+@app.on_event("shutdown")
+def _stop_cache_sweeper() -> None:
+    stop_cache_sweeper()
 
 
 @app.middleware("http")
@@ -74,9 +110,10 @@ async def verify_api_key(request: Request, call_next):
     """
     Middleware de seguridad opcional.
     Si GICATESIS_API_KEY esta definida en variables de entorno,
-    verifica que el header X-GICATESIS-KEY coincida.
+    verifica que el header X-GICATESIS-KEY coincida en /api/v1/ y en /metrics.
     """
-    if API_KEY and request.url.path.startswith("/api/v1/"):
+    path = request.url.path
+    if API_KEY and (path.startswith("/api/v1/") or path == "/metrics"):
         # Permitir docs y openapi sin clave
         if "docs" in request.url.path or "openapi" in request.url.path:
             return await call_next(request)
@@ -129,3 +166,5 @@ app.include_router(references_router)
 app.include_router(api_router)
 app.include_router(generation_router)
 app.include_router(render_router)
+app.include_router(cache_router)
+app.include_router(metrics_router)
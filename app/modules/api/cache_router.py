@@ -0,0 +1,118 @@
+"""
+Archivo: app/modules/api/cache_router.py
+Proposito:
+- Endpoints de administracion de los caches en disco.
+
+Responsabilidades:
+- GET /api/v1/cache/stats: uso de disco, cuota y hit ratio (total y por
+  namespace: render, docx, pdf, artifacts).
+- POST /api/v1/cache/sweep: fuerza un barrido (adoptar, olvidar, desalojar).
+- GET /api/v1/cache/prewarm: progreso del precalentado de PDFs.
+- POST /api/v1/cache/prewarm: lanza o retoma el precalentado.
+No hace:
+- No escribe ni lee entradas del cache (eso es de cada modulo).
+
+Dependencias:
+- app.core.cache_store, app.modules.formats.prewarm.
+
+Donde tocar si falla:
+- Si los numeros no cuadran con el disco, ejecutar POST /api/v1/cache/sweep.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from app.core.cache_store import get_cache_store
+from app.modules.formats.prewarm import get_pdf_prewarmer
+
+
+router = APIRouter(prefix="/api/v1/cache", tags=["cache"])
+
+
+class CacheNamespaceStats(BaseModel):
+    """Uso y efectividad de un namespace del cache."""
+
+    entries: int
+    sizeBytes: int
+    hits: int
+    misses: int
+    evictions: int
+    hitRatio: float
+
+
+class CacheStatsResponse(CacheNamespaceStats):
+    """Uso total del cache, cuota y desglose por namespace."""
+
+    maxBytes: int
+    maxAgeSeconds: float
+    namespaces: Dict[str, CacheNamespaceStats] = Field(default_factory=dict)
+
+
+class CacheSweepResponse(BaseModel):
+    """Resultado de un barrido manual."""
+
+    evicted: int
+    stats: CacheStatsResponse
+
+
+@router.get("/stats", response_model=CacheStatsResponse)
+def get_cache_stats() -> CacheStatsResponse:
+    """Reporta uso de disco y hit ratio de los caches DOCX/PDF/render/artefactos."""
+    return CacheStatsResponse(**get_cache_store().stats())
+
+
+@router.post("/sweep", response_model=CacheSweepResponse)
+def sweep_cache() -> CacheSweepResponse:
+    """Ejecuta un barrido inmediato del cache."""
+    store = get_cache_store()
+    evicted = store.sweep()
+    return CacheSweepResponse(evicted=evicted, stats=CacheStatsResponse(**store.stats()))
+
+
+class PrewarmStatusResponse(BaseModel):
+    """Progreso del precalentado de PDFs."""
+
+    state: str = Field(..., description="idle | running | finished")
+    enabled: bool = Field(..., description="PDF_PREWARM_ON_STARTUP activo")
+    ready: bool = Field(
+        ..., description="False solo mientras el prewarm corre (idle/finished = listo)"
+    )
+    degraded: bool = Field(..., description="Algun formato fallo (ver errors)")
+    total: int
+    pending: int
+    running: int
+    done: int
+    fresh: int = Field(..., description="Formatos ya cacheados que se saltaron")
+    failed: int
+    workers: int
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    order: List[str] = Field(default_factory=list)
+    errors: Dict[str, str] = Field(default_factory=dict)
+
+
+class PrewarmStartResponse(BaseModel):
+    """Resultado de POST /api/v1/cache/prewarm."""
+
+    started: bool
+    status: PrewarmStatusResponse
+
+
+@router.get("/prewarm", response_model=PrewarmStatusResponse)
+def get_prewarm_status() -> PrewarmStatusResponse:
+    """Conteos done/pending/failed del prewarm (para readiness probes)."""
+    return PrewarmStatusResponse(**get_pdf_prewarmer().status())
+
+
+@router.post("/prewarm", response_model=PrewarmStartResponse)
+def start_prewarm() -> PrewarmStartResponse:
+    """Lanza el prewarm; los formatos ya cacheados se saltan (retoma)."""
+    prewarmer = get_pdf_prewarmer()
+    started = prewarmer.start()
+    return PrewarmStartResponse(
+        started=started, status=PrewarmStatusResponse(**prewarmer.status())
+    )
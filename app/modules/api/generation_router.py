@@ -1,18 +1,25 @@
 """
 Generation Router - API endpoints for document generation.
 
-POST /api/v1/generate - Generate DOCX/PDF from format + values
+POST /api/v1/generate - Enqueue DOCX/PDF generation (202 + runId)
+GET /api/v1/runs/{runId} - Run status and timings
 GET /api/v1/artifacts/{runId}/docx - Download generated DOCX
 GET /api/v1/artifacts/{runId}/pdf - Download generated PDF
 """
 
+import asyncio
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 
 from app.modules.api.ai_content_contract import AIResult, serialize_ai_sections
+from app.modules.generation.jobs import (
+    GenerationQueueFull,
+    GenerationRun,
+    get_generation_queue,
+)
 from app.modules.generation.service import generate_artifacts, get_artifact_path
 
 
@@ -55,12 +62,48 @@ class GenerateResponse(BaseModel):
     status: str
     artifacts: List[ArtifactResponse] = Field(default_factory=list)
     error: Optional[str] = None
+    statusUrl: Optional[str] = None
 
 
-@router.post("/generate", response_model=GenerateResponse)
-async def generate_document(request: GenerateRequest):
+class RunStatusResponse(BaseModel):
+    """Status of a queued generation run."""
+
+    projectId: str
+    runId: str
+    formatId: str
+    status: str = Field(..., description="queued, running, done or error")
+    artifacts: List[ArtifactResponse] = Field(default_factory=list)
+    error: Optional[str] = None
+    submittedAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    timings: Dict[str, Optional[float]] = Field(default_factory=dict)
+
+
+def _run_artifacts(run: GenerationRun) -> List[ArtifactResponse]:
+    if run.result is None:
+        return []
+    return [
+        ArtifactResponse(type=a.type, downloadUrl=a.download_url)
+        for a in run.result.artifacts
+    ]
+
+
+@router.post("/generate", response_model=GenerateResponse, status_code=202)
+async def generate_document(
+    request: GenerateRequest,
+    response: Response,
+    wait: bool = Query(
+        default=False,
+        description="Wait for the run to finish and answer 200 with artifacts",
+    ),
+):
     """
-    Generate DOCX and PDF documents using real GicaTesis generators.
+    Enqueue DOCX and PDF generation using real GicaTesis generators.
+
+    Returns 202 with a runId right away; poll GET /api/v1/runs/{runId}.
+    With ?wait=true the request awaits the run (without blocking the event
+    loop) and answers like the synchronous endpoint did.
 
     The format must be publishable (not a config/reference).
     aiResult sections will be applied to matching document sections.
@@ -72,29 +115,64 @@ async def generate_document(request: GenerateRequest):
     if request.aiResult:
         ai_result_dict = {"sections": serialize_ai_sections(request.aiResult.sections)}
 
-    result = generate_artifacts(
-        project_id=request.projectId,
-        format_id=request.formatId,
-        values=request.values,
-        ai_result=ai_result_dict,
-        mode=request.mode,
+    try:
+        run, future = get_generation_queue().submit(
+            generate_artifacts,
+            project_id=request.projectId,
+            format_id=request.formatId,
+            values=request.values,
+            ai_result=ai_result_dict,
+            mode=request.mode,
+        )
+    except GenerationQueueFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+    status_url = f"/api/v1/runs/{run.run_id}"
+
+    if not wait:
+        return GenerateResponse(
+            projectId=run.project_id,
+            runId=run.run_id,
+            status="queued",
+            statusUrl=status_url,
+        )
+
+    await asyncio.wrap_future(future)
+
+    if run.status == "error":
+        if "not found" in (run.error or "").lower():
+            raise HTTPException(status_code=404, detail=run.error)
+        if "not publishable" in (run.error or "").lower():
+            raise HTTPException(status_code=404, detail=run.error)
+        raise HTTPException(status_code=500, detail=run.error or "Generation failed")
+
+    response.status_code = 200
+    return GenerateResponse(
+        projectId=run.project_id,
+        runId=run.run_id,
+        status=run.result.status,
+        artifacts=_run_artifacts(run),
+        statusUrl=status_url,
     )
 
-    if result.status == "error":
-        if "not found" in (result.error or "").lower():
-            raise HTTPException(status_code=404, detail=result.error)
-        if "not publishable" in (result.error or "").lower():
-            raise HTTPException(status_code=404, detail=result.error)
-        raise HTTPException(status_code=500, detail=result.error or "Generation failed")
 
-    return GenerateResponse(
-        projectId=result.project_id,
-        runId=result.run_id,
-        status=result.status,
-        artifacts=[
-            ArtifactResponse(type=a.type, downloadUrl=a.download_url)
-            for a in result.artifacts
-        ],
+@router.get("/runs/{run_id}", response_model=RunStatusResponse)
+async def get_run_status(run_id: str):
+    """Status (queued/running/done/error) and timings of a generation run."""
+    run = get_generation_queue().get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found or expired")
+
+    return RunStatusResponse(
+        projectId=run.project_id,
+        runId=run.run_id,
+        formatId=run.format_id,
+        status=run.status,
+        artifacts=_run_artifacts(run),
+        error=run.error,
+        submittedAt=run.submitted_at,
+        startedAt=run.started_at,
+        finishedAt=run.finished_at,
+        timings=run.timings(),
     )
 
 
@@ -0,0 +1,44 @@
+"""
+Archivo: app/modules/api/metrics_router.py
+Proposito:
+- Expone GET /metrics en formato de texto de Prometheus (version 0.0.4).
+
+Responsabilidades:
+- Serializar los histogramas y contadores de app.core.metrics: etapas del
+  pipeline por formato, render por tipo de block, generador por backend,
+  conversion PDF y espera en cola, hits/misses del cache DOCX/PDF.
+No hace:
+- No mide nada por si mismo (los puntos instrumentados llaman a metrics).
+- No agrega entre procesos: con varios workers de uvicorn cada uno expone
+  sus propias series (los backends "pool" y "subprocess" si reenvian las de
+  sus procesos generadores).
+- No autentica: con GICATESIS_API_KEY definida, el middleware verify_api_key
+  de app/main.py exige X-GICATESIS-KEY tambien en /metrics.
+
+Dependencias:
+- fastapi, app.core.metrics.
+
+Donde tocar si falla:
+- 404: GICATESIS_METRICS=false en el entorno del servidor.
+- 403: falta el header X-GICATESIS-KEY en el scraper (ver README).
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import get_metrics_registry, render_metrics
+
+
+router = APIRouter(tags=["metrics"])
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics() -> PlainTextResponse:
+    """Metricas del proceso para el scraper de Prometheus."""
+    if not get_metrics_registry().enabled:
+        raise HTTPException(status_code=404, detail="Metricas desactivadas")
+    return PlainTextResponse(render_metrics(), media_type=_CONTENT_TYPE)
@@ -8,6 +8,10 @@ Responsabilidades:
 - POST /api/v1/render/pdf: Genera PDF usando pipeline real + Word COM.
 - Modo simulacion: sanitiza JSON, inyecta contenido AI, genera documento.
 - Modo final: usa JSON original tal cual.
+- Reutiliza renders identicos via app.core.render_cache (clave por contenido).
+- "profile": true (solo con GICATESIS_API_KEY) renderiza in-process bajo
+  app.core.render_profiler y guarda el perfil junto al artefacto; se consulta
+  en GET /api/v1/render/profiles/{id}.
 No hace:
 - No contiene logica de generacion. Delega a formats/service y generation/preprocessor.
 
@@ -17,27 +21,31 @@ Dependencias:
 
 from __future__ import annotations
 
+import hmac
 import inspect
 import json
+import os
 import tempfile
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 
 from app.modules.formats import service as formats_service
-from app.modules.formats.router import _ensure_pdf_cached, _get_source_mtime
+from app.modules.formats.router import _ensure_pdf_cached, _get_source_version
 from app.core.loaders import find_format_index
-from app.core.document_generator import cleanup_temp_file
-from app.modules.api.ai_content_contract import AIResult, serialize_ai_sections
-from app.modules.generation.preprocessor import (
-    exclude_instruction_keys,
-    merge_values,
-    apply_ai_content,
-    cleanup_temp_json,
+from app.core.document_generator import build_document_filename, cleanup_temp_file
+from app.core.render_cache import build_render_cache_key, get_render_cache
+from app.core.render_profiler import (
+    ProfilerBusyError,
+    RenderProfile,
+    get_profile_file,
+    profile_render,
 )
+from app.modules.api.ai_content_contract import AIResult, serialize_ai_sections
+from app.modules.generation.preprocessor import preprocess_format_data
 
 
 router = APIRouter(prefix="/api/v1/render", tags=["render"])
@@ -60,6 +68,10 @@ class RenderRequest(BaseModel):
         default_factory=list,
         description="Selected sections to keep in final render",
     )
+    profile: bool = Field(
+        default=False,
+        description="Render in-process under the profiler (requires GICATESIS_API_KEY)",
+    )
 
 
 def _validate_publishable(format_id: str) -> None:
@@ -69,6 +81,74 @@ def _validate_publishable(format_id: str) -> None:
         raise HTTPException(status_code=404, detail=f"Format not found: {format_id}")
 
 
+def _new_temp_path(suffix: str) -> Path:
+    tmp_file = tempfile.NamedTemporaryFile(prefix="render_", suffix=suffix, delete=False)
+    tmp_file.close()
+    return Path(tmp_file.name)
+
+
+def _simulation_cache_key(
+    format_id: str,
+    values: Dict[str, Any],
+    ai_sections: list[dict[str, Any]],
+    selected_sections: list[dict[str, Any]] | None,
+) -> str:
+    """Clave de cache para un render en modo simulacion."""
+    return build_render_cache_key(
+        format_id,
+        {
+            "mode": "simulation",
+            "values": values or {},
+            "aiSections": ai_sections,
+            "selectedSections": selected_sections or [],
+        },
+    )
+
+
+def _copy_from_render_cache(key: str, kind: str) -> Optional[Path]:
+    """Copia una entrada del cache a un temporal propio del request (o None)."""
+    cache = get_render_cache()
+    if cache is None:
+        return None
+    target = _new_temp_path(f".{kind}")
+    if cache.copy_to(key, kind, target):
+        return target
+    cleanup_temp_file(target)
+    return None
+
+
+def _store_in_render_cache(key: str, kind: str, path: Path) -> None:
+    cache = get_render_cache()
+    if cache is not None:
+        cache.put(key, kind, path)
+
+
+def _load_format_json(item: Any) -> Dict[str, Any]:
+    json_path = item.path
+    if not json_path.exists():
+        raise RuntimeError(f"JSON file not found: {json_path}")
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_simulation_data(
+    item: Any,
+    values: Dict[str, Any],
+    ai_sections: list[dict[str, Any]],
+    selected_sections: list[dict[str, Any]] | None,
+) -> Dict[str, Any]:
+    """Load the original JSON and apply steps 1-3 of the simulation pipeline."""
+    format_data = _load_format_json(item)
+
+    # 1-3) Sanitize instruction/guide keys, merge user values, apply AI content
+    return preprocess_format_data(
+        format_data,
+        values,
+        ai_sections,
+        selected_sections=selected_sections,
+    )
+
+
 def _generate_simulation_docx(
     format_id: str,
     values: Dict[str, Any],
@@ -81,62 +161,35 @@ def _generate_simulation_docx(
     2. Sanitize (remove notes/guides)
     3. Merge user values
     4. Inject AI content into JSON
-    5. Call formats_service.generate_document with override JSON
+    5. Call formats_service.generate_document with the processed data
     """
     item = find_format_index(format_id)
     if not item:
         raise ValueError(f"Invalid format ID: {format_id}")
 
-    # Load original JSON
-    json_path = item.path
-    if not json_path.exists():
-        raise RuntimeError(f"JSON file not found: {json_path}")
-
-    with open(json_path, "r", encoding="utf-8") as f:
-        format_data = json.load(f)
-
-    # 1) Sanitize: remove instruction/guide keys
-    sanitized = exclude_instruction_keys(format_data)
-
-    # 2) Merge user values
-    if values:
-        sanitized = merge_values(sanitized, values)
-
-    # 3) Apply AI content
     ai_sections = []
     if ai_result and ai_result.sections:
         ai_sections = serialize_ai_sections(ai_result.sections)
-    sanitized = apply_ai_content(
-        sanitized,
-        ai_sections,
-        selected_sections=selected_sections,
-    )
+    sim_filename = build_document_filename(item).replace(".docx", "_SIMULACION.docx")
 
-    # 4) Write processed JSON to temp file
-    tmp_json = tempfile.NamedTemporaryFile(
-        prefix="sim_",
-        suffix=".json",
-        delete=False,
-        mode="w",
-        encoding="utf-8",
-    )
-    json.dump(sanitized, tmp_json, ensure_ascii=False, indent=2)
-    tmp_json.close()
-    sanitized_path = Path(tmp_json.name)
+    # 0) Same payload + same engine -> reuse the cached DOCX
+    cache_key = _simulation_cache_key(format_id, values, ai_sections, selected_sections)
+    cached_path = _copy_from_render_cache(cache_key, "docx")
+    if cached_path is not None:
+        return cached_path, sim_filename
 
-    # 5) Generate via the standard pipeline with override JSON
+    sanitized = _load_simulation_data(item, values, ai_sections, selected_sections)
+
+    # 4) Generate via the standard pipeline with the processed data
+    #    (the generator backend decides whether a temp JSON is needed)
     try:
-        output_path, filename = formats_service.generate_document(
-            format_id, override_json_path=sanitized_path
+        output_path, _filename = formats_service.generate_document(
+            format_id, override_data=sanitized
         )
     except Exception as e:
-        cleanup_temp_json(sanitized_path)
         raise RuntimeError(f"Simulation generation failed: {e}")
 
-    cleanup_temp_json(sanitized_path)
-
-    # Adjust filename for simulation
-    sim_filename = filename.replace(".docx", "_SIMULACION.docx")
+    _store_in_render_cache(cache_key, "docx", output_path)
     return output_path, sim_filename
 
 
@@ -158,16 +211,140 @@ def _invoke_simulation_docx(
     return _generate_simulation_docx(format_id, values, ai_result)
 
 
+def _generate_final_docx(format_id: str) -> Tuple[Path, str]:
+    """Generate the unmodified format DOCX, reusing the render cache when possible."""
+    cache_key = build_render_cache_key(format_id, {"mode": "final"})
+    cached_path = _copy_from_render_cache(cache_key, "docx")
+    if cached_path is not None:
+        item = find_format_index(format_id)
+        if item:
+            return cached_path, build_document_filename(item)
+        cleanup_temp_file(cached_path)
+
+    output_path, filename = formats_service.generate_document(format_id)
+    _store_in_render_cache(cache_key, "docx", output_path)
+    return output_path, filename
+
+
+def _authorize_profiling(http_request: Request) -> None:
+    """Profiling is only available when an API key is configured and presented."""
+    api_key = os.getenv("GICATESIS_API_KEY", "")
+    client_key = http_request.headers.get("X-GICATESIS-KEY", "")
+    if not api_key or not hmac.compare_digest(client_key.encode(), api_key.encode()):
+        raise HTTPException(
+            status_code=403,
+            detail="Profiling requires GICATESIS_API_KEY and a matching X-GICATESIS-KEY header",
+        )
+
+
+def _render_profiled(request: RenderRequest, kind: str) -> Tuple[Path, str, RenderProfile]:
+    """
+    Render in-process under the profiler, skipping render cache and backend.
+
+    Runs preprocess (simulation), normalize, render and save and, for PDFs, the
+    conversion too, so the profile covers everything the request waits for.
+    LibreOffice/Word run in their own process: the conversion shows up as a
+    single wait (stages_ms.pdf_convert), not as their internal calls.
+    """
+    item = find_format_index(request.formatId)
+    if not item:
+        raise ValueError(f"Invalid format ID: {request.formatId}")
+
+    from app.universities.shared.universal_generator import generate_document_from_data
+
+    filename = build_document_filename(item)
+    if request.mode == "simulation":
+        filename = filename.replace(".docx", "_SIMULACION.docx")
+    if kind == "pdf":
+        filename = filename.replace(".docx", ".pdf")
+    docx_path = _new_temp_path(".docx")
+
+    def run() -> Path:
+        if request.mode == "simulation":
+            ai_sections = []
+            if request.aiResult and request.aiResult.sections:
+                ai_sections = serialize_ai_sections(request.aiResult.sections)
+            data = _load_simulation_data(
+                item, request.values, ai_sections, request.selectedSections
+            )
+        else:
+            data = _load_format_json(item)
+        generate_document_from_data(data, str(docx_path))
+        if kind == "docx":
+            return docx_path
+
+        from app.core.pdf_converter import convert_docx_to_pdf
+
+        pdf_path = docx_path.with_suffix(".pdf")
+        convert_docx_to_pdf(str(docx_path), str(pdf_path))
+        if not pdf_path.exists():
+            raise RuntimeError("PDF conversion finished but file is missing")
+        return pdf_path
+
+    label = f"{kind}:{request.mode}:{request.formatId}"
+    try:
+        output_path, profile = profile_render(run, label=label)
+    except (ValueError, RuntimeError):
+        cleanup_temp_file(docx_path)
+        raise
+    except Exception as exc:
+        cleanup_temp_file(docx_path)
+        raise RuntimeError(f"Profiled render failed: {type(exc).__name__}: {exc}") from exc
+    if output_path != docx_path:
+        cleanup_temp_file(docx_path)
+    return output_path, filename, profile
+
+
+def _profiled_response(
+    request: RenderRequest, kind: str, background_tasks: BackgroundTasks
+) -> FileResponse:
+    try:
+        output_path, filename, profile = _render_profiled(request, kind)
+    except ProfilerBusyError as exc:
+        raise HTTPException(
+            status_code=409, detail=f"Profiler busy, retry later: {exc}"
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    background_tasks.add_task(cleanup_temp_file, output_path)
+    return FileResponse(
+        path=str(output_path),
+        filename=filename,
+        media_type=(
+            "application/pdf"
+            if kind == "pdf"
+            else "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        ),
+        headers={
+            "X-Rendered-By": "gicatesis-real-generator",
+            "X-Render-Mode": request.mode,
+            "X-Render-Profile": profile.profile_id,
+            "X-Render-Profile-Url": f"{router.prefix}/profiles/{profile.profile_id}",
+        },
+    )
+
+
 @router.post("/docx")
-def render_docx(request: RenderRequest, background_tasks: BackgroundTasks):
+def render_docx(
+    request: RenderRequest,
+    background_tasks: BackgroundTasks,
+    http_request: Request,
+):
     """
     Generate DOCX using the REAL GicaTesis generator pipeline.
 
     Mode:
     - "simulation": Removes notes/guides, injects AI placeholders
     - "final": Uses original JSON as-is (same as GicaTesis UI)
+    - "profile": true -> in-process render under the profiler (see /profiles)
     """
     _validate_publishable(request.formatId)
+    if request.profile:
+        _authorize_profiling(http_request)
+        return _profiled_response(request, "docx", background_tasks)
 
     try:
         if request.mode == "simulation":
@@ -178,8 +355,8 @@ def render_docx(request: RenderRequest, background_tasks: BackgroundTasks):
                 request.selectedSections,
             )
         else:
-            # Final mode: use existing pipeline unchanged
-            output_path, filename = formats_service.generate_document(request.formatId)
+            # Final mode: original JSON as-is (cached by format + engine hash)
+            output_path, filename = _generate_final_docx(request.formatId)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except RuntimeError as exc:
@@ -200,40 +377,72 @@ def render_docx(request: RenderRequest, background_tasks: BackgroundTasks):
 
 
 @router.post("/pdf")
-def render_pdf(request: RenderRequest, background_tasks: BackgroundTasks):
+def render_pdf(
+    request: RenderRequest,
+    background_tasks: BackgroundTasks,
+    http_request: Request,
+):
     """
     Generate PDF using the REAL GicaTesis pipeline.
 
     Mode:
     - "simulation": First generates simulation DOCX, then converts to PDF
     - "final": Uses cached PDF pipeline (same as GicaTesis UI)
+    - "profile": true -> in-process render + conversion under the profiler
     """
     _validate_publishable(request.formatId)
+    if request.profile:
+        _authorize_profiling(http_request)
+        return _profiled_response(request, "pdf", background_tasks)
 
     try:
         if request.mode == "simulation":
-            # Generate simulation DOCX first
-            docx_path, docx_filename = _invoke_simulation_docx(
+            ai_sections = []
+            if request.aiResult and request.aiResult.sections:
+                ai_sections = serialize_ai_sections(request.aiResult.sections)
+            cache_key = _simulation_cache_key(
                 request.formatId,
                 request.values,
-                request.aiResult,
+                ai_sections,
                 request.selectedSections,
             )
 
-            if not docx_path.exists():
-                raise RuntimeError("DOCX generation returned path but file is missing")
+            # Same payload + same engine -> skip render and conversion entirely
+            pdf_path = _copy_from_render_cache(cache_key, "pdf")
+            if pdf_path is not None:
+                item = find_format_index(request.formatId)
+                docx_filename = (
+                    build_document_filename(item).replace(".docx", "_SIMULACION.docx")
+                    if item
+                    else f"{request.formatId}_SIMULACION.docx"
+                )
+            else:
+                # Generate simulation DOCX first
+                docx_path, docx_filename = _invoke_simulation_docx(
+                    request.formatId,
+                    request.values,
+                    request.aiResult,
+                    request.selectedSections,
+                )
+
+                if not docx_path.exists():
+                    raise RuntimeError(
+                        "DOCX generation returned path but file is missing"
+                    )
+
+                # Convert to PDF using same Word COM pipeline
+                from app.core.pdf_converter import convert_docx_to_pdf
+
+                pdf_path = docx_path.with_suffix(".pdf")
+                convert_docx_to_pdf(str(docx_path), str(pdf_path))
+
+                if not pdf_path.exists():
+                    raise RuntimeError("PDF conversion finished but file is missing")
+
+                _store_in_render_cache(cache_key, "pdf", pdf_path)
+                # Cleanup DOCX
+                background_tasks.add_task(cleanup_temp_file, docx_path)
 
-            # Convert to PDF using same Word COM pipeline
-            from app.core.pdf_converter import convert_docx_to_pdf
-
-            pdf_path = docx_path.with_suffix(".pdf")
-            convert_docx_to_pdf(str(docx_path), str(pdf_path))
-
-            if not pdf_path.exists():
-                raise RuntimeError("PDF conversion finished but file is missing")
-
-            # Cleanup DOCX
-            background_tasks.add_task(cleanup_temp_file, docx_path)
             background_tasks.add_task(cleanup_temp_file, pdf_path)
 
             filename = docx_filename.replace(".docx", ".pdf")
@@ -249,9 +458,9 @@ def render_pdf(request: RenderRequest, background_tasks: BackgroundTasks):
             )
         else:
             # Final mode: use cached PDF pipeline
-            source_mtime = _get_source_mtime(request.formatId)
-            pdf_path, docx_path, docx_sha256 = _ensure_pdf_cached(
-                request.formatId, source_mtime
+            source_version = _get_source_version(request.formatId)
+            pdf_path = _ensure_pdf_cached(
+                request.formatId, source_version
             )
 
             item = find_format_index(request.formatId)
@@ -273,3 +482,33 @@ def render_pdf(request: RenderRequest, background_tasks: BackgroundTasks):
             status_code=500,
             detail=f"PDF generation failed: {exc}",
         )
+
+
+_PROFILE_MEDIA_TYPES = {
+    ".json": "application/json",
+    ".pstats": "application/octet-stream",
+    ".txt": "text/plain; charset=utf-8",
+    ".collapsed": "text/plain; charset=utf-8",
+}
+
+
+@router.get("/profiles/{profile_id}")
+@router.get("/profiles/{profile_id}/{name}")
+def get_render_profile(
+    profile_id: str, http_request: Request, name: str = "summary.json"
+):
+    """
+    Files of a profiled render (same API key gate as "profile": true).
+
+    summary.json: stage and per-block-type breakdown; profile.pstats: cProfile
+    dump; profile.txt: pstats report; profile.collapsed: flamegraph.pl input.
+    """
+    _authorize_profiling(http_request)
+    path = get_profile_file(profile_id, name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}/{name}")
+    return FileResponse(
+        path=str(path),
+        filename=f"{profile_id}_{name}",
+        media_type=_PROFILE_MEDIA_TYPES[path.suffix],
+    )
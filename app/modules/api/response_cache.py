@@ -0,0 +1,170 @@
+"""
+Archivo: app/modules/api/response_cache.py
+Propósito:
+- Guardar cuerpos JSON listos para enviar (identity, gzip, brotli) de la API
+  de formatos, indexados por catalogVersion / formatHash.
+
+Responsabilidades:
+- Serializar una sola vez cada versión de respuesta (mismo formato que JSONResponse).
+- Precomprimir variantes gzip y brotli (brotli viene en requirements.txt; sin
+  el paquete se sirve solo gzip/identity).
+- Negociar Accept-Encoding y construir la Response con los bytes cacheados.
+- Acotar memoria con LRU por cantidad de entradas.
+No hace:
+- No calcula hashes ni versiones (eso es de api/service).
+- No decide 304/ETag (eso es del router).
+
+Dependencias:
+- gzip, json, threading, brotli, fastapi.
+
+Puntos de extensión:
+- Agregar variantes (ej. zstd) en encode_json_body y _ENCODING_PREFERENCE.
+
+Donde tocar si falla:
+- Si un cliente recibe bytes ilegibles, revisar negotiate_encoding y Vary.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from fastapi import Response
+
+try:  # brotli esta en requirements.txt; sin el paquete solo se sirve gzip/identity.
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None  # type: ignore[assignment]
+
+
+_MAX_ENTRIES = 256
+# Por debajo de este tamaño comprimir no compensa (cabeceras > ahorro).
+_MIN_COMPRESS_BYTES = 512
+_ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """Cuerpo JSON serializado y sus variantes comprimidas."""
+
+    identity: bytes
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    def variant(self, encoding: str) -> Optional[bytes]:
+        if encoding == "identity":
+            return self.identity
+        return getattr(self, encoding, None)
+
+
+def encode_json_body(content: Any) -> EncodedBody:
+    """Serializa igual que JSONResponse.render() y precomprime."""
+    identity = json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    if len(identity) < _MIN_COMPRESS_BYTES:
+        return EncodedBody(identity=identity)
+    return EncodedBody(
+        identity=identity,
+        gzip=gzip.compress(identity, compresslevel=9, mtime=0),
+        br=brotli.compress(identity, quality=11) if brotli is not None else None,
+    )
+
+
+def _parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for token in (header or "").split(","):
+        name, _, params = token.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    return weights
+
+
+def negotiate_encoding(accept_encoding: Optional[str], body: EncodedBody) -> str:
+    """Elige br > gzip > identity entre las variantes aceptadas y disponibles."""
+    weights = _parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    for encoding in _ENCODING_PREFERENCE[:-1]:
+        if body.variant(encoding) is None:
+            continue
+        if weights.get(encoding, wildcard) > 0:
+            return encoding
+    return "identity"
+
+
+class ResponseBodyCache:
+    """LRU en memoria de EncodedBody por clave (versión + filtros)."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, EncodedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> EncodedBody:
+        """Retorna el cuerpo cacheado o lo construye con build() (contenido JSON)."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = encode_json_body(build())
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_CACHE = ResponseBodyCache()
+
+
+def get_response_cache() -> ResponseBodyCache:
+    """Retorna el cache de cuerpos de la API de formatos (singleton)."""
+    return _CACHE
+
+
+def encoded_json_response(
+    body: EncodedBody,
+    accept_encoding: Optional[str],
+    headers: Mapping[str, str],
+) -> Response:
+    """Construye la Response con la variante negociada, sin re-serializar."""
+    encoding = negotiate_encoding(accept_encoding, body)
+    response_headers = dict(headers)
+    response_headers["Vary"] = "Accept-Encoding"
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    return Response(
+        content=body.variant(encoding),
+        media_type="application/json",
+        headers=response_headers,
+    )
@@ -7,11 +7,13 @@ Propósito:
 Responsabilidades:
 - Recibir requests HTTP, delegar a service, retornar responses.
 - Manejar headers de cache (ETag, Cache-Control, 304).
+- Servir cuerpos pre-serializados/pre-comprimidos (response_cache) por versión.
 No hace:
 - No carga datos directamente (delega a service).
 
 Dependencias:
-- fastapi, app.modules.api.service, app.modules.api.dtos
+- fastapi, app.modules.api.service, app.modules.api.dtos,
+  app.modules.api.response_cache
 
 Puntos de extensión:
 - Agregar endpoints de assets si se necesita.
@@ -23,6 +25,7 @@ from fastapi import APIRouter, Header, Query, Response
 from fastapi.responses import JSONResponse
 
 from app.modules.api import service
+from app.modules.api.response_cache import encoded_json_response, get_response_cache
 from app.modules.api.dtos import (
     CatalogValidationResponse,
     CatalogVersionResponse,
@@ -62,14 +65,16 @@ async def list_formats(
         None, description="Filtrar por tipo de documento"
     ),
     if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
 ) -> Response:
     """
     Lista todos los formatos disponibles.
 
     Soporta filtros opcionales y cache vía ETag.
     Si If-None-Match coincide con la versión actual, retorna 304.
+    El cuerpo se serializa/comprime una vez por versión y filtros.
     """
-    summaries, catalog_version = service.list_formats(
+    formats, catalog_version = service.select_formats(
         university=university,
         category=category,
         document_type=documentType,
@@ -88,12 +93,15 @@ async def list_formats(
             },
         )
 
-    # Serializar respuesta
-    content = [s.model_dump() for s in summaries]
-
-    return JSONResponse(
-        content=content,
-        headers={
+    body = get_response_cache().get_or_build(
+        ("formats", catalog_version, university, category, documentType),
+        # Los DTOs solo se construyen en un miss del cache de cuerpos.
+        lambda: [service.map_to_dto_summary(f).model_dump() for f in formats],
+    )
+    return encoded_json_response(
+        body,
+        accept_encoding,
+        {
             "ETag": etag,
             "Cache-Control": CACHE_CONTROL,
         },
@@ -152,16 +160,18 @@ async def validate_catalog() -> CatalogValidationResponse:
 async def get_format_detail(
     format_id: str,
     if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
 ) -> Response:
     """
     Obtiene el detalle completo de un formato.
 
     Incluye campos del wizard, assets y reglas.
-    Soporta cache vía ETag.
+    Soporta cache vía ETag; el DTO solo se construye si el cuerpo de ese
+    formatHash no está en el cache de respuestas.
     """
-    detail, format_hash = service.get_format_detail_by_id(format_id)
+    format_hash = service.get_format_hash_by_id(format_id)
 
-    if detail is None:
+    if format_hash is None:
         return JSONResponse(
             content={"detail": f"Formato no encontrado: {format_id}"},
             status_code=404,
@@ -180,9 +190,17 @@ async def get_format_detail(
             },
         )
 
-    return JSONResponse(
-        content=detail.model_dump(),
-        headers={
+    def _build_detail():
+        detail, _hash = service.get_format_detail_by_id(format_id)
+        return detail.model_dump()
+
+    body = get_response_cache().get_or_build(
+        ("format", format_id, format_hash), _build_detail
+    )
+    return encoded_json_response(
+        body,
+        accept_encoding,
+        {
             "ETag": etag,
             "Cache-Control": CACHE_CONTROL,
         },
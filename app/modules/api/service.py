@@ -8,18 +8,20 @@ Responsabilidades:
 - Leer formatos via loaders existentes.
 - Normalizar a estructura interna.
 - Calcular formatHash por contenido (no por mtime).
+- Memoizar formato normalizado + hash por identidad del archivo fuente
+  (ruta, mtime, size): solo se re-normaliza y re-hashea lo que cambio.
 - Calcular catalogVersion global.
 - Mapear a DTOs públicos.
 No hace:
 - No maneja HTTP ni headers (eso es del router).
 
 Dependencias:
-- app.core.loaders (discover_format_files, load_format_by_id)
+- app.core.loaders (discover_format_files, find_format_index, load_format_by_id)
 - app.core.registry (get_provider)
 - hashlib, json
 
 Puntos de extensión:
-- Agregar caché en memoria si el rendimiento lo requiere.
+- clear_format_cache() descarta la memoizacion (tests / recargas masivas).
 """
 
 from __future__ import annotations
@@ -27,12 +29,18 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from app.core.loaders import discover_format_files, load_format_by_id, FormatIndexItem
+from app.core.loaders import (
+    discover_format_files,
+    find_format_index,
+    load_format_by_id,
+    FormatIndexItem,
+)
 from app.modules.api.dtos import (
     AssetRef,
     CatalogValidationResponse,
@@ -68,6 +76,8 @@ class InternalFormat:
     template_kind: Optional[str] = None
     template_path: Optional[Path] = None
     rules: Optional[Dict[str, Any]] = None
+    # Hash memoizado por get_internal_format(); None = calcular bajo demanda.
+    content_hash: Optional[str] = field(default=None, compare=False, repr=False)
 
 
 # -----------------------------------------------------------------------------
@@ -119,6 +129,11 @@ def compute_format_hash(fmt: InternalFormat) -> str:
     return hasher.hexdigest()
 
 
+def format_hash(fmt: InternalFormat) -> str:
+    """Hash del formato, reutilizando el memoizado si existe."""
+    return fmt.content_hash or compute_format_hash(fmt)
+
+
 def make_stable_format_id(uni: str, category: str, title: str, raw_id: str) -> str:
     """
     Genera un ID estable basado en contenido lógico, no en paths.
@@ -313,6 +328,52 @@ def load_internal_format(item: FormatIndexItem) -> InternalFormat:
     )
 
 
+# -----------------------------------------------------------------------------
+# MEMOIZACION POR IDENTIDAD DEL ARCHIVO FUENTE
+# -----------------------------------------------------------------------------
+
+_SourceSignature = Tuple[str, str, int, int]
+_FORMAT_CACHE: Dict[str, Tuple[_SourceSignature, InternalFormat]] = {}
+_FORMAT_CACHE_LOCK = threading.Lock()
+
+
+def _source_signature(item: FormatIndexItem) -> Optional[_SourceSignature]:
+    """(format_id, ruta, mtime_ns, size) del JSON fuente; None si no existe."""
+    try:
+        stat = item.path.stat()
+    except OSError:
+        return None
+    return (item.format_id, str(item.path), stat.st_mtime_ns, stat.st_size)
+
+
+def get_internal_format(item: FormatIndexItem) -> InternalFormat:
+    """
+    Retorna el formato normalizado con su hash ya calculado.
+    Si el archivo fuente no cambio desde la ultima carga, no relee ni rehashea.
+    """
+    signature = _source_signature(item)
+    if signature is not None:
+        with _FORMAT_CACHE_LOCK:
+            cached = _FORMAT_CACHE.get(item.format_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    fmt = load_internal_format(item)
+    fmt.content_hash = compute_format_hash(fmt)
+
+    # Con plantilla externa el hash depende de otro archivo: no se memoiza.
+    if signature is not None and fmt.template_path is None:
+        with _FORMAT_CACHE_LOCK:
+            _FORMAT_CACHE[item.format_id] = (signature, fmt)
+    return fmt
+
+
+def clear_format_cache() -> None:
+    """Descarta formatos y hashes memoizados."""
+    with _FORMAT_CACHE_LOCK:
+        _FORMAT_CACHE.clear()
+
+
 def _meta_entity(raw_data: Dict[str, Any]) -> str:
     """Retorna entidad normalizada desde _meta.entity."""
     meta = raw_data.get("_meta") or {}
@@ -380,7 +441,7 @@ def load_all_formats(
     formats = []
     for item in items:
         try:
-            fmt = load_internal_format(item)
+            fmt = get_internal_format(item)
 
             # Catálogo público: solo publicables. Diagnóstico: incluir todos.
             if include_unpublished or is_publishable_format(fmt):
@@ -400,6 +461,8 @@ def get_catalog_version(formats: Optional[List[InternalFormat]] = None) -> str:
     """
     Calcula la versión global del catálogo.
     Es un hash de todos los hashes individuales ordenados por ID.
+    Los hashes individuales vienen memoizados, así que solo se re-hashean
+    los formatos cuyo archivo cambió; el pliegue final es O(n) sobre ids.
     """
     if formats is None:
         formats = load_all_formats()
@@ -407,8 +470,7 @@ def get_catalog_version(formats: Optional[List[InternalFormat]] = None) -> str:
     # Construir lista de pares id:hash ordenada
     pairs = []
     for fmt in formats:
-        fmt_hash = compute_format_hash(fmt)
-        pairs.append(f"{fmt.id}:{fmt_hash}")
+        pairs.append(f"{fmt.id}:{format_hash(fmt)}")
 
     pairs.sort()
 
@@ -424,7 +486,7 @@ def get_catalog_version(formats: Optional[List[InternalFormat]] = None) -> str:
 
 def map_to_dto_summary(fmt: InternalFormat) -> FormatSummary:
     """Mapea formato interno a DTO de resumen."""
-    fmt_hash = compute_format_hash(fmt)
+    fmt_hash = format_hash(fmt)
     return FormatSummary(
         id=fmt.id,
         title=fmt.title,
@@ -437,7 +499,7 @@ def map_to_dto_summary(fmt: InternalFormat) -> FormatSummary:
 
 def map_to_dto_detail(fmt: InternalFormat) -> FormatDetail:
     """Mapea formato interno a DTO de detalle."""
-    fmt_hash = compute_format_hash(fmt)
+    fmt_hash = format_hash(fmt)
 
     # Mapear campos con validación de tipo
     fields = []
@@ -531,6 +593,23 @@ def list_formats(
     Lista formatos con filtros opcionales.
     Retorna: (lista de summaries, catalogVersion)
     """
+    formats, catalog_version = select_formats(university, category, document_type)
+
+    # Mapear a DTOs
+    summaries = [map_to_dto_summary(f) for f in formats]
+
+    return summaries, catalog_version
+
+
+def select_formats(
+    university: Optional[str] = None,
+    category: Optional[str] = None,
+    document_type: Optional[str] = None,
+) -> Tuple[List[InternalFormat], str]:
+    """
+    Formatos filtrados y su catalogVersion, sin mapear a DTOs.
+    Permite resolver ETag/304 y el cache de respuestas sin construir los summaries.
+    """
     formats = load_all_formats(university)
 
     # Filtros adicionales
@@ -550,10 +629,7 @@ def list_formats(
         else hashlib.sha256(b"empty").hexdigest()
     )
 
-    # Mapear a DTOs
-    summaries = [map_to_dto_summary(f) for f in formats]
-
-    return summaries, catalog_version
+    return formats, catalog_version
 
 
 def get_format_detail_by_id(
@@ -563,16 +639,43 @@ def get_format_detail_by_id(
     Obtiene el detalle de un formato por ID.
     Retorna: (FormatDetail, formatHash) o (None, None) si no existe.
     """
-    # Buscar en el catálogo
-    formats = load_all_formats()
+    fmt = _find_publishable_format(format_id)
+    if fmt is None:
+        return None, None
 
-    for fmt in formats:
-        if fmt.id == format_id:
-            detail = map_to_dto_detail(fmt)
-            fmt_hash = compute_format_hash(fmt)
-            return detail, fmt_hash
+    fmt_hash = format_hash(fmt)
+    return map_to_dto_detail(fmt), fmt_hash
 
-    return None, None
+
+def get_format_hash_by_id(format_id: str) -> Optional[str]:
+    """
+    Retorna solo el formatHash de un formato publicable (None si no existe).
+    Permite resolver ETag/304 y el cache de respuestas sin construir el DTO.
+    """
+    fmt = _find_publishable_format(format_id)
+    return format_hash(fmt) if fmt is not None else None
+
+
+def _find_publishable_format(format_id: str) -> Optional[InternalFormat]:
+    """
+    Resuelve un formato publicable por ID.
+    Camino rapido: indice de loaders -> carga y hash de un solo formato.
+    Solo si el ID no coincide (ej. _meta.id distinto del format_id del
+    loader) se recorre el catálogo memoizado.
+    """
+    item = find_format_index(format_id)
+    if item is not None:
+        try:
+            fmt = get_internal_format(item)
+        except Exception:
+            fmt = None
+        if fmt is not None and fmt.id == format_id:
+            return fmt if is_publishable_format(fmt) else None
+
+    for fmt in load_all_formats():
+        if fmt.id == format_id:
+            return fmt
+    return None
 
 
 def get_catalog_version_info() -> CatalogVersionResponse:
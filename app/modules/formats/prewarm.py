@@ -0,0 +1,214 @@
+"""
+Archivo: app/modules/formats/prewarm.py
+Proposito:
+- Precalentar el cache de PDFs de vista previa en segundo plano.
+
+Responsabilidades:
+- Elegir candidatos (UNAC primero, o todos si no hay UNAC) y ordenarlos por
+  demanda: hits registrados en el indice de caches (app.core.cache_store).
+- Convertir con paralelismo acotado (GICATESIS_PREWARM_CONCURRENCY) sin
+  bloquear el arranque del servidor.
+- Saltar formatos cuyo DOCX/PDF de la version actual ya esta en disco, de modo
+  que relanzar el prewarm (o reiniciar el servidor) retoma donde quedo.
+- Exponer progreso (pending/running/done/fresh/failed) para el endpoint
+  GET /api/v1/cache/prewarm. "ready" solo es False mientras corre: con el
+  prewarm desactivado (idle) el servidor esta listo y genera bajo demanda, y
+  los fallos se reportan aparte ("degraded") para no trabar un readiness probe.
+No hace:
+- No genera ni convierte directamente: usa _ensure_pdf_cached del router.
+
+Dependencias:
+- concurrent.futures, threading, app.core.cache_store, app.core.loaders,
+  app.core.settings, app.modules.formats.router.
+
+Donde tocar si falla:
+- Ver "errors" en GET /api/v1/cache/prewarm y relanzar con POST.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from app.core.cache_store import get_cache_store
+from app.core.loaders import discover_format_files
+from app.core.settings import get_prewarm_concurrency, is_pdf_prewarm_enabled
+from app.modules.formats.router import (
+    _VERSION_TAG_LEN,
+    _ensure_pdf_cached,
+    _get_source_version,
+    _is_pdf_cached,
+)
+
+logger = logging.getLogger(__name__)
+
+# Largo del sufijo "-{source_version[:16]}" en los PDFs cacheados.
+_PDF_HASH_SUFFIX = _VERSION_TAG_LEN + 1
+
+
+def prewarm_candidates() -> List[str]:
+    """Formatos a precalentar: UNAC; si no hay, todos los disponibles."""
+    items = discover_format_files(None)
+    candidates = [item.format_id for item in items if item.uni == "unac"]
+    if not candidates:
+        candidates = [item.format_id for item in items]
+    return candidates
+
+
+def _pdf_hits_by_format() -> Dict[str, int]:
+    """Suma hits del namespace "pdf" por nombre seguro de formato."""
+    hits: Dict[str, int] = {}
+    for name, count in get_cache_store().entry_hits("pdf").items():
+        stem = name[: -len(".pdf")] if name.endswith(".pdf") else name
+        if len(stem) <= _PDF_HASH_SUFFIX:
+            continue
+        safe_name = stem[:-_PDF_HASH_SUFFIX]
+        hits[safe_name] = hits.get(safe_name, 0) + count
+    return hits
+
+
+def prioritize(format_ids: Iterable[str], hits: Mapping[str, int]) -> List[str]:
+    """Ordena por hits descendentes; a igualdad conserva el orden original."""
+    ordered = list(dict.fromkeys(format_ids))
+    return sorted(
+        ordered, key=lambda format_id: -hits.get(format_id.replace("/", "_"), 0)
+    )
+
+
+class PdfPrewarmer:
+    """Ejecuta un prewarm por vez en un hilo de fondo y reporta su progreso."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._status: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, format_ids: Optional[Iterable[str]] = None) -> bool:
+        """Lanza (o relanza) el prewarm. False si ya hay uno en curso."""
+        with self._lock:
+            if self.running:
+                return False
+            ids = format_ids if format_ids is not None else prewarm_candidates()
+            ordered = prioritize(ids, _pdf_hits_by_format())
+            self._status = {format_id: "pending" for format_id in ordered}
+            self._errors = {}
+            self._started_at = time.time()
+            self._finished_at = None
+            self._thread = threading.Thread(
+                target=self._run, args=(ordered,), name="pdf-prewarm", daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def _run(self, ordered: List[str]) -> None:
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="pdf-prewarm"
+        ) as executor:
+            # map respeta el orden de envio: los mas pedidos arrancan primero.
+            list(executor.map(self._warm_one, ordered))
+        with self._lock:
+            self._finished_at = time.time()
+        summary = self.status()
+        logger.info(
+            "PDF prewarm terminado: %d generados, %d frescos, %d fallidos",
+            summary["done"],
+            summary["fresh"],
+            summary["failed"],
+        )
+
+    def _set(self, format_id: str, state: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._status[format_id] = state
+            if error is not None:
+                self._errors[format_id] = error
+
+    def _warm_one(self, format_id: str) -> None:
+        self._set(format_id, "running")
+        try:
+            source_version = _get_source_version(format_id)
+            if _is_pdf_cached(format_id, source_version):
+                self._set(format_id, "fresh")
+                return
+            _ensure_pdf_cached(format_id, source_version)
+        except Exception as exc:
+            logger.warning("prewarm failed %s: %s", format_id, exc)
+            self._set(format_id, "failed", str(exc))
+            return
+        self._set(format_id, "done")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine el prewarm en curso. Util en tests."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.running
+
+    def status(self) -> Dict[str, Any]:
+        """Conteos por estado, orden de la corrida y errores por formato."""
+        with self._lock:
+            statuses = dict(self._status)
+            errors = dict(self._errors)
+            started_at, finished_at = self._started_at, self._finished_at
+        counts = {state: 0 for state in ("pending", "running", "done", "fresh", "failed")}
+        for state in statuses.values():
+            counts[state] += 1
+        if started_at is None:
+            state = "idle"
+        elif finished_at is None:
+            state = "running"
+        else:
+            state = "finished"
+        return {
+            "state": state,
+            "enabled": is_pdf_prewarm_enabled(),
+            "ready": state != "running",
+            "degraded": counts["failed"] > 0,
+            "total": len(statuses),
+            **counts,
+            "workers": self.workers,
+            "startedAt": started_at,
+            "finishedAt": finished_at,
+            "order": list(statuses),
+            "errors": errors,
+        }
+
+
+_PREWARMER: Optional[PdfPrewarmer] = None
+_PREWARMER_LOCK = threading.Lock()
+
+
+def get_pdf_prewarmer() -> PdfPrewarmer:
+    """Retorna el prewarmer del proceso (singleton)."""
+    global _PREWARMER
+    if _PREWARMER is None:
+        with _PREWARMER_LOCK:
+            if _PREWARMER is None:
+                _PREWARMER = PdfPrewarmer(workers=get_prewarm_concurrency())
+    return _PREWARMER
+
+
+def start_pdf_prewarm_on_startup() -> bool:
+    """Lanza el prewarm en segundo plano si PDF_PREWARM_ON_STARTUP esta activo."""
+    if not is_pdf_prewarm_enabled():
+        return False
+    return get_pdf_prewarmer().start()
+
+
+def reset_pdf_prewarmer() -> None:
+    """Descarta el singleton (espera al prewarm en curso). Util en tests."""
+    global _PREWARMER
+    with _PREWARMER_LOCK:
+        prewarmer, _PREWARMER = _PREWARMER, None
+    if prewarmer is not None:
+        prewarmer.wait()
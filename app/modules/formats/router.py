@@ -7,6 +7,10 @@ Responsabilidades:
 - Renderizar vistas de detalle y versiones.
 - Generar DOCX y convertir a PDF cuando se solicita.
 - Servir JSON completo para vista previa.
+- Deduplicar llenados concurrentes del cache DOCX/PDF (single-flight).
+- Invalidar el cache por version de fuentes (huella del motor + hash del JSON).
+- Registrar hits/misses/escrituras en el indice unico (app.core.cache_store)
+  y en gicatesis_cache_requests_total (app.core.metrics, GET /metrics).
 No hace:
 - No implementa discovery ni logica de negocio de formatos.
 
@@ -31,15 +35,20 @@ import shutil
 import time
 from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
+from typing import Callable
 
 import logging
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 
-from app.core.loaders import find_format_index, load_format_by_id
+from app.core import metrics
+from app.core.cache_store import get_cache_store
+from app.core.engine_fingerprint import get_engine_fingerprint
+from app.core.loaders import FormatIndexItem, find_format_index, load_format_by_id
 from app.core.paths import get_docx_cache_dir, get_pdf_cache_dir
 from app.core.pdf_converter import convert_docx_to_pdf
 from app.core.registry import get_provider
+from app.core.single_flight import single_flight
 from app.core.document_generator import cleanup_temp_file
 from app.core.templates import templates
 from app.modules.formats import service
@@ -47,16 +56,15 @@ from app.modules.formats import service
 router = APIRouter(prefix="/formatos", tags=["formatos"])
 
 _PDF_CACHE_MAX_AGE = int(os.getenv("PDF_CACHE_MAX_AGE", "3600"))
-_PDF_PREWARM_ON_STARTUP = os.getenv("PDF_PREWARM_ON_STARTUP", "false").lower() in (
-    "1",
-    "true",
-    "yes",
-    "on",
-)
 _PDF_CONVERSION_TIMEOUT = float(os.getenv("PDF_CONVERSION_TIMEOUT", "120"))
 
 logger = logging.getLogger(__name__)
 
+# Largo de la version de fuentes en el nombre de los DOCX/PDF cacheados.
+_VERSION_TAG_LEN = 16
+# Regeneraciones si otro request desaloja la entrada recien escrita (cuota).
+_CACHE_FILL_ATTEMPTS = 2
+
 
 def _ensure_cache_dirs() -> tuple[Path, Path]:
     """Crea (si falta) los directorios de cache DOCX/PDF."""
@@ -67,20 +75,18 @@ def _ensure_cache_dirs() -> tuple[Path, Path]:
     return docx_dir, pdf_dir
 
 
-def _get_cached_docx_path(format_id: str) -> Path:
-    """Ruta de cache DOCX para un format_id."""
+def _get_cached_docx_path(format_id: str, source_version: str) -> Path:
+    """Ruta de cache DOCX para un format_id en una version de fuentes."""
     docx_dir, _ = _ensure_cache_dirs()
     safe_name = format_id.replace("/", "_")
-    return docx_dir / f"{safe_name}.docx"
+    return docx_dir / f"{safe_name}-{source_version[:_VERSION_TAG_LEN]}.docx"
 
 
-def _get_cached_pdf_path(format_id: str, content_hash: str | None = None) -> Path:
-    """Ruta de cache PDF para un format_id (opcionalmente con hash de contenido)."""
+def _get_cached_pdf_path(format_id: str, source_version: str) -> Path:
+    """Ruta de cache PDF para un format_id en una version de fuentes."""
     _, pdf_dir = _ensure_cache_dirs()
     safe_name = format_id.replace("/", "_")
-    if content_hash:
-        return pdf_dir / f"{safe_name}-{content_hash[:12]}.pdf"
-    return pdf_dir / f"{safe_name}.pdf"
+    return pdf_dir / f"{safe_name}-{source_version[:_VERSION_TAG_LEN]}.pdf"
 
 
 def _get_manifest_path(format_id: str) -> Path:
@@ -90,13 +96,25 @@ def _get_manifest_path(format_id: str) -> Path:
     return pdf_dir / f"{safe_name}.manifest.json"
 
 
-def _is_cache_fresh(path: Path, source_mtime: float) -> bool:
-    """Verifica si el cache es mas nuevo que la fuente y no esta vacio."""
-    if not path.exists():
-        return False
-    if path.stat().st_size <= 0:
+def _is_cache_fresh(path: Path) -> bool:
+    """Verifica que el cache exista y no este vacio (la version va en el nombre)."""
+    try:
+        return path.stat().st_size > 0
+    except OSError:
         return False
-    return path.stat().st_mtime >= source_mtime
+
+
+def _prune_stale_versions(format_id: str, keep: Path) -> None:
+    """Elimina DOCX/PDF cacheados de versiones anteriores del mismo formato."""
+    safe_name = format_id.replace("/", "_")
+    for path in keep.parent.glob(f"{safe_name}-*{keep.suffix}"):
+        suffix = path.stem[len(safe_name) + 1 :]
+        if path == keep or len(suffix) != _VERSION_TAG_LEN:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
 
 
 def _calculate_sha256(path: Path) -> str:
@@ -171,22 +189,27 @@ def _build_cache_headers(
 
 def _write_manifest(
     format_id: str,
-    json_path: Path,
-    json_mtime: float,
-    generator_path: Path | None,
-    generator_mtime: float,
+    item: FormatIndexItem,
+    source_version: str,
     docx_path: Path,
     pdf_path: Path,
     docx_sha256: str | None = None,
 ) -> None:
     """Escribe un manifest JSON para depuracion de cache."""
     manifest_path = _get_manifest_path(format_id)
+    generator_path = None
+    try:
+        generator = get_provider(item.uni).get_generator_command(item.categoria)
+        generator_path = _resolve_generator_path(generator)
+    except Exception:
+        generator_path = None
     payload = {
         "format_id": format_id,
-        "json_path": str(json_path),
-        "json_mtime": json_mtime,
+        "json_path": str(item.path),
+        "json_sha256": item.content_hash or None,
         "generator_script_path": str(generator_path) if generator_path else None,
-        "generator_mtime": generator_mtime,
+        "engine_fingerprint": get_engine_fingerprint(),
+        "source_version": source_version,
         "created_at": _http_date(time.time()),
         "docx_path": str(docx_path),
         "pdf_path": str(pdf_path),
@@ -204,66 +227,105 @@ def _convert_docx_to_pdf(docx_path: str, pdf_path: str) -> None:
     convert_docx_to_pdf(docx_path, pdf_path, timeout=_PDF_CONVERSION_TIMEOUT)
 
 
-def _ensure_docx_cached(format_id: str, source_mtime: float) -> Path:
-    """Genera o reutiliza el DOCX cacheado."""
-    docx_path = _get_cached_docx_path(format_id)
-    if _is_cache_fresh(docx_path, source_mtime):
-        logger.info("DOCX cache hit: %s", docx_path)
-        return docx_path
+def _ensure_docx_cached(format_id: str, source_version: str) -> Path:
+    """Genera o reutiliza el DOCX cacheado para la version de fuentes dada."""
+    return _ensure_cached_exists(_fill_docx_cache, format_id, source_version)
 
-    generated_path, _filename = service.generate_document(format_id)
-    _replace_cached_file(Path(generated_path), docx_path)
-    logger.info("DOCX generado: %s", docx_path)
-    return docx_path
 
+def _ensure_pdf_cached(format_id: str, source_version: str) -> Path:
+    """Genera o reutiliza el PDF cacheado para la version de fuentes dada.
 
-def _ensure_pdf_cached(format_id: str, source_mtime: float) -> tuple[Path, Path, str]:
-    """Genera o reutiliza el PDF cacheado (por hash del DOCX)."""
-    docx_path = _ensure_docx_cached(format_id, source_mtime)
-    docx_sha256 = _calculate_sha256(docx_path)
-    pdf_path = _get_cached_pdf_path(format_id, docx_sha256)
+    El DOCX es deterministico por version de fuentes, asi que un hit no lee ni
+    hashea el DOCX; solo se hashea (para el manifest) al regenerar el PDF.
+    """
+    return _ensure_cached_exists(_fill_pdf_cache, format_id, source_version)
 
-    if pdf_path.exists() and pdf_path.stat().st_size > 0:
-        logger.info("PDF cache hit (hash): %s", pdf_path)
-        return pdf_path, docx_path, docx_sha256
 
-    if pdf_path.exists():
-        try:
-            pdf_path.unlink()
-        except Exception:
-            pass
-    start = time.time()
-    _convert_docx_to_pdf(str(docx_path), str(pdf_path))
-    logger.info("PDF generado: %s (%.2fs)", pdf_path, time.time() - start)
-    return pdf_path, docx_path, docx_sha256
+def _ensure_cached_exists(
+    fill: Callable[[str, str], Path], format_id: str, source_version: str
+) -> Path:
+    """Devuelve la ruta de ``fill`` solo si sigue en disco.
 
+    enforce_quota nunca borra la entrada del propio request, pero la de otro
+    request concurrente si puede desalojarla antes de usarla: se regenera.
+    """
+    for _attempt in range(_CACHE_FILL_ATTEMPTS):
+        path = fill(format_id, source_version)
+        if path.exists():
+            return path
+        logger.warning("Entrada de cache desalojada antes de usarla: %s", path)
+    raise RuntimeError(f"Cache entry evicted before use: {path.name}")
 
-def prewarm_pdfs() -> None:
-    """Precalienta el cache de PDF si esta habilitado por entorno."""
-    if not _PDF_PREWARM_ON_STARTUP:
-        return
 
-    try:
-        from app.core.loaders import discover_format_files
-    except Exception as exc:
-        print(f"[WARN] prewarm import failed: {exc}")
-        return
+def _fill_docx_cache(format_id: str, source_version: str) -> Path:
+    store = get_cache_store()
+    docx_path = _get_cached_docx_path(format_id, source_version)
+    if _is_cache_fresh(docx_path):
+        logger.info("DOCX cache hit: %s", docx_path)
+        store.record_hit("docx", docx_path)
+        metrics.inc("gicatesis_cache_requests_total", cache="docx", result="hit")
+        return docx_path
 
-    items = discover_format_files(None)
-    if not items:
-        return
+    store.record_miss("docx")
+    metrics.inc("gicatesis_cache_requests_total", cache="docx", result="miss")
+    # Un solo render por formato; los que esperaban reutilizan el resultado.
+    with single_flight(f"docx:{format_id}"):
+        if _is_cache_fresh(docx_path):
+            logger.info("DOCX cache hit (single-flight): %s", docx_path)
+            return docx_path
+        generated_path, _filename = service.generate_document(format_id)
+        _replace_cached_file(Path(generated_path), docx_path)
+        _prune_stale_versions(format_id, docx_path)
+        store.record_put("docx", docx_path)
+    logger.info("DOCX generado: %s", docx_path)
+    store.enforce_quota(exclude=(docx_path,))
+    return docx_path
 
-    # Prioriza UNAC; si no hay, precalienta todo lo disponible.
-    candidates = [item.format_id for item in items if item.uni == "unac"]
-    if not candidates:
-        candidates = [item.format_id for item in items]
 
-    for format_id in candidates:
-        try:
-            source_mtime = _get_source_mtime(format_id)
-            _ensure_pdf_cached(format_id, source_mtime)
-        except Exception as exc:
-            logger.warning("prewarm failed %s: %s", format_id, exc)
+def _fill_pdf_cache(format_id: str, source_version: str) -> Path:
+    pdf_path = _get_cached_pdf_path(format_id, source_version)
+
+    store = get_cache_store()
+    if _is_cache_fresh(pdf_path):
+        logger.info("PDF cache hit: %s", pdf_path)
+        store.record_hit("pdf", pdf_path)
+        metrics.inc("gicatesis_cache_requests_total", cache="pdf", result="hit")
+        return pdf_path
+
+    store.record_miss("pdf")
+    metrics.inc("gicatesis_cache_requests_total", cache="pdf", result="miss")
+    with single_flight(f"pdf:{format_id}:{source_version}"):
+        if _is_cache_fresh(pdf_path):
+            logger.info("PDF cache hit (single-flight): %s", pdf_path)
+            return pdf_path
+        docx_path = _ensure_docx_cached(format_id, source_version)
+        if pdf_path.exists():
+            try:
+                pdf_path.unlink()
+            except Exception:
+                pass
+        start = time.time()
+        _convert_docx_to_pdf(str(docx_path), str(pdf_path))
+        _prune_stale_versions(format_id, pdf_path)
+        store.record_put("pdf", pdf_path)
+        item = find_format_index(format_id)
+        if item:
+            _write_manifest(
+                format_id=format_id,
+                item=item,
+                source_version=source_version,
+                docx_path=docx_path,
+                pdf_path=pdf_path,
+                docx_sha256=_calculate_sha256(docx_path),
+            )
+    logger.info("PDF generado: %s (%.2fs)", pdf_path, time.time() - start)
+    store.enforce_quota(exclude=(pdf_path,))
+    return pdf_path
+
+
+def _is_pdf_cached(format_id: str, source_version: str) -> bool:
+    """Indica si el PDF de la version actual ya esta en cache (sin generar)."""
+    return _is_cache_fresh(_get_cached_pdf_path(format_id, source_version))
 
 
 def _resolve_generator_path(generator) -> Path | None:
@@ -285,52 +347,23 @@ def _resolve_generator_path(generator) -> Path | None:
     return path if path.exists() else None
 
 
-def _get_source_info(format_id: str):
-    """Obtiene info de fuentes para invalidacion y manifest."""
-    item = find_format_index(format_id)
-    if not item:
-        return None, None, 0.0, None, 0.0, 0.0
-
-    json_path = item.path
-    json_mtime = json_path.stat().st_mtime if json_path.exists() else 0.0
-    script_path = None
-    script_mtime = 0.0
-    extra_mtime = 0.0
+def _source_version_for(item: FormatIndexItem | None) -> str:
+    """Token de invalidacion: huella del motor + hash del JSON del formato."""
+    content_hash = item.content_hash if item else "missing"
+    raw = f"{get_engine_fingerprint()}:{content_hash}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
 
-    try:
-        provider = get_provider(item.uni)
-        generator = provider.get_generator_command(item.categoria)
-        script_path = _resolve_generator_path(generator)
-        script_mtime = (
-            script_path.stat().st_mtime if script_path and script_path.exists() else 0.0
-        )
-    except Exception:
-        script_path = None
-        script_mtime = 0.0
-
-    extra_paths = [
-        Path(__file__).resolve().parent / "service.py",
-        Path(__file__).resolve().parents[2] / "core" / "loaders.py",
-    ]
-    # Track engine modules so cache invalidates when normalizer/renderers change
-    engine_dir = Path(__file__).resolve().parents[2] / "engine"
-    if engine_dir.is_dir():
-        for py in engine_dir.rglob("*.py"):
-            extra_paths.append(py)
-    for path in extra_paths:
-        if path.exists():
-            extra_mtime = max(extra_mtime, path.stat().st_mtime)
 
-    source_mtime = max(json_mtime, script_mtime, extra_mtime)
-    return item, json_path, json_mtime, script_path, script_mtime, source_mtime
+def _get_source_info(format_id: str) -> tuple[FormatIndexItem | None, str]:
+    """Obtiene el item de indice y la version de fuentes (sin recorrer disco)."""
+    item = find_format_index(format_id)
+    return item, _source_version_for(item)
 
 
-def _get_source_mtime(format_id: str) -> float:
-    """Obtiene mtime total de fuentes para invalidar cache PDF."""
-    _item, _json_path, _json_mtime, _script_path, _script_mtime, source_mtime = (
-        _get_source_info(format_id)
-    )
-    return source_mtime
+def _get_source_version(format_id: str) -> str:
+    """Obtiene la version de fuentes que invalida el cache DOCX/PDF."""
+    _item, source_version = _get_source_info(format_id)
+    return source_version
 
 
 @router.get("/{format_id}", response_class=HTMLResponse)
@@ -396,37 +429,19 @@ async def generate_format_document(format_id: str, background_tasks: BackgroundT
 
 
 @router.get("/{format_id}/pdf")
-async def get_format_pdf(format_id: str, request: Request):
-    """Genera el DOCX, lo convierte a PDF y lo devuelve."""
+def get_format_pdf(format_id: str, request: Request):
+    """Genera el DOCX, lo convierte a PDF y lo devuelve.
+
+    Ruta sincrona a proposito: FastAPI la corre en el threadpool, asi la espera
+    del lock single-flight y la conversion no bloquean el event loop.
+    """
     try:
-        item, json_path, json_mtime, script_path, script_mtime, source_mtime = (
-            _get_source_info(format_id)
-        )
-        pdf_path, docx_path, docx_sha256 = _ensure_pdf_cached(format_id, source_mtime)
-        etag = f'"{docx_sha256[:16]}"' if docx_sha256 else None
-        if item and json_path:
-            _write_manifest(
-                format_id=format_id,
-                json_path=json_path,
-                json_mtime=json_mtime,
-                generator_path=script_path,
-                generator_mtime=script_mtime,
-                docx_path=docx_path,
-                pdf_path=pdf_path,
-                docx_sha256=docx_sha256,
-            )
-        # Logs claros de fuente usada
-        try:
-            logger.info(
-                "PDF preview DOCX fuente: %s (size=%s, sha256=%s)",
-                docx_path,
-                docx_path.stat().st_size,
-                docx_sha256,
-            )
-        except Exception:
-            pass
+        source_version = _get_source_version(format_id)
+        pdf_path = _ensure_pdf_cached(format_id, source_version)
+        etag = f'"{source_version[:16]}"'
+        logger.info("PDF preview: %s (source_version=%s)", pdf_path, source_version[:16])
         headers = _build_cache_headers(
-            format_id, source_mtime, etag=etag, no_store=True
+            format_id, pdf_path.stat().st_mtime, etag=etag, no_store=True
         )
         return FileResponse(
             path=str(pdf_path),
@@ -25,7 +25,7 @@ Donde tocar si falla:
 """
 
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from app.core.loaders import find_format_index, load_json_file, load_format_by_id
 from app.core.format_builder import build_format_entry
@@ -54,12 +54,15 @@ def generate_document(
     format_id: str,
     section_filter: Optional[str] = None,
     override_json_path: Optional[Path] = None,
+    override_data: Optional[Dict[str, Any]] = None,
 ) -> Tuple[Path, str]:
     """
     Genera un DOCX para el formato indicado.
-    Permite filtrar secciones o usar un JSON custom (override).
+    Permite filtrar secciones o usar un JSON/dict custom (override).
     """
-    return generate_document_by_id(format_id, section_filter, override_json_path)
+    return generate_document_by_id(
+        format_id, section_filter, override_json_path, override_data
+    )
 
 
 # NUEVA FUNCION AGREGADA PARA LA VISTA PREVIA (CARATULAS)
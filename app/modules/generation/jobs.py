@@ -0,0 +1,315 @@
+"""
+Archivo: app/modules/generation/jobs.py
+Proposito:
+- Cola asincrona de corridas de generacion (POST /api/v1/generate).
+
+Responsabilidades:
+- Asignar runId y encolar generate_artifacts en un executor acotado.
+- Acotar tambien la espera: el backlog de ThreadPoolExecutor no tiene limite,
+  asi que submit() rechaza con GenerationQueueFull (429 en el router) cuando
+  hay GICATESIS_GENERATION_MAX_QUEUED corridas esperando.
+- Registrar estado (queued/running/done/error) y tiempos de cada corrida, en
+  memoria y en <artifacts>/<runId>/run.json: con varios workers uvicorn el
+  poll puede caer en otro proceso, que responde leyendo ese archivo.
+- Expirar corridas viejas con el mismo TTL que los artefactos.
+No hace:
+- No genera documentos (delega a generation.service.generate_artifacts).
+- No define rutas HTTP (eso vive en api/generation_router).
+
+Entradas/Salidas:
+- Entradas: funcion de generacion + kwargs del request.
+- Salidas: GenerationRun consultable por runId y Future de la corrida.
+
+Dependencias:
+- concurrent.futures, threading, app.core.settings, app.modules.generation.service.
+
+Puntos de extension:
+- Cambiar el executor por una cola externa si se escala a varios nodos.
+
+Donde tocar si falla:
+- GICATESIS_GENERATION_CONCURRENCY limita los renders simultaneos.
+- 429 en POST /generate: la cola esta llena; subir
+  GICATESIS_GENERATION_MAX_QUEUED o la concurrencia.
+- Si un runId desaparece, revisar _RUNS_TTL_SECONDS y que todos los workers
+  compartan la carpeta de artefactos (outputs/artifacts).
+- Una corrida cuyo proceso murio queda en queued/running en run.json hasta
+  que el sweeper expire la carpeta.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.core.settings import get_generation_concurrency, get_generation_max_queued
+from app.modules.generation.service import (
+    ARTIFACTS_TTL_SECONDS,
+    ArtifactInfo,
+    GenerationResult,
+    generate_run_id,
+    get_artifacts_dir,
+    is_valid_run_id,
+)
+
+logger = logging.getLogger(__name__)
+
+_RUNS_TTL_SECONDS = ARTIFACTS_TTL_SECONDS
+_RUN_FILE = "run.json"
+
+
+@dataclass
+class GenerationRun:
+    """Estado de una corrida encolada."""
+
+    run_id: str
+    project_id: str
+    format_id: str
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[GenerationResult] = None
+    error: Optional[str] = None
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        """Tiempos en milisegundos (None mientras la etapa no ocurra)."""
+
+        def _ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+            if start is None or end is None:
+                return None
+            return round((end - start) * 1000, 1)
+
+        return {
+            "queuedMs": _ms(self.submitted_at, self.started_at or self.finished_at),
+            "runMs": _ms(self.started_at, self.finished_at),
+            "totalMs": _ms(self.submitted_at, self.finished_at),
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """Estado serializable (run.json)."""
+        result = None
+        if self.result is not None:
+            result = {
+                "status": self.result.status,
+                "createdAt": self.result.created_at,
+                "error": self.result.error,
+                "artifacts": [
+                    {
+                        "type": artifact.type,
+                        "path": str(artifact.path),
+                        "downloadUrl": artifact.download_url,
+                    }
+                    for artifact in self.result.artifacts
+                ],
+            }
+        return {
+            "runId": self.run_id,
+            "projectId": self.project_id,
+            "formatId": self.format_id,
+            "status": self.status,
+            "submittedAt": self.submitted_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "error": self.error,
+            "result": result,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "GenerationRun":
+        """Inversa de to_record()."""
+        result = None
+        data = record.get("result")
+        if data is not None:
+            result = GenerationResult(
+                project_id=record["projectId"],
+                run_id=record["runId"],
+                format_id=record["formatId"],
+                status=data["status"],
+                artifacts=[
+                    ArtifactInfo(
+                        type=item["type"],
+                        path=Path(item["path"]),
+                        download_url=item["downloadUrl"],
+                    )
+                    for item in data.get("artifacts") or []
+                ],
+                created_at=data["createdAt"],
+                error=data.get("error"),
+            )
+        return cls(
+            run_id=record["runId"],
+            project_id=record["projectId"],
+            format_id=record["formatId"],
+            status=record["status"],
+            submitted_at=record["submittedAt"],
+            started_at=record.get("startedAt"),
+            finished_at=record.get("finishedAt"),
+            result=result,
+            error=record.get("error"),
+        )
+
+
+def _run_file(run_id: str) -> Path:
+    return get_artifacts_dir() / run_id / _RUN_FILE
+
+
+def _save_run(run: GenerationRun) -> None:
+    """Escribe run.json de forma atomica (un lector nunca ve un JSON a medias)."""
+    path = _run_file(run.run_id)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{_RUN_FILE}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(run.to_record()), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("No se pudo guardar el estado de %s: %s", run.run_id, exc)
+
+
+def _load_run(run_id: str) -> Optional[GenerationRun]:
+    """Corrida registrada por otro worker, o None si no existe o vencio."""
+    if not is_valid_run_id(run_id):
+        return None
+    try:
+        record = json.loads(_run_file(run_id).read_text(encoding="utf-8"))
+        run = GenerationRun.from_record(record)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if run.finished_at is not None and time.time() - run.finished_at > _RUNS_TTL_SECONDS:
+        return None
+    return run
+
+
+class GenerationQueueFull(RuntimeError):
+    """Hay max_queued corridas esperando un worker libre."""
+
+
+class GenerationJobQueue:
+    """Executor acotado + registro de corridas por runId."""
+
+    def __init__(self, max_workers: int, max_queued: int = 32) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_queued = max(0, int(max_queued))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="generation"
+        )
+        self._runs: Dict[str, GenerationRun] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        generate: Callable[..., GenerationResult],
+        *,
+        project_id: str,
+        format_id: str,
+        **kwargs: Any,
+    ) -> tuple[GenerationRun, Future]:
+        """Registra la corrida como queued y la encola. No bloquea.
+
+        Lanza GenerationQueueFull si ya hay max_queued corridas esperando.
+        """
+        self._cleanup()
+        run = GenerationRun(
+            run_id=generate_run_id(),
+            project_id=project_id,
+            format_id=format_id,
+        )
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queued:
+                raise GenerationQueueFull(
+                    f"Generation queue is full ({self.max_queued} runs waiting)"
+                )
+            self._pending += 1
+            self._runs[run.run_id] = run
+        _save_run(run)
+        future = self._executor.submit(
+            self._execute, run, generate, project_id, format_id, kwargs
+        )
+        return run, future
+
+    def get(self, run_id: str) -> Optional[GenerationRun]:
+        """Corrida de este proceso o, si no, la que otro worker dejo en disco."""
+        with self._lock:
+            run = self._runs.get(run_id)
+        return run if run is not None else _load_run(run_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(
+        self,
+        run: GenerationRun,
+        generate: Callable[..., GenerationResult],
+        project_id: str,
+        format_id: str,
+        kwargs: Dict[str, Any],
+    ) -> GenerationRun:
+        run.started_at = time.time()
+        run.status = "running"
+        _save_run(run)
+        try:
+            result = generate(
+                project_id=project_id,
+                format_id=format_id,
+                run_id=run.run_id,
+                **kwargs,
+            )
+        except Exception as exc:
+            logger.exception("Generation run %s failed", run.run_id)
+            run.error = f"Generation failed: {exc}"
+            run.status = "error"
+        else:
+            run.result = result
+            run.error = result.error
+            run.status = "done" if result.status == "success" else "error"
+        finally:
+            run.finished_at = time.time()
+            _save_run(run)
+            with self._lock:
+                self._pending -= 1
+        return run
+
+    def _cleanup(self) -> None:
+        now = time.time()
+        with self._lock:
+            expired = [
+                run_id
+                for run_id, run in self._runs.items()
+                if run.finished_at is not None
+                and now - run.finished_at > _RUNS_TTL_SECONDS
+            ]
+            for run_id in expired:
+                self._runs.pop(run_id, None)
+
+
+_QUEUE: Optional[GenerationJobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_generation_queue() -> GenerationJobQueue:
+    """Retorna la cola de generacion (singleton por proceso)."""
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = GenerationJobQueue(
+                    get_generation_concurrency(), get_generation_max_queued()
+                )
+    return _QUEUE
+
+
+def reset_generation_queue() -> None:
+    """Descarta la cola actual (relee env en el proximo uso). Util en tests."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        queue, _QUEUE = _QUEUE, None
+    if queue is not None:
+        queue.shutdown()
@@ -6,7 +6,10 @@ Proposito:
 Responsabilidades:
 - Eliminar claves de instruccion/guia recursivamente.
 - Fusionar valores del usuario en placeholders.
-- Inyectar contenido IA en las secciones correspondientes.
+- Inyectar contenido IA en las secciones correspondientes (localizadas con
+  un indice _SectionLocator construido una sola vez por llamada).
+- Componer las tres etapas en un pipeline (preprocess_format_data) que recorre
+  el arbol una sola vez y solo copia los subarboles que modifica.
 - Gestionar archivos JSON temporales.
 No hace:
 - No genera documentos DOCX/PDF directamente.
@@ -17,15 +20,16 @@ Entradas/Salidas:
 - Salidas: datos JSON procesados listos para el generador.
 
 Dependencias:
-- Ninguna externa (solo tipos de Python estandar).
+- Ninguna externa; app.core.metrics mide preprocess_format_data.
 
 Puntos de extension:
 - Agregar nuevas claves a EXCLUDED_KEYS si se crean nuevas guias.
-- Agregar nuevos patrones de placeholder en merge_values.
+- Agregar nuevos patrones de placeholder en _PlaceholderSubstitution.
 
 Donde tocar si falla:
 - Si un campo de guia no se limpia, agregarlo a EXCLUDED_KEYS.
-- Si un placeholder no se reemplaza, agregar patron en merge_values.
+- Si un placeholder no se reemplaza, agregar patron en
+  _PlaceholderSubstitution (usado por merge_values).
 """
 
 from __future__ import annotations
@@ -34,9 +38,12 @@ import re
 import unicodedata
 import logging
 from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
+from app.core import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,7 +91,13 @@ def _norm_upper(text: str) -> str:
 
 
 def _normalize_path(path: str) -> str:
-    normalized = _strip_accents(str(path or ""))
+    return _normalize_path_text(str(path or ""))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_path_text(text: str) -> str:
+    # Memoizado: los mismos titulos/rutas se normalizan en cada seleccion y consumo.
+    normalized = _strip_accents(text)
     normalized = normalized.replace("\\", "/")
     normalized = _PATH_SEPARATOR_RE.sub("/", normalized)
     normalized = _WHITESPACE_RE.sub(" ", normalized)
@@ -334,19 +347,30 @@ def _apply_unac_maestria_smart_replacements(
         "[dd de mes de aaaa]": v.get("fecha_sustentacion"),
     }
 
+    active = [(placeholder, str(val)) for placeholder, val in replacements.items() if val]
+
     def _recursive_replace(obj: Any) -> Any:
+        # Comparte los subarboles sin reemplazos (no se modifican in-place).
         if isinstance(obj, str):
             res = obj
-            for placeholder, val in replacements.items():
-                if val and placeholder in res:
-                    res = res.replace(placeholder, str(val))
+            if "[" not in res:
+                # Todos los placeholders institucionales llevan corchetes.
+                return res
+            for placeholder, val in active:
+                if placeholder in res:
+                    res = res.replace(placeholder, val)
             return res
         elif isinstance(obj, dict):
-            return {k: _recursive_replace(v) for k, v in obj.items()}
+            out = {k: _recursive_replace(v) for k, v in obj.items()}
+            return out if any(out[k] is not v for k, v in obj.items()) else obj
         elif isinstance(obj, list):
-            return [_recursive_replace(item) for item in obj]
+            items = [_recursive_replace(item) for item in obj]
+            return items if any(a is not b for a, b in zip(items, obj)) else obj
         return obj
 
+    if not active:
+        return
+
     # Apply replacement recursively to the whole doc structure (caratula, info_basica, matriz, etc.)
     for key in list(data.keys()):
         data[key] = _recursive_replace(data[key])
@@ -446,6 +470,15 @@ def sanitize_ai_text(content: str) -> str:
     return cleaned.strip()
 
 
+def _copy_tree(obj: Any) -> Any:
+    """Copia dicts/listas de un arbol JSON; las hojas (str, numeros) se comparten."""
+    if isinstance(obj, dict):
+        return {key: _copy_tree(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_tree(item) for item in obj]
+    return obj
+
+
 def exclude_instruction_keys(obj: Any) -> Any:
     """Recursively remove instruction/guidance keys from format data."""
     if isinstance(obj, dict):
@@ -459,6 +492,69 @@ def exclude_instruction_keys(obj: Any) -> Any:
     return obj
 
 
+# Span candidato a placeholder: apertura + clave sin delimitadores + cierre
+# ("[TITULO]", "{autor}", "<fecha>"). Las ocurrencias de estos spans nunca se
+# solapan, asi que un solo recorrido las encuentra todas.
+_PLACEHOLDER_SPAN_RE = re.compile(r"[\[{<][^\[\]{}<>]*[\]}>]")
+_PLACEHOLDER_DELIMITERS = frozenset("[]{}<>")
+
+
+class _PlaceholderSubstitution:
+    """Sustitucion de placeholders compilada una vez por llamada a merge_values.
+
+    Semantica de referencia (``_sequential``): por cada clave de ``values`` en
+    orden y por cada variante (``[KEY]``, ``[key]``, ``{key}``, ``<key>``) se
+    reemplazan todas sus ocurrencias. ``apply`` obtiene el mismo resultado con
+    un solo recorrido del string (regex + tabla patron -> valor, gana la
+    primera clave que registra un patron) y vuelve al recorrido secuencial
+    solo cuando un valor insertado forma un placeholder nuevo (cascada) o
+    alguna clave contiene delimitadores.
+    """
+
+    def __init__(self, values: Dict[str, Any]) -> None:
+        self._pairs: List[tuple] = []
+        self._table: Dict[str, str] = {}
+        single_pass = True
+        for key, value in values.items():
+            if value is None:
+                continue
+            # Skip empty strings to prevent accidental clearing of placeholders
+            # when data is missing but the key exists.
+            val_str = str(value).strip()
+            if not val_str:
+                continue
+            if not _PLACEHOLDER_DELIMITERS.isdisjoint(key):
+                single_pass = False
+            for pattern in (f"[{key.upper()}]", f"[{key}]", f"{{{key}}}", f"<{key}>"):
+                self._pairs.append((pattern, val_str))
+                self._table.setdefault(pattern, val_str)
+        self._single_pass = single_pass
+
+    def _sequential(self, text: str) -> str:
+        for pattern, val_str in self._pairs:
+            if pattern in text:
+                text = text.replace(pattern, val_str)
+        return text
+
+    def _lookup(self, match: "re.Match[str]") -> str:
+        span = match.group(0)
+        return self._table.get(span, span)
+
+    def apply(self, text: str) -> str:
+        if not self._table:
+            return text
+        if not self._single_pass:
+            return self._sequential(text)
+        result = _PLACEHOLDER_SPAN_RE.sub(self._lookup, text)
+        if result == text:
+            return text
+        table = self._table
+        for match in _PLACEHOLDER_SPAN_RE.finditer(result):
+            if match.group(0) in table:
+                return self._sequential(text)
+        return result
+
+
 def merge_values(
     data: Dict[str, Any],
     values: Dict[str, Any],
@@ -469,28 +565,11 @@ def merge_values(
     Looks for placeholder patterns like "[TITULO]" or "{autor}"
     and replaces with actual values.
     """
+    substitution = _PlaceholderSubstitution(values or {})
 
     def _replace_placeholders(obj: Any) -> Any:
         if isinstance(obj, str):
-            result = obj
-            for key, value in values.items():
-                if value is None:
-                    continue
-                # Skip empty strings to prevent accidental clearing of placeholders
-                # when data is missing but the key exists.
-                val_str = str(value).strip()
-                if not val_str:
-                    continue
-                patterns = [
-                    f"[{key.upper()}]",
-                    f"[{key}]",
-                    f"{{{key}}}",
-                    f"<{key}>",
-                ]
-                for pattern in patterns:
-                    if pattern in result:
-                        result = result.replace(pattern, val_str)
-            return result
+            return substitution.apply(obj)
         elif isinstance(obj, dict):
             return {k: _replace_placeholders(v) for k, v in obj.items()}
         elif isinstance(obj, list):
@@ -499,36 +578,115 @@ def merge_values(
 
     merged = _replace_placeholders(data)
     if isinstance(merged, dict):
-        if values:
-            merged["values"] = deepcopy(values)
-            for key in (
-                "matriz_consistencia",
-                "operacionalizacion_vi",
-                "operacionalizacion_vd",
-                "operacionalizacion_variable_independiente",
-                "operacionalizacion_variable_dependiente",
-            ):
-                if key in values and values[key] not in (None, "", [], {}):
-                    merged[key] = deepcopy(values[key])
+        _apply_merged_values(merged, values)
+    return merged
 
-        # DIAGNOSTIC: Log the keys in values
+
+def _apply_merged_values(merged: Dict[str, Any], values: Dict[str, Any]) -> None:
+    """Pasos de merge_values posteriores a los placeholders (modifican ``merged``).
+
+    Escriben en el nivel raiz, ``caratula`` e ``informacion_basica``; el resto
+    de subarboles solo se reasigna (nunca se modifica in-place).
+    """
+    if values:
+        merged["values"] = _copy_tree(values)
+        for key in (
+            "matriz_consistencia",
+            "operacionalizacion_vi",
+            "operacionalizacion_vd",
+            "operacionalizacion_variable_independiente",
+            "operacionalizacion_variable_dependiente",
+        ):
+            if key in values and values[key] not in (None, "", [], {}):
+                merged[key] = _copy_tree(values[key])
+
+    # DIAGNOSTIC: Log the keys in values
+    logger.info(
+        f"PREPROCESSOR: Received values keys: {list((values or {}).keys())}"
+    )
+    if values and "autor1_nombres" in values:
         logger.info(
-            f"PREPROCESSOR: Received values keys: {list((values or {}).keys())}"
+            f"PREPROCESSOR: autor1_nombres found: {values.get('autor1_nombres')}"
         )
-        if values and "autor1_nombres" in values:
-            logger.info(
-                f"PREPROCESSOR: autor1_nombres found: {values.get('autor1_nombres')}"
-            )
 
-        _apply_cover_fallbacks(merged, values or {})
-        _apply_informacion_basica_values(merged, values or {})
+    _apply_cover_fallbacks(merged, values or {})
+    _apply_informacion_basica_values(merged, values or {})
 
-        # Smart UNAC-Maestria replacement for hardcoded institutional placeholders
-        try:
-            _apply_unac_maestria_smart_replacements(merged, values or {})
-        except Exception as e:
-            logger.error(f"PREPROCESSOR: Smart replacement failed: {e}")
-    return merged
+    # Smart UNAC-Maestria replacement for hardcoded institutional placeholders
+    try:
+        _apply_unac_maestria_smart_replacements(merged, values or {})
+    except Exception as e:
+        logger.error(f"PREPROCESSOR: Smart replacement failed: {e}")
+
+
+def _prune_and_substitute(
+    obj: Any, substitution: "_PlaceholderSubstitution | None"
+) -> Any:
+    """exclude_instruction_keys + placeholders en un solo recorrido.
+
+    Retorna el mismo objeto cuando el subarbol no cambia (ni claves excluidas
+    ni placeholders), asi que solo se copian los caminos modificados.
+    """
+    if isinstance(obj, str):
+        return substitution.apply(obj) if substitution is not None else obj
+    if isinstance(obj, dict):
+        changed = False
+        out: Dict[str, Any] = {}
+        for key, value in obj.items():
+            if key.lower() in EXCLUDED_KEYS:
+                changed = True
+                continue
+            new_value = _prune_and_substitute(value, substitution)
+            changed = changed or new_value is not value
+            out[key] = new_value
+        return out if changed else obj
+    if isinstance(obj, list):
+        items = [_prune_and_substitute(item, substitution) for item in obj]
+        if any(new is not old for new, old in zip(items, obj)):
+            return items
+        return obj
+    return obj
+
+
+def preprocess_format_data(
+    data: Dict[str, Any],
+    values: Dict[str, Any] | None = None,
+    ai_sections: List[Dict[str, Any]] | None = None,
+    selected_sections: List[Dict[str, Any]] | List[str] | None = None,
+) -> Dict[str, Any]:
+    """Pipeline exclude -> merge -> AI inject con estructura compartida.
+
+    Equivale a::
+
+        clean = exclude_instruction_keys(data)
+        if values:
+            clean = merge_values(clean, values)
+        clean = apply_ai_content(clean, ai_sections, selected_sections=...)
+
+    pero recorre el arbol una sola vez para excluir claves y reemplazar
+    placeholders, y cada etapa copia solo lo que modifica. El resultado puede
+    compartir subarboles sin cambios con ``data``: no modificar ``data``
+    despues (los llamadores lo cargan por request y lo descartan).
+    """
+    with metrics.timed(
+        "gicatesis_stage_duration_seconds",
+        stage="preprocess",
+        format=metrics.format_label(data),
+    ):
+        substitution = _PlaceholderSubstitution(values) if values else None
+        prepared = _prune_and_substitute(data, substitution)
+        if isinstance(prepared, dict):
+            if prepared is data:
+                prepared = dict(data)
+            if values:
+                # Unicos subarboles que _apply_merged_values modifica in-place.
+                for key in ("caratula", "informacion_basica"):
+                    if isinstance(prepared.get(key), dict):
+                        prepared[key] = dict(prepared[key])
+                _apply_merged_values(prepared, values)
+        return apply_ai_content(
+            prepared, ai_sections or [], selected_sections=selected_sections
+        )
 
 
 def _inject_ai_into_informacion_basica(data: Dict[str, Any], content: Any) -> None:
@@ -548,6 +706,83 @@ def _inject_ai_into_informacion_basica(data: Dict[str, Any], content: Any) -> No
         pass
 
 
+class _SectionLocator:
+    """Indice del contenido IA por ruta normalizada, construido una vez.
+
+    - ``_content``: ruta completa -> contenido (orden de llegada).
+    - ``_by_leaf``: ultimo segmento -> rutas que terminan en el.
+    - ``_by_annex``: prefijo ``ANEXO N`` del ultimo segmento -> rutas.
+
+    Consumir por hoja o por numero de anexo solo procede si hay exactamente
+    una ruta candidata (mismas reglas de ambiguedad que el recorrido lineal);
+    ``pop`` mantiene los tres indices consistentes.
+    """
+
+    __slots__ = ("_content", "_display", "_by_leaf", "_by_annex")
+
+    def __init__(self) -> None:
+        self._content: Dict[str, Any] = {}  # str or List[dict]
+        self._display: Dict[str, str] = {}
+        self._by_leaf: Dict[str, Dict[str, None]] = {}
+        self._by_annex: Dict[str, Dict[str, None]] = {}
+
+    def add(self, key: str, content: Any, display: str | None = None) -> None:
+        if key not in self._content:
+            leaf = key.split("/")[-1]
+            self._by_leaf.setdefault(leaf, {})[key] = None
+            match = _ANNEX_PREFIX_RE.match(leaf)
+            if match:
+                self._by_annex.setdefault(match.group(1), {})[key] = None
+        self._content[key] = content
+        if display is not None:
+            self._display[key] = display
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._content
+
+    def keys(self) -> List[str]:
+        return list(self._content)
+
+    def get(self, key: str) -> Any:
+        return self._content.get(key)
+
+    def display(self, key: str) -> str:
+        return self._display.get(key, key.split("/")[-1])
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        if key not in self._content:
+            return default
+        leaf = key.split("/")[-1]
+        self._discard(self._by_leaf, leaf, key)
+        match = _ANNEX_PREFIX_RE.match(leaf)
+        if match:
+            self._discard(self._by_annex, match.group(1), key)
+        return self._content.pop(key)
+
+    def unique_leaf(self, leaf: str) -> str | None:
+        """Ruta cuyo ultimo segmento es ``leaf`` si es la unica (o None)."""
+        return self._unique(self._by_leaf.get(leaf))
+
+    def unique_annex(self, annex_prefix: str) -> str | None:
+        """Ruta del anexo ``annex_prefix`` (``ANEXO N``) si es la unica (o None)."""
+        return self._unique(self._by_annex.get(annex_prefix))
+
+    @staticmethod
+    def _unique(keys: Dict[str, None] | None) -> str | None:
+        if keys and len(keys) == 1:
+            return next(iter(keys))
+        return None
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[str, None]], bucket: str, key: str) -> None:
+        keys = index.get(bucket)
+        if keys is None:
+            return
+        keys.pop(key, None)
+        if not keys:
+            del index[bucket]
+
+
 def apply_ai_content(
     data: Dict[str, Any],
     ai_sections: List[Dict[str, Any]],
@@ -575,8 +810,7 @@ def apply_ai_content(
                 return text.strip()
         return ""
 
-    content_map: Dict[str, Any] = {}  # str or List[dict]
-    content_display_map: Dict[str, str] = {}
+    content_map = _SectionLocator()
     for section in ai_sections:
         raw_content = section.get("content", "")
 
@@ -599,11 +833,15 @@ def apply_ai_content(
             normalized_locator = _normalize_path(locator)
             if not normalized_locator or _is_index_path(normalized_locator):
                 continue
-            content_map[normalized_locator] = processed_content
-            if locator_key == "path":
-                content_display_map[normalized_locator] = (
+            content_map.add(
+                normalized_locator,
+                processed_content,
+                (
                     locator.replace("\\", "/").split("/")[-1].strip()
-                )
+                    if locator_key == "path"
+                    else None
+                ),
+            )
 
     def _consume_content(*candidates: str) -> Any:  # str or List[dict]
         for candidate in candidates:
@@ -615,11 +853,9 @@ def apply_ai_content(
             leaf = _normalize_path(candidate).split("/")[-1]
             if not leaf:
                 continue
-            matches = [
-                key for key in content_map if key == leaf or key.endswith(f"/{leaf}")
-            ]
-            if len(matches) == 1:
-                return content_map.pop(matches[0])
+            matched_key = content_map.unique_leaf(leaf)
+            if matched_key is not None:
+                return content_map.pop(matched_key)
 
         return ""
 
@@ -637,18 +873,9 @@ def apply_ai_content(
             annex_prefix = f"ANEXO {annex_position}"
         else:
             return "", ""
-        matches = [
-            key
-            for key in content_map
-            if _ANNEX_PREFIX_RE.match(key.split("/")[-1] if key else "")
-            and _ANNEX_PREFIX_RE.match(key.split("/")[-1]).group(1) == annex_prefix
-        ]
-        if len(matches) == 1:
-            matched_key = matches[0]
-            return (
-                content_map.pop(matched_key),
-                content_display_map.get(matched_key, matched_key.split("/")[-1]),
-            )
+        matched_key = content_map.unique_annex(annex_prefix)
+        if matched_key is not None:
+            return content_map.pop(matched_key), content_map.display(matched_key)
         return "", ""
 
     def _flatten_to_text(content: Any) -> str:
@@ -739,8 +966,6 @@ def apply_ai_content(
     # --- INFORMACION BASICA SPECIAL HANDLING ---
     # Many formats treat 'Información Básica' as a top-level block, not a section.
     ib_content = _consume_content("INFORMACION BASICA", "DATOS GENERALES")
-    if ib_content:
-        _inject_ai_into_informacion_basica(data, ib_content)
 
     # --- BODY INJECTION ---
 
@@ -787,7 +1012,15 @@ def apply_ai_content(
 
         contenido.insert(0, {"parrafos": [content]})
 
-    result = deepcopy(data)
+    # Copia solo lo que esta funcion modifica (preliminares, capitulos
+    # conservados, finales, informacion_basica); el resto se comparte.
+    result = dict(data)
+    for key in ("preliminares", "finales"):
+        if isinstance(result.get(key), dict):
+            result[key] = _copy_tree(result[key])
+    if ib_content and isinstance(result.get("informacion_basica"), dict):
+        result["informacion_basica"] = dict(result["informacion_basica"])
+        _inject_ai_into_informacion_basica(result, _copy_tree(ib_content))
     selected_paths = _collect_selected_paths(selected_sections)
     document_id = str(
         (
@@ -926,7 +1159,9 @@ def apply_ai_content(
         if not chapter_key:
             return []
         prefix = f"{chapter_key}/"
-        candidate_keys = sorted([key for key in content_map if key.startswith(prefix)])
+        candidate_keys = sorted(
+            key for key in content_map.keys() if key.startswith(prefix)
+        )
         for key in candidate_keys:
             tables = _extract_table_blocks(content_map.get(key))
             if tables:
@@ -1014,6 +1249,7 @@ def apply_ai_content(
                 continue
             if selected_paths and not _path_selected(capitulo_titulo, selected_paths):
                 continue
+            capitulo = _copy_tree(capitulo)
 
             normalized_capitulo_titulo = _normalize_path(capitulo_titulo).lower()
             is_schedule_or_budget_chapter = any(
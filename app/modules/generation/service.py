@@ -7,7 +7,10 @@ Responsabilidades:
 - Cargar definiciones de formato.
 - Preprocesar datos (sanitizar, merge, AI content).
 - Invocar el pipeline de generacion via formats/service.
-- Gestionar artefactos temporales con TTL.
+- Gestionar artefactos temporales con TTL (registrados en app.core.cache_store,
+  cuyo sweeper borra las carpetas vencidas aunque no haya nuevas corridas).
+- Reutilizar DOCX/PDF identicos desde app.core.render_cache.
+- Servir artefactos de corridas de otro worker desde la carpeta compartida.
 No hace:
 - No define rutas HTTP.
 - No genera DOCX directamente (delega a generadores).
@@ -19,7 +22,11 @@ Dependencias:
 from __future__ import annotations
 
 import json
+import re
+import shutil
+import threading
 import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -27,16 +34,17 @@ from typing import Any, Dict, List, Optional
 
 from app.core.loaders import load_format_by_id
 from app.core.document_generator import generate_document_by_id as generate_document
+from app.core.cache_store import get_cache_store
+from app.core.render_cache import build_render_cache_key, get_render_cache
 
-from app.modules.generation.preprocessor import (
-    exclude_instruction_keys,
-    merge_values,
-    apply_ai_content,
-)
+from app.modules.generation.preprocessor import preprocess_format_data
 
 # Storage for generated artifacts (in-memory with TTL)
 _ARTIFACTS_STORE: Dict[str, "GenerationResult"] = {}
-_ARTIFACTS_TTL_SECONDS = 3600  # 1 hour
+# generate_artifacts corre en varios hilos de GenerationJobQueue.
+_ARTIFACTS_LOCK = threading.Lock()
+ARTIFACTS_TTL_SECONDS = 3600  # 1 hour
+_RUN_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
 
 
 @dataclass
@@ -61,34 +69,40 @@ class GenerationResult:
     error: Optional[str] = None
 
 
-def _generate_run_id() -> str:
+def generate_run_id() -> str:
     """Generate a unique run ID."""
-    return f"gen-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    return f"gen-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
 
 
-def _get_artifacts_dir() -> Path:
+def get_artifacts_dir() -> Path:
     """Get/create artifacts storage directory."""
     path = Path("outputs") / "artifacts"
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
+def register_artifacts_cache() -> None:
+    """Let the cache sweeper adopt and expire run dirs left by earlier processes."""
+    get_cache_store().register_root(
+        "artifacts", get_artifacts_dir(), ttl=ARTIFACTS_TTL_SECONDS
+    )
+
+
 def _cleanup_old_artifacts() -> None:
     """Remove artifacts older than TTL."""
     now = time.time()
-    expired = [
-        run_id
-        for run_id, result in _ARTIFACTS_STORE.items()
-        if now - result.created_at > _ARTIFACTS_TTL_SECONDS
-    ]
-    for run_id in expired:
-        result = _ARTIFACTS_STORE.pop(run_id, None)
-        if result:
-            for artifact in result.artifacts:
-                try:
-                    artifact.path.unlink(missing_ok=True)
-                except Exception:
-                    pass
+    with _ARTIFACTS_LOCK:
+        expired = [
+            _ARTIFACTS_STORE.pop(run_id)
+            for run_id, result in list(_ARTIFACTS_STORE.items())
+            if now - result.created_at > ARTIFACTS_TTL_SECONDS
+        ]
+    for result in expired:
+        for artifact in result.artifacts:
+            try:
+                artifact.path.unlink(missing_ok=True)
+            except Exception:
+                pass
 
 
 def generate_artifacts(
@@ -97,6 +111,7 @@ def generate_artifacts(
     values: Optional[Dict[str, Any]] = None,
     ai_result: Optional[Dict[str, Any]] = None,
     mode: str = "simulation",
+    run_id: Optional[str] = None,
 ) -> GenerationResult:
     """
     Generate DOCX and PDF artifacts using the real GicaTesis generators.
@@ -107,13 +122,14 @@ def generate_artifacts(
         values: User-provided values for placeholders
         ai_result: AI-generated content sections
         mode: "simulation" or "production"
+        run_id: Pre-assigned run ID (async job queue); generated if omitted
 
     Returns:
         GenerationResult with artifact paths and download URLs
     """
     _cleanup_old_artifacts()
 
-    run_id = _generate_run_id()
+    run_id = run_id or generate_run_id()
 
     # 1. Load and validate format
     try:
@@ -138,55 +154,66 @@ def generate_artifacts(
             error="Format is not publishable",
         )
 
-    # 2. Exclude instruction keys
-    clean_data = exclude_instruction_keys(raw_data)
-
-    # 3. Merge user values
-    if values:
-        clean_data = merge_values(clean_data, values)
+    artifacts_dir = get_artifacts_dir()
+    run_dir = artifacts_dir / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    final_docx = run_dir / f"{format_id.replace('/', '_')}.docx"
+    final_pdf = run_dir / f"{format_id.replace('/', '_')}.pdf"
 
-    # 4. Apply AI content (or simulation placeholders)
     ai_sections = []
     if ai_result and isinstance(ai_result.get("sections"), list):
         ai_sections = ai_result["sections"]
-    clean_data = apply_ai_content(clean_data, ai_sections)
 
-    # 5. Write merged JSON to temp file
-    artifacts_dir = _get_artifacts_dir()
-    run_dir = artifacts_dir / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
-
-    merged_json_path = run_dir / "merged_input.json"
-    merged_json_path.write_text(
-        json.dumps(clean_data, ensure_ascii=False, indent=2), encoding="utf-8"
+    # Same payload + same engine -> reuse the cached artifacts without rendering
+    cache = get_render_cache()
+    cache_key = build_render_cache_key(
+        format_id,
+        {"mode": mode, "values": values or {}, "aiSections": ai_sections},
     )
+    docx_from_cache = cache is not None and cache.copy_to(cache_key, "docx", final_docx)
 
-    # 6. Generate DOCX using existing generator
-    try:
-        docx_path, _filename = generate_document(
-            format_id, override_json_path=merged_json_path
-        )
-        # Move to run directory
-        final_docx = run_dir / f"{format_id.replace('/', '_')}.docx"
-        docx_path.rename(final_docx)
-    except Exception as exc:
-        return GenerationResult(
-            project_id=project_id,
-            run_id=run_id,
-            format_id=format_id,
-            status="error",
-            error=f"DOCX generation failed: {exc}",
+    if not docx_from_cache:
+        # 2-4. Exclude instruction keys, merge user values and apply AI content
+        #      (single traversal; raw_data is not used after this point)
+        clean_data = preprocess_format_data(raw_data, values, ai_sections)
+
+        # 5. Write merged JSON next to the artifacts (kept for debugging)
+        merged_json_path = run_dir / "merged_input.json"
+        merged_json_path.write_text(
+            json.dumps(clean_data, ensure_ascii=False, indent=2), encoding="utf-8"
         )
 
+        # 6. Generate DOCX using existing generator
+        try:
+            docx_path, _filename = generate_document(
+                format_id,
+                override_json_path=merged_json_path,
+                override_data=clean_data,
+            )
+            # Move to run directory
+            shutil.move(str(docx_path), str(final_docx))
+        except Exception as exc:
+            return GenerationResult(
+                project_id=project_id,
+                run_id=run_id,
+                format_id=format_id,
+                status="error",
+                error=f"DOCX generation failed: {exc}",
+            )
+        if cache is not None:
+            cache.put(cache_key, "docx", final_docx)
+
     # 7. Convert to PDF
-    final_pdf = run_dir / f"{format_id.replace('/', '_')}.pdf"
-    try:
-        from app.core.pdf_converter import convert_docx_to_pdf
+    if cache is None or not cache.copy_to(cache_key, "pdf", final_pdf):
+        try:
+            from app.core.pdf_converter import convert_docx_to_pdf
 
-        convert_docx_to_pdf(str(final_docx), str(final_pdf))
-    except Exception:
-        # PDF conversion failed but DOCX succeeded
-        pass
+            convert_docx_to_pdf(str(final_docx), str(final_pdf))
+        except Exception:
+            # PDF conversion failed but DOCX succeeded
+            pass
+        if cache is not None and final_pdf.exists():
+            cache.put(cache_key, "pdf", final_pdf)
 
     # 8. Build result
     artifacts = [
@@ -213,8 +240,10 @@ def generate_artifacts(
         artifacts=artifacts,
     )
 
-    # Store for later retrieval
-    _ARTIFACTS_STORE[run_id] = result
+    # Store for later retrieval; the cache store expires the run dir by TTL
+    with _ARTIFACTS_LOCK:
+        _ARTIFACTS_STORE[run_id] = result
+    get_cache_store().record_put("artifacts", run_dir, ttl=ARTIFACTS_TTL_SECONDS)
 
     return result
 
@@ -225,13 +254,37 @@ def get_artifact_path(run_id: str, artifact_type: str) -> Optional[Path]:
 
     Returns None if not found or expired.
     """
-    result = _ARTIFACTS_STORE.get(run_id)
+    with _ARTIFACTS_LOCK:
+        result = _ARTIFACTS_STORE.get(run_id)
     if not result:
-        return None
+        # Generated by another worker process: look in the shared run dir
+        return _find_artifact_on_disk(run_id, artifact_type)
 
     for artifact in result.artifacts:
         if artifact.type == artifact_type:
             if artifact.path.exists():
+                get_cache_store().record_hit("artifacts", artifact.path.parent)
                 return artifact.path
 
     return None
+
+
+def is_valid_run_id(run_id: str) -> bool:
+    """True if run_id is safe to use as a directory name under the artifacts dir."""
+    return bool(_RUN_ID_RE.match(run_id or ""))
+
+
+def _find_artifact_on_disk(run_id: str, artifact_type: str) -> Optional[Path]:
+    if not is_valid_run_id(run_id):
+        return None
+    run_dir = get_artifacts_dir() / run_id
+    try:
+        if time.time() - run_dir.stat().st_mtime > ARTIFACTS_TTL_SECONDS:
+            return None
+    except OSError:
+        return None
+    for path in sorted(run_dir.glob(f"*.{artifact_type}")):
+        if path.is_file():
+            get_cache_store().record_hit("artifacts", run_dir)
+            return path
+    return None
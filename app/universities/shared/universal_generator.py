@@ -4,23 +4,31 @@ Universal Generator - GicaTesis
 Genera documentos DOCX para todas las universidades y formatos de tesis.
 
 Arquitectura: Block Engine (Fase 5)
-    JSON → normalize() → Block[] → render_blocks() → DOCX
+    JSON → iter_normalize() → Block… → render_blocks() → DOCX
+    (los blocks se renderizan a medida que se normalizan)
 
 El código de rendering vive ahora en:
-    app/engine/normalizer.py   — JSON → Block[]
+    app/engine/normalizer.py   — JSON → Block[] (normalize) / Block… (iter_normalize)
     app/engine/renderers/      — Block → python-docx
     app/engine/primitives.py   — helpers DOCX atómicos
     app/engine/registry.py     — @register + dispatch
 
 Este archivo conserva únicamente:
-    - load_json()               — carga del JSON de entrada
-    - generate_document_unified — orquesta el pipeline
-    - __main__                  — CLI para subprocess
+    - load_json()                 — carga del JSON de entrada
+    - build_document()            — JSON ya parseado → Document en memoria
+    - render_document_bytes()     — JSON ya parseado → bytes DOCX (pool de workers)
+                                    (serializacion determinista: app/engine/packaging.py)
+    - generate_document_from_data — JSON ya parseado → DOCX en disco (in-process)
+    - generate_document_unified   — orquesta el pipeline desde un archivo
+    - __main__                    — CLI para subprocess (metricas via sidecar JSON)
 """
 
 import json
+import os
 import sys
+import time
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
 
 # Ensure project root is on sys.path (needed when called via subprocess)
 _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent.parent.parent)
@@ -29,6 +37,8 @@ if _PROJECT_ROOT not in sys.path:
 
 from docx import Document
 
+from app.core import metrics
+
 # ─────────────────────────────────────────────────────────────
 # ENGINE IMPORTS
 # ─────────────────────────────────────────────────────────────
@@ -36,10 +46,15 @@ from docx import Document
 # Trigger registration of all 19 block-type renderers
 import app.engine.renderers  # noqa: F401
 
-from app.engine.normalizer import normalize
+from app.engine.normalizer import iter_normalize
+from app.engine.packaging import document_to_bytes, save_document
 from app.engine.primitives import configure_styles, configure_margins
 from app.engine.registry import render_blocks
 
+# Histograma por etapa (normalize/render/save) y formato; ver app/core/metrics.py.
+_STAGE_METRIC = "gicatesis_stage_duration_seconds"
+_END = object()
+
 
 # ─────────────────────────────────────────────────────────────
 # JSON LOADER
@@ -59,38 +74,88 @@ def load_json(path_str: str):
 # ─────────────────────────────────────────────────────────────
 
 
-def generate_document_unified(json_path: str, output_path: str):
-    """Genera un DOCX completo a partir de un JSON canónico v2.
+def build_document(data: Dict[str, Any]):
+    """Construye el Document python-docx en memoria para un JSON canónico v2.
 
     Pipeline:
-        1. Carga JSON
-        2. configure_styles + configure_margins
-        3. normalize(data) → Block[]
-        4. render_blocks(doc, blocks) → DOCX in-memory
-        5. doc.save(output_path)
+        1. configure_styles + configure_margins
+        2. iter_normalize(data) → Block… (perezoso, sección por sección)
+        3. render_blocks(doc, blocks) → DOCX in-memory, consumiendo cada block
+           apenas se produce (la lista completa nunca se materializa)
     """
-    data = load_json(json_path)
+    format_label = metrics.format_label(data)
     doc = Document()
 
     # 1. Setup
     configure_styles(doc)
     configure_margins(doc)
 
-    # 2. Normalize → flat block list
-    blocks = normalize(data)
+    # 2-3. Normalize y render intercalados; el tiempo de cada etapa se separa
+    #      midiendo cuanto tarda el iterador en entregar cada block.
+    normalize_seconds = [0.0]
+    start = time.perf_counter()
+    try:
+        render_blocks(doc, _timed_blocks(iter_normalize(data), normalize_seconds))
+    finally:
+        total = time.perf_counter() - start
+        metrics.observe(
+            _STAGE_METRIC, normalize_seconds[0], stage="normalize", format=format_label
+        )
+        metrics.observe(
+            _STAGE_METRIC, total - normalize_seconds[0], stage="render", format=format_label
+        )
+    return doc
+
+
+def _timed_blocks(blocks: Iterable[Dict[str, Any]], spent: List[float]) -> Iterator[Dict[str, Any]]:
+    """Reenvia los blocks sumando en ``spent[0]`` el tiempo de producirlos."""
+    iterator = iter(blocks)
+    while True:
+        start = time.perf_counter()
+        block = next(iterator, _END)
+        spent[0] += time.perf_counter() - start
+        if block is _END:
+            return
+        yield block
+
+
+def render_document_bytes(data: Dict[str, Any]) -> bytes:
+    """Renderiza el JSON y retorna el DOCX serializado (usado por el pool)."""
+    doc = build_document(data)
+    with metrics.timed(_STAGE_METRIC, stage="save", format=metrics.format_label(data)):
+        return document_to_bytes(doc)
+
+
+def generate_document_from_data(data: Dict[str, Any], output_path: str) -> None:
+    """Genera un DOCX en disco a partir de un JSON ya parseado (sin subprocess).
+
+    El guardado es determinista: mismo JSON → mismos bytes, de modo que los
+    caches indexados por hash del DOCX (DOCX→PDF, artefactos) deduplican.
+    """
+    doc = build_document(data)
+    with metrics.timed(_STAGE_METRIC, stage="save", format=metrics.format_label(data)):
+        save_document(doc, output_path)
+
 
-    # 3. Render all blocks
-    render_blocks(doc, blocks)
+def generate_document_unified(json_path: str, output_path: str):
+    """Genera un DOCX completo a partir de un JSON canónico v2.
 
-    # 4. Save
-    doc.save(output_path)
+    Pipeline:
+        1. Carga JSON
+        2. build_document(data) → Document
+        3. save_document(doc, output_path) (bytes estables)
+    """
+    data = load_json(json_path)
+    generate_document_from_data(data, output_path)
     print(f"[OK] Generated: {output_path}")
 
 
 if __name__ == "__main__":
     if len(sys.argv) > 2:
         try:
-            generate_document_unified(sys.argv[1], sys.argv[2])
+            # El backend "subprocess" recoge estas metricas del sidecar.
+            with metrics.export_observations(os.environ.get(metrics.METRICS_SIDECAR_ENV)):
+                generate_document_unified(sys.argv[1], sys.argv[2])
         except Exception as e:
             print(f"[ERROR] {e}")
             sys.exit(1)
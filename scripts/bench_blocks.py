@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+=============================================================================
+ARCHIVO: scripts/bench_blocks.py
+FASE: Rendimiento - Block Engine
+=============================================================================
+
+PROPÓSITO:
+Medir qué ahorran los blocks con slots (app/engine/blocks.py) frente a los
+mismos blocks como dict, sobre los formatos más grandes de app/data:
+
+    memoria   KiB retenidos por la lista de normalize() (tracemalloc)
+    dispatch  render_blocks con renderers vacíos (registry + métricas)
+    lectura   block.get() de cada clave de cada block
+    render    render_blocks real con python-docx
+
+y verificar que ambos caminos producen el mismo XML.
+
+Con --ai-paragraphs cada subtítulo del cuerpo recibe una sección IA con N
+párrafos, como las tesis generadas por GicaGen (el caso de cientos de blocks).
+
+USO:
+    python scripts/bench_blocks.py [opciones]
+
+OPCIONES:
+    --top N              Formatos con más blocks a medir (default: 3)
+    --ai-paragraphs N    Párrafos IA por subtítulo; 0 = formato tal cual (default: 40)
+    --repeat N           Repeticiones por medición; se reporta la mejor (default: 5)
+
+SALIDA:
+    Por formato: blocks (tipados), KiB dict -> slots, ms de dispatch, lectura
+    y render dict -> slots, y si el XML es idéntico.
+
+EXIT CODES:
+    0: XML idéntico en todos los formatos
+    1: Algún formato produjo XML distinto entre caminos
+=============================================================================
+"""
+import argparse
+import copy
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from docx import Document  # noqa: E402
+from lxml import etree  # noqa: E402
+
+import app.engine.registry as registry  # noqa: E402
+import app.engine.renderers  # noqa: E402,F401
+from app.core.loaders import discover_format_files, load_format_by_id  # noqa: E402
+from app.engine.blocks import SlottedBlock  # noqa: E402
+from app.engine.normalizer import normalize  # noqa: E402
+from app.engine.primitives import configure_margins, configure_styles  # noqa: E402
+from app.modules.generation.preprocessor import apply_ai_content  # noqa: E402
+
+
+def _with_ai(data: dict, paragraphs: int) -> dict:
+    if paragraphs <= 0:
+        return data
+    sections = []
+    for chapter in data.get("cuerpo") or []:
+        if not isinstance(chapter, dict) or not chapter.get("titulo"):
+            continue
+        for item in chapter.get("contenido") or []:
+            if isinstance(item, dict) and item.get("texto"):
+                content = [
+                    {"tipo": "parrafo", "texto": f"Párrafo {i}. " + "Texto generado. " * 25}
+                    for i in range(paragraphs)
+                ]
+                sections.append({"path": f"{chapter['titulo']}/{item['texto']}", "content": content})
+    return apply_ai_content(data, sections)
+
+
+def _as_dicts(blocks: list) -> list:
+    return [block.to_dict() if isinstance(block, SlottedBlock) else block for block in blocks]
+
+
+def _retained_kib(data: dict, as_dicts: bool) -> float:
+    sample = copy.deepcopy(data)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    blocks = normalize(sample)
+    if as_dicts:
+        blocks = _as_dicts(blocks)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del blocks
+    return retained / 1024
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best * 1000
+
+
+def _dispatch_ms(blocks: list, repeat: int) -> float:
+    original = dict(registry._RENDERERS)
+    accepts_ctx = dict(registry._ACCEPTS_CTX)
+    try:
+        for block_type in original:
+            registry._RENDERERS[block_type] = lambda doc, block: None
+            registry._ACCEPTS_CTX.pop(block_type, None)
+        return _best_ms(lambda: registry.render_blocks(None, blocks), repeat)
+    finally:
+        registry._RENDERERS.clear()
+        registry._RENDERERS.update(original)
+        registry._ACCEPTS_CTX.clear()
+        registry._ACCEPTS_CTX.update(accepts_ctx)
+
+
+def _read_ms(blocks: list, repeat: int) -> float:
+    keys = [list(block) for block in blocks]
+
+    def read():
+        for block, block_keys in zip(blocks, keys):
+            for key in block_keys:
+                block.get(key)
+            block.get("missing", None)
+
+    return _best_ms(read, repeat)
+
+
+def _render(blocks: list, repeat: int) -> tuple[float, bytes]:
+    xml = b""
+
+    def render():
+        nonlocal xml
+        doc = Document()
+        configure_styles(doc)
+        configure_margins(doc)
+        registry.render_blocks(doc, blocks)
+        xml = etree.tostring(doc.element.body)
+
+    return _best_ms(render, repeat), xml
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("PROPÓSITO:")[0])
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--ai-paragraphs", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sized = []
+    for item in discover_format_files(None):
+        data = _with_ai(load_format_by_id(item.format_id), args.ai_paragraphs)
+        sized.append((len(normalize(copy.deepcopy(data))), item.format_id, data))
+    sized.sort(key=lambda entry: -entry[0])
+
+    mismatches = 0
+    print(
+        f"{'formato':<26} {'blocks':>13} {'KiB dict->slots':>17} "
+        f"{'dispatch ms':>14} {'lectura ms':>13} {'render ms':>15}  xml"
+    )
+    for count, format_id, data in sized[: args.top]:
+        typed = normalize(copy.deepcopy(data))
+        dicts = _as_dicts(typed)
+        typed_count = sum(isinstance(block, SlottedBlock) for block in typed)
+
+        dict_kib = _retained_kib(data, True)
+        slot_kib = _retained_kib(data, False)
+        dict_dispatch = _dispatch_ms(dicts, args.repeat)
+        slot_dispatch = _dispatch_ms(typed, args.repeat)
+        dict_read = _read_ms(dicts, args.repeat)
+        slot_read = _read_ms(typed, args.repeat)
+        dict_render, dict_xml = _render(dicts, max(1, args.repeat // 2))
+        slot_render, slot_xml = _render(typed, max(1, args.repeat // 2))
+        same = dict_xml == slot_xml
+        mismatches += not same
+        print(
+            f"{format_id:<26} {count:>6} ({typed_count:>5}) "
+            f"{dict_kib:>7.0f} -> {slot_kib:>6.0f} "
+            f"{dict_dispatch:>6.2f} -> {slot_dispatch:>5.2f} "
+            f"{dict_read:>5.2f} -> {slot_read:>5.2f} "
+            f"{dict_render:>6.0f} -> {slot_render:>6.0f}  "
+            f"{'idéntico' if same else 'DISTINTO'}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+=============================================================================
+ARCHIVO: scripts/bench_preprocess.py
+FASE: Rendimiento - Preprocesamiento
+=============================================================================
+
+PROPÓSITO:
+Comparar tiempo y memoria pico de la cadena de preprocesamiento por etapas
+(exclude_instruction_keys -> merge_values -> apply_ai_content) contra el
+pipeline de un solo recorrido (preprocess_format_data), verificando que ambos
+producen el mismo JSON.
+
+USO:
+    python scripts/bench_preprocess.py [opciones]
+
+OPCIONES:
+    --match TEXTO   Filtra format_id (default: unac-proyecto)
+    --repeat N      Repeticiones por medición; se reporta la mejor (default: 20)
+    --values N      Claves extra en values, como las que envía GicaGen (default: 200)
+
+SALIDA:
+    Por formato: ms y KiB pico (tracemalloc) de cada camino y si el JSON es idéntico.
+
+EXIT CODES:
+    0: Salidas idénticas
+    1: Algún formato produjo JSON distinto entre caminos
+=============================================================================
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from app.core.loaders import discover_format_files, load_format_by_id  # noqa: E402
+from app.modules.generation.preprocessor import (  # noqa: E402
+    apply_ai_content,
+    exclude_instruction_keys,
+    merge_values,
+    preprocess_format_data,
+)
+
+
+def _values(extra: int) -> dict:
+    values = {
+        "titulo": "Mantenimiento predictivo en flota minera",
+        "autor1_nombres": "Ana Pérez",
+        "asesor_nombres": "Luis Rojas",
+        "anio": "2026",
+        "lugar_caratula": "Callao",
+        "linea_investigacion": "Gestión del mantenimiento",
+    }
+    values.update({f"campo_{i}": f"valor {i}" for i in range(extra)})
+    return values
+
+
+def _ai_sections(data: dict) -> list:
+    sections = [{"path": "PRELIMINARES/RESUMEN", "content": "Resumen generado. " * 20}]
+    for chapter in data.get("cuerpo") or []:
+        if not isinstance(chapter, dict) or not chapter.get("titulo"):
+            continue
+        title = str(chapter["titulo"])
+        for item in chapter.get("contenido") or []:
+            if isinstance(item, dict) and item.get("texto"):
+                sections.append(
+                    {"path": f"{title}/{item['texto']}", "content": "Párrafo generado. " * 40}
+                )
+    return sections
+
+
+def _chain(data: dict, values: dict, sections: list) -> dict:
+    clean = exclude_instruction_keys(data)
+    if values:
+        clean = merge_values(clean, values)
+    return apply_ai_content(clean, sections)
+
+
+def _pipeline(data: dict, values: dict, sections: list) -> dict:
+    return preprocess_format_data(data, values, sections)
+
+
+def _measure(fn, format_id: str, values: dict, sections: list, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        data = load_format_by_id(format_id)
+        start = time.perf_counter()
+        fn(data, values, sections)
+        best = min(best, time.perf_counter() - start)
+    data = load_format_by_id(format_id)
+    tracemalloc.start()
+    result = fn(data, values, sections)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024, json.dumps(result, ensure_ascii=False)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("PROPÓSITO:")[0])
+    parser.add_argument("--match", default="unac-proyecto")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--values", type=int, default=200)
+    args = parser.parse_args()
+
+    values = _values(args.values)
+    format_ids = [
+        item.format_id
+        for item in discover_format_files(None)
+        if args.match in item.format_id
+    ]
+    mismatches = 0
+    print(f"{'formato':<28} {'cadena':>18} {'pipeline':>18}  json")
+    for format_id in format_ids:
+        sections = _ai_sections(load_format_by_id(format_id))
+        chain_ms, chain_kib, chain_json = _measure(
+            _chain, format_id, values, sections, args.repeat
+        )
+        fused_ms, fused_kib, fused_json = _measure(
+            _pipeline, format_id, values, sections, args.repeat
+        )
+        same = chain_json == fused_json
+        mismatches += not same
+        print(
+            f"{format_id:<28} {chain_ms:>6.2f} ms {chain_kib:>6.0f} KiB "
+            f"{fused_ms:>6.2f} ms {fused_kib:>6.0f} KiB  "
+            f"{'idéntico' if same else 'DISTINTO'}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+"""
+=============================================================================
+ARCHIVO: scripts/bench_render.py
+FASE: Rendimiento - Pipeline completo
+=============================================================================
+
+PROPÓSITO:
+Línea base de rendimiento del motor, offline. Recorre todos los formatos de
+app/data y los escenarios de tests/test_n8n_stress_scenarios.py. Para cada
+uno mide, por separado, tiempo y memoria pico (tracemalloc) de cada etapa:
+
+    exclude   exclude_instruction_keys
+    merge     merge_values (values simulados como los de GicaGen)
+    ai        apply_ai_content (una sección IA por subtítulo del cuerpo)
+    normalize normalize -> Block[]
+    render    configure_styles/margins + render_blocks
+    save      document_to_bytes (doc.save determinista)
+
+Escribe un reporte JSON. Con --baseline compara contra un reporte previo y
+marca regresiones de tiempo o memoria por etapa.
+
+Los escenarios de estrés se toman del propio archivo de tests: se ejecuta
+cada test sin fixtures y se captura el JSON que pasa a _pipeline, así el
+benchmark sigue los escenarios que el equipo mantiene sin duplicarlos.
+
+USO:
+    python scripts/bench_render.py [opciones]
+
+OPCIONES:
+    --match TEXTO       Filtra casos por nombre (format_id o stress:Clase.test)
+    --repeat N          Repeticiones por caso tras una de calentamiento; se reporta
+                        la mejor (default: 3)
+    --no-formats        Omite los formatos de app/data
+    --no-stress         Omite los escenarios de estrés
+    --output RUTA       Reporte JSON (default: outputs/bench/render_bench.json)
+    --baseline RUTA     Reporte previo contra el que comparar
+    --threshold F       Tolerancia relativa antes de marcar regresión (default: 0.25)
+    --min-ms F          Diferencia mínima en ms para marcar regresión (default: 5.0)
+    --min-kib F         Diferencia mínima en KiB para marcar regresión (default: 256)
+
+SALIDA:
+    Tabla por caso con ms por etapa y total, más el reporte JSON. Con
+    --baseline, lista de regresiones (caso, etapa, métrica, antes, ahora).
+
+EXIT CODES:
+    0: Sin regresiones (o sin --baseline)
+    1: Alguna etapa superó la línea base más la tolerancia
+    2: Algún caso falló al renderizar
+=============================================================================
+"""
+import argparse
+import copy
+import gc
+import importlib.util
+import inspect
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from docx import Document  # noqa: E402
+
+import app.engine.renderers  # noqa: E402,F401
+from app.core.engine_fingerprint import get_engine_fingerprint  # noqa: E402
+from app.core.loaders import discover_format_files, load_format_by_id  # noqa: E402
+from app.engine.normalizer import normalize  # noqa: E402
+from app.engine.packaging import document_to_bytes  # noqa: E402
+from app.engine.primitives import configure_margins, configure_styles  # noqa: E402
+from app.engine.registry import render_blocks  # noqa: E402
+from app.modules.generation.preprocessor import (  # noqa: E402
+    apply_ai_content,
+    exclude_instruction_keys,
+    merge_values,
+)
+
+STAGES = ("exclude", "merge", "ai", "normalize", "render", "save")
+STRESS_TESTS = BASE_DIR / "tests" / "test_n8n_stress_scenarios.py"
+REPORT_SCHEMA = 1
+
+_VALUES = {
+    "titulo": "Mantenimiento predictivo en flota minera",
+    "autor1_nombres": "Ana Pérez",
+    "asesor_nombres": "Luis Rojas",
+    "anio": "2026",
+    "lugar_caratula": "Callao",
+    "linea_investigacion": "Gestión del mantenimiento",
+}
+
+
+def _ai_sections(data: dict) -> list:
+    sections = [{"path": "PRELIMINARES/RESUMEN", "content": "Resumen generado. " * 20}]
+    for chapter in data.get("cuerpo") or []:
+        if not isinstance(chapter, dict) or not chapter.get("titulo"):
+            continue
+        title = str(chapter["titulo"])
+        for item in chapter.get("contenido") or []:
+            if isinstance(item, dict) and item.get("texto"):
+                sections.append(
+                    {"path": f"{title}/{item['texto']}", "content": "Párrafo generado. " * 40}
+                )
+    return sections
+
+
+def _collect_format_cases() -> list:
+    cases = []
+    for item in discover_format_files(None):
+        data = load_format_by_id(item.format_id)
+        cases.append((item.format_id, "format", data, _ai_sections(data)))
+    return cases
+
+
+def _collect_stress_cases() -> list:
+    """Ejecuta los tests de estrés sin fixtures y captura el JSON de cada _pipeline."""
+    spec = importlib.util.spec_from_file_location("_bench_n8n_stress", STRESS_TESTS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    captured = []
+    calls = {}
+    current = {"name": ""}
+    original_pipeline = module._pipeline
+
+    def capturing_pipeline(data):
+        name = current["name"]
+        calls[name] = calls.get(name, 0) + 1
+        if calls[name] > 1:
+            name = f"{name}#{calls[name]}"
+        captured.append((name, "stress", copy.deepcopy(data), []))
+        return original_pipeline(data)
+
+    module._pipeline = capturing_pipeline
+    for class_name, cls in vars(module).items():
+        if not (class_name.startswith("Test") and isinstance(cls, type)):
+            continue
+        for attr in vars(cls):
+            if not attr.startswith("test_"):
+                continue
+            method = getattr(cls(), attr)
+            if inspect.signature(method).parameters:
+                continue  # requiere fixtures de pytest
+            current["name"] = f"stress:{class_name}.{attr}"
+            try:
+                method()
+            except Exception:
+                pass  # la corrección la verifica la suite; aquí solo interesa el JSON
+    return captured
+
+
+def _run_stages(data: dict, ai_sections: list, trace: bool) -> tuple[dict, dict, int, int]:
+    timings = {}
+    peaks = {}
+    state = {}
+
+    def stage(name, fn):
+        if trace:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = fn()
+        timings[name] = (time.perf_counter() - start) * 1000
+        if trace:
+            peaks[name] = max(0, tracemalloc.get_traced_memory()[1] - baseline) / 1024
+        return result
+
+    state["data"] = stage("exclude", lambda: exclude_instruction_keys(data))
+    state["data"] = stage("merge", lambda: merge_values(state["data"], _VALUES))
+    state["data"] = stage("ai", lambda: apply_ai_content(state["data"], ai_sections))
+    blocks = stage("normalize", lambda: normalize(state["data"]))
+
+    def render():
+        doc = Document()
+        configure_styles(doc)
+        configure_margins(doc)
+        render_blocks(doc, blocks)
+        return doc
+
+    doc = stage("render", render)
+    payload = stage("save", lambda: document_to_bytes(doc))
+    return timings, peaks, len(blocks), len(payload)
+
+
+def _measure_case(data: dict, ai_sections: list, repeat: int) -> dict:
+    best = {name: float("inf") for name in STAGES}
+    best_total = float("inf")
+    # Calentamiento: imports perezosos, regex y caches del primer render no cuentan.
+    _run_stages(copy.deepcopy(data), ai_sections, False)
+    for _ in range(repeat):
+        sample = copy.deepcopy(data)
+        gc.collect()
+        gc.disable()  # como timeit: las pausas del GC no son del motor
+        try:
+            timings, _peaks, blocks, size = _run_stages(sample, ai_sections, False)
+        finally:
+            gc.enable()
+        for name in STAGES:
+            best[name] = min(best[name], timings[name])
+        best_total = min(best_total, sum(timings.values()))
+
+    tracemalloc.start()
+    try:
+        _timings, peaks, _blocks, _size = _run_stages(copy.deepcopy(data), ai_sections, True)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "blocks": blocks,
+        "docx_bytes": size,
+        "total_ms": round(best_total, 3),
+        "stages": {
+            name: {"ms": round(best[name], 3), "peak_kib": round(peaks[name], 1)}
+            for name in STAGES
+        },
+    }
+
+
+def _compare(current: dict, baseline: dict, threshold: float, min_ms: float, min_kib: float) -> list:
+    regressions = []
+    base_cases = baseline.get("cases", {})
+    for name, case in current["cases"].items():
+        base_case = base_cases.get(name)
+        if not base_case or "stages" not in case or "stages" not in base_case:
+            continue
+        for stage_name in STAGES:
+            now = case["stages"].get(stage_name)
+            before = base_case["stages"].get(stage_name)
+            if not now or not before:
+                continue
+            for metric, floor in (("ms", min_ms), ("peak_kib", min_kib)):
+                delta = now[metric] - before[metric]
+                if delta >= floor and now[metric] > before[metric] * (1 + threshold):
+                    regressions.append((name, stage_name, metric, before[metric], now[metric]))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("PROPÓSITO:")[0])
+    parser.add_argument("--match", default="")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-formats", action="store_true")
+    parser.add_argument("--no-stress", action="store_true")
+    parser.add_argument("--output", default=str(BASE_DIR / "outputs" / "bench" / "render_bench.json"))
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=5.0)
+    parser.add_argument("--min-kib", type=float, default=256.0)
+    args = parser.parse_args()
+
+    cases = []
+    if not args.no_formats:
+        cases.extend(_collect_format_cases())
+    if not args.no_stress:
+        cases.extend(_collect_stress_cases())
+    cases = [case for case in cases if args.match in case[0]]
+
+    report = {
+        "schema": REPORT_SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "engine_fingerprint": get_engine_fingerprint(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "cases": {},
+    }
+    failures = 0
+    print(f"{'caso':<60} " + " ".join(f"{name:>9}" for name in STAGES) + f" {'total':>9}")
+    for name, kind, data, ai_sections in cases:
+        try:
+            result = _measure_case(data, ai_sections, args.repeat)
+        except Exception as exc:
+            failures += 1
+            report["cases"][name] = {"kind": kind, "error": f"{type(exc).__name__}: {exc}"}
+            print(f"{name:<60} ERROR {type(exc).__name__}: {exc}")
+            continue
+        report["cases"][name] = {"kind": kind, **result}
+        print(
+            f"{name[:60]:<60} "
+            + " ".join(f"{result['stages'][stage]['ms']:>9.1f}" for stage in STAGES)
+            + f" {result['total_ms']:>9.1f}"
+        )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nReporte: {output}")
+
+    if failures:
+        return 2
+    if not args.baseline:
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    if baseline.get("schema") != REPORT_SCHEMA:
+        print(f"Línea base con schema {baseline.get('schema')!r}; se esperaba {REPORT_SCHEMA}.")
+        return 1
+    regressions = _compare(report, baseline, args.threshold, args.min_ms, args.min_kib)
+    missing = sorted(set(baseline.get("cases", {})) - set(report["cases"]))
+    if missing and not args.match:
+        print(f"Casos de la línea base que ya no existen: {', '.join(missing)}")
+    if not regressions:
+        print(f"Sin regresiones contra {args.baseline} (tolerancia {args.threshold:.0%}).")
+        return 0
+    print(f"\nRegresiones contra {args.baseline} (tolerancia {args.threshold:.0%}):")
+    for name, stage_name, metric, before, now in regressions:
+        print(f"  {name:<60} {stage_name:<9} {metric:<8} {before:>10.1f} -> {now:>10.1f}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
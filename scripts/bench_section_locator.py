@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+=============================================================================
+ARCHIVO: scripts/bench_section_locator.py
+FASE: Rendimiento - Preprocesamiento
+=============================================================================
+
+PROPÓSITO:
+Medir cómo escala apply_ai_content con el número de secciones IA, comparando
+el índice _SectionLocator (consumo O(1) por ruta, hoja y número de anexo) con
+una referencia que recorre todas las rutas en cada consumo (comportamiento
+previo), y verificando que ambos producen el mismo JSON.
+
+USO:
+    python scripts/bench_section_locator.py [opciones]
+
+OPCIONES:
+    --sections N [N ...]   Secciones IA a medir (default: 25 50 100 200 400)
+    --repeat N             Repeticiones por medición; se reporta la mejor (default: 5)
+
+SALIDA:
+    Tabla con ms por estrategia, speedup y si el JSON es idéntico.
+
+EXIT CODES:
+    0: Todas las mediciones con JSON idéntico
+    1: Alguna medición produjo JSON distinto entre estrategias
+=============================================================================
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+import app.modules.generation.preprocessor as preprocessor  # noqa: E402
+
+
+class _LinearSectionLocator(preprocessor._SectionLocator):
+    """Referencia: resuelve hoja/anexo recorriendo todas las rutas."""
+
+    def unique_leaf(self, leaf):
+        matches = [key for key in self._content if key.split("/")[-1] == leaf]
+        return matches[0] if len(matches) == 1 else None
+
+    def unique_annex(self, annex_prefix):
+        matches = []
+        for key in self._content:
+            match = preprocessor._ANNEX_PREFIX_RE.match(key.split("/")[-1])
+            if match and match.group(1) == annex_prefix:
+                matches.append(key)
+        return matches[0] if len(matches) == 1 else None
+
+
+def _scenario(sections: int) -> tuple[dict, list]:
+    per_chapter = 10
+    chapters = max(1, sections // per_chapter)
+    annexes = max(1, sections // 10)
+    data = {
+        "cuerpo": [
+            {
+                "titulo": f"CAPÍTULO {c + 1}",
+                "contenido": [
+                    {"texto": f"{c + 1}.{i + 1} Sección {c + 1}-{i + 1}"}
+                    for i in range(per_chapter)
+                ],
+            }
+            for c in range(chapters)
+        ],
+        "finales": {
+            "anexos": {
+                "titulo_seccion": "ANEXOS",
+                "lista": [{"titulo": f"Anexo {a + 1}: Plantilla"} for a in range(annexes)],
+            }
+        },
+    }
+    ai_sections = []
+    for c in range(chapters):
+        for i in range(per_chapter):
+            # La mitad llega sin el capítulo padre: obliga a resolver por hoja.
+            parent = f"CAPÍTULO {c + 1}/" if i % 2 else ""
+            ai_sections.append(
+                {
+                    "path": f"{parent}{c + 1}.{i + 1} Sección {c + 1}-{i + 1}",
+                    "content": f"Contenido generado {c + 1}-{i + 1}.",
+                }
+            )
+    for a in range(annexes):
+        ai_sections.append(
+            {"path": f"ANEXOS/Anexo {a + 1}: Título final", "content": f"Anexo {a + 1}."}
+        )
+    return data, ai_sections
+
+
+def _run(locator_cls, data: dict, ai_sections: list, repeat: int) -> tuple[float, str]:
+    default_cls = preprocessor._SectionLocator
+    preprocessor._SectionLocator = locator_cls
+    try:
+        best = float("inf")
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = preprocessor.apply_ai_content(data, ai_sections)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        preprocessor._SectionLocator = default_cls
+    return best * 1000, json.dumps(result, ensure_ascii=False, sort_keys=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("PROPÓSITO:")[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[25, 50, 100, 200, 400])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'secciones':>10} {'lineal':>10} {'índice':>10} {'speedup':>8}  json")
+    for sections in args.sections:
+        data, ai_sections = _scenario(sections)
+        linear_ms, linear_json = _run(_LinearSectionLocator, data, ai_sections, args.repeat)
+        indexed_ms, indexed_json = _run(
+            preprocessor._SectionLocator, data, ai_sections, args.repeat
+        )
+        same = linear_json == indexed_json
+        mismatches += not same
+        print(
+            f"{len(ai_sections):>10} {linear_ms:>7.2f} ms {indexed_ms:>7.2f} ms "
+            f"{linear_ms / indexed_ms:>7.1f}x  {'idéntico' if same else 'DISTINTO'}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
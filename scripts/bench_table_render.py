@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+=============================================================================
+ARCHIVO: scripts/bench_table_render.py
+FASE: Rendimiento - Block Engine
+=============================================================================
+
+PROPÓSITO:
+Medir cómo escala el render de tablas (renderer "table") con filas × columnas,
+comparando la ruta celda por celda con la ruta rápida (_append_rows_bulk) y
+verificando que ambas producen el mismo XML.
+
+USO:
+    python scripts/bench_table_render.py [opciones]
+
+OPCIONES:
+    --rows N [N ...]   Filas de datos a medir (default: 25 50 100 200 400)
+    --cols N [N ...]   Columnas a medir (default: 4 8 12)
+    --repeat N         Repeticiones por medición; se reporta la mejor (default: 3)
+    --schedule         Usar subtipo cronograma_actividades (compactación + cantSplit)
+
+SALIDA:
+    Tabla con ms por ruta, speedup y si el XML es idéntico.
+
+EXIT CODES:
+    0: Todas las mediciones con XML idéntico
+    1: Alguna medición produjo XML distinto entre rutas
+=============================================================================
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from docx import Document  # noqa: E402
+from lxml import etree  # noqa: E402
+
+import app.engine.renderers  # noqa: E402,F401
+import app.engine.renderers.table as table_mod  # noqa: E402
+from app.engine.registry import render_blocks  # noqa: E402
+
+
+def _table_block(rows: int, cols: int, schedule: bool) -> dict:
+    block = {
+        "type": "table",
+        "titulo": "Tabla de prueba",
+        "orientacion": "landscape" if cols > 5 else "portrait",
+        "encabezados": [f"Columna {c + 1}" for c in range(cols)],
+        "filas": [
+            [f"Actividad {r + 1}" if c == 0 else ("X" if (r + c) % 3 == 0 else "")
+             for c in range(cols)]
+            for r in range(rows)
+        ],
+    }
+    if schedule:
+        block.update(
+            subtipo="cronograma_actividades",
+            simbolo_marca="X",
+            filas_fase=list(range(0, rows, 10)),
+        )
+    return block
+
+
+def _render(block: dict, bulk_min_rows: int, repeat: int) -> tuple[float, bytes]:
+    table_mod._BULK_MIN_ROWS = bulk_min_rows
+    best = float("inf")
+    xml = b""
+    for _ in range(repeat):
+        doc = Document()
+        start = time.perf_counter()
+        render_blocks(doc, [dict(block)])
+        best = min(best, time.perf_counter() - start)
+        xml = etree.tostring(doc.element.body)
+    return best * 1000, xml
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("PROPÓSITO:")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[25, 50, 100, 200, 400])
+    parser.add_argument("--cols", type=int, nargs="+", default=[4, 8, 12])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--schedule", action="store_true")
+    args = parser.parse_args()
+
+    default_min_rows = table_mod._BULK_MIN_ROWS
+    mismatches = 0
+    print(f"{'filas':>6} {'cols':>5} {'celdas':>7} {'celda x celda':>14} {'rápida':>9} {'speedup':>8}  xml")
+    try:
+        for cols in args.cols:
+            for rows in args.rows:
+                block = _table_block(rows, cols, args.schedule)
+                legacy_ms, legacy_xml = _render(block, sys.maxsize, args.repeat)
+                bulk_ms, bulk_xml = _render(block, 0, args.repeat)
+                same = legacy_xml == bulk_xml
+                mismatches += not same
+                print(
+                    f"{rows:>6} {cols:>5} {rows * cols:>7} {legacy_ms:>11.1f} ms "
+                    f"{bulk_ms:>6.1f} ms {legacy_ms / bulk_ms:>7.1f}x  "
+                    f"{'idéntico' if same else 'DISTINTO'}"
+                )
+    finally:
+        table_mod._BULK_MIN_ROWS = default_min_rows
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
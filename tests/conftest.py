@@ -4,6 +4,7 @@ Propósito: Configuración compartida de pytest — fixtures y sys.path.
 """
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
@@ -39,3 +40,39 @@ def unac_data_dir(data_dir: Path) -> Path:
 def uni_data_dir(data_dir: Path) -> Path:
     """Directorio de datos UNI."""
     return data_dir / "uni"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_render_cache(tmp_path_factory):
+    """Aísla los caches en disco (render, DOCX/PDF, índice) para no tocar app/.cache."""
+    from app.core.cache_store import reset_cache_store
+    from app.core.render_cache import reset_render_cache
+
+    overrides = {
+        "GICATESIS_CACHE_DIR": str(tmp_path_factory.mktemp("cache")),
+        "GICATESIS_RENDER_CACHE_DIR": str(tmp_path_factory.mktemp("render-cache")),
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    reset_cache_store()
+    reset_render_cache()
+    yield
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    reset_render_cache()
+    reset_cache_store()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_artifacts_dir(tmp_path_factory):
+    """Aísla outputs/artifacts: cada corrida encolada deja su run.json ahí."""
+    from app.modules.generation import jobs, service
+
+    root = tmp_path_factory.mktemp("artifacts")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(service, "get_artifacts_dir", lambda: root)
+        patch.setattr(jobs, "get_artifacts_dir", lambda: root)
+        yield root
@@ -250,14 +250,14 @@ def test_generate_endpoint_accepts_structured_content(
     docx_path.write_bytes(b"docx")
 
     def fake_generate_artifacts(
-        project_id: str, format_id: str, values: dict, ai_result, mode: str
+        project_id: str, format_id: str, values: dict, ai_result, mode: str, run_id: str
     ):
         captured["project_id"] = project_id
         captured["format_id"] = format_id
         captured["ai_result"] = ai_result
         return GenerationResult(
             project_id=project_id,
-            run_id="gen-test-001",
+            run_id=run_id,
             format_id=format_id,
             status="success",
             artifacts=[
@@ -274,7 +274,7 @@ def test_generate_endpoint_accepts_structured_content(
     )
 
     response = client.post(
-        "/api/v1/generate",
+        "/api/v1/generate?wait=true",
         json={
             "projectId": "proj-test-1",
             "formatId": valid_format_id,
@@ -0,0 +1,152 @@
+"""Tests for the pre-serialized, pre-compressed formats API responses."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import brotli
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.api import response_cache, service
+from app.modules.api.response_cache import (
+    EncodedBody,
+    encode_json_body,
+    get_response_cache,
+    negotiate_encoding,
+)
+
+FORMAT_ID = "unac-informe-cuant"
+
+
+@pytest.fixture
+def client() -> TestClient:
+    get_response_cache().clear()
+    yield TestClient(app)
+    get_response_cache().clear()
+
+
+def test_body_matches_json_response_encoding() -> None:
+    content = {"id": "x", "titulo": "Introducción", "items": list(range(300))}
+    body = encode_json_body(content)
+
+    assert body.identity == json.dumps(
+        content, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    assert gzip.decompress(body.gzip) == body.identity
+    assert brotli.decompress(body.br) == body.identity
+
+
+def test_small_bodies_are_not_compressed() -> None:
+    body = encode_json_body({"ok": True})
+    assert body.gzip is None and body.br is None
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, "identity"),
+        ("gzip, deflate", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", "identity"),
+        ("*", "br"),
+        ("identity", "identity"),
+    ],
+)
+def test_negotiate_encoding(header, expected) -> None:
+    body = EncodedBody(identity=b"{}", gzip=b"g", br=b"b")
+    assert negotiate_encoding(header, body) == expected
+
+
+def test_brotli_is_skipped_when_unavailable() -> None:
+    body = EncodedBody(identity=b"{}", gzip=b"g", br=None)
+    assert negotiate_encoding("br, gzip", body) == "gzip"
+
+
+def test_detail_is_served_gzip_from_cache(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    builds = []
+    original = service.get_format_detail_by_id
+
+    def _counting(format_id):
+        builds.append(format_id)
+        return original(format_id)
+
+    monkeypatch.setattr(service, "get_format_detail_by_id", _counting)
+    # Forzar gzip: el cliente de tests solo declara br si tiene brotli.
+    headers = {"Accept-Encoding": "gzip"}
+
+    first = client.get(f"/api/v1/formats/{FORMAT_ID}", headers=headers)
+    second = client.get(f"/api/v1/formats/{FORMAT_ID}", headers=headers)
+    plain = client.get(
+        f"/api/v1/formats/{FORMAT_ID}", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in plain.headers
+    assert first.json() == second.json() == plain.json()
+    assert first.json()["id"] == FORMAT_ID
+    assert first.headers["etag"] == plain.headers["etag"]
+    assert builds == [FORMAT_ID]
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_list_negotiates_precompressed_variant(client: TestClient, encoding: str) -> None:
+    plain = client.get("/api/v1/formats", headers={"Accept-Encoding": "identity"})
+    response = client.get(
+        "/api/v1/formats", headers={"Accept-Encoding": f"{encoding}, identity;q=0.1"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == plain.json()
+
+
+def test_list_cache_hit_skips_dto_mapping(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mapped = []
+    original = service.map_to_dto_summary
+
+    def _counting(fmt):
+        mapped.append(fmt.id)
+        return original(fmt)
+
+    monkeypatch.setattr(service, "map_to_dto_summary", _counting)
+
+    first = client.get("/api/v1/formats")
+    built = len(mapped)
+    second = client.get("/api/v1/formats")
+
+    assert built > 0
+    assert len(mapped) == built
+    assert first.content == second.content
+
+
+def test_list_reuses_body_until_catalog_changes(client: TestClient) -> None:
+    first = client.get("/api/v1/formats")
+    second = client.get("/api/v1/formats")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert get_response_cache().hits >= 1
+
+    not_modified = client.get(
+        "/api/v1/formats", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+
+
+def test_cache_is_bounded() -> None:
+    cache = response_cache.ResponseBodyCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_build(key, lambda: {"key": key})
+
+    cache.get_or_build("a", lambda: {"key": "rebuilt"})
+    assert cache.misses == 4
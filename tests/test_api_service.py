@@ -214,3 +214,95 @@ class TestDTOMapping:
         assert detail.templateRef.kind == "docx"
         assert detail.definition["preliminares"]["introduccion"]["titulo"] == "INTRODUCCION"
         assert "cuerpo" in detail.definition
+
+
+class TestFormatMemoization:
+    """Tests para la memoizacion por identidad del archivo fuente."""
+
+    @pytest.fixture
+    def source(self, tmp_path, monkeypatch):
+        from app.core.loaders import FormatIndexItem
+        from app.modules.api import service
+
+        path = tmp_path / "memo.json"
+        path.write_text("{}", encoding="utf-8")
+        state = {"title": "Memo", "loads": 0}
+
+        def _load(format_id):
+            state["loads"] += 1
+            return {
+                "_meta": {
+                    "id": format_id,
+                    "entity": "format",
+                    "publish": True,
+                    "title": state["title"],
+                },
+                "caratula": {"titulo": state["title"]},
+            }
+
+        item = FormatIndexItem(
+            format_id="unac-memo", uni="unac", categoria="informe",
+            enfoque="general", path=path, titulo="Memo",
+        )
+        monkeypatch.setattr(service, "load_format_by_id", _load)
+        monkeypatch.setattr(service, "discover_format_files", lambda university=None: [item])
+        service.clear_format_cache()
+        yield path, state
+        service.clear_format_cache()
+
+    def test_unchanged_source_is_not_reloaded(self, source):
+        from app.modules.api import service
+
+        _path, state = source
+        first = service.get_catalog_version_info().version
+        second = service.get_catalog_version_info().version
+        summaries, version = service.list_formats()
+
+        assert first == second == version
+        assert state["loads"] == 1
+        assert summaries[0].version == load_all_formats()[0].content_hash[:16]
+
+    def test_changed_source_is_rehashed(self, source):
+        from app.modules.api import service
+
+        path, state = source
+        before = service.get_catalog_version_info().version
+        state["title"] = "Memo actualizado"
+        path.write_text('{"v": 2}', encoding="utf-8")
+
+        assert service.get_catalog_version_info().version != before
+        assert state["loads"] == 2
+
+
+class TestFormatDetailLookup:
+    """Tests para el camino directo de get_format_detail_by_id."""
+
+    def test_detail_loads_only_the_requested_format(self, monkeypatch):
+        from app.modules.api import service
+
+        loaded = []
+        original = service.load_internal_format
+
+        def _counting(item):
+            loaded.append(item.format_id)
+            return original(item)
+
+        def _no_catalog_scan(*_args, **_kwargs):
+            raise AssertionError("detail lookup should not scan the catalog")
+
+        monkeypatch.setattr(service, "load_internal_format", _counting)
+        monkeypatch.setattr(service, "load_all_formats", _no_catalog_scan)
+        service.clear_format_cache()
+        try:
+            detail, fmt_hash = service.get_format_detail_by_id("unac-informe-cuant")
+        finally:
+            service.clear_format_cache()
+
+        assert loaded == ["unac-informe-cuant"]
+        assert detail.id == "unac-informe-cuant"
+        assert detail.version == fmt_hash[:16]
+
+    def test_unknown_id_returns_none(self):
+        from app.modules.api import service
+
+        assert service.get_format_detail_by_id("unac-no-existe") == (None, None)
@@ -0,0 +1,194 @@
+"""Tests for the unified, size-bounded cache index and its admin endpoint."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache_store
+from app.core.cache_store import CacheStore, CacheSweeper
+from app.main import app
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> CacheStore:
+    store = CacheStore(tmp_path / "index.sqlite3", max_bytes=10_000, max_age=3600)
+    yield store
+    store.close()
+
+
+def _write(path: Path, size: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_quota_evicts_least_recently_used_across_namespaces(
+    store: CacheStore, tmp_path: Path
+) -> None:
+    pdf = _write(tmp_path / "pdf" / "a.pdf", 4000)
+    docx = _write(tmp_path / "docx" / "a.docx", 4000)
+    store.record_put("pdf", pdf)
+    store.record_put("docx", docx)
+    store.record_hit("pdf", pdf)
+
+    run_dir = tmp_path / "artifacts" / "gen-1"
+    _write(run_dir / "out.docx", 3000)
+    store.record_put("artifacts", run_dir)
+
+    assert store.evict() == 1
+    assert pdf.exists() and run_dir.exists()
+    assert not docx.exists()
+    assert store.stats()["namespaces"]["docx"]["evictions"] == 1
+
+
+def test_put_path_checks_quota_from_running_total(
+    store: CacheStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    old = _write(tmp_path / "pdf" / "old.pdf", 4000)
+    mid = _write(tmp_path / "pdf" / "mid.pdf", 4000)
+    store.record_put("pdf", old)
+    store.record_put("pdf", mid)
+    store.record_put("pdf", mid)  # upsert: no suma dos veces
+    assert store.used_bytes() == 8000
+
+    def _no_scan(*_args, **_kwargs):
+        raise AssertionError("enforce_quota no debe recorrer el disco")
+
+    monkeypatch.setattr(Path, "exists", _no_scan)
+    assert store.enforce_quota() == 0
+
+    new = _write(tmp_path / "pdf" / "new.pdf", 4000)
+    store.record_put("pdf", new)
+    assert store.enforce_quota() == 1
+    monkeypatch.undo()
+
+    assert not old.exists() and mid.exists() and new.exists()
+    assert store.used_bytes() == store.stats()["sizeBytes"] == 8000
+
+
+def test_enforce_quota_never_evicts_excluded_entry(
+    store: CacheStore, tmp_path: Path
+) -> None:
+    old = _write(tmp_path / "pdf" / "old.pdf", 4000)
+    big = _write(tmp_path / "pdf" / "big.pdf", 20_000)
+    store.record_put("pdf", old)
+    store.record_put("pdf", big)
+
+    assert store.enforce_quota(exclude=(big,)) == 1
+    assert store.enforce_quota(exclude=(big,)) == 0
+
+    assert big.exists() and not old.exists()
+    assert store.used_bytes() == 20_000
+
+
+def test_running_total_is_seeded_for_existing_indexes(
+    store: CacheStore, tmp_path: Path
+) -> None:
+    store.record_put("pdf", _write(tmp_path / "pdf" / "a.pdf", 300))
+    conn = store._connection()
+    conn.executescript(
+        "DROP TRIGGER entries_usage_insert; DROP TRIGGER entries_usage_update; "
+        "DROP TRIGGER entries_usage_delete; DROP TABLE usage;"
+    )
+    store.close()
+
+    assert store.used_bytes() == 300
+
+
+def test_sweep_removes_stale_temp_files(store: CacheStore, tmp_path: Path) -> None:
+    root = tmp_path / "render"
+    stale = _write(root / ".abc-1.docx.tmp", 10)
+    fresh = _write(root / ".abc-2.docx.tmp", 10)
+    past = time.time() - 2 * 3600
+    os.utime(stale, (past, past))
+    store.register_root("render", root)
+
+    store.sweep()
+
+    assert not stale.exists() and fresh.exists()
+    assert store.stats()["entries"] == 0
+
+
+def test_entry_ttl_overrides_store_max_age(store: CacheStore, tmp_path: Path) -> None:
+    run_dir = tmp_path / "artifacts" / "gen-1"
+    _write(run_dir / "out.pdf", 10)
+    keep = _write(tmp_path / "pdf" / "b.pdf", 10)
+    store.record_put("artifacts", run_dir, ttl=60)
+    store.record_put("pdf", keep)
+
+    assert store.evict(now=time.time() + 120) == 1
+    assert not run_dir.exists() and keep.exists()
+
+
+def test_sweep_adopts_orphans_and_forgets_missing_files(
+    store: CacheStore, tmp_path: Path
+) -> None:
+    legacy = _write(tmp_path / "pdf" / "old-abc.pdf", 100)
+    _write(tmp_path / "pdf" / "old.manifest.json", 100)
+    gone = _write(tmp_path / "pdf" / "gone.pdf", 100)
+    store.record_put("pdf", gone)
+    gone.unlink()
+    store.register_root("pdf", tmp_path / "pdf", "*.pdf")
+
+    assert store.sweep() == 0
+
+    stats = store.stats()
+    assert stats["entries"] == 1
+    assert stats["sizeBytes"] == legacy.stat().st_size
+
+
+def test_hit_ratio_is_shared_between_store_instances(
+    store: CacheStore, tmp_path: Path
+) -> None:
+    path = _write(tmp_path / "render" / "k.docx", 10)
+    store.record_put("render", path)
+    store.record_hit("render", path)
+    store.record_miss("render")
+
+    other_worker = CacheStore(store.index_path, max_bytes=10_000, max_age=3600)
+    try:
+        other_worker.record_hit("render", path)
+        stats = other_worker.stats()
+    finally:
+        other_worker.close()
+
+    assert stats["namespaces"]["render"]["hits"] == 2
+    assert stats["hitRatio"] == pytest.approx(2 / 3, abs=1e-3)
+
+
+def test_sweeper_runs_in_background(store: CacheStore, tmp_path: Path) -> None:
+    store.register_root("pdf", tmp_path / "pdf", "*.pdf")
+    _write(tmp_path / "pdf" / "a.pdf", 10)
+
+    sweeper = CacheSweeper(store, interval=0.05)
+    sweeper.start()
+    try:
+        deadline = time.monotonic() + 5
+        while store.stats()["entries"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        sweeper.stop()
+
+    assert store.stats()["entries"] == 1
+
+
+def test_admin_endpoint_reports_usage(
+    store: CacheStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cache_store, "_STORE", store)
+    pdf = _write(tmp_path / "pdf" / "a.pdf", 256)
+    store.record_put("pdf", pdf)
+    store.record_hit("pdf", pdf)
+
+    client = TestClient(app)
+    body = client.get("/api/v1/cache/stats").json()
+
+    assert body["sizeBytes"] == 256
+    assert body["maxBytes"] == 10_000
+    assert body["namespaces"]["pdf"]["hitRatio"] == 1.0
+    assert client.post("/api/v1/cache/sweep").json()["evicted"] == 0
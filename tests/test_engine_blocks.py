@@ -0,0 +1,126 @@
+"""
+=============================================================================
+ARCHIVO: tests/test_engine_blocks.py
+FASE: Block Engine - Rendimiento
+=============================================================================
+
+PROPÓSITO:
+Tests para los blocks tipados con slots (app/engine/blocks.py).
+Verifica que se comportan como el Block dict y que el normalizer los produce.
+
+TESTS INCLUIDOS:
+- test_slotted_block_behaves_like_dict: get/[]/in/==/dict()/copy/pop
+- test_slotted_block_rejects_undeclared_keys: sin __dict__, claves fijas
+- test_typed_block_falls_back_to_dict: tipo o claves no declaradas → mismo dict
+- test_normalize_emits_typed_blocks_equal_to_dicts: normalize tipa los blocks
+  de forma fija y deja en dict los que transportan JSON (table)
+- test_registry_dispatches_slotted_blocks: render_block acepta SlottedBlock
+
+CÓMO EJECUTAR:
+    py -m pytest tests/test_engine_blocks.py -v
+=============================================================================
+"""
+import copy
+import pickle
+
+import pytest
+
+from app.engine.blocks import (
+    HeadingBlock,
+    ParagraphBlock,
+    SlottedBlock,
+    typed_block,
+)
+from app.engine.normalizer import normalize
+from app.engine.registry import _RENDERERS, register, render_block
+
+
+def test_slotted_block_behaves_like_dict():
+    literal = {"type": "heading", "text": "CAPÍTULO I", "level": 1, "centered": True}
+    block = typed_block(dict(literal))
+
+    assert isinstance(block, HeadingBlock)
+    assert block == literal and literal == block
+    assert dict(block) == literal and {**block} == literal
+    assert block["type"] == "heading" and block.get("type") == "heading"
+    assert block.get("space_after", 12) == 12
+    assert "space_after" not in block and "centered" in block and "type" in block
+    assert len(block) == 4 and list(block) == ["type", "text", "level", "centered"]
+    assert copy.deepcopy(block) == literal
+    assert pickle.loads(pickle.dumps(block)) == literal
+    with pytest.raises(KeyError):
+        block["space_before"]
+
+    clone = block.copy()
+    clone["text"] = "CAPÍTULO II"
+    assert clone.pop("centered") is True
+    assert block["text"] == "CAPÍTULO I" and "centered" in block
+    assert clone == {"type": "heading", "text": "CAPÍTULO II", "level": 1}
+
+
+def test_slotted_block_rejects_undeclared_keys():
+    block = ParagraphBlock(text="x")
+
+    assert not hasattr(block, "__dict__")
+    with pytest.raises(KeyError, match="no declarada"):
+        block["bold"] = True
+
+
+def test_typed_block_falls_back_to_dict():
+    extra = {"type": "paragraph", "text": "x", "bold": True}
+    table = {"type": "table", "titulo": "T", "filas": []}
+
+    assert typed_block(extra) is extra
+    assert typed_block(table) is table
+    assert typed_block({"type": ["no", "hash"]}) == {"type": ["no", "hash"]}
+
+
+def test_normalize_emits_typed_blocks_equal_to_dicts():
+    data = {
+        "caratula": {"universidad": "UNIVERSIDAD X"},
+        "cuerpo": [
+            {
+                "titulo": "I. INTRODUCCIÓN",
+                "nota_capitulo": "Nota",
+                "contenido": [
+                    {"texto": "1.1 Contexto"},
+                    {
+                        "tipo": "tabla",
+                        "titulo": "Tabla 1",
+                        "encabezados": ["A", "B"],
+                        "filas": [["1", "2"]],
+                    },
+                ],
+            }
+        ],
+    }
+
+    blocks = normalize(data)
+
+    by_type = {block["type"]: block for block in blocks}
+    assert isinstance(by_type["heading"], SlottedBlock)
+    assert isinstance(by_type["note"], SlottedBlock)
+    assert isinstance(by_type["page_footer"], SlottedBlock)
+    assert type(by_type["table"]) is dict
+    assert [block.to_dict() if isinstance(block, SlottedBlock) else block for block in blocks] == blocks
+
+
+def test_registry_dispatches_slotted_blocks():
+    seen = []
+    block_type = "_test_slotted_dispatch"
+
+    class _Probe(SlottedBlock):
+        __slots__ = ("text",)
+
+    _Probe.block_type = block_type
+
+    @register(block_type)
+    def _render(doc, block):
+        seen.append((block["text"], block.get("missing", "default")))
+
+    try:
+        render_block(None, _Probe(text="hola"))
+    finally:
+        _RENDERERS.pop(block_type, None)
+
+    assert seen == [("hola", "default")]
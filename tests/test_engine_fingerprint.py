@@ -0,0 +1,85 @@
+"""Tests for the engine fingerprint token used to key DOCX/PDF caches."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core import engine_fingerprint, loaders
+from app.modules.formats import router
+
+FORMAT_ID = "unac-informe-cuant"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_fingerprint():
+    engine_fingerprint.reset_engine_fingerprint()
+    yield
+    engine_fingerprint.reset_engine_fingerprint()
+
+
+def _fake_app(root: Path) -> Path:
+    (root / "engine").mkdir(parents=True)
+    (root / "engine" / "core.py").write_text("X = 1\n", encoding="utf-8")
+    (root / "core").mkdir()
+    (root / "core" / "loaders.py").write_text("Y = 2\n", encoding="utf-8")
+    return root
+
+
+def test_fingerprint_depends_on_content_not_mtime(tmp_path: Path) -> None:
+    root = _fake_app(tmp_path)
+    before = engine_fingerprint.compute_engine_fingerprint(root)
+
+    os.utime(root / "engine" / "core.py", (0, 0))
+    assert engine_fingerprint.compute_engine_fingerprint(root) == before
+
+    (root / "engine" / "core.py").write_text("X = 2\n", encoding="utf-8")
+    assert engine_fingerprint.compute_engine_fingerprint(root) != before
+
+
+def test_fingerprint_is_computed_once_until_reload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tokens = iter(["token-1", "token-2"])
+    calls = []
+
+    def _compute():
+        calls.append(1)
+        return next(tokens)
+
+    monkeypatch.setattr(engine_fingerprint, "compute_engine_fingerprint", _compute)
+
+    for _ in range(5):
+        assert engine_fingerprint.get_engine_fingerprint() == "token-1"
+    assert engine_fingerprint.reload_engine_fingerprint() == "token-2"
+    assert engine_fingerprint.get_engine_fingerprint() == "token-2"
+    assert len(calls) == 2
+
+
+def test_source_version_does_not_walk_engine_per_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine_fingerprint.get_engine_fingerprint()
+    loaders.find_format_index(FORMAT_ID)
+    monkeypatch.setattr(
+        Path, "rglob", lambda *_args, **_kwargs: pytest.fail("rglob per request")
+    )
+
+    first = router._get_source_version(FORMAT_ID)
+    assert router._get_source_version(FORMAT_ID) == first
+
+
+def test_source_version_tracks_engine_and_format_content(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    item = loaders.find_format_index(FORMAT_ID)
+    assert item is not None and len(item.content_hash) == 64
+    base = router._source_version_for(item)
+
+    edited = loaders.FormatIndexItem(**{**item.__dict__, "content_hash": "otro"})
+    assert router._source_version_for(edited) != base
+
+    monkeypatch.setattr(router, "get_engine_fingerprint", lambda: "otro-engine")
+    assert router._source_version_for(item) != base
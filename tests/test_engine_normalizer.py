@@ -17,6 +17,8 @@ TESTS INCLUIDOS:
 - Cuerpo con tabla, imagen, nota, legacy table, mostrar_matriz
 - Finales: referencias, anexos con matriz landscape, fallback matriz
 - Carga real de los 9 JSONs → normalize sin crash + verificación de estructura
+- iter_normalize: mismos blocks que normalize, perezoso y con la racha
+  landscape resuelta en streaming
 
 CÓMO EJECUTAR:
     py -m pytest tests/test_engine_normalizer.py -v
@@ -27,7 +29,8 @@ from pathlib import Path
 
 import pytest
 
-from app.engine.normalizer import normalize
+from app.engine import normalizer
+from app.engine.normalizer import iter_normalize, normalize
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -252,6 +255,45 @@ def test_consecutive_landscape_tables_disable_intermediate_portrait_restore():
     assert tables[1].get("restore_portrait", True) is True
 
 
+def test_streaming_landscape_policy_holds_only_the_current_run():
+    def table(name, orientation="landscape"):
+        return {"type": "table", "titulo": name, "orientacion": orientation}
+
+    consumed = []
+
+    def source():
+        for block in (
+            table("A"), table("B"), {"type": "paragraph", "text": "x"},
+            table("C"), table("D", "portrait"), table("E"), table("F"),
+        ):
+            consumed.append(block.get("titulo") or block["type"])
+            yield block
+
+    stream = normalizer._iter_consecutive_landscape_table_policy(source())
+
+    first = next(stream)
+    # A solo se libera al llegar al paragraph que cierra la racha A-B.
+    assert consumed == ["A", "B", "paragraph"]
+    rest = list(stream)
+    restores = [(b.get("titulo"), b.get("restore_portrait", True)) for b in [first] + rest]
+    assert restores == [
+        ("A", False), ("B", True), (None, True),
+        ("C", True), ("D", True), ("E", False), ("F", True),
+    ]
+
+
+def test_iter_normalize_is_lazy_per_section(monkeypatch):
+    def fail(_data):
+        raise AssertionError("finales se normalizo antes de consumir el cuerpo")
+
+    monkeypatch.setattr(normalizer, "_normalize_finales", fail)
+    stream = iter_normalize(_minimal_json())
+
+    assert next(stream)["type"]
+    with pytest.raises(AssertionError, match="finales"):
+        list(stream)
+
+
 def test_operationalization_tables_include_page_break_between_31_and_32():
     blocks = normalize(_project_structured_json())
     table_positions = [
@@ -1513,6 +1555,11 @@ class TestNormalizeRealJsons:
         assert isinstance(blocks, list)
         assert len(blocks) > 10, f"JSON {path} generó muy pocos blocks: {len(blocks)}"
 
+    def test_iter_normalize_matches_normalize(self, real_json):
+        """El camino en streaming produce exactamente los mismos blocks."""
+        data, path = real_json
+        assert list(iter_normalize(json.loads(json.dumps(data)))) == normalize(data), path
+
     def test_all_blocks_have_type(self, real_json):
         """Todos los blocks de JSONs reales tienen 'type'."""
         data, path = real_json
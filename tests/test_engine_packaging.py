@@ -0,0 +1,75 @@
+"""Tests for the deterministic DOCX serialization."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from app.core.loaders import load_json_file
+from app.engine.packaging import (
+    ZIP_FIXED_DATE_TIME,
+    document_to_bytes,
+    normalize_docx_zip,
+)
+from app.universities.shared.universal_generator import (
+    generate_document_from_data,
+    render_document_bytes,
+)
+
+
+@pytest.fixture
+def format_data(unac_data_dir: Path) -> dict:
+    return load_json_file(unac_data_dir / "informe" / "unac_informe_cuant.json")
+
+
+def test_same_input_produces_identical_bytes(format_data: dict, tmp_path: Path) -> None:
+    first = tmp_path / "a.docx"
+    second = tmp_path / "b.docx"
+    generate_document_from_data(format_data, str(first))
+    generate_document_from_data(format_data, str(second))
+
+    digest = lambda path: hashlib.sha256(path.read_bytes()).hexdigest()  # noqa: E731
+    assert digest(first) == digest(second)
+    assert first.read_bytes() == render_document_bytes(format_data)
+
+
+def test_zip_entries_have_fixed_dates_and_stable_order(format_data: dict) -> None:
+    with zipfile.ZipFile(io.BytesIO(render_document_bytes(format_data))) as archive:
+        infos = archive.infolist()
+
+    names = [info.filename for info in infos]
+    assert names[0] == "[Content_Types].xml"
+    assert names[1:] == sorted(names[1:])
+    assert {info.date_time for info in infos} == {ZIP_FIXED_DATE_TIME}
+
+
+def test_core_properties_are_normalized() -> None:
+    doc = Document()
+    doc.core_properties.modified = datetime.now(timezone.utc)
+    doc.core_properties.revision = 7
+
+    with zipfile.ZipFile(io.BytesIO(document_to_bytes(doc))) as archive:
+        core = archive.read("docProps/core.xml").decode("utf-8")
+
+    assert "<cp:revision>1</cp:revision>" in core
+    assert core.count("2013-12-23T23:15:00Z") == 2
+
+
+def test_core_date_honours_source_date_epoch(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "946684800")
+
+    with zipfile.ZipFile(io.BytesIO(document_to_bytes(Document()))) as archive:
+        core = archive.read("docProps/core.xml").decode("utf-8")
+
+    assert "2000-01-01T00:00:00Z" in core
+
+
+def test_normalize_docx_zip_is_idempotent() -> None:
+    payload = document_to_bytes(Document())
+    assert normalize_docx_zip(payload) == payload
@@ -282,6 +282,27 @@ class TestRenderBlocks:
 
         assert calls == [1, 3]
 
+    def test_render_blocks_passes_fresh_context_to_ctx_renderers(self):
+        """Renderers con parametro ctx reciben un RenderContext por documento."""
+        seen = []
+
+        @register("ctx_aware")
+        def render_ctx(doc, block, ctx=None):
+            seen.append(ctx)
+            ctx.next_table_number()
+
+        @register("plain")
+        def render_plain(doc, block):
+            seen.append("plain")
+
+        first = render_blocks(None, [{"type": "ctx_aware"}, {"type": "plain"}])
+        second = render_blocks(None, [{"type": "ctx_aware"}])
+
+        assert seen == [first, "plain", second]
+        assert first is not second
+        assert first.chapter_table_number == 1
+        assert second.chapter_table_number == 1
+
 
 # ──────────────────────────────────────────────────────────────
 # CLEAR REGISTRY (para tests)
@@ -20,11 +20,13 @@ CÓMO EJECUTAR:
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from lxml import etree
 
 # Import renderers to trigger @register
 import app.engine.renderers  # noqa: F401
@@ -372,12 +374,123 @@ class TestPageControl:
         # Footer should have content (PAGE field)
         assert len(footer.paragraphs) >= 1
 
+    def test_page_control_reads_only_the_document_tail(self, monkeypatch):
+        """page_break/section_switch no deben recorrer todo el body (O(n) por bloque)."""
+        from docx.document import Document as DocumentClass
+
+        doc = _doc()
+        for i in range(200):
+            doc.add_paragraph(f"Párrafo {i}")
+        doc.add_table(rows=1, cols=1)
+        doc.add_paragraph()
+
+        def _full_scan(_self):
+            raise AssertionError("doc.paragraphs recorre todo el documento")
+
+        monkeypatch.setattr(DocumentClass, "paragraphs", property(_full_scan))
+        render_blocks(doc, [
+            {"type": "page_break"},
+            {"type": "section_switch", "orientation": "landscape"},
+            {"type": "page_break"},
+            {"type": "section_switch", "orientation": "portrait"},
+        ])
+
+        body = list(doc.element.body)
+        # El salto reutiliza el spacer vacío que dejó la tabla.
+        assert body[201].tag.endswith("}p") and "w:br" in body[201].xml
+        assert len(body) == 205
+
+    def test_doc_tail_helpers(self):
+        from app.engine import doc_tail
+
+        doc = _doc()
+        assert doc_tail.last_content_element(doc) is None
+        doc.add_paragraph("Título")
+        table = doc.add_table(rows=1, cols=1)
+        table.cell(0, 0).text = "celda"
+        doc.add_paragraph()
+
+        assert doc_tail.last_text_paragraph(doc).text == "Título"
+        assert doc_tail.last_empty_trailing_paragraph(doc) is not None
+        assert not doc_tail.last_content_is_section_break(doc)
+
+        render_block(doc, {"type": "section_switch", "orientation": "landscape"})
+        assert doc_tail.last_content_is_section_break(doc)
+        assert doc_tail.last_section_break_paragraph(doc) is doc_tail.last_content_element(doc)
+
 
 # ─────────────────────────────────────────────────────────────
 # TABLE
 # ─────────────────────────────────────────────────────────────
 
 class TestTable:
+    def test_concurrent_renders_keep_independent_numbering(self):
+        """Dos documentos en hilos distintos no comparten contadores de tabla."""
+        def _blocks(chapter: str) -> list:
+            blocks = [{"type": "heading", "text": f"{chapter}. CAPITULO", "level": 1}]
+            for i in range(15):
+                blocks.append({
+                    "type": "table",
+                    "titulo": f"Resultado {i}",
+                    "encabezados": ["A"],
+                    "filas": [["1"]],
+                })
+            return blocks
+
+        def _captions(chapter: str) -> list:
+            doc = _render_many(_blocks(chapter))
+            return [p.text for p in doc.paragraphs if p.text.startswith("Tabla ")]
+
+        expected = {chapter: _captions(chapter) for chapter in ("I", "II")}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for _ in range(3):
+                futures = {
+                    chapter: executor.submit(_captions, chapter) for chapter in ("I", "II")
+                }
+                for chapter, future in futures.items():
+                    assert future.result() == expected[chapter]
+        assert expected["I"][-1] == "Tabla 1.15 Resultado 14"
+        assert expected["II"][0] == "Tabla 2.1 Resultado 0"
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {},
+            {"orientacion": "landscape", "estilo": {"ancho_columnas": [3, 4, 5, 2]}},
+            {"subtipo": "presupuesto_investigacion", "filas_categoria": [0, 7], "fila_total": 19},
+            {
+                "subtipo": "cronograma_actividades",
+                "filas_fase": [0, 9],
+                "simbolo_marca": "X",
+                "estilo": {"celda_margen_twips": 20, "fuente_marcas_pt": 7},
+                "celdas_fusionadas": [{"fila": 0, "col": 0, "cols_span": 4, "texto": "Fase 1"}],
+            },
+        ],
+    )
+    def test_bulk_rows_match_cell_by_cell_path(self, monkeypatch, extra):
+        """La ruta rápida de tablas grandes produce el mismo XML que la celda por celda."""
+        import app.engine.renderers.table as table_mod
+
+        filas = [
+            [f"Fila {r}", "linea 1\nlinea 2" if r % 5 == 0 else "X", None, r]
+            for r in range(20)
+        ]
+        filas[3] = ["corta"]
+        filas[4] = ["a\tb", "", "  ", "extra", "ignorada"]
+        block = {
+            "type": "table",
+            "titulo": "Tabla grande",
+            "encabezados": ["Actividad", "Detalle", "Vacía", "Número"],
+            "filas": filas,
+            **extra,
+        }
+
+        def _body_xml(min_rows: int) -> bytes:
+            monkeypatch.setattr(table_mod, "_BULK_MIN_ROWS", min_rows)
+            return etree.tostring(_render_many([dict(block)]).element.body)
+
+        assert _body_xml(1) == _body_xml(10_000)
+
     def test_basic_table(self):
         doc = _render({
             "type": "table",
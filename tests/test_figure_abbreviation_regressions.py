@@ -1,7 +1,7 @@
 from docx import Document
 
 import app.engine.renderers  # noqa: F401
-from app.engine.normalizer import normalize
+from app.engine.normalizer import _derive_document_abbreviation_rows, normalize
 from app.engine.registry import render_block, render_blocks
 
 
@@ -164,3 +164,21 @@ def test_annex_image_uses_annex_heading_without_figure_caption() -> None:
     assert "Anexo 2: Diagrama de flujo del proceso de recoleccion de datos" in texts
     assert not any(text.startswith("Figura ") for text in texts)
     assert len(doc.inline_shapes) >= 2
+
+
+def test_known_abbreviation_matcher_keeps_table_order_and_token_boundaries() -> None:
+    rows = _derive_document_abbreviation_rows(
+        {
+            "cuerpo": [
+                {
+                    "titulo": "I. PLANTEAMIENTO",
+                    "_ai_content": (
+                        "El sistema SCADA expone una API; el modelo de ia usa "
+                        "datos GPS. API2, IAS y KPIs no cuentan; ML si."
+                    ),
+                }
+            ]
+        }
+    )
+
+    assert [row["sigla"] for row in rows] == ["IA", "ML", "API", "SCADA", "GPS"]
@@ -0,0 +1,103 @@
+"""Tests for the cached, invalidation-aware format index in app.core.loaders."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core import loaders, registry
+
+
+class _FakeProvider:
+    def __init__(self, data_dir: Path) -> None:
+        self._data_dir = data_dir
+
+    def get_data_dir(self) -> Path:
+        return self._data_dir
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "zzz"
+    (root / "informe").mkdir(parents=True)
+    _write(root / "informe" / "zzz_informe_cuant.json", {"titulo": "Informe"})
+    _write(root / "informe" / "zzz_informe_cual.json", {"titulo": "Cualitativo"})
+
+    monkeypatch.setattr(registry, "get_provider", lambda code: _FakeProvider(root))
+    loaders.clear_format_index_cache()
+    yield root
+    loaders.clear_format_index_cache()
+
+
+@pytest.fixture
+def load_calls(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    calls: list[Path] = []
+    original = loaders.load_json_file
+
+    def _counting(path: Path):
+        calls.append(Path(path))
+        return original(path)
+
+    monkeypatch.setattr(loaders, "load_json_file", _counting)
+    return calls
+
+
+def _write(path: Path, payload: dict) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_lookup_is_served_from_the_index(data_dir: Path, load_calls: list[Path]) -> None:
+    first = loaders.find_format_index("zzz-informe-cuant")
+    built = len(load_calls)
+    for _ in range(5):
+        assert loaders.find_format_index("zzz-informe-cuant") == first
+    assert loaders.find_format_index("zzz-no-existe") is None
+
+    assert first is not None and first.titulo == "Informe"
+    assert built == 2
+    assert len(load_calls) == built
+
+
+def test_edited_file_is_reindexed_alone(data_dir: Path, load_calls: list[Path]) -> None:
+    loaders.discover_format_files("zzz")
+    load_calls.clear()
+
+    _write(data_dir / "informe" / "zzz_informe_cuant.json", {"titulo": "Informe v2 editado"})
+
+    assert loaders.find_format_index("zzz-informe-cuant").titulo == "Informe v2 editado"
+    assert [path.name for path in load_calls] == ["zzz_informe_cuant.json"]
+
+
+def test_added_and_removed_files_rebuild_the_index(data_dir: Path) -> None:
+    assert len(loaders.discover_format_files("zzz")) == 2
+
+    _write(data_dir / "informe" / "zzz_informe_mixto.json", {"titulo": "Mixto"})
+    assert loaders.find_format_index("zzz-informe-mixto") is not None
+
+    (data_dir / "informe" / "zzz_informe_cual.json").unlink()
+    ids = [item.format_id for item in loaders.discover_format_files("zzz")]
+    assert ids == ["zzz-informe-cuant", "zzz-informe-mixto"]
+
+
+def test_clear_provider_cache_drops_the_format_index(data_dir: Path) -> None:
+    loaders.discover_format_files("zzz")
+    assert loaders._FORMAT_INDEX
+
+    registry.clear_provider_cache()
+
+    assert not loaders._FORMAT_INDEX
+
+
+def test_list_entries_are_copied_on_load(data_dir: Path) -> None:
+    (data_dir / "posgrado").mkdir()
+    (data_dir / "posgrado" / "zzz_posgrado.json").write_text(
+        json.dumps([{"id": "zzz-maestria", "secciones": [{"titulo": "I"}]}]),
+        encoding="utf-8",
+    )
+
+    payload = loaders.load_format_by_id("zzz-maestria")
+    payload["secciones"][0]["titulo"] = "mutado"
+
+    assert loaders.load_format_by_id("zzz-maestria")["secciones"][0]["titulo"] == "I"
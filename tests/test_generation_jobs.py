@@ -0,0 +1,218 @@
+"""Tests for the async generation job queue and /api/v1/runs."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.api import generation_router
+from app.modules.generation import jobs, service
+from app.modules.generation.jobs import (
+    GenerationJobQueue,
+    GenerationQueueFull,
+    reset_generation_queue,
+)
+from app.modules.generation.service import ArtifactInfo, GenerationResult
+
+PAYLOAD = {"projectId": "proj-1", "formatId": "unac-informe-cuant", "values": {}}
+
+
+@pytest.fixture(autouse=True)
+def artifacts_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "artifacts"
+    monkeypatch.setattr(jobs, "get_artifacts_dir", lambda: root)
+    monkeypatch.setattr(service, "get_artifacts_dir", lambda: root)
+    return root
+
+
+@pytest.fixture
+def client():
+    reset_generation_queue()
+    yield TestClient(app)
+    reset_generation_queue()
+
+
+def _fake_result(project_id: str, format_id: str, run_id: str, path: Path):
+    return GenerationResult(
+        project_id=project_id,
+        run_id=run_id,
+        format_id=format_id,
+        status="success",
+        artifacts=[
+            ArtifactInfo(
+                type="docx",
+                path=path,
+                download_url=f"/api/v1/artifacts/{run_id}/docx",
+            )
+        ],
+    )
+
+
+def _poll(client: TestClient, run_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"/api/v1/runs/{run_id}").json()
+        if body["status"] in ("done", "error") or time.monotonic() > deadline:
+            return body
+        time.sleep(0.02)
+
+
+def test_generate_returns_202_and_run_reports_timings(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    release = threading.Event()
+
+    def fake_generate_artifacts(project_id, format_id, run_id, **_kwargs):
+        release.wait(5)
+        return _fake_result(project_id, format_id, run_id, tmp_path / "a.docx")
+
+    monkeypatch.setattr(generation_router, "generate_artifacts", fake_generate_artifacts)
+
+    response = client.post("/api/v1/generate", json=PAYLOAD)
+    assert response.status_code == 202
+    run_id = response.json()["runId"]
+    assert response.json()["statusUrl"] == f"/api/v1/runs/{run_id}"
+
+    pending = client.get(f"/api/v1/runs/{run_id}").json()
+    assert pending["status"] in ("queued", "running")
+    assert pending["timings"]["totalMs"] is None
+
+    release.set()
+    body = _poll(client, run_id)
+    assert body["status"] == "done"
+    assert body["artifacts"][0]["downloadUrl"] == f"/api/v1/artifacts/{run_id}/docx"
+    assert body["timings"]["totalMs"] >= body["timings"]["runMs"] >= 0
+
+
+def test_generate_errors_are_reported_in_run_status(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fake_generate_artifacts(project_id, format_id, run_id, **_kwargs):
+        return GenerationResult(
+            project_id=project_id,
+            run_id=run_id,
+            format_id=format_id,
+            status="error",
+            error=f"Format not found: {format_id}",
+        )
+
+    monkeypatch.setattr(generation_router, "generate_artifacts", fake_generate_artifacts)
+
+    run_id = client.post("/api/v1/generate", json=PAYLOAD).json()["runId"]
+    body = _poll(client, run_id)
+    assert body["status"] == "error"
+    assert "not found" in body["error"]
+
+    waited = client.post("/api/v1/generate?wait=true", json=PAYLOAD)
+    assert waited.status_code == 404
+
+
+def test_unknown_run_returns_404(client: TestClient) -> None:
+    assert client.get("/api/v1/runs/gen-missing").status_code == 404
+    assert client.get("/api/v1/runs/..%2F..%2Fetc").status_code == 404
+
+
+def test_run_finished_by_another_worker_is_served_from_disk(
+    client: TestClient, artifacts_dir: Path
+) -> None:
+    other_worker = GenerationJobQueue(max_workers=1)
+
+    def fake_generate(project_id, format_id, run_id):
+        docx = artifacts_dir / run_id / "doc.docx"
+        docx.write_bytes(b"PK docx")
+        return _fake_result(project_id, format_id, run_id, docx)
+
+    try:
+        run, future = other_worker.submit(fake_generate, project_id="p", format_id="f")
+        future.result(timeout=10)
+    finally:
+        other_worker.shutdown()
+
+    body = client.get(f"/api/v1/runs/{run.run_id}").json()
+    assert body["status"] == "done"
+    assert body["timings"] == run.timings()
+    download = client.get(body["artifacts"][0]["downloadUrl"])
+    assert download.status_code == 200
+    assert download.content == b"PK docx"
+
+
+def test_queue_limits_concurrent_runs(tmp_path: Path) -> None:
+    queue = GenerationJobQueue(max_workers=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_generate(project_id, format_id, run_id):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return _fake_result(project_id, format_id, run_id, tmp_path / "x.docx")
+
+    try:
+        futures = [
+            queue.submit(fake_generate, project_id="p", format_id="f")[1]
+            for _ in range(6)
+        ]
+        runs = [future.result(timeout=10) for future in futures]
+    finally:
+        queue.shutdown()
+
+    assert peak == 2
+    assert len({run.run_id for run in runs}) == 6
+    assert all(run.status == "done" for run in runs)
+
+
+def test_queue_rejects_submissions_past_max_backlog(tmp_path: Path) -> None:
+    queue = GenerationJobQueue(max_workers=1, max_queued=1)
+    release = threading.Event()
+
+    def fake_generate(project_id, format_id, run_id):
+        release.wait(10)
+        return _fake_result(project_id, format_id, run_id, tmp_path / "x.docx")
+
+    try:
+        futures = [
+            queue.submit(fake_generate, project_id="p", format_id="f")[1]
+            for _ in range(2)
+        ]
+        with pytest.raises(GenerationQueueFull):
+            queue.submit(fake_generate, project_id="p", format_id="f")
+        release.set()
+        for future in futures:
+            future.result(timeout=10)
+        _, future = queue.submit(fake_generate, project_id="p", format_id="f")
+        assert future.result(timeout=10).status == "done"
+    finally:
+        release.set()
+        queue.shutdown()
+
+
+def test_generate_returns_429_when_queue_is_full(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GICATESIS_GENERATION_CONCURRENCY", "1")
+    monkeypatch.setenv("GICATESIS_GENERATION_MAX_QUEUED", "0")
+    reset_generation_queue()
+    release = threading.Event()
+
+    def fake_generate_artifacts(project_id, format_id, run_id, **_kwargs):
+        release.wait(10)
+        return _fake_result(project_id, format_id, run_id, Path("a.docx"))
+
+    monkeypatch.setattr(generation_router, "generate_artifacts", fake_generate_artifacts)
+    try:
+        assert client.post("/api/v1/generate", json=PAYLOAD).status_code == 202
+        rejected = client.post("/api/v1/generate", json=PAYLOAD)
+        assert rejected.status_code == 429
+        assert "full" in rejected.json()["detail"]
+    finally:
+        release.set()
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import json
+
+from app.core.loaders import load_format_by_id
 from app.modules.generation.preprocessor import (
     apply_ai_content,
+    exclude_instruction_keys,
     merge_values,
+    preprocess_format_data,
     sanitize_ai_text,
 )
 
@@ -62,6 +67,51 @@ def test_merge_values_exposes_structured_project_tables_at_root() -> None:
     assert merged["operacionalizacion_vd"]["filas"][0]["dimension"] == "D2"
 
 
+def _sequential_placeholder_reference(text: str, values: dict) -> str:
+    result = text
+    for key, value in values.items():
+        val_str = str(value).strip() if value is not None else ""
+        if not val_str:
+            continue
+        for pattern in (f"[{key.upper()}]", f"[{key}]", f"{{{key}}}", f"<{key}>"):
+            result = result.replace(pattern, val_str)
+    return result
+
+
+def test_merge_values_replaces_all_placeholder_variants_in_one_pass() -> None:
+    data = {
+        "caratula": {"autor": "[AUTOR] / [autor] / {autor} / <autor>"},
+        "lista": ["{fecha}", "sin placeholder", "[desconocido]", 3],
+    }
+    values = {"autor": "  Ana Perez ", "fecha": "2026", "vacio": "", "nulo": None}
+
+    merged = merge_values(data, values)
+
+    assert merged["caratula"]["autor"] == "Ana Perez / Ana Perez / Ana Perez / Ana Perez"
+    assert merged["lista"] == ["2026", "sin placeholder", "[desconocido]", 3]
+
+
+def test_merge_values_keeps_sequential_precedence_and_cascades() -> None:
+    cases = [
+        # Misma variante registrada por dos claves: gana la primera.
+        ("[KEY]", {"key": "minuscula", "KEY": "mayuscula"}),
+        # Un valor que contiene un placeholder de una clave posterior se expande...
+        ("{a} y {b}", {"a": "<b>", "b": "B"}),
+        # ...pero no el de una clave anterior.
+        ("{a} y {b}", {"b": "B", "a": "<b>"}),
+        # Placeholder formado al insertar un valor dentro de otro span.
+        ("[pre{x}]", {"x": "fijo", "prefijo": "hit"}),
+        # Claves con delimitadores usan el recorrido secuencial.
+        ("{[a]} [a]", {"[a]": "X", "a": "Y"}),
+    ]
+    for text, values in cases:
+        merged = merge_values({"texto": text}, values)
+        assert merged["texto"] == _sequential_placeholder_reference(text, values), (
+            text,
+            values,
+        )
+
+
 def test_sanitize_ai_text_removes_markdown_and_placeholder_lines() -> None:
     raw = (
         "# Encabezado markdown\n"
@@ -750,3 +800,104 @@ def test_apply_ai_content_matches_annex_by_position_when_base_title_is_not_annex
         tabla["_ai_content"][0]["titulo"]
         == "Tabla 15. Tabla de resultados complementarios"
     )
+
+
+def test_preprocess_format_data_matches_stage_by_stage_chain() -> None:
+    values = {
+        "titulo": "Mantenimiento predictivo [AUTOR]",
+        "autor1_nombres": "Ana Perez",
+        "asesor_nombres": "Luis Rojas",
+        "anio": "2026",
+        "matriz_consistencia": {"problema": "P", "objetivos": ["O1", "O2"]},
+    }
+    for format_id in ("unac-proyecto-cuant", "unac-informe-cual"):
+        data = load_format_by_id(format_id)
+        ai_sections = [{"path": "INFORMACION BASICA", "content": "Datos IA."}]
+        for chapter in data.get("cuerpo", []):
+            for item in chapter.get("contenido") or []:
+                if isinstance(item, dict) and item.get("texto"):
+                    ai_sections.append(
+                        {"path": f"{chapter['titulo']}/{item['texto']}", "content": "Texto IA."}
+                    )
+        selected = [{"path": data["cuerpo"][0]["titulo"]}]
+
+        chain = apply_ai_content(
+            merge_values(exclude_instruction_keys(load_format_by_id(format_id)), values),
+            ai_sections,
+            selected_sections=selected,
+        )
+        snapshot = json.dumps(data, ensure_ascii=False)
+        fused = preprocess_format_data(data, values, ai_sections, selected)
+
+        assert json.dumps(fused, ensure_ascii=False, indent=2) == json.dumps(
+            chain, ensure_ascii=False, indent=2
+        )
+        assert json.dumps(data, ensure_ascii=False) == snapshot
+
+
+def test_preprocess_format_data_shares_unchanged_subtrees() -> None:
+    data = {
+        "_meta": {"id": "demo"},
+        "caratula": {"titulo": "[TITULO]"},
+        "matriz": {"filas": [["sin placeholders"]]},
+        "cuerpo": [{"titulo": "I. INTRO", "guia": "quitar", "contenido": [{"texto": "1.1"}]}],
+        "informacion_basica": {"tipo": "Aplicada"},
+    }
+
+    result = preprocess_format_data(
+        data,
+        {"titulo": "Mi tesis"},
+        [{"path": "INFORMACION BASICA", "content": "Datos IA."}],
+    )
+
+    assert result["_meta"] is data["_meta"]
+    assert result["matriz"] is data["matriz"]
+    assert result["caratula"]["titulo"] == "Mi tesis"
+    assert "guia" not in result["cuerpo"][0]
+    assert result["informacion_basica"]["_ai_content"] == "Datos IA."
+    assert data["caratula"] == {"titulo": "[TITULO]"}
+    assert data["informacion_basica"] == {"tipo": "Aplicada"}
+    assert data["cuerpo"][0]["guia"] == "quitar"
+
+
+def test_apply_ai_content_skips_ambiguous_leaf_and_annex_matches() -> None:
+    data = {
+        "cuerpo": [
+            {"titulo": "I. PLANTEAMIENTO", "contenido": [{"texto": "Justificación"}]},
+        ],
+        "finales": {
+            "anexos": {
+                "titulo_seccion": "ANEXOS",
+                "lista": [{"titulo": "Anexo 1: Matriz"}],
+            }
+        },
+    }
+    ai_sections = [
+        {"path": "OTRO/Justificación", "content": "Primera."},
+        {"path": "TERCERO/Justificacion", "content": "Segunda."},
+        {"path": "ANEXOS/Anexo 1: Fotos", "content": "Fotos."},
+        {"path": "ANEXOS/Anexo 1: Tabla", "content": "Tabla."},
+    ]
+
+    result = apply_ai_content(data, ai_sections)
+
+    assert "_ai_content" not in result["cuerpo"][0]["contenido"][0]
+    assert "_ai_content" not in result["finales"]["anexos"]["lista"][0]
+
+
+def test_apply_ai_content_consumes_each_leaf_match_once() -> None:
+    data = {
+        "cuerpo": [
+            {
+                "titulo": "I. PLANTEAMIENTO",
+                "contenido": [{"texto": "Objetivos"}, {"texto": "Objetivos"}],
+            },
+        ]
+    }
+    ai_sections = [{"path": "OTRO CAPITULO/Objetivos", "content": "Objetivos IA."}]
+
+    result = apply_ai_content(data, ai_sections)
+    items = result["cuerpo"][0]["contenido"]
+
+    assert items[0]["_ai_content"] == "Objetivos IA."
+    assert "_ai_content" not in items[1]
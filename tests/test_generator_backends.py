@@ -0,0 +1,209 @@
+"""Tests for the pluggable DOCX generator backends."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.core import document_generator, generator_backends
+from app.core.generator_backends import (
+    InProcessGeneratorBackend,
+    SubprocessGeneratorBackend,
+    WorkerPoolGeneratorBackend,
+    get_generator_backend,
+    is_shared_generator,
+    reset_generator_backend,
+)
+from app.core.loaders import load_json_file
+from app.core.registry import get_provider
+
+FORMAT_ID = "unac-informe-cuant"
+
+
+@pytest.fixture
+def shared_generator():
+    return get_provider("unac").get_generator_command("informe")
+
+
+@pytest.fixture
+def format_data(unac_data_dir: Path) -> dict:
+    return load_json_file(unac_data_dir / "informe" / "unac_informe_cuant.json")
+
+
+@pytest.fixture
+def copy_script(tmp_path: Path) -> Path:
+    """Generador custom que copia el JSON de entrada como salida."""
+    script = tmp_path / "copy_generator.py"
+    script.write_text(
+        "import shutil, sys\nshutil.copyfile(sys.argv[1], sys.argv[2])\n",
+        encoding="utf-8",
+    )
+    return script
+
+
+@pytest.fixture
+def backend_mode(monkeypatch: pytest.MonkeyPatch):
+    def _set(mode: str) -> None:
+        monkeypatch.setenv("GICATESIS_GENERATOR_MODE", mode)
+        reset_generator_backend()
+
+    yield _set
+    reset_generator_backend()
+
+
+def _assert_docx(path: Path) -> None:
+    assert path.exists() and path.stat().st_size > 0
+    with zipfile.ZipFile(path) as archive:
+        assert "word/document.xml" in archive.namelist()
+
+
+def test_shared_generator_detection(shared_generator, copy_script: Path) -> None:
+    assert is_shared_generator(shared_generator)
+    assert not is_shared_generator(copy_script)
+    assert not is_shared_generator([sys.executable, str(shared_generator)])
+
+
+def test_subprocess_backend_serializes_data_to_temp_json(
+    copy_script: Path, tmp_path: Path
+) -> None:
+    output = tmp_path / "out.json"
+    SubprocessGeneratorBackend().generate(
+        copy_script, output, data={"titulo": "Demo"}
+    )
+
+    assert json.loads(output.read_text(encoding="utf-8")) == {"titulo": "Demo"}
+
+
+def test_subprocess_backend_reports_stderr(tmp_path: Path) -> None:
+    script = tmp_path / "failing.py"
+    script.write_text("import sys\nsys.exit('boom')\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        SubprocessGeneratorBackend().generate(script, tmp_path / "x.docx", data={})
+
+
+def test_inprocess_backend_renders_shared_generator(
+    shared_generator, format_data: dict, tmp_path: Path
+) -> None:
+    output = tmp_path / "inprocess.docx"
+    InProcessGeneratorBackend().generate(shared_generator, output, data=format_data)
+
+    _assert_docx(output)
+
+
+def test_inprocess_backend_falls_back_to_subprocess_for_custom_generators(
+    copy_script: Path, tmp_path: Path
+) -> None:
+    output = tmp_path / "custom.json"
+    InProcessGeneratorBackend().generate(copy_script, output, data={"a": 1})
+
+    assert json.loads(output.read_text(encoding="utf-8")) == {"a": 1}
+
+
+def test_pool_backend_returns_docx_bytes_from_warm_worker(
+    shared_generator, format_data: dict, tmp_path: Path
+) -> None:
+    backend = WorkerPoolGeneratorBackend(size=1, timeout=120)
+    try:
+        backend.warm()
+        output = tmp_path / "pool.docx"
+        backend.generate(shared_generator, output, data=format_data)
+    finally:
+        backend.shutdown()
+
+    _assert_docx(output)
+
+
+def test_pool_timeout_kills_only_the_hung_worker(
+    shared_generator, format_data: dict, tmp_path: Path
+) -> None:
+    backend = WorkerPoolGeneratorBackend(size=2, timeout=5)
+    errors = []
+    try:
+        backend.warm()
+        pids = {worker.pid for worker in backend._workers}
+
+        def hang():
+            try:
+                backend._run(time.sleep, 60)
+            except Exception as exc:
+                errors.append(exc)
+
+        hung = threading.Thread(target=hang)
+        hung.start()
+        while backend._idle.qsize() > 1:
+            time.sleep(0.01)
+        output = tmp_path / "concurrent.docx"
+        backend.generate(shared_generator, output, data=format_data)
+        hung.join(30)
+
+        survivors = {worker.pid for worker in backend._workers}
+        _assert_docx(output)
+        assert len(errors) == 1 and isinstance(errors[0], generator_backends._WorkerTimeout)
+        assert len(pids & survivors) == 1 and len(survivors) == 2
+        assert backend._run(generator_backends.os.getpid) in survivors
+    finally:
+        backend.shutdown()
+    assert backend._idle is None and not backend._workers
+
+
+def test_pool_timeout_excludes_time_waiting_for_a_free_worker() -> None:
+    backend = WorkerPoolGeneratorBackend(size=1, timeout=2)
+    try:
+        backend.warm()
+        first = threading.Thread(target=backend._run, args=(time.sleep, 1.5))
+        first.start()
+        while backend._idle.qsize():
+            time.sleep(0.01)
+        # Espera ~1.5s en cola + 1s de trabajo: supera el timeout solo si la
+        # cola contara.
+        backend._run(time.sleep, 1.0)
+        first.join(10)
+    finally:
+        backend.shutdown()
+
+
+def test_backend_selection_reads_env(backend_mode) -> None:
+    backend_mode("inprocess")
+    assert get_generator_backend().name == "inprocess"
+
+    backend_mode("desconocido")
+    assert get_generator_backend().name == "subprocess"
+
+
+def test_generate_document_by_id_uses_override_data_in_process(
+    backend_mode, format_data: dict
+) -> None:
+    backend_mode("inprocess")
+    format_data = dict(format_data)
+    format_data["caratula"] = dict(format_data.get("caratula") or {})
+
+    output_path, filename = document_generator.generate_document_by_id(
+        FORMAT_ID, override_data=format_data
+    )
+    try:
+        assert filename == "UNAC_INFORME_CUANT.docx"
+        _assert_docx(output_path)
+    finally:
+        output_path.unlink(missing_ok=True)
+
+
+def test_generate_document_by_id_wraps_backend_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _FailingBackend:
+        name = "failing"
+
+        def generate(self, *args, **kwargs):
+            raise RuntimeError("render exploded")
+
+    monkeypatch.setattr(generator_backends, "_BACKEND", _FailingBackend())
+
+    with pytest.raises(RuntimeError, match="Document generation failed"):
+        document_generator.generate_document_by_id(FORMAT_ID)
@@ -0,0 +1,157 @@
+"""Tests for the persistent LibreOffice conversion pool (fake soffice binary)."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core import libreoffice_pool, pdf_converter
+from app.core.libreoffice_pool import LibreOfficeServerPool, reset_libreoffice_pool
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="LibreOffice pool is Linux-only")
+
+# Emula `soffice --convert-to pdf --outdir DIR SRC`: escribe DIR/<stem>.pdf con
+# el perfil usado; un DOCX cuyo nombre contiene "hang" se queda colgado.
+_FAKE_SOFFICE = f"""#!{sys.executable}
+import pathlib, sys, time
+args = sys.argv[1:]
+profile = next(a.split("=", 1)[1] for a in args if a.startswith("-env:UserInstallation="))
+outdir = pathlib.Path(args[args.index("--outdir") + 1])
+source = pathlib.Path(args[-1])
+if "hang" in source.name:
+    time.sleep(60)
+if "broken" in source.name:
+    sys.exit("cannot load document")
+(outdir / (source.stem + ".pdf")).write_text(profile, encoding="utf-8")
+"""
+
+
+@pytest.fixture
+def fake_soffice(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setattr(libreoffice_pool, "uno", None)
+    script = tmp_path / "soffice"
+    script.write_text(_FAKE_SOFFICE, encoding="utf-8")
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.fixture
+def pool(fake_soffice: str, tmp_path: Path):
+    instance = LibreOfficeServerPool(fake_soffice, size=2, profile_root=tmp_path / "profiles")
+    yield instance
+    instance.shutdown()
+
+
+def _docx(tmp_path: Path, name: str) -> Path:
+    path = tmp_path / name
+    path.write_bytes(b"PK fake docx")
+    return path
+
+
+def test_pool_converts_using_persistent_profiles(pool, tmp_path: Path) -> None:
+    profiles = set()
+    for index in range(4):
+        target = tmp_path / "out" / f"doc-{index}.pdf"
+        pool.convert(str(_docx(tmp_path, f"doc-{index}.docx")), str(target))
+        profiles.add(target.read_text(encoding="utf-8"))
+
+    assert profiles <= {
+        (tmp_path / "profiles" / f"instance-{os.getpid()}-{i}").resolve().as_uri()
+        for i in range(2)
+    }
+    assert sum(item["conversions"] for item in pool.stats()["instances"]) == 4
+
+
+def test_profiles_are_per_process_and_shutdown_leaves_foreign_ones(
+    fake_soffice: str, tmp_path: Path
+) -> None:
+    root = tmp_path / "profiles"
+    foreign = root / "instance-1-0"
+    foreign.mkdir(parents=True)
+    (foreign / ".lock").write_text("otro worker", encoding="utf-8")
+
+    pool = LibreOfficeServerPool(fake_soffice, size=1, profile_root=root)
+    try:
+        pool.convert(str(_docx(tmp_path, "own.docx")), str(tmp_path / "own.pdf"))
+    finally:
+        pool.shutdown()
+
+    assert (tmp_path / "own.pdf").read_text(encoding="utf-8").endswith(
+        f"profiles/instance-{os.getpid()}-0"
+    )
+    assert (foreign / ".lock").is_file()
+    assert not (root / f"instance-{os.getpid()}-0").exists()
+
+
+def test_same_stem_in_parallel_does_not_collide(pool, tmp_path: Path) -> None:
+    sources = [tmp_path / name / "doc.docx" for name in ("a", "b")]
+    errors: list[BaseException] = []
+
+    def _run(source: Path) -> None:
+        source.parent.mkdir()
+        source.write_bytes(b"PK")
+        try:
+            pool.convert(str(source), str(source.with_suffix(".pdf")))
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_run, args=(source,)) for source in sources]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert all(source.with_suffix(".pdf").is_file() for source in sources)
+
+
+def test_hung_conversion_times_out_and_instance_recovers(
+    fake_soffice: str, tmp_path: Path
+) -> None:
+    pool = LibreOfficeServerPool(fake_soffice, size=1, profile_root=tmp_path / "p")
+    try:
+        with pytest.raises(TimeoutError):
+            pool.convert(str(_docx(tmp_path, "hang.docx")), str(tmp_path / "h.pdf"), timeout=1)
+
+        pool.convert(str(_docx(tmp_path, "ok.docx")), str(tmp_path / "ok.pdf"), timeout=30)
+    finally:
+        pool.shutdown()
+
+    assert (tmp_path / "ok.pdf").is_file()
+    assert pool.stats()["instances"][0]["restarts"] == 1
+
+
+def test_conversion_errors_are_reported(pool, tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match="cannot load document"):
+        pool.convert(str(_docx(tmp_path, "broken.docx")), str(tmp_path / "b.pdf"))
+
+
+def test_convert_docx_to_pdf_uses_pool_from_env(
+    fake_soffice: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GICATESIS_LIBREOFFICE_BIN", fake_soffice)
+    monkeypatch.setenv("GICATESIS_LIBREOFFICE_POOL_SIZE", "1")
+    monkeypatch.setattr(libreoffice_pool, "get_libreoffice_profile_root", lambda: tmp_path / "env")
+    reset_libreoffice_pool()
+    try:
+        pdf_converter.convert_docx_to_pdf(
+            str(_docx(tmp_path, "env.docx")), str(tmp_path / "env.pdf")
+        )
+        assert libreoffice_pool.get_libreoffice_pool().size == 1
+    finally:
+        reset_libreoffice_pool()
+
+    assert (tmp_path / "env.pdf").read_text(encoding="utf-8").endswith(
+        f"env/instance-{os.getpid()}-0"
+    )
+
+
+def test_pool_size_zero_disables_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GICATESIS_LIBREOFFICE_POOL_SIZE", "0")
+    reset_libreoffice_pool()
+
+    assert libreoffice_pool.get_libreoffice_pool() is None
@@ -0,0 +1,158 @@
+"""Tests for the in-process metrics registry and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.core import metrics
+from app.core.document_generator import run_generator
+from app.core.generator_backends import reset_generator_backend
+from app.core.loaders import load_json_file
+from app.core.metrics import reset_metrics_registry
+from app.core.registry import get_provider
+from app.main import app
+from app.modules.formats import router as formats_router
+from app.universities.shared.universal_generator import render_document_bytes
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("GICATESIS_METRICS", raising=False)
+    reset_metrics_registry()
+    yield
+    reset_metrics_registry()
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"serie no encontrada: {prefix}")
+
+
+def test_histogram_exposition_is_cumulative_with_sum_and_count() -> None:
+    for value in (0.02, 0.02, 3.0, 100.0):
+        metrics.observe(
+            "gicatesis_stage_duration_seconds", value, stage="render", format="f1"
+        )
+
+    text = metrics.render_metrics()
+    series = 'gicatesis_stage_duration_seconds_bucket{stage="render",format="f1",le='
+
+    assert "# TYPE gicatesis_stage_duration_seconds histogram" in text
+    assert _sample(text, series + '"0.01"}') == 0
+    assert _sample(text, series + '"0.025"}') == 2
+    assert _sample(text, series + '"5"}') == 3
+    assert _sample(text, series + '"+Inf"}') == 4
+    labels = '{stage="render",format="f1"}'
+    assert _sample(text, f"gicatesis_stage_duration_seconds_count{labels}") == 4
+    assert _sample(text, f"gicatesis_stage_duration_seconds_sum{labels}") == pytest.approx(103.04)
+
+
+def test_counter_and_label_escaping() -> None:
+    metrics.inc("gicatesis_cache_requests_total", cache="pdf", result="hit")
+    metrics.inc("gicatesis_cache_requests_total", cache="pdf", result="hit")
+    metrics.observe("gicatesis_block_render_duration_seconds", 0.001, block_type='a"b\\c')
+
+    text = metrics.render_metrics()
+
+    assert _sample(text, 'gicatesis_cache_requests_total{cache="pdf",result="hit"}') == 2
+    assert 'block_type="a\\"b\\\\c"' in text
+
+
+def test_captured_observations_replay_into_registry() -> None:
+    with metrics.capture_observations() as captured:
+        metrics.observe("gicatesis_generator_duration_seconds", 0.5, backend="pool")
+    assert "gicatesis_generator_duration_seconds_count{" not in metrics.render_metrics()
+
+    metrics.replay_observations(captured)
+
+    text = metrics.render_metrics()
+    assert _sample(text, 'gicatesis_generator_duration_seconds_count{backend="pool"}') == 1
+
+
+def test_disabled_registry_ignores_observations_and_hides_endpoint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GICATESIS_METRICS", "false")
+    reset_metrics_registry()
+    metrics.inc("gicatesis_cache_requests_total", cache="docx", result="miss")
+
+    assert "gicatesis_cache_requests_total{" not in metrics.render_metrics()
+    assert TestClient(app).get("/metrics").status_code == 404
+
+
+def test_render_records_stage_and_block_type_series_exposed_at_metrics() -> None:
+    data = {
+        "_meta": {"id": "fmt-metricas"},
+        "caratula": {"universidad": "UNIVERSIDAD TEST", "titulo": "Titulo"},
+        "cuerpo": [{"titulo": "I. INTRODUCCION", "contenido": [{"texto": "1.1 Tema"}]}],
+    }
+    render_document_bytes(data)
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for stage in ("normalize", "render", "save"):
+        labels = f'{{stage="{stage}",format="fmt-metricas"}}'
+        assert _sample(response.text, f"gicatesis_stage_duration_seconds_count{labels}") == 1
+    assert 'gicatesis_block_render_duration_seconds_count{block_type="heading"}' in response.text
+
+
+def test_subprocess_generator_replays_child_stage_and_block_series(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, unac_data_dir: Path
+) -> None:
+    monkeypatch.setenv("GICATESIS_GENERATOR_MODE", "subprocess")
+    reset_generator_backend()
+    generator = get_provider("unac").get_generator_command("informe")
+    data = load_json_file(unac_data_dir / "informe" / "unac_informe_cuant.json")
+    data["_meta"] = {"id": "fmt-subprocess"}
+
+    try:
+        run_generator(generator, tmp_path / "out.docx", data=data)
+    finally:
+        reset_generator_backend()
+
+    text = metrics.render_metrics()
+    assert _sample(text, 'gicatesis_generator_duration_seconds_count{backend="subprocess"}') == 1
+    for stage in ("normalize", "render", "save"):
+        labels = f'{{stage="{stage}",format="fmt-subprocess"}}'
+        assert _sample(text, f"gicatesis_stage_duration_seconds_count{labels}") == 1
+    assert 'gicatesis_block_render_duration_seconds_count{block_type="heading"}' in text
+
+
+def test_metrics_endpoint_requires_api_key_when_configured(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(main_module, "API_KEY", "secret")
+    client = TestClient(app)
+
+    assert client.get("/metrics").status_code == 403
+    response = client.get("/metrics", headers={"X-GICATESIS-KEY": "secret"})
+    assert response.status_code == 200
+
+
+def test_formats_cache_counts_docx_hits_and_misses(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fake_generate_document(format_id):
+        out = tmp_path / f"out-{time.monotonic_ns()}.docx"
+        out.write_bytes(b"PK docx")
+        return str(out), f"{format_id}.docx"
+
+    monkeypatch.setattr(formats_router, "get_docx_cache_dir", lambda: tmp_path / "docx")
+    monkeypatch.setattr(formats_router, "get_pdf_cache_dir", lambda: tmp_path / "pdf")
+    monkeypatch.setattr(formats_router.service, "generate_document", fake_generate_document)
+
+    formats_router._ensure_docx_cached("unac-informe-cuant", "c" * 64)
+    formats_router._ensure_docx_cached("unac-informe-cuant", "c" * 64)
+
+    text = metrics.render_metrics()
+    assert _sample(text, 'gicatesis_cache_requests_total{cache="docx",result="miss"}') == 1
+    assert _sample(text, 'gicatesis_cache_requests_total{cache="docx",result="hit"}') == 1
@@ -0,0 +1,140 @@
+"""Tests for the background, prioritized PDF prewarm and its status endpoint."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.formats import prewarm
+from app.modules.formats.prewarm import PdfPrewarmer, prioritize
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> dict:
+    state = {"active": 0, "peak": 0, "built": [], "release": threading.Event()}
+    state["release"].set()
+    lock = threading.Lock()
+
+    def fake_ensure(format_id, _version):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        state["release"].wait(5)
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        if format_id == "broken":
+            raise RuntimeError("soffice crashed")
+        state["built"].append(format_id)
+
+    monkeypatch.setattr(prewarm, "_get_source_version", lambda format_id: "v1")
+    monkeypatch.setattr(prewarm, "_is_pdf_cached", lambda format_id, _v: format_id == "cached")
+    monkeypatch.setattr(prewarm, "_ensure_pdf_cached", fake_ensure)
+    monkeypatch.setattr(prewarm, "_pdf_hits_by_format", lambda: {})
+    return state
+
+
+def test_prioritize_orders_by_hits_and_keeps_ties_stable() -> None:
+    order = prioritize(["a", "b", "c", "d"], {"c": 5, "b": 1})
+    assert order == ["c", "b", "a", "d"]
+
+
+def test_prewarm_is_bounded_and_reports_counts(fake_pipeline: dict) -> None:
+    ids = ["f1", "f2", "cached", "f3", "broken", "f4"]
+    prewarmer = PdfPrewarmer(workers=2)
+
+    assert prewarmer.start(ids)
+    assert prewarmer.wait(10)
+
+    status = prewarmer.status()
+    assert fake_pipeline["peak"] == 2
+    assert (status["done"], status["fresh"], status["failed"], status["pending"]) == (
+        4,
+        1,
+        1,
+        0,
+    )
+    # Un fallo no traba el readiness: se reporta aparte como degraded.
+    assert status["state"] == "finished" and status["ready"] and status["degraded"]
+    assert "soffice crashed" in status["errors"]["broken"]
+    assert sorted(fake_pipeline["built"]) == ["f1", "f2", "f3", "f4"]
+
+
+def test_start_is_non_blocking_and_single_run(fake_pipeline: dict) -> None:
+    fake_pipeline["release"].clear()
+    prewarmer = PdfPrewarmer(workers=1)
+
+    began = time.monotonic()
+    assert prewarmer.start(["f1", "f2"])
+    assert time.monotonic() - began < 1.0
+    assert not prewarmer.start(["f1"])
+    assert prewarmer.status()["state"] == "running"
+
+    fake_pipeline["release"].set()
+    assert prewarmer.wait(10)
+    assert prewarmer.status()["ready"]
+
+
+def test_disabled_prewarm_reports_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PDF_PREWARM_ON_STARTUP", raising=False)
+    monkeypatch.setattr(prewarm, "_PREWARMER", PdfPrewarmer(workers=1))
+
+    assert prewarm.start_pdf_prewarm_on_startup() is False
+    body = TestClient(app).get("/api/v1/cache/prewarm").json()
+
+    assert body["state"] == "idle" and body["total"] == 0
+    assert body["enabled"] is False
+    assert body["ready"] is True and body["degraded"] is False
+
+
+def test_running_prewarm_is_not_ready(fake_pipeline: dict) -> None:
+    fake_pipeline["release"].clear()
+    prewarmer = PdfPrewarmer(workers=1)
+    prewarmer.start(["f1"])
+    try:
+        assert prewarmer.status()["ready"] is False
+    finally:
+        fake_pipeline["release"].set()
+        prewarmer.wait(10)
+
+
+def test_status_endpoint_and_resume(
+    fake_pipeline: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(prewarm, "_PREWARMER", PdfPrewarmer(workers=2))
+    monkeypatch.setattr(prewarm, "prewarm_candidates", lambda: ["f1", "cached"])
+    client = TestClient(app)
+
+    assert client.get("/api/v1/cache/prewarm").json()["state"] == "idle"
+
+    started = client.post("/api/v1/cache/prewarm").json()
+    assert started["started"] is True
+    prewarm.get_pdf_prewarmer().wait(10)
+
+    body = client.get("/api/v1/cache/prewarm").json()
+    assert (body["total"], body["done"], body["fresh"], body["failed"]) == (2, 1, 1, 0)
+    assert body["ready"] is True and body["degraded"] is False
+
+
+def test_pdf_hits_are_grouped_by_format(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from app.core.cache_store import CacheStore
+
+    store = CacheStore(tmp_path / "index.sqlite3", max_bytes=10_000, max_age=3600)
+    for name, hits in (("unac-a-0123456789abcdef.pdf", 2), ("unac-a-fedcba9876543210.pdf", 1)):
+        path = tmp_path / name
+        path.write_bytes(b"%PDF")
+        store.record_put("pdf", path)
+        for _ in range(hits):
+            store.record_hit("pdf", path)
+    monkeypatch.setattr(prewarm, "get_cache_store", lambda: store)
+
+    try:
+        assert prewarm._pdf_hits_by_format() == {"unac-a": 3}
+    finally:
+        store.close()
@@ -0,0 +1,146 @@
+"""Tests for the content-addressed render cache."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from app.core import render_cache
+from app.core.cache_store import CacheStore
+from app.core.render_cache import RenderCache, build_render_cache_key
+from app.modules.api import render_router
+from app.modules.generation import service as generation_service
+
+FORMAT_ID = "unac-informe-cuant"
+
+
+@pytest.fixture
+def cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> RenderCache:
+    index = CacheStore(tmp_path / "index.sqlite3", max_bytes=10_000, max_age=3600)
+    store = RenderCache(tmp_path / "store", store=index)
+    monkeypatch.setattr(render_cache, "_CACHE", store)
+    monkeypatch.setattr(render_cache, "get_render_cache", lambda: store)
+    monkeypatch.setattr(render_router, "get_render_cache", lambda: store)
+    monkeypatch.setattr(generation_service, "get_render_cache", lambda: store)
+    return store
+
+
+def _write(path: Path, payload: bytes) -> Path:
+    path.write_bytes(payload)
+    return path
+
+
+def test_key_is_canonical_and_payload_sensitive() -> None:
+    key_a = build_render_cache_key(FORMAT_ID, {"values": {"a": 1, "b": 2}})
+    key_b = build_render_cache_key(FORMAT_ID, {"values": {"b": 2, "a": 1}})
+    key_c = build_render_cache_key(FORMAT_ID, {"values": {"a": 1, "b": 3}})
+
+    assert key_a == key_b
+    assert key_a != key_c
+    assert len(key_a) == 64
+
+
+def test_key_changes_with_engine_fingerprint(monkeypatch: pytest.MonkeyPatch) -> None:
+    before = build_render_cache_key(FORMAT_ID, {})
+    monkeypatch.setattr(render_cache, "get_engine_fingerprint", lambda: "otro-engine")
+
+    assert build_render_cache_key(FORMAT_ID, {}) != before
+
+
+def test_put_get_roundtrip_counts_hits_and_misses(
+    cache: RenderCache, tmp_path: Path
+) -> None:
+    assert cache.get("k1", "docx") is None
+    cache.put("k1", "docx", _write(tmp_path / "a.docx", b"docx-bytes"))
+
+    cached = cache.get("k1", "docx")
+    assert cached is not None and cached.read_bytes() == b"docx-bytes"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_entries_expire_by_age(cache: RenderCache, tmp_path: Path) -> None:
+    stored = cache.put("old", "pdf", _write(tmp_path / "a.pdf", b"%PDF"))
+
+    assert cache.store.evict(now=time.time() + 7200) == 1
+    assert not stored.exists()
+    assert cache.get("old", "pdf") is None
+
+
+def test_lru_eviction_keeps_recently_used_entries(
+    cache: RenderCache, tmp_path: Path
+) -> None:
+    blob = b"x" * 4000
+    first = cache.put("first", "docx", _write(tmp_path / "1", blob))
+    second = cache.put("second", "docx", _write(tmp_path / "2", blob))
+    cache.get("first", "docx")  # touch: "second" becomes least recently used
+
+    cache.put("third", "docx", _write(tmp_path / "3", blob))
+
+    assert first.exists()
+    assert not second.exists()
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_larger_than_quota_is_kept_for_its_writer(
+    cache: RenderCache, tmp_path: Path
+) -> None:
+    small = cache.put("small", "docx", _write(tmp_path / "s", b"x" * 4000))
+
+    big = cache.put("big", "pdf", _write(tmp_path / "b", b"x" * 20_000))
+
+    assert big is not None and big.exists()
+    assert not small.exists()
+    assert cache.get("big", "pdf") == big
+
+
+def test_simulation_docx_reuses_cached_render(
+    cache: RenderCache, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    calls: list[str] = []
+
+    def fake_generate(format_id: str, override_data=None, **_kwargs):
+        calls.append(format_id)
+        return _write(tmp_path / f"gen-{len(calls)}.docx", b"rendered"), "X.docx"
+
+    monkeypatch.setattr(render_router.formats_service, "generate_document", fake_generate)
+
+    first, name = render_router._generate_simulation_docx(FORMAT_ID, {"title": "A"}, None)
+    second, _ = render_router._generate_simulation_docx(FORMAT_ID, {"title": "A"}, None)
+    render_router._generate_simulation_docx(FORMAT_ID, {"title": "B"}, None)
+
+    assert calls == [FORMAT_ID, FORMAT_ID]
+    assert name == "UNAC_INFORME_CUANT_SIMULACION.docx"
+    assert second != first and second.read_bytes() == b"rendered"
+    second.unlink()
+
+
+def test_generate_artifacts_skips_render_on_cache_hit(
+    cache: RenderCache, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    calls: list[str] = []
+
+    def fake_generate(format_id: str, **_kwargs):
+        calls.append(format_id)
+        return _write(tmp_path / f"artifact-{len(calls)}.docx", b"docx"), "X.docx"
+
+    def fake_convert(src: str, dest: str) -> None:
+        Path(dest).write_bytes(b"%PDF-1.4")
+
+    import app.core.pdf_converter as pdf_converter
+
+    monkeypatch.setattr(generation_service, "generate_document", fake_generate)
+    monkeypatch.setattr(pdf_converter, "convert_docx_to_pdf", fake_convert)
+    monkeypatch.setattr(generation_service, "get_artifacts_dir", lambda: tmp_path)
+    run_ids = iter(["gen-a", "gen-b"])
+    monkeypatch.setattr(generation_service, "generate_run_id", lambda: next(run_ids))
+
+    first = generation_service.generate_artifacts("p", FORMAT_ID, values={"t": 1})
+    second = generation_service.generate_artifacts("p", FORMAT_ID, values={"t": 1})
+
+    assert first.status == second.status == "success"
+    assert calls == [FORMAT_ID]
+    assert [a.type for a in second.artifacts] == ["docx", "pdf"]
+    assert (tmp_path / "gen-b" / "unac-informe-cuant.pdf").read_bytes() == b"%PDF-1.4"
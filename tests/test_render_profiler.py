@@ -0,0 +1,179 @@
+"""Tests for on-demand render profiling (app/core/render_profiler.py + render router)."""
+
+from __future__ import annotations
+
+import pstats
+import re
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.core import metrics, render_profiler
+from app.core.loaders import discover_format_files, load_format_by_id
+from app.core.metrics import reset_metrics_registry
+from app.main import app
+from app.universities.shared.universal_generator import render_document_bytes
+
+_COLLAPSED_LINE = re.compile(r"^\S[^\n]* \d+$")
+
+
+@pytest.fixture(autouse=True)
+def profile_root(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("GICATESIS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("GICATESIS_RENDER_CACHE", "false")
+    monkeypatch.delenv("GICATESIS_METRICS", raising=False)
+    reset_metrics_registry()
+    yield tmp_path / "cache" / "profiles"
+    reset_metrics_registry()
+
+
+@pytest.fixture
+def format_id() -> str:
+    for item in discover_format_files(None):
+        if load_format_by_id(item.format_id).get("cuerpo"):
+            return item.format_id
+    pytest.skip("No formats with body available")
+
+
+def test_profile_render_writes_pstats_collapsed_and_block_breakdown(format_id: str) -> None:
+    data = load_format_by_id(format_id)
+
+    payload, profile = render_profiler.profile_render(
+        lambda: render_document_bytes(data), label="unit"
+    )
+
+    assert payload[:2] == b"PK"
+    assert sorted(path.name for path in profile.directory.iterdir()) == sorted(
+        render_profiler.PROFILE_FILES
+    )
+    stats = pstats.Stats(str(profile.directory / "profile.pstats"))
+    assert any(func[2] == "render_blocks" for func in stats.stats)
+    assert "cumulative" in (profile.directory / "profile.txt").read_text(encoding="utf-8")
+    collapsed = (profile.directory / "profile.collapsed").read_text(encoding="utf-8")
+    assert all(_COLLAPSED_LINE.match(line) for line in collapsed.splitlines())
+
+    summary = profile.summary
+    assert set(summary["stages_ms"]) >= {"normalize", "render", "save"}
+    block_types = {row["block_type"] for row in summary["blocks"]}
+    assert "heading" in block_types
+    totals = [row["total_ms"] for row in summary["blocks"]]
+    assert totals == sorted(totals, reverse=True)
+    # Profiled durations are inflated by cProfile: they must not reach /metrics.
+    assert "gicatesis_block_render_duration_seconds_count" not in metrics.render_metrics()
+
+
+def test_profile_render_keeps_only_latest_profiles(monkeypatch: pytest.MonkeyPatch, profile_root) -> None:
+    monkeypatch.setenv("GICATESIS_PROFILE_KEEP", "2")
+
+    ids = [render_profiler.profile_render(lambda: None, label="noop")[1].profile_id for _ in range(3)]
+
+    remaining = {path.name for path in profile_root.iterdir()}
+    assert len(remaining) == 2
+    assert ids[-1] in remaining
+    assert render_profiler.get_profile_file(ids[-1]) is not None
+    assert render_profiler.get_profile_file("../" + ids[-1]) is None
+    assert render_profiler.get_profile_file(ids[-1], "secrets.txt") is None
+
+
+def test_profile_summary_reports_pdf_conversion_wait() -> None:
+    def convert():
+        metrics.observe("gicatesis_pdf_conversion_duration_seconds", 0.25, converter="word")
+
+    _, profile = render_profiler.profile_render(convert, label="pdf")
+
+    assert profile.summary["stages_ms"] == {"pdf_convert": 250.0}
+
+
+def test_overlapping_profiles_are_rejected_while_one_is_running() -> None:
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(10)
+        return "first"
+
+    worker = threading.Thread(
+        target=lambda: results.append(render_profiler.profile_render(slow, label="slow")[0])
+    )
+    worker.start()
+    try:
+        assert started.wait(10)
+        with pytest.raises(render_profiler.ProfilerBusyError):
+            render_profiler.profile_render(lambda: "second", label="overlap")
+    finally:
+        release.set()
+        worker.join(10)
+
+    assert results == ["first"]
+    assert render_profiler.profile_render(lambda: "after", label="after")[0] == "after"
+
+
+def test_render_profile_returns_409_when_profiler_is_busy(
+    format_id: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GICATESIS_API_KEY", "secret")
+    monkeypatch.setattr(main_module, "API_KEY", "secret")
+    client = TestClient(app)
+
+    with render_profiler._PROFILE_LOCK:
+        response = client.post(
+            "/api/v1/render/pdf",
+            json={"formatId": format_id, "mode": "final", "profile": True},
+            headers={"X-GICATESIS-KEY": "secret"},
+        )
+
+    assert response.status_code == 409
+    assert "busy" in response.json()["detail"]
+
+
+def test_render_profile_flag_requires_api_key(format_id: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("GICATESIS_API_KEY", raising=False)
+    monkeypatch.setattr(main_module, "API_KEY", None)
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/render/docx", json={"formatId": format_id, "mode": "final", "profile": True}
+    )
+
+    assert response.status_code == 403
+    assert "GICATESIS_API_KEY" in response.json()["detail"]
+
+
+def test_render_docx_with_profile_stores_profile_next_to_artifact(
+    format_id: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GICATESIS_API_KEY", "secret")
+    monkeypatch.setattr(main_module, "API_KEY", "secret")
+    client = TestClient(app)
+    headers = {"X-GICATESIS-KEY": "secret"}
+
+    response = client.post(
+        "/api/v1/render/docx",
+        json={"formatId": format_id, "mode": "simulation", "profile": True},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.content[:2] == b"PK"
+    profile_id = response.headers["X-Render-Profile"]
+    assert response.headers["X-Render-Profile-Url"] == f"/api/v1/render/profiles/{profile_id}"
+
+    summary = client.get(f"/api/v1/render/profiles/{profile_id}", headers=headers)
+    assert summary.status_code == 200
+    body = summary.json()
+    assert body["label"] == f"docx:simulation:{format_id}"
+    assert "preprocess" in body["stages_ms"]
+    assert body["blocks"]
+
+    collapsed = client.get(
+        f"/api/v1/render/profiles/{profile_id}/profile.collapsed", headers=headers
+    )
+    assert collapsed.status_code == 200
+    assert collapsed.headers["content-type"].startswith("text/plain")
+
+    missing = client.get(f"/api/v1/render/profiles/{'0' * 32}", headers=headers)
+    assert missing.status_code == 404
@@ -0,0 +1,194 @@
+"""Tests for single-flight deduplication of DOCX/PDF preview cache fills."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.core.cache_store import CacheStore
+from app.core.single_flight import SingleFlight
+from app.main import app
+from app.modules.formats import router
+
+FORMAT_ID = "unac-informe-cuant"
+VERSION_A = "a" * 64
+VERSION_B = "b" * 64
+
+
+@pytest.fixture
+def preview_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> dict:
+    calls = {"generate": 0, "convert": 0}
+    flights = SingleFlight(tmp_path / "locks")
+
+    def fake_generate_document(format_id):
+        calls["generate"] += 1
+        time.sleep(0.1)
+        out = tmp_path / f"out-{calls['generate']}.docx"
+        out.write_bytes(b"PK docx " + format_id.encode())
+        return str(out), f"{format_id}.docx"
+
+    def fake_convert(docx_path, pdf_path):
+        calls["convert"] += 1
+        time.sleep(0.1)
+        Path(pdf_path).write_bytes(b"%PDF-1.7")
+
+    monkeypatch.setattr(router, "get_docx_cache_dir", lambda: tmp_path / "docx")
+    monkeypatch.setattr(router, "get_pdf_cache_dir", lambda: tmp_path / "pdf")
+    monkeypatch.setattr(router, "single_flight", flights.hold)
+    monkeypatch.setattr(router.service, "generate_document", fake_generate_document)
+    monkeypatch.setattr(router, "_convert_docx_to_pdf", fake_convert)
+    return calls
+
+
+def test_concurrent_pdf_requests_render_once(preview_cache: dict) -> None:
+    results = []
+    barrier = threading.Barrier(6)
+
+    def worker():
+        barrier.wait()
+        results.append(router._ensure_pdf_cached(FORMAT_ID, VERSION_A))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert preview_cache == {"generate": 1, "convert": 1}
+    assert len(results) == 6
+    assert len(set(results)) == 1
+
+
+def test_pdf_cache_hit_does_not_touch_docx(
+    preview_cache: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = router._ensure_pdf_cached(FORMAT_ID, VERSION_A)
+
+    def _forbidden(*_args):
+        raise AssertionError("un hit no debe leer ni hashear el DOCX")
+
+    monkeypatch.setattr(router, "_calculate_sha256", _forbidden)
+    monkeypatch.setattr(router, "_ensure_docx_cached", _forbidden)
+
+    assert router._ensure_pdf_cached(FORMAT_ID, VERSION_A) == first
+    assert router._is_pdf_cached(FORMAT_ID, VERSION_A)
+    assert not router._is_pdf_cached(FORMAT_ID, VERSION_B)
+    assert preview_cache == {"generate": 1, "convert": 1}
+    manifest = router._get_manifest_path(FORMAT_ID).read_text(encoding="utf-8")
+    assert '"docx_sha256": "' in manifest
+
+
+def test_pdf_route_converts_off_the_event_loop(
+    preview_cache: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    converting = threading.Event()
+    release = threading.Event()
+    released = []
+
+    def blocking_convert(docx_path, pdf_path):
+        converting.set()
+        released.append(release.wait(10))
+        Path(pdf_path).write_bytes(b"%PDF-1.7")
+
+    monkeypatch.setattr(router, "_convert_docx_to_pdf", blocking_convert)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            pdf = asyncio.create_task(client.get(f"/formatos/{FORMAT_ID}/pdf"))
+            while not converting.is_set():
+                await asyncio.sleep(0.01)
+            # Con la conversion en curso, el loop sigue atendiendo otras rutas.
+            other = await client.get("/favicon.ico")
+            release.set()
+            return other, await pdf
+
+    other, pdf = asyncio.run(scenario())
+
+    assert released == [True]
+    assert other.status_code != 500
+    assert pdf.status_code == 200 and pdf.content == b"%PDF-1.7"
+
+
+def test_quota_smaller_than_one_file_still_serves_fresh_entries(
+    preview_cache: dict, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = CacheStore(tmp_path / "index.sqlite3", max_bytes=1, max_age=3600)
+    monkeypatch.setattr(router, "get_cache_store", lambda: store)
+    converted_from = []
+
+    def checked_convert(docx_path, pdf_path):
+        converted_from.append(Path(docx_path).exists())
+        Path(pdf_path).write_bytes(b"%PDF-1.7")
+
+    monkeypatch.setattr(router, "_convert_docx_to_pdf", checked_convert)
+    try:
+        pdf = router._ensure_pdf_cached(FORMAT_ID, VERSION_A)
+        assert pdf.exists() and converted_from == [True]
+        assert router._ensure_docx_cached(FORMAT_ID, VERSION_B).exists()
+    finally:
+        store.close()
+
+
+def test_entry_evicted_by_another_request_is_regenerated(
+    preview_cache: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    evictions = []
+
+    class _RacingStore:
+        def __getattr__(self, _name):
+            return lambda *args, **kwargs: None
+
+        def enforce_quota(self, exclude=()):
+            # Simula a otro request desalojando la entrada tras escribirla.
+            if not evictions:
+                for path in exclude:
+                    evictions.append(path)
+                    Path(path).unlink()
+            return len(evictions)
+
+    monkeypatch.setattr(router, "get_cache_store", lambda: _RacingStore())
+
+    docx = router._ensure_docx_cached(FORMAT_ID, VERSION_A)
+
+    assert docx.exists() and len(evictions) == 1
+    assert preview_cache["generate"] == 2
+
+
+def test_new_source_version_regenerates_and_prunes_old_docx(preview_cache: dict) -> None:
+    old = router._ensure_docx_cached(FORMAT_ID, VERSION_A)
+    new = router._ensure_docx_cached(FORMAT_ID, VERSION_B)
+    router._ensure_docx_cached(FORMAT_ID, VERSION_B)
+
+    assert preview_cache["generate"] == 2
+    assert new.exists() and not old.exists()
+
+
+def test_single_flight_serializes_same_key_only(tmp_path: Path) -> None:
+    flights = SingleFlight(tmp_path)
+    active = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+    lock = threading.Lock()
+
+    def worker(key: str):
+        with flights.hold(key):
+            with lock:
+                active[key] += 1
+                peak[key] = max(peak[key], active[key])
+            time.sleep(0.02)
+            with lock:
+                active[key] -= 1
+
+    threads = [threading.Thread(target=worker, args=(key,)) for key in "abab" * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert peak == {"a": 1, "b": 1}
+    assert not flights._locks